@@ -0,0 +1,242 @@
+"""
+Processing Activity Buffer
+
+Activity log lines are written from the processing loop, uploads, exports and
+status changes. Committing each one separately takes the SQLite write lock
+once per line. The ActivityBuffer accumulates activity rows in memory and
+writes them with one multi-row INSERT when max_entries rows are pending or
+flush_interval seconds after the first pending row, whichever comes first.
+
+Pending rows are flushed on shutdown and before a session reaches a final
+status. Entries that must be visible immediately (session lifecycle and
+status changes) bypass the buffer; they flush the pending rows first so the
+log keeps its order.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .db_writer import get_database_writer, uses_database_writer
+from .models import ActivityType, ProcessingActivity
+from .services.status_snapshot import notify_status_change
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Session lifecycle entries are written synchronously (never buffered)
+IMMEDIATE_ACTIVITY_TYPES = frozenset({
+    ActivityType.PROCESSING_STARTED,
+    ActivityType.PROCESSING_PAUSED,
+    ActivityType.PROCESSING_RESUMED,
+    ActivityType.PROCESSING_COMPLETED,
+    ActivityType.PROCESSING_FAILED,
+    ActivityType.PROCESSING_CANCELLED
+})
+
+RowWriter = Callable[[List[Dict[str, Any]]], Any]
+
+
+def activity_row(
+    session_id: str,
+    activity_type: ActivityType,
+    message: str,
+    employee_id: Optional[str] = None,
+    created_by: str = "SYSTEM"
+) -> Dict[str, Any]:
+    """Column values for one processing_activities row, timestamped now"""
+    return {
+        "activity_id": uuid.uuid4(),
+        "session_id": uuid.UUID(str(session_id)),
+        "activity_type": activity_type,
+        "activity_message": message,
+        "employee_id": employee_id,
+        "created_at": datetime.now(timezone.utc),
+        "created_by": created_by
+    }
+
+
+def insert_activity_rows(session: Session, rows: List[Dict[str, Any]]):
+    """Insert activity rows with a single multi-row INSERT"""
+    session.execute(insert(ProcessingActivity.__table__).values(rows))
+
+
+class ActivityBuffer:
+    """
+    Accumulates activity rows and writes them in batches from a flusher thread
+
+    Args:
+        write_rows: Callable writing a list of rows and returning once committed
+        max_entries: Pending rows that trigger a flush (also the rows per INSERT)
+        flush_interval: Seconds after the first pending row before it is flushed
+        name: Thread name
+    """
+
+    def __init__(
+        self,
+        write_rows: RowWriter,
+        max_entries: int = 100,
+        flush_interval: float = 0.25,
+        name: str = "activity-buffer"
+    ):
+        self.write_rows = write_rows
+        self.max_entries = max(1, max_entries)
+        self.flush_interval = max(0.0, flush_interval)
+        self.name = name
+
+        self._rows: List[Dict[str, Any]] = []
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._metrics = {
+            "entries_buffered": 0,
+            "entries_written": 0,
+            "entries_dropped": 0,
+            "flushes": 0,
+            "max_flush_size": 0
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the flusher thread (no-op when running)"""
+        with self._condition:
+            if self.is_running:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the flusher thread and write the pending rows"""
+        with self._condition:
+            thread = self._thread
+            self._stopping = True
+            self._condition.notify_all()
+        if thread is not None:
+            thread.join(timeout=timeout)
+            self._thread = None
+        self.flush()
+
+    def add(self, row: Dict[str, Any]):
+        """Queue an activity row (see activity_row); returns without touching the database"""
+        self.start()
+        with self._condition:
+            self._rows.append(row)
+            self._metrics["entries_buffered"] += 1
+            if len(self._rows) == 1 or len(self._rows) >= self.max_entries:
+                self._condition.notify_all()
+
+    def flush(self) -> int:
+        """
+        Write all pending rows and wait for the commit
+
+        Returns:
+            Number of rows written
+        """
+        with self._flush_lock:
+            with self._condition:
+                rows, self._rows = self._rows, []
+            if not rows:
+                return 0
+
+            written = 0
+            for start in range(0, len(rows), self.max_entries):
+                chunk = rows[start:start + self.max_entries]
+                try:
+                    self.write_rows(chunk)
+                    written += len(chunk)
+                except Exception as e:
+                    logger.error(f"Failed to write {len(chunk)} buffered activities: {e}")
+                    with self._condition:
+                        self._metrics["entries_dropped"] += len(chunk)
+
+            with self._condition:
+                self._metrics["entries_written"] += written
+                self._metrics["flushes"] += 1
+                self._metrics["max_flush_size"] = max(self._metrics["max_flush_size"], len(rows))
+            return written
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Buffering statistics"""
+        with self._condition:
+            metrics = dict(self._metrics)
+            metrics["pending"] = len(self._rows)
+        metrics["running"] = self.is_running
+        return metrics
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._rows and not self._stopping:
+                    self._condition.wait()
+                deadline = time.monotonic() + self.flush_interval
+                while not self._stopping and len(self._rows) < self.max_entries:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                stopping = self._stopping
+            if stopping:
+                return
+            self.flush()
+
+
+def _write_with_database_writer(rows: List[Dict[str, Any]]):
+    """Insert rows on the application database through the database writer"""
+    get_database_writer().execute(lambda session: insert_activity_rows(session, rows))
+    for session_id in {row["session_id"] for row in rows}:
+        notify_status_change(session_id)
+
+
+# Application buffer (created on first use)
+_activity_buffer: Optional[ActivityBuffer] = None
+_activity_buffer_lock = threading.Lock()
+
+
+def get_activity_buffer() -> ActivityBuffer:
+    """Get the application's activity buffer"""
+    global _activity_buffer
+    with _activity_buffer_lock:
+        if _activity_buffer is None:
+            _activity_buffer = ActivityBuffer(
+                _write_with_database_writer,
+                max_entries=settings.activity_buffer_max_entries,
+                flush_interval=settings.activity_buffer_flush_ms / 1000.0
+            )
+        return _activity_buffer
+
+
+def buffers_activity(db: Optional[Session], activity_type: ActivityType) -> bool:
+    """Whether an activity is buffered (non-immediate types written through the database writer)"""
+    return (
+        settings.activity_buffer_enabled
+        and activity_type not in IMMEDIATE_ACTIVITY_TYPES
+        and uses_database_writer(db)
+    )
+
+
+def flush_activity_buffer() -> int:
+    """Write the application's pending activity rows (no-op before first use)"""
+    return _activity_buffer.flush() if _activity_buffer is not None else 0
+
+
+def stop_activity_buffer():
+    """Stop the application's activity flusher after writing the pending rows"""
+    if _activity_buffer is not None:
+        _activity_buffer.stop()
+
+
+def get_activity_buffer_metrics() -> Dict[str, Any]:
+    """Activity buffer statistics (empty before first use)"""
+    return _activity_buffer.get_metrics() if _activity_buffer is not None else {}
@@ -124,6 +124,30 @@ class SessionFileInfoResponse(BaseModel):
     status: str = Field(..., description="Session status")
 
 
+class PageDeltaInfo(BaseModel):
+    """Page-level delta of one uploaded file against the most similar earlier file"""
+    base_session_id: str = Field(..., description="Session of the most similar earlier file")
+    base_upload_id: str = Field(..., description="Upload ID of the most similar earlier file")
+    base_checksum: str = Field(..., description="Checksum of the most similar earlier file")
+    estimated_similarity: float = Field(..., ge=0.0, le=1.0, description="MinHash similarity estimate")
+    similarity: float = Field(..., ge=0.0, le=1.0, description="Exact page-set similarity (Jaccard)")
+    exact_match: bool = Field(..., description="Whether the whole files are identical")
+    page_count: int = Field(..., description="Pages in the uploaded file")
+    base_page_count: int = Field(..., description="Pages in the earlier file")
+    new_pages: List[int] = Field(default_factory=list, description="Pages not present in the earlier file")
+    changed_pages: List[int] = Field(default_factory=list, description="Pages replacing an earlier page at the same position")
+    removed_pages: List[int] = Field(default_factory=list, description="Pages of the earlier file no longer present")
+    reused_page_count: int = Field(..., description="Pages whose extracted content can be reused")
+
+
+class PageDeltaResponse(BaseModel):
+    """Response model for page-level delta detection"""
+    session_id: str = Field(..., description="Session UUID")
+    car: Optional[PageDeltaInfo] = Field(None, description="CAR file page delta (None when no similar file)")
+    receipt: Optional[PageDeltaInfo] = Field(None, description="Receipt file page delta (None when no similar file)")
+    analysis_timestamp: datetime = Field(..., description="When the analysis was performed")
+
+
 # Configure security logger
 security_logger = logging.getLogger('security.delta_api')
 
@@ -312,6 +336,65 @@ async def get_session_file_info(
     )
 
 
+@router.get("/{session_id}/page-delta", response_model=PageDeltaResponse)
+async def get_session_page_delta(
+    session_id: str,
+    db: Session = Depends(get_db),
+    current_user: UserInfo = Depends(get_current_user)
+):
+    """
+    Page-level near-duplicate detection for a session's uploaded files
+    
+    Finds, per file, the most similar file among the owner's completed
+    sessions (MinHash over per-page hashes stored at upload) and reports which
+    pages are new or changed. Processing re-extracts only those pages; text of
+    the other pages is reused from the page cache.
+    """
+    processor = DeltaProcessor(db)
+    if not processor._validate_session_id(session_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid session ID format"
+        )
+    
+    session = db.query(ProcessingSession).filter(
+        ProcessingSession.session_id == session_id
+    ).first()
+    
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+    
+    if session.created_by != current_user.username and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this session"
+        )
+    
+    try:
+        page_delta = processor.detect_page_delta(session_id, session.created_by)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except SQLAlchemyError as e:
+        security_logger.error(f"Database error during page delta detection: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Page delta detection failed"
+        )
+    
+    return PageDeltaResponse(
+        session_id=session_id,
+        car=page_delta.get("car"),
+        receipt=page_delta.get("receipt"),
+        analysis_timestamp=datetime.now(timezone.utc)
+    )
+
+
 @router.post("/calculate-checksum")
 async def calculate_file_checksum(
     request: Request,
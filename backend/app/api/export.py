@@ -7,14 +7,15 @@ Provides endpoints for generating and downloading various export formats:
 - Issues PDF reports for management reporting
 """
 
+import asyncio
 import io
 import csv
 from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, Response, Path, BackgroundTasks
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Path, BackgroundTasks
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 
@@ -36,10 +37,17 @@ except ImportError:
 from ..database import get_db
 from ..auth import get_current_user, UserInfo
 from ..models import (
-    ProcessingSession, EmployeeRevision, ProcessingActivity,
+    ProcessingSession, ProcessingActivity,
     SessionStatus, ValidationStatus, ActivityType
 )
-from ..services.export_generator import ExportGenerator, create_export_generator
+from ..services.export_generator import (
+    ExportGenerator, create_export_generator, export_statuses, has_session_rows, iter_csv_chunks,
+    iter_session_rows, PVAULT_COLUMNS
+)
+from ..services.session_statistics import get_session_statistics
+from ..services.result_snapshots import load_session_employees
+from ..services.export_artifacts import ExportArtifact, get_export_artifact
+from ..services.status_snapshot import etag_matches
 from pydantic import BaseModel, Field
 from pathlib import Path as PathLib
 
@@ -94,8 +102,32 @@ def _log_export_activity(db: Session, session_id: str, export_type: str, filenam
         # Don't raise - logging failure shouldn't break export
 
 
+def _artifact_response(request: Request, artifact: ExportArtifact) -> Response:
+    """
+    Serve a stored export file
+    
+    Clients accepting gzip get the stored compressed copy of text exports.
+    FileResponse answers Range requests with 206; a matching If-None-Match
+    gets 304 without the file being read.
+    """
+    use_gzip = artifact.gzip_path is not None and "gzip" in request.headers.get("accept-encoding", "").lower()
+    # Each content coding is a separate representation with its own strong tag
+    etag = artifact.etag[:-1] + '-gzip"' if use_gzip else artifact.etag
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Accept-Encoding"}
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    headers["Content-Disposition"] = f"attachment; filename={artifact.filename}"
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return FileResponse(artifact.gzip_path, media_type=artifact.media_type, headers=headers)
+    return FileResponse(artifact.path, media_type=artifact.media_type, headers=headers)
+
+
 @router.get("/{session_id}/pvault")
 async def export_pvault_csv(
+    request: Request,
     session_id: str = Path(..., description="Session UUID"),
     include_resolved: bool = True,
     db: Session = Depends(get_db),
@@ -122,95 +154,74 @@ async def export_pvault_csv(
             detail=f"Session not ready for export. Status: {session.status.value}"
         )
     
-    # Build query for employees to export
-    employee_query = db.query(EmployeeRevision).filter(
-        EmployeeRevision.session_id == session_id
-    )
-    
-    # Filter based on validation status
-    if include_resolved:
-        employee_query = employee_query.filter(
-            EmployeeRevision.validation_status.in_([
-                ValidationStatus.VALID,
-                ValidationStatus.RESOLVED
-            ])
-        )
-    else:
-        employee_query = employee_query.filter(
-            EmployeeRevision.validation_status == ValidationStatus.VALID
-        )
-    
-    employees = employee_query.all()
+    # Employees to export, filtered by validation status
+    statuses = export_statuses(include_resolved)
     
-    if not employees:
-        raise HTTPException(
-            status_code=404,
-            detail="No employees available for export"
+    def build_csv():
+        """CSV chunks and filename (only when not yet built for the session's current data)"""
+        if not has_session_rows(db, session.session_id, statuses):
+            raise HTTPException(
+                status_code=404,
+                detail="No employees available for export"
+            )
+        
+        # CSV headers for pVault compatibility
+        headers = [
+            "Employee_ID",
+            "Employee_Name",
+            "Card_Amount",
+            "Receipt_Amount",
+            "Total_Amount",
+            "Validation_Status",
+            "Processing_Date",
+            "Resolved_By",
+            "Resolution_Notes"
+        ]
+        
+        def employee_rows():
+            """Employee data rows, read from the database as the file is written"""
+            for employee in iter_session_rows(db, session.session_id, PVAULT_COLUMNS, statuses):
+                car_amount = float(employee.car_amount) if employee.car_amount else 0.0
+                receipt_amount = float(employee.receipt_amount) if employee.receipt_amount else 0.0
+                total_amount = car_amount + receipt_amount
+                
+                yield [
+                    employee.employee_id or "",
+                    employee.employee_name,
+                    f"{car_amount:.2f}",
+                    f"{receipt_amount:.2f}",
+                    f"{total_amount:.2f}",
+                    employee.validation_status.value,
+                    employee.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+                    employee.resolved_by or "",
+                    employee.resolution_notes or ""
+                ]
+        
+        # Generate filename
+        filename = _generate_filename(
+            session.session_name,
+            str(session.session_id),
+            "pVault",
+            "csv"
         )
+        return iter_csv_chunks(headers, employee_rows()), filename
     
-    # Generate CSV content
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # CSV headers for pVault compatibility
-    headers = [
-        "Employee_ID",
-        "Employee_Name",
-        "Card_Amount",
-        "Receipt_Amount",
-        "Total_Amount",
-        "Validation_Status",
-        "Processing_Date",
-        "Resolved_By",
-        "Resolution_Notes"
-    ]
-    writer.writerow(headers)
-    
-    # Write employee data
-    for employee in employees:
-        car_amount = float(employee.car_amount) if employee.car_amount else 0.0
-        receipt_amount = float(employee.receipt_amount) if employee.receipt_amount else 0.0
-        total_amount = car_amount + receipt_amount
-        
-        writer.writerow([
-            employee.employee_id or "",
-            employee.employee_name,
-            f"{car_amount:.2f}",
-            f"{receipt_amount:.2f}",
-            f"{total_amount:.2f}",
-            employee.validation_status.value,
-            employee.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            employee.resolved_by or "",
-            employee.resolution_notes or ""
-        ])
-    
-    # Generate filename
-    filename = _generate_filename(
-        session.session_name,
-        str(session.session_id),
-        "pVault",
-        "csv"
+    # Stored file for the session's current data (built in a worker thread on the first download)
+    artifact, _ = await asyncio.to_thread(
+        get_export_artifact, db, session.session_id, f"pvault:resolved={include_resolved}", "text/csv", build_csv
     )
+    response = _artifact_response(request, artifact)
     
-    # Log export activity
-    _log_export_activity(db, str(session.session_id), "pVault CSV", filename, current_user.username)
-    
-    # Prepare response
-    csv_content = output.getvalue()
-    output.close()
+    # Log export activity (not for revalidations answered with 304)
+    if response.status_code != 304:
+        _log_export_activity(db, str(session.session_id), "pVault CSV", artifact.filename, current_user.username)
     
-    return StreamingResponse(
-        io.StringIO(csv_content),
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}",
-            "Content-Length": str(len(csv_content.encode('utf-8')))
-        }
-    )
+    return response
 
 
 @router.get("/{session_id}/followup")
 async def export_followup_excel(
+    request: Request,
     session_id: str = Path(..., description="Session UUID"),
     db: Session = Depends(get_db),
     current_user: UserInfo = Depends(get_current_user)
@@ -235,82 +246,82 @@ async def export_followup_excel(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    # Get employees needing attention
-    employees = db.query(EmployeeRevision).filter(
-        EmployeeRevision.session_id == session_id,
-        EmployeeRevision.validation_status == ValidationStatus.NEEDS_ATTENTION
-    ).all()
-    
-    if not employees:
-        raise HTTPException(
-            status_code=404,
-            detail="No employees requiring follow-up"
+    def build_excel():
+        """Excel content and filename (only when not yet built for the session's current data)"""
+        # Get employees needing attention
+        employees = load_session_employees(db, session.session_id, [ValidationStatus.NEEDS_ATTENTION])
+        
+        if not employees:
+            raise HTTPException(
+                status_code=404,
+                detail="No employees requiring follow-up"
+            )
+        
+        # Prepare data for Excel
+        data = []
+        for employee in employees:
+            validation_issues = ", ".join(employee.validation_flags.keys()) if employee.validation_flags else "None"
+            
+            data.append({
+                "Employee ID": employee.employee_id or "N/A",
+                "Employee Name": employee.employee_name,
+                "Car Allowance": float(employee.car_amount) if employee.car_amount else 0.0,
+                "Receipt Amount": float(employee.receipt_amount) if employee.receipt_amount else 0.0,
+                "Validation Issues": validation_issues,
+                "Processing Date": employee.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+                "Status": employee.validation_status.value,
+                "Notes": employee.resolution_notes or ""
+            })
+        
+        # Create DataFrame and Excel file
+        df = pd.DataFrame(data)
+        
+        # Generate filename
+        filename = _generate_filename(
+            session.session_name,
+            str(session.session_id),
+            "Followup",
+            "xlsx"
         )
-    
-    # Prepare data for Excel
-    data = []
-    for employee in employees:
-        validation_issues = ", ".join(employee.validation_flags.keys()) if employee.validation_flags else "None"
-        
-        data.append({
-            "Employee ID": employee.employee_id or "N/A",
-            "Employee Name": employee.employee_name,
-            "Car Allowance": float(employee.car_amount) if employee.car_amount else 0.0,
-            "Receipt Amount": float(employee.receipt_amount) if employee.receipt_amount else 0.0,
-            "Validation Issues": validation_issues,
-            "Processing Date": employee.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            "Status": employee.validation_status.value,
-            "Notes": employee.resolution_notes or ""
-        })
-    
-    # Create DataFrame and Excel file
-    df = pd.DataFrame(data)
-    
-    # Generate filename
-    filename = _generate_filename(
-        session.session_name,
-        str(session.session_id),
-        "Followup",
-        "xlsx"
+        
+        # Create Excel file in memory
+        output = io.BytesIO()
+        with pd.ExcelWriter(output, engine='openpyxl') as writer:
+            df.to_excel(writer, sheet_name='Follow-up Required', index=False)
+            
+            # Auto-adjust column widths
+            worksheet = writer.sheets['Follow-up Required']
+            for column in worksheet.columns:
+                max_length = 0
+                column = [cell for cell in column]
+                for cell in column:
+                    try:
+                        if len(str(cell.value)) > max_length:
+                            max_length = len(str(cell.value))
+                    except:
+                        pass
+                adjusted_width = min(max_length + 2, 50)
+                worksheet.column_dimensions[column[0].column_letter].width = adjusted_width
+        
+        return output.getvalue(), filename
+    
+    # Stored file for the session's current data (built in a worker thread on the first download)
+    artifact, _ = await asyncio.to_thread(
+        get_export_artifact, db, session.session_id, "followup",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", build_excel
     )
+    response = _artifact_response(request, artifact)
     
-    # Create Excel file in memory
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Follow-up Required', index=False)
-        
-        # Auto-adjust column widths
-        worksheet = writer.sheets['Follow-up Required']
-        for column in worksheet.columns:
-            max_length = 0
-            column = [cell for cell in column]
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column[0].column_letter].width = adjusted_width
-    
-    # Log export activity
-    _log_export_activity(db, str(session.session_id), "Follow-up Excel", filename, current_user.username)
-    
-    # Prepare response
-    output.seek(0)
-    
-    return StreamingResponse(
-        io.BytesIO(output.read()),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}",
-            "Content-Length": str(len(output.getvalue()))
-        }
-    )
+    # Log export activity (not for revalidations answered with 304)
+    if response.status_code != 304:
+        _log_export_activity(db, str(session.session_id), "Follow-up Excel", artifact.filename, current_user.username)
+    
+    return response
 
 
 @router.get("/{session_id}/issues")
 async def export_issues_report(
+    request: Request,
     session_id: str = Path(..., description="Session UUID"),
     db: Session = Depends(get_db),
     current_user: UserInfo = Depends(get_current_user)
@@ -341,142 +352,139 @@ async def export_issues_report(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    # Get all employees for statistics
-    all_employees = db.query(EmployeeRevision).filter(
-        EmployeeRevision.session_id == session_id
-    ).all()
-    
-    # Get employees with issues
-    problem_employees = db.query(EmployeeRevision).filter(
-        EmployeeRevision.session_id == session_id,
-        EmployeeRevision.validation_status == ValidationStatus.NEEDS_ATTENTION
-    ).all()
-    
-    # Generate filename
-    filename = _generate_filename(
-        session.session_name,
-        str(session.session_id),
-        "IssuesReport",
-        "pdf"
-    )
-    
-    # Create PDF in memory
-    output = io.BytesIO()
-    doc = SimpleDocTemplate(output, pagesize=letter)
-    styles = getSampleStyleSheet()
-    story = []
-    
-    # Title
-    title = Paragraph(f"Processing Issues Report", styles['Title'])
-    story.append(title)
-    story.append(Spacer(1, 12))
-    
-    # Session information
-    session_info = [
-        ["Session Name:", session.session_name],
-        ["Session ID:", str(session.session_id)[:8] + "..."],
-        ["Created By:", session.created_by],
-        ["Processing Date:", session.created_at.strftime("%Y-%m-%d %H:%M:%S")],
-        ["Status:", session.status.value],
-    ]
-    
-    session_table = Table(session_info, colWidths=[2*inch, 4*inch])
-    session_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    
-    story.append(session_table)
-    story.append(Spacer(1, 20))
-    
-    # Statistics summary
-    total_count = len(all_employees)
-    valid_count = sum(1 for e in all_employees if e.validation_status == ValidationStatus.VALID)
-    issues_count = sum(1 for e in all_employees if e.validation_status == ValidationStatus.NEEDS_ATTENTION)
-    resolved_count = sum(1 for e in all_employees if e.validation_status == ValidationStatus.RESOLVED)
-    
-    stats_header = Paragraph("Processing Statistics", styles['Heading2'])
-    story.append(stats_header)
-    story.append(Spacer(1, 12))
-    
-    stats_data = [
-        ["Total Employees Processed:", str(total_count)],
-        ["Valid (No Issues):", str(valid_count)],
-        ["Issues Requiring Attention:", str(issues_count)],
-        ["Issues Resolved:", str(resolved_count)],
-        ["Success Rate:", f"{(valid_count/total_count*100):.1f}%" if total_count > 0 else "N/A"]
-    ]
-    
-    stats_table = Table(stats_data, colWidths=[3*inch, 2*inch])
-    stats_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    
-    story.append(stats_table)
-    story.append(Spacer(1, 20))
-    
-    # Issues details
-    if problem_employees:
-        issues_header = Paragraph("Employees Requiring Attention", styles['Heading2'])
-        story.append(issues_header)
+    def build_pdf():
+        """PDF content and filename (only when not yet built for the session's current data)"""
+        # Statistics from the maintained per-session counters
+        stats = get_session_statistics(db, session.session_id)
+        
+        # Employees with issues (only the first 20 are listed in the report)
+        problem_count = stats["needs_attention_employees"]
+        problem_employees = load_session_employees(db, session.session_id, [ValidationStatus.NEEDS_ATTENTION], limit=20)
+        
+        # Generate filename
+        filename = _generate_filename(
+            session.session_name,
+            str(session.session_id),
+            "IssuesReport",
+            "pdf"
+        )
+        
+        # Create PDF in memory
+        output = io.BytesIO()
+        doc = SimpleDocTemplate(output, pagesize=letter)
+        styles = getSampleStyleSheet()
+        story = []
+        
+        # Title
+        title = Paragraph(f"Processing Issues Report", styles['Title'])
+        story.append(title)
         story.append(Spacer(1, 12))
         
-        issues_data = [["Employee Name", "Employee ID", "Issues", "Status"]]
+        # Session information
+        session_info = [
+            ["Session Name:", session.session_name],
+            ["Session ID:", str(session.session_id)[:8] + "..."],
+            ["Created By:", session.created_by],
+            ["Processing Date:", session.created_at.strftime("%Y-%m-%d %H:%M:%S")],
+            ["Status:", session.status.value],
+        ]
+        
+        session_table = Table(session_info, colWidths=[2*inch, 4*inch])
+        session_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
         
-        for employee in problem_employees[:20]:  # Limit to first 20 to prevent huge PDFs
-            issues = ", ".join(employee.validation_flags.keys()) if employee.validation_flags else "Validation failed"
-            issues_data.append([
-                employee.employee_name,
-                employee.employee_id or "N/A",
-                issues[:50] + "..." if len(issues) > 50 else issues,
-                employee.validation_status.value
-            ])
+        story.append(session_table)
+        story.append(Spacer(1, 20))
         
-        if len(problem_employees) > 20:
-            issues_data.append(["...", "...", f"And {len(problem_employees)-20} more", "..."])
+        # Statistics summary
+        total_count = stats["total_employees"]
+        valid_count = stats["valid_employees"]
+        issues_count = problem_count
+        resolved_count = stats["resolved_employees"]
+        
+        stats_header = Paragraph("Processing Statistics", styles['Heading2'])
+        story.append(stats_header)
+        story.append(Spacer(1, 12))
         
-        issues_table = Table(issues_data, colWidths=[2*inch, 1.5*inch, 2.5*inch, 1*inch])
-        issues_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        stats_data = [
+            ["Total Employees Processed:", str(total_count)],
+            ["Valid (No Issues):", str(valid_count)],
+            ["Issues Requiring Attention:", str(issues_count)],
+            ["Issues Resolved:", str(resolved_count)],
+            ["Success Rate:", f"{(valid_count/total_count*100):.1f}%" if total_count > 0 else "N/A"]
+        ]
+        
+        stats_table = Table(stats_data, colWidths=[3*inch, 2*inch])
+        stats_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
             ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP')
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
         ]))
         
-        story.append(issues_table)
-    
-    # Build PDF
-    doc.build(story)
+        story.append(stats_table)
+        story.append(Spacer(1, 20))
+        
+        # Issues details
+        if problem_employees:
+            issues_header = Paragraph("Employees Requiring Attention", styles['Heading2'])
+            story.append(issues_header)
+            story.append(Spacer(1, 12))
+            
+            issues_data = [["Employee Name", "Employee ID", "Issues", "Status"]]
+            
+            for employee in problem_employees:  # Limited to 20 to prevent huge PDFs
+                issues = ", ".join(employee.validation_flags.keys()) if employee.validation_flags else "Validation failed"
+                issues_data.append([
+                    employee.employee_name,
+                    employee.employee_id or "N/A",
+                    issues[:50] + "..." if len(issues) > 50 else issues,
+                    employee.validation_status.value
+                ])
+            
+            if problem_count > 20:
+                issues_data.append(["...", "...", f"And {problem_count-20} more", "..."])
+            
+            issues_table = Table(issues_data, colWidths=[2*inch, 1.5*inch, 2.5*inch, 1*inch])
+            issues_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 9),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP')
+            ]))
+            
+            story.append(issues_table)
+        
+        # Build PDF
+        doc.build(story)
+        
+        return output.getvalue(), filename
     
-    # Log export activity
-    _log_export_activity(db, str(session.session_id), "Issues PDF Report", filename, current_user.username)
+    # Stored file for the session's current data (built in a worker thread on the first download)
+    artifact, _ = await asyncio.to_thread(
+        get_export_artifact, db, session.session_id, "issues", "application/pdf", build_pdf
+    )
+    response = _artifact_response(request, artifact)
     
-    # Prepare response
-    output.seek(0)
+    # Log export activity (not for revalidations answered with 304)
+    if response.status_code != 304:
+        _log_export_activity(db, str(session.session_id), "Issues PDF Report", artifact.filename, current_user.username)
     
-    return StreamingResponse(
-        io.BytesIO(output.read()),
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}",
-            "Content-Length": str(len(output.getvalue()))
-        }
-    )
+    return response
 
 
 @router.get("/{session_id}/history", response_model=ExportHistoryResponse)
@@ -534,6 +542,7 @@ async def get_export_history(
 
 @router.get("/{session_id}/pvault/enhanced")
 async def export_enhanced_pvault_csv(
+    request: Request,
     session_id: str = Path(..., description="Session UUID"),
     include_resolved: bool = True,
     include_validation_details: bool = False,
@@ -558,36 +567,30 @@ async def export_enhanced_pvault_csv(
         # Create export generator
         generator = create_export_generator(db)
         
-        # Generate CSV
-        csv_buffer, filename = generator.generate_pvault_csv(
-            session=session,
-            include_resolved=include_resolved,
-            include_validation_details=include_validation_details
+        # Stored CSV for the session's current data (streamed into the file in a worker thread on the first download)
+        artifact, _ = await asyncio.to_thread(
+            get_export_artifact, db, session.session_id,
+            f"pvault_enhanced:resolved={include_resolved}:details={include_validation_details}",
+            generator.get_export_mime_type("csv"),
+            lambda: generator.stream_pvault_csv(
+                session=session,
+                include_resolved=include_resolved,
+                include_validation_details=include_validation_details
+            )
         )
+        response = _artifact_response(request, artifact)
+        
+        # Log export activity (not for revalidations answered with 304)
+        if response.status_code != 304:
+            generator.log_export_activity(
+                session_id=session_id,
+                export_type="enhanced_pvault_csv",
+                filename=artifact.filename,
+                username=current_user.username,
+                file_size=artifact.size
+            )
         
-        # Get file size for logging
-        csv_content = csv_buffer.getvalue()
-        file_size = len(csv_content.encode('utf-8'))
-        
-        # Log export activity
-        generator.log_export_activity(
-            session_id=session_id,
-            export_type="enhanced_pvault_csv",
-            filename=filename,
-            username=current_user.username,
-            file_size=file_size
-        )
-        
-        # Return file download
-        csv_buffer.seek(0)
-        return StreamingResponse(
-            io.StringIO(csv_content),
-            media_type=generator.get_export_mime_type("csv"),
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Content-Length": str(file_size)
-            }
-        )
+        return response
         
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
@@ -597,6 +600,7 @@ async def export_enhanced_pvault_csv(
 
 @router.get("/{session_id}/followup/enhanced")
 async def export_enhanced_followup_excel(
+    request: Request,
     session_id: str = Path(..., description="Session UUID"),
     include_summary: bool = True,
     db: Session = Depends(get_db),
@@ -620,35 +624,31 @@ async def export_enhanced_followup_excel(
         # Create export generator
         generator = create_export_generator(db)
         
-        # Generate Excel
-        excel_buffer, filename = generator.generate_followup_excel(
-            session=session,
-            include_summary=include_summary
-        )
-        
-        # Get file size for logging
-        excel_content = excel_buffer.getvalue()
-        file_size = len(excel_content)
+        def build_excel():
+            excel_buffer, filename = generator.generate_followup_excel(
+                session=session,
+                include_summary=include_summary
+            )
+            return excel_buffer.getvalue(), filename
         
-        # Log export activity
-        generator.log_export_activity(
-            session_id=session_id,
-            export_type="enhanced_followup_excel",
-            filename=filename,
-            username=current_user.username,
-            file_size=file_size
+        # Stored Excel file for the session's current data (built in a worker thread on the first download)
+        artifact, _ = await asyncio.to_thread(
+            get_export_artifact, db, session.session_id, f"followup_enhanced:summary={include_summary}",
+            generator.get_export_mime_type("excel"), build_excel
         )
+        response = _artifact_response(request, artifact)
+        
+        # Log export activity (not for revalidations answered with 304)
+        if response.status_code != 304:
+            generator.log_export_activity(
+                session_id=session_id,
+                export_type="enhanced_followup_excel",
+                filename=artifact.filename,
+                username=current_user.username,
+                file_size=artifact.size
+            )
         
-        # Return file download
-        excel_buffer.seek(0)
-        return StreamingResponse(
-            io.BytesIO(excel_content),
-            media_type=generator.get_export_mime_type("excel"),
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Content-Length": str(file_size)
-            }
-        )
+        return response
         
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
@@ -658,6 +658,7 @@ async def export_enhanced_followup_excel(
 
 @router.get("/{session_id}/issues/enhanced")
 async def export_enhanced_issues_report(
+    request: Request,
     session_id: str = Path(..., description="Session UUID"),
     include_statistics: bool = True,
     include_recommendations: bool = True,
@@ -682,36 +683,33 @@ async def export_enhanced_issues_report(
         # Create export generator
         generator = create_export_generator(db)
         
-        # Generate PDF
-        pdf_buffer, filename = generator.generate_issues_report(
-            session=session,
-            include_statistics=include_statistics,
-            include_recommendations=include_recommendations
-        )
-        
-        # Get file size for logging
-        pdf_content = pdf_buffer.getvalue()
-        file_size = len(pdf_content)
+        def build_pdf():
+            pdf_buffer, filename = generator.generate_issues_report(
+                session=session,
+                include_statistics=include_statistics,
+                include_recommendations=include_recommendations
+            )
+            return pdf_buffer.getvalue(), filename
         
-        # Log export activity
-        generator.log_export_activity(
-            session_id=session_id,
-            export_type="enhanced_issues_pdf",
-            filename=filename,
-            username=current_user.username,
-            file_size=file_size
+        # Stored PDF for the session's current data (built in a worker thread on the first download)
+        artifact, _ = await asyncio.to_thread(
+            get_export_artifact, db, session.session_id,
+            f"issues_enhanced:statistics={include_statistics}:recommendations={include_recommendations}",
+            generator.get_export_mime_type("pdf"), build_pdf
         )
+        response = _artifact_response(request, artifact)
+        
+        # Log export activity (not for revalidations answered with 304)
+        if response.status_code != 304:
+            generator.log_export_activity(
+                session_id=session_id,
+                export_type="enhanced_issues_pdf",
+                filename=artifact.filename,
+                username=current_user.username,
+                file_size=artifact.size
+            )
         
-        # Return file download
-        pdf_buffer.seek(0)
-        return StreamingResponse(
-            io.BytesIO(pdf_content),
-            media_type=generator.get_export_mime_type("pdf"),
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Content-Length": str(file_size)
-            }
-        )
+        return response
         
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
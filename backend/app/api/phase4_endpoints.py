@@ -12,7 +12,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
 from sqlalchemy.orm import Session
 
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..auth import get_current_user, UserInfo
 from ..models import ProcessingSession, SessionStatus
 from ..services.receipt_reprocessing_service import ReceiptReprocessingService
@@ -444,7 +444,7 @@ async def get_change_summary(
 async def get_session_analytics(
     date_from: Optional[datetime] = None,
     date_to: Optional[datetime] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: UserInfo = Depends(get_current_user)
 ):
     """Get comprehensive session analytics (admin only)"""
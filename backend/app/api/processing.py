@@ -20,7 +20,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import func
 
-from ..database import get_db, create_isolated_session, safe_commit, atomic_transaction, cleanup_session
+from ..database import get_db, create_isolated_session, cleanup_session, ReadSessionLocal
+from ..db_writer import run_write
 from ..resilience import PROCESSING_CIRCUIT_BREAKER, CircuitBreakerOpenException
 from ..degradation import get_degradation_manager, handle_database_failure
 from ..consistency import validate_and_checkpoint, get_consistency_manager
@@ -34,10 +35,18 @@ from ..schemas import (
     ProcessingConfig, ErrorResponse
 )
 from ..services.document_intelligence import create_document_processor
-from ..services.mock_processor import simulate_document_processing, log_processing_activity, update_session_status
+from ..services.mock_processor import (
+    simulate_document_processing, log_processing_activity, update_session_status, flush_buffered_activities
+)
+from ..services.merge_engine import merge_employees
+from ..services.incremental_validation import invalidate_validation_state
+from ..services.status_snapshot import notify_status_change
+from ..services.result_snapshots import refresh_result_snapshot_async
+from ..services.employee_fingerprint import fingerprint_employee_data
 from ..services.delta_aware_processor import (
     DeltaAwareProcessor, create_delta_processing_config, should_use_delta_processing
 )
+from ..services.delta_processor import DeltaProcessor
 from ..websocket import notifier
 from ..services.auto_export_service import trigger_auto_exports
 from ..config import settings
@@ -332,17 +341,16 @@ async def process_documents_with_intelligence(
         # Use circuit breaker for initial database setup
         try:
             with PROCESSING_CIRCUIT_BREAKER.protect():
-                if not safe_commit(db):
-                    raise Exception("Failed to commit initial session setup")
-                
-                # Update session totals with isolated transaction
-                with atomic_transaction() as session:
+                def set_totals(session: Session):
                     session_obj = session.query(ProcessingSession).filter(
                         ProcessingSession.session_id == session_uuid
                     ).first()
                     if session_obj:
                         session_obj.total_employees = total_employees
                         session_obj.processed_employees = 0
+                
+                # The initial session setup pending on db is committed first
+                await run_write(db, set_totals)
 
         except CircuitBreakerOpenException:
             logger.error("Circuit breaker is open - processing unavailable")
@@ -436,7 +444,7 @@ async def process_documents_with_intelligence(
         # Final integrity check
         consistency_manager = get_consistency_manager()
         try:
-            with atomic_transaction() as integrity_session:
+            with ReadSessionLocal() as integrity_session:
                 integrity_result = consistency_manager.verify_data_integrity(integrity_session, session_id)
                 
                 if not integrity_result.is_valid:
@@ -449,36 +457,44 @@ async def process_documents_with_intelligence(
         # Update session totals and complete processing
         logger.info(f"Finalizing processing - total: {total_employees}, processed: {processed_count}")
         
+        # Progress lines still buffered are written before the session completes
+        await flush_buffered_activities()
+        
         # Use circuit breaker for final session updates
         try:
             with PROCESSING_CIRCUIT_BREAKER.protect():
-                with atomic_transaction() as final_session:
-                    # Update session totals
-                    db_session = final_session.query(ProcessingSession).filter(
+                def complete_session(session: Session) -> bool:
+                    db_session = session.query(ProcessingSession).filter(
                         ProcessingSession.session_id == session_uuid
                     ).first()
                     
-                    if db_session:
-                        db_session.total_employees = total_employees
-                        db_session.processed_employees = processed_count
-                        db_session.status = SessionStatus.COMPLETED
-                        db_session.updated_at = datetime.now(timezone.utc)
-                        logger.info(f"Successfully updated session {session_id} status to COMPLETED")
-                    else:
-                        logger.error(f"Failed to find session {session_id} for status update")
-                        raise ValueError(f"Session {session_id} not found for status update")
+                    if not db_session:
+                        return False
+                    db_session.total_employees = total_employees
+                    db_session.processed_employees = processed_count
+                    db_session.status = SessionStatus.COMPLETED
+                    db_session.updated_at = datetime.now(timezone.utc)
+                    return True
+                
+                if not await run_write(None, complete_session):
+                    logger.error(f"Failed to find session {session_id} for status update")
+                    raise ValueError(f"Session {session_id} not found for status update")
+                logger.info(f"Successfully updated session {session_id} status to COMPLETED")
+                # Employees were rewritten; incremental validation state reloads on next use
+                invalidate_validation_state(session_id)
+                notify_status_change(session_id)
                 
-                # Log completion with separate session to avoid conflicts
                 issues_count = sum(1 for emp in all_employees if emp.get('validation_status') == ValidationStatus.NEEDS_ATTENTION)
                 logger.info(f"Completion stats - processed: {processed_count}, issues: {issues_count}, valid: {processed_count - issues_count}")
                 
-                # Use a separate database session for logging
-                with atomic_transaction() as log_session:
-                    await log_processing_activity(
-                        log_session, session_id, ActivityType.PROCESSING,
-                        f"Batch processing completed successfully - {processed_count} employees processed ({processed_count - issues_count} valid, {issues_count} with issues)",
-                        created_by="system"
-                    )
+                await log_processing_activity(
+                    None, session_id, ActivityType.PROCESSING,
+                    f"Batch processing completed successfully - {processed_count} employees processed ({processed_count - issues_count} valid, {issues_count} with issues)",
+                    created_by="system", immediate=True
+                )
+                
+                # Results are read from the snapshot from now on
+                await refresh_result_snapshot_async(session_id)
                 
         except CircuitBreakerOpenException:
             logger.error(f"Circuit breaker open during final processing steps for session {session_id}")
@@ -556,9 +572,9 @@ async def process_documents_with_intelligence(
         
         # Handle failure with circuit breaker and graceful degradation
         try:
-            # Try to update session status with isolated transaction
-            with atomic_transaction() as failure_session:
-                db_session = failure_session.query(ProcessingSession).filter(
+            # Mark the session failed through the database writer
+            def mark_failed(session: Session):
+                db_session = session.query(ProcessingSession).filter(
                     ProcessingSession.session_id == session_uuid
                 ).first()
                 
@@ -566,6 +582,8 @@ async def process_documents_with_intelligence(
                     db_session.status = SessionStatus.FAILED
                     db_session.updated_at = datetime.now(timezone.utc)
             
+            await run_write(None, mark_failed)
+            
             logger.info(f"Successfully updated session status to FAILED for session {session_id}")
             
             # Notify WebSocket clients of failure
@@ -599,7 +617,7 @@ async def _process_employee_batch(
     index_records: List[Dict[str, Any]]
 ) -> bool:
     """
-    Process a batch of employees with isolated database session
+    Insert a batch of employees through the database writer
     
     Args:
         batch_employees: List of employee data to process
@@ -613,80 +631,83 @@ async def _process_employee_batch(
     """
     logger.debug(f"Processing batch {batch_number} with {len(batch_employees)} employees")
     
-    batch_index_records = []  # Temporary index records for this batch
-    
-    try:
-        with atomic_transaction() as session:
-            for i, employee_data in enumerate(batch_employees):
-                employee_name = employee_data.get('employee_name', 'Unknown')
-                logger.debug(f"Processing employee {i+1}/{len(batch_employees)} in batch {batch_number}: {employee_name}")
+    def insert_batch(session: Session) -> List[Dict[str, Any]]:
+        batch_index_records = []  # Temporary index records for this batch
+        for i, employee_data in enumerate(batch_employees):
+            employee_name = employee_data.get('employee_name', 'Unknown')
+            logger.debug(f"Processing employee {i+1}/{len(batch_employees)} in batch {batch_number}: {employee_name}")
+            
+            try:
+                # Derive validation flags and status
+                car_amount_val = employee_data.get('car_amount')
+                receipt_amount_val = employee_data.get('receipt_amount')
                 
                 try:
-                    # Derive validation flags and status
-                    car_amount_val = employee_data.get('car_amount')
-                    receipt_amount_val = employee_data.get('receipt_amount')
+                    car_amount_f = float(car_amount_val) if car_amount_val is not None else None
+                except (TypeError, ValueError):
+                    car_amount_f = None
+                    logger.warning(f"Invalid car_amount for {employee_name}: {car_amount_val}")
                     
-                    try:
-                        car_amount_f = float(car_amount_val) if car_amount_val is not None else None
-                    except (TypeError, ValueError):
-                        car_amount_f = None
-                        logger.warning(f"Invalid car_amount for {employee_name}: {car_amount_val}")
-                        
-                    try:
-                        receipt_amount_f = float(receipt_amount_val) if receipt_amount_val is not None else None
-                    except (TypeError, ValueError):
-                        receipt_amount_f = None
-                        logger.warning(f"Invalid receipt_amount for {employee_name}: {receipt_amount_val}")
-
-                    validation_flags = {}
-                    needs_attention = False
-
-                    # Missing receipts
-                    if receipt_amount_f is None or receipt_amount_f <= 0:
-                        validation_flags['missing_receipt'] = True
+                try:
+                    receipt_amount_f = float(receipt_amount_val) if receipt_amount_val is not None else None
+                except (TypeError, ValueError):
+                    receipt_amount_f = None
+                    logger.warning(f"Invalid receipt_amount for {employee_name}: {receipt_amount_val}")
+
+                validation_flags = {}
+                needs_attention = False
+
+                # Missing receipts
+                if receipt_amount_f is None or receipt_amount_f <= 0:
+                    validation_flags['missing_receipt'] = True
+                    needs_attention = True
+
+                # Amount mismatch when both present
+                if car_amount_f is not None and receipt_amount_f is not None:
+                    if abs(car_amount_f - receipt_amount_f) > 0.01:
+                        validation_flags['amount_mismatch'] = True
                         needs_attention = True
 
-                    # Amount mismatch when both present
-                    if car_amount_f is not None and receipt_amount_f is not None:
-                        if abs(car_amount_f - receipt_amount_f) > 0.01:
-                            validation_flags['amount_mismatch'] = True
-                            needs_attention = True
-
-                    validation_status = ValidationStatus.NEEDS_ATTENTION if needs_attention else ValidationStatus.VALID
-                    
-                    # Add convenience counts placeholder (will be populated when entries persisted)
-                    if settings.lines_enabled:
-                        validation_flags['receipt_entry_count'] = validation_flags.get('receipt_entry_count', 0)
-                        validation_flags['car_line_count'] = validation_flags.get('car_line_count', 0)
-
-                    # Create employee revision
-                    employee = EmployeeRevision(
-                        session_id=session_uuid,
-                        employee_id=employee_data.get('employee_id'),
-                        employee_name=employee_data.get('employee_name'),
-                        car_amount=employee_data.get('car_amount'),
-                        receipt_amount=employee_data.get('receipt_amount'),
-                        validation_status=validation_status,
-                        validation_flags=validation_flags
-                    )
-                    
-                    session.add(employee)
-                    session.flush()  # Get the revision_id
-                    
-                    # Add to temporary index records for this batch
-                    if settings.lines_enabled:
-                        batch_index_records.append({
-                            'employee_key': (employee.employee_name or '').replace(' ', '').upper(),
-                            'employee_id': employee.employee_id,
-                            'employee_name': employee.employee_name,
-                            'revision_id': str(employee.revision_id)
-                        })
-                    
-                except Exception as emp_error:
-                    logger.error(f"Error processing employee {i+1} ({employee_name}) in batch {batch_number}: {emp_error}")
-                    # Continue with other employees in the batch, but log the error
-                    # The transaction will still complete for valid employees
-                    continue
+                validation_status = ValidationStatus.NEEDS_ATTENTION if needs_attention else ValidationStatus.VALID
+                
+                # Add convenience counts placeholder (will be populated when entries persisted)
+                if settings.lines_enabled:
+                    validation_flags['receipt_entry_count'] = validation_flags.get('receipt_entry_count', 0)
+                    validation_flags['car_line_count'] = validation_flags.get('car_line_count', 0)
+
+                # Create employee revision
+                employee = EmployeeRevision(
+                    session_id=session_uuid,
+                    employee_id=employee_data.get('employee_id'),
+                    employee_name=employee_data.get('employee_name'),
+                    car_amount=employee_data.get('car_amount'),
+                    receipt_amount=employee_data.get('receipt_amount'),
+                    validation_status=validation_status,
+                    validation_flags=validation_flags,
+                    content_fingerprint=fingerprint_employee_data(employee_data)
+                )
+                
+                session.add(employee)
+                session.flush()  # Get the revision_id
+                
+                # Add to temporary index records for this batch
+                if settings.lines_enabled:
+                    batch_index_records.append({
+                        'employee_key': (employee.employee_name or '').replace(' ', '').upper(),
+                        'employee_id': employee.employee_id,
+                        'employee_name': employee.employee_name,
+                        'revision_id': str(employee.revision_id)
+                    })
+                
+            except Exception as emp_error:
+                logger.error(f"Error processing employee {i+1} ({employee_name}) in batch {batch_number}: {emp_error}")
+                # Continue with other employees in the batch, but log the error
+                # The transaction will still complete for valid employees
+                continue
+        return batch_index_records
+    
+    try:
+        batch_index_records = await run_write(None, insert_batch)
         
         # Only add to main index records if the entire batch transaction succeeded
         index_records.extend(batch_index_records)
@@ -706,7 +727,7 @@ async def _update_batch_progress(
     total_employees: int
 ):
     """
-    Update processing progress with isolated database session
+    Update processing progress through the database writer
     
     Args:
         session_uuid: Processing session UUID
@@ -718,7 +739,7 @@ async def _update_batch_progress(
     
     try:
         with STATUS_UPDATE_CIRCUIT_BREAKER.protect():
-            with atomic_transaction() as session:
+            def apply_progress(session: Session):
                 # Update session progress
                 db_session = session.query(ProcessingSession).filter(
                     ProcessingSession.session_id == session_uuid
@@ -727,6 +748,9 @@ async def _update_batch_progress(
                 if db_session:
                     db_session.processed_employees = processed_count
             
+            await run_write(None, apply_progress)
+            notify_status_change(session_id)
+            
             # Send WebSocket progress update
             from ..websocket import websocket_manager as notifier
             await notifier.notify_processing_progress(
@@ -736,13 +760,11 @@ async def _update_batch_progress(
             # Log progress periodically
             if processed_count % 10 == 0 or processed_count == total_employees:
                 percent_complete = int((processed_count / total_employees) * 100)
-                # Use a separate database session for logging
-                with atomic_transaction() as log_session:
-                    await log_processing_activity(
-                        log_session, session_id, ActivityType.PROCESSING,
-                        f"Batch processing progress: {processed_count}/{total_employees} employees ({percent_complete}%)",
-                        created_by="system"
-                    )
+                await log_processing_activity(
+                    None, session_id, ActivityType.PROCESSING,
+                    f"Batch processing progress: {processed_count}/{total_employees} employees ({percent_complete}%)",
+                    created_by="system"
+                )
                 
     except Exception as e:
         # Import here since CircuitBreakerOpenException is only used in except block
@@ -757,6 +779,9 @@ def merge_employee_data(car_employees: List[Dict], receipt_employees: List[Dict]
     """
     Merge employee data from CAR and Receipt documents
     
+    Employees are joined on digits-only Employee ID; records without an ID
+    partner are fuzzy-matched by name (see services/merge_engine.py).
+    
     Args:
         car_employees: Employee data from CAR document
         receipt_employees: Employee data from Receipt document
@@ -764,79 +789,7 @@ def merge_employee_data(car_employees: List[Dict], receipt_employees: List[Dict]
     Returns:
         Merged list of employee data
     """
-    # Normalize Employee IDs to digits-only for reliable matching
-    import re
-    def _norm_emp_id(value: Optional[str]) -> Optional[str]:
-        if value is None:
-            return None
-        norm = re.sub(r"\D+", "", str(value))
-        return norm if norm else None
-
-    # Create dictionaries for quick lookup by normalized Employee ID
-    receipt_lookup = { _norm_emp_id(emp.get('employee_id')): emp for emp in receipt_employees if _norm_emp_id(emp.get('employee_id')) }
-    car_lookup = { _norm_emp_id(emp.get('employee_id')): emp for emp in car_employees if _norm_emp_id(emp.get('employee_id')) }
-    
-    merged_employees = []
-    processed_ids = set()
-    
-    # Process CAR employees first (with potential receipt matches)
-    for car_emp in car_employees:
-        raw_emp_id = car_emp.get('employee_id')
-        employee_id = _norm_emp_id(raw_emp_id)
-        receipt_emp = receipt_lookup.get(employee_id) if employee_id else None
-        if not receipt_emp:
-            receipt_emp = {}
-        
-        # Merge data with CAR taking priority for identity; use standard keys from processors
-        car_amount = car_emp.get('car_amount') if isinstance(car_emp, dict) else None
-        receipt_amount = receipt_emp.get('receipt_amount') if isinstance(receipt_emp, dict) else None
-
-        merged_emp = {
-            'employee_id': employee_id,
-            'employee_name': car_emp.get('employee_name', receipt_emp.get('employee_name')),
-            'department': car_emp.get('department', receipt_emp.get('department')),
-            'position': car_emp.get('position', receipt_emp.get('position')),
-            'car_amount': car_amount,
-            'receipt_amount': receipt_amount,
-            'car_data': car_emp,
-            'receipt_data': receipt_emp,
-            'validation_status': ValidationStatus.VALID
-        }
-
-        # Basic validation: require a name and at least one amount > 0
-        if (not merged_emp['employee_name'] or
-                ((merged_emp['car_amount'] is None or float(merged_emp['car_amount']) <= 0) and
-                 (merged_emp['receipt_amount'] is None or float(merged_emp['receipt_amount']) <= 0))):
-            merged_emp['validation_status'] = ValidationStatus.NEEDS_ATTENTION
-        
-        merged_employees.append(merged_emp)
-        if employee_id:
-            processed_ids.add(employee_id)
-    
-    # Process receipt-only employees (not found in CAR)
-    for receipt_emp in receipt_employees:
-        employee_id = _norm_emp_id(receipt_emp.get('employee_id'))
-        
-        # Skip if already processed from CAR data
-        if employee_id and employee_id in processed_ids:
-            continue
-            
-        # Create receipt-only employee record
-        merged_emp = {
-            'employee_id': employee_id,
-            'employee_name': receipt_emp.get('employee_name'),
-            'department': receipt_emp.get('department'),
-            'position': receipt_emp.get('position'),
-            'car_amount': None,
-            'receipt_amount': receipt_emp.get('receipt_amount'),
-            'car_data': {},
-            'receipt_data': receipt_emp,
-            'validation_status': ValidationStatus.NEEDS_ATTENTION  # Receipt-only needs attention
-        }
-        
-        merged_employees.append(merged_emp)
-    
-    return merged_employees
+    return merge_employees(car_employees, receipt_employees)
 
 
 async def process_session(session_id: str, config: Dict[str, Any], db_url: str):
@@ -1125,6 +1078,31 @@ async def start_processing(
             db_session.processing_options.update(config_dict)
             db.commit()
             
+            # Exact-match execution mode: identical files reuse a completed session's results
+            if config_dict.get("clone_exact_matches"):
+                try:
+                    clone_summary = DeltaProcessor(db).clone_exact_match(db_session, current_user.username)
+                except Exception as clone_error:
+                    logger.warning(f"Exact-match clone failed for session {session_id}, processing normally: {clone_error}")
+                    clone_summary = None
+                
+                if clone_summary:
+                    clear_processing_state(session_id)
+                    logger.info(
+                        f"Session {session_id} completed by cloning {clone_summary['base_session_id']} "
+                        f"in {clone_summary['duration_ms']}ms"
+                    )
+                    return ProcessingResponse(
+                        session_id=session_id,
+                        status=SessionStatus.COMPLETED,
+                        message=(
+                            f"Identical files found; {clone_summary['employees_cloned']} employees cloned "
+                            f"from session {clone_summary['base_session_id']} without processing"
+                        ),
+                        processing_config=config_dict,
+                        timestamp=datetime.now(timezone.utc)
+                    )
+            
             # Clear any existing processing state
             clear_processing_state(session_id)
             
@@ -9,20 +9,31 @@ from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Response
+import asyncio
+import gzip
 import json
 from pathlib import Path as FilePath
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import desc, asc, func, and_, or_, Boolean
 
-from ..database import get_db
+from ..database import get_db, get_async_db
 from ..auth import get_current_user, UserInfo
 from ..models import (
     ProcessingSession, EmployeeRevision, ProcessingActivity,
     SessionStatus, ValidationStatus, ActivityType
 )
 from ..schemas import ErrorResponse
+from ..cache import get_cache, invalidate_session_cache, session_tag
+from ..config import settings
 from ..services.results_formatter import ResultsFormatter, create_results_formatter
+from ..services.incremental_validation import record_status_change
+from ..services.session_statistics import export_success_rate, get_session_statistics
+from ..services.status_snapshot import etag_matches, read_status_version, status_etag
+from ..services.result_snapshots import (
+    collect_result_snapshot, load_result_snapshot, save_result_snapshot, schedule_result_snapshot_refresh
+)
 from pydantic import BaseModel, Field
 import time
 from functools import wraps
@@ -394,7 +405,7 @@ async def get_session_exceptions(
     sort_order: str = Query("asc", description="Sort order (asc/desc)"),
     limit: int = Query(100, ge=1, le=500, description="Maximum results to return"),
     offset: int = Query(0, ge=0, description="Results offset for pagination"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInfo = Depends(get_current_user)
 ):
     """
@@ -415,128 +426,131 @@ async def get_session_exceptions(
         from uuid import UUID
         session_uuid = UUID(session_id)
         
-        # Get session
-        db_session = db.query(ProcessingSession).filter(
-            ProcessingSession.session_id == session_uuid
-        ).first()
-        
-        if not db_session:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        # Check access permissions
-        if not current_user.is_admin:
-            session_creator = db_session.created_by.lower()
-            if '\\' in session_creator:
-                session_creator = session_creator.split('\\')[1]
+        def build_exceptions(sync_db: Session) -> Dict[str, Any]:
+            # Get session
+            db_session = sync_db.query(ProcessingSession).filter(
+                ProcessingSession.session_id == session_uuid
+            ).first()
             
-            if session_creator != current_user.username.lower():
-                raise HTTPException(status_code=403, detail="Access denied")
-        
-        # Build query for employees with issues only
-        employees_query = db.query(EmployeeRevision).filter(
-            EmployeeRevision.session_id == session_uuid
-        )
-        
-        # Filter for problematic employees only
-        problem_conditions = []
-        
-        if issue_type == "missing_receipts":
-            # Only employees with missing or zero receipt amounts
-            problem_conditions.append(
-                or_(
-                    EmployeeRevision.receipt_amount.is_(None),
-                    EmployeeRevision.receipt_amount <= 0
-                )
+            if not db_session:
+                raise HTTPException(status_code=404, detail="Session not found")
+            
+            # Check access permissions
+            if not current_user.is_admin:
+                session_creator = db_session.created_by.lower()
+                if '\\' in session_creator:
+                    session_creator = session_creator.split('\\')[1]
+                
+                if session_creator != current_user.username.lower():
+                    raise HTTPException(status_code=403, detail="Access denied")
+            
+            # Build query for employees with issues only
+            employees_query = sync_db.query(EmployeeRevision).filter(
+                EmployeeRevision.session_id == session_uuid
             )
-        elif issue_type == "coding_issues":
-            # Only employees with coding validation issues
-            problem_conditions.append(
-                and_(
-                    EmployeeRevision.validation_status == ValidationStatus.NEEDS_ATTENTION,
-                    func.json_extract(EmployeeRevision.validation_flags, '$.coding_incomplete') == 'true'
+            
+            # Filter for problematic employees only
+            problem_conditions = []
+            
+            if issue_type == "missing_receipts":
+                # Only employees with missing or zero receipt amounts
+                problem_conditions.append(
+                    or_(
+                        EmployeeRevision.receipt_amount.is_(None),
+                        EmployeeRevision.receipt_amount <= 0
+                    )
                 )
-            )
-        elif issue_type == "data_mismatches":
-            # Only employees with amount mismatches
-            problem_conditions.append(
-                and_(
-                    EmployeeRevision.validation_status == ValidationStatus.NEEDS_ATTENTION,
-                    func.json_extract(EmployeeRevision.validation_flags, '$.amount_mismatch') == 'true'
+            elif issue_type == "coding_issues":
+                # Only employees with coding validation issues
+                problem_conditions.append(
+                    and_(
+                        EmployeeRevision.validation_status == ValidationStatus.NEEDS_ATTENTION,
+                        EmployeeRevision.flag_coding_incomplete.is_(True)
+                    )
                 )
-            )
-        else:
-            # All problematic employees (default exception filter)
-            problem_conditions.append(
-                or_(
-                    # Missing receipts
-                    EmployeeRevision.receipt_amount.is_(None),
-                    EmployeeRevision.receipt_amount <= 0,
-                    # Validation issues
-                    EmployeeRevision.validation_status == ValidationStatus.NEEDS_ATTENTION
+            elif issue_type == "data_mismatches":
+                # Only employees with amount mismatches
+                problem_conditions.append(
+                    and_(
+                        EmployeeRevision.validation_status == ValidationStatus.NEEDS_ATTENTION,
+                        EmployeeRevision.flag_amount_mismatch.is_(True)
+                    )
                 )
-            )
-        
-        employees_query = employees_query.filter(or_(*problem_conditions))
-        
-        # Apply sorting
-        sort_column = getattr(EmployeeRevision, sort_by, EmployeeRevision.employee_name)
-        if sort_order.lower() == "desc":
-            employees_query = employees_query.order_by(desc(sort_column))
-        else:
-            employees_query = employees_query.order_by(asc(sort_column))
-        
-        # Get total count before pagination
-        total_count = employees_query.count()
-        
-        # Apply pagination
-        employees = employees_query.offset(offset).limit(limit).all()
-        
-        # Convert to simple dicts expected by frontend ExpandableEmployeeList
-        employees_data = []
-        for emp in employees:
-            issue_category = _categorize_employee_issues(emp)
-            # Compute difference when both amounts exist
-            car_amount_val = float(emp.car_amount) if emp.car_amount is not None else None
-            receipt_amount_val = float(emp.receipt_amount) if emp.receipt_amount is not None else None
-            difference_val = None
-            if car_amount_val is not None and receipt_amount_val is not None:
-                try:
-                    difference_val = round(receipt_amount_val - car_amount_val, 2)
-                except Exception:
-                    difference_val = None
-            employees_data.append({
-                "revision_id": str(emp.revision_id),
-                "employee_id": emp.employee_id,
-                "employee_name": emp.employee_name or "Unknown",
-                "car_amount": float(emp.car_amount) if emp.car_amount else None,
-                "receipt_amount": float(emp.receipt_amount) if emp.receipt_amount else None,
-                "difference": difference_val,
-                "validation_status": emp.validation_status.value,
-                "validation_flags": emp.validation_flags or {},
-                "issue_category": issue_category,
-                "required_action": _get_required_action(emp),
-                "created_at": emp.created_at.isoformat() if emp.created_at else None,
-                "updated_at": emp.updated_at.isoformat() if emp.updated_at else None
-            })
-        
-        # Calculate summary statistics focused on issues
-        issue_stats = _calculate_issue_statistics(db, session_uuid)
-        
-        return {
-            "session_id": session_id,
-            "session_name": db_session.session_name,
-            "session_status": db_session.status.value,
-            "employees": employees_data,
-            "total_count": total_count,
-            "returned_count": len(employees_data),
-            "summary_statistics": issue_stats.model_dump() if hasattr(issue_stats, 'model_dump') else issue_stats.dict(),
-            "processing_metadata": {
-                "last_updated": db_session.updated_at.isoformat() if db_session.updated_at else None,
-                "processing_completed": db_session.status == SessionStatus.COMPLETED,
-                "filter_applied": "exceptions_only",
-                "issue_type_filter": issue_type or "all_issues"
+            else:
+                # All problematic employees (default exception filter)
+                problem_conditions.append(
+                    or_(
+                        # Missing receipts
+                        EmployeeRevision.receipt_amount.is_(None),
+                        EmployeeRevision.receipt_amount <= 0,
+                        # Validation issues
+                        EmployeeRevision.validation_status == ValidationStatus.NEEDS_ATTENTION
+                    )
+                )
+            
+            employees_query = employees_query.filter(or_(*problem_conditions))
+            
+            # Apply sorting
+            sort_column = getattr(EmployeeRevision, sort_by, EmployeeRevision.employee_name)
+            if sort_order.lower() == "desc":
+                employees_query = employees_query.order_by(desc(sort_column))
+            else:
+                employees_query = employees_query.order_by(asc(sort_column))
+            
+            # Get total count before pagination
+            total_count = employees_query.count()
+            
+            # Apply pagination
+            employees = employees_query.offset(offset).limit(limit).all()
+            
+            # Convert to simple dicts expected by frontend ExpandableEmployeeList
+            employees_data = []
+            for emp in employees:
+                issue_category = _categorize_employee_issues(emp)
+                # Compute difference when both amounts exist
+                car_amount_val = float(emp.car_amount) if emp.car_amount is not None else None
+                receipt_amount_val = float(emp.receipt_amount) if emp.receipt_amount is not None else None
+                difference_val = None
+                if car_amount_val is not None and receipt_amount_val is not None:
+                    try:
+                        difference_val = round(receipt_amount_val - car_amount_val, 2)
+                    except Exception:
+                        difference_val = None
+                employees_data.append({
+                    "revision_id": str(emp.revision_id),
+                    "employee_id": emp.employee_id,
+                    "employee_name": emp.employee_name or "Unknown",
+                    "car_amount": float(emp.car_amount) if emp.car_amount else None,
+                    "receipt_amount": float(emp.receipt_amount) if emp.receipt_amount else None,
+                    "difference": difference_val,
+                    "validation_status": emp.validation_status.value,
+                    "validation_flags": emp.validation_flags or {},
+                    "issue_category": issue_category,
+                    "required_action": _get_required_action(emp),
+                    "created_at": emp.created_at.isoformat() if emp.created_at else None,
+                    "updated_at": emp.updated_at.isoformat() if emp.updated_at else None
+                })
+            
+            # Calculate summary statistics focused on issues
+            issue_stats = _calculate_issue_statistics(sync_db, session_uuid)
+            
+            return {
+                "session_id": session_id,
+                "session_name": db_session.session_name,
+                "session_status": db_session.status.value,
+                "employees": employees_data,
+                "total_count": total_count,
+                "returned_count": len(employees_data),
+                "summary_statistics": issue_stats.model_dump() if hasattr(issue_stats, 'model_dump') else issue_stats.dict(),
+                "processing_metadata": {
+                    "last_updated": db_session.updated_at.isoformat() if db_session.updated_at else None,
+                    "processing_completed": db_session.status == SessionStatus.COMPLETED,
+                    "filter_applied": "exceptions_only",
+                    "issue_type_filter": issue_type or "all_issues"
+                }
             }
-        }
+        
+        return await db.run_sync(build_exceptions)
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid session ID: {str(e)}")
@@ -548,7 +562,7 @@ async def get_session_exceptions(
 async def get_session_summary(
     request: Request,
     session_id: str = Path(..., description="Session UUID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInfo = Depends(get_current_user)
 ):
     """
@@ -572,34 +586,52 @@ async def get_session_summary(
         # Input validation with detailed error handling
         session_uuid = _validate_session_id(session_id, correlation_id)
         
-        # Database operations with circuit breaker protection
-        db_session = db_circuit_breaker.call(
-            _get_session_with_access_check, db, session_uuid, current_user, correlation_id
-        )
-        
-        # Statistics calculation with circuit breaker protection
-        stats = db_circuit_breaker.call(
-            _calculate_comprehensive_statistics, db, session_uuid
+        # Access check and status version (one primary key lookup) before any cached data is served
+        version_row = await db.run_sync(
+            lambda sync_db: db_circuit_breaker.call(
+                _get_status_version_with_access_check, sync_db, session_uuid, current_user, correlation_id
+            )
         )
         
-        # Add session metadata safely
-        try:
-            stats.update({
-                "session_id": session_id,
-                "session_name": db_session.session_name or "Unnamed Session",
-                "session_status": db_session.status.value.lower(),
-                "processing_completed": db_session.status == SessionStatus.COMPLETED,
-                "last_updated": db_session.updated_at.isoformat() if db_session.updated_at else None,
-                "created_at": db_session.created_at.isoformat() if db_session.created_at else None
-            })
-        except Exception as meta_error:
-            logger.warning(f"[{correlation_id}] Failed to add metadata to session {session_id}: {meta_error}")
-            # Continue with stats even if metadata fails
+        def build_summary(sync_db: Session) -> Dict[str, Any]:
+            # Database operations with circuit breaker protection
+            db_session = db_circuit_breaker.call(
+                _get_session_with_access_check, sync_db, session_uuid, current_user, correlation_id
+            )
+            
+            # Statistics calculation with circuit breaker protection
+            stats = db_circuit_breaker.call(
+                _calculate_comprehensive_statistics, sync_db, session_uuid
+            )
+            
+            # Add session metadata safely
+            try:
+                stats.update({
+                    "session_id": session_id,
+                    "session_name": db_session.session_name or "Unnamed Session",
+                    "session_status": db_session.status.value.lower(),
+                    "processing_completed": db_session.status == SessionStatus.COMPLETED,
+                    "last_updated": db_session.updated_at.isoformat() if db_session.updated_at else None,
+                    "created_at": db_session.created_at.isoformat() if db_session.created_at else None
+                })
+            except Exception as meta_error:
+                logger.warning(f"[{correlation_id}] Failed to add metadata to session {session_id}: {meta_error}")
+                # Continue with stats even if metadata fails
+            
+            # Success logging
+            logger.info(f"[{correlation_id}] Session summary generated successfully for {session_id}")
+            
+            return stats
         
-        # Success logging
-        logger.info(f"[{correlation_id}] Session summary generated successfully for {session_id}")
+        if not settings.cache_enabled:
+            return await db.run_sync(build_summary)
         
-        return stats
+        # Keyed by status version: any write to the session yields a new key
+        return await get_cache().get_or_compute_async(
+            f"summary:{session_id}:{status_etag(version_row.version, version_row.changed_at)}",
+            lambda: db.run_sync(build_summary),
+            tags=[session_tag(session_uuid)]
+        )
         
     except ValueError as e:
         logger.warning(f"[{correlation_id}] Invalid input for session {session_id}: {e}")
@@ -660,18 +692,7 @@ def _get_session_with_access_check(db: Session, session_uuid: "UUID", current_us
             raise FileNotFoundError("Session not found")
         
         # Access control check
-        if not current_user.is_admin:
-            if not db_session.created_by:
-                logger.warning(f"[{correlation_id}] Session {session_uuid} has no creator information")
-                raise PermissionError("Session access information unavailable")
-            
-            session_creator = db_session.created_by.lower()
-            if '\\' in session_creator:
-                session_creator = session_creator.split('\\')[1]
-            
-            if session_creator != current_user.username.lower():
-                logger.warning(f"[{correlation_id}] User {current_user.username} attempted to access session owned by {session_creator}")
-                raise PermissionError(f"Session belongs to different user")
+        _check_session_owner(db_session.created_by, session_uuid, current_user, correlation_id)
         
         return db_session
         
@@ -682,16 +703,60 @@ def _get_session_with_access_check(db: Session, session_uuid: "UUID", current_us
         raise ConnectionError("Database operation failed")
 
 
+def _get_status_version_with_access_check(db: Session, session_uuid: "UUID", current_user: "UserInfo", correlation_id: str):
+    """Read a session's status version (see status_snapshot.read_status_version) with access control"""
+    import logging
+    logger = logging.getLogger(__name__)
+    
+    try:
+        version_row = read_status_version(db, session_uuid)
+        
+        if version_row is None:
+            logger.info(f"[{correlation_id}] Session not found in database: {session_uuid}")
+            raise FileNotFoundError("Session not found")
+        
+        _check_session_owner(version_row.created_by, session_uuid, current_user, correlation_id)
+        
+        return version_row
+        
+    except (FileNotFoundError, PermissionError):
+        raise  # Re-raise known exceptions
+    except Exception as e:
+        logger.error(f"[{correlation_id}] Database error retrieving session {session_uuid}: {e}")
+        raise ConnectionError("Database operation failed")
+
+
+def _check_session_owner(created_by: Optional[str], session_uuid: "UUID", current_user: "UserInfo", correlation_id: str):
+    """Raise PermissionError unless the user is an admin or created the session"""
+    import logging
+    logger = logging.getLogger(__name__)
+    
+    if current_user.is_admin:
+        return
+    
+    if not created_by:
+        logger.warning(f"[{correlation_id}] Session {session_uuid} has no creator information")
+        raise PermissionError("Session access information unavailable")
+    
+    session_creator = created_by.lower()
+    if '\\' in session_creator:
+        session_creator = session_creator.split('\\')[1]
+    
+    if session_creator != current_user.username.lower():
+        logger.warning(f"[{correlation_id}] User {current_user.username} attempted to access session owned by {session_creator}")
+        raise PermissionError(f"Session belongs to different user")
+
+
 def _categorize_employee_issues(emp: EmployeeRevision) -> str:
     """Categorize the primary issue for an employee"""
     if not emp.receipt_amount or emp.receipt_amount <= 0:
         return "missing_receipts"
     
     if emp.validation_status == ValidationStatus.NEEDS_ATTENTION:
-        flags = emp.validation_flags or {}
-        if flags.get("coding_incomplete"):
+        # Generated flag columns (read with the row, no JSON parsing)
+        if emp.flag_coding_incomplete:
             return "coding_issues"
-        if flags.get("amount_mismatch"):
+        if emp.flag_amount_mismatch:
             return "data_mismatches"
     
     return "validation_errors"
@@ -713,280 +778,57 @@ def _get_required_action(emp: EmployeeRevision) -> str:
 
 def _calculate_issue_statistics(db: Session, session_uuid) -> SessionSummaryStats:
     """Calculate statistics focused on issues and exceptions"""
-    total_employees = db.query(EmployeeRevision).filter(
-        EmployeeRevision.session_id == session_uuid
-    ).count()
-    
-    # Ready for export (no issues)
-    ready_query = db.query(EmployeeRevision).filter(
-        and_(
-            EmployeeRevision.session_id == session_uuid,
-            EmployeeRevision.receipt_amount > 0,
-            EmployeeRevision.validation_status == ValidationStatus.VALID
-        )
-    )
-    ready_count = ready_query.count()
-    
-    # Issues breakdown
-    missing_receipts = db.query(EmployeeRevision).filter(
-        and_(
-            EmployeeRevision.session_id == session_uuid,
-            or_(
-                EmployeeRevision.receipt_amount.is_(None),
-                EmployeeRevision.receipt_amount <= 0
-            )
-        )
-    ).count()
-    
-    coding_issues = db.query(EmployeeRevision).filter(
-        and_(
-            EmployeeRevision.session_id == session_uuid,
-            EmployeeRevision.validation_status == ValidationStatus.NEEDS_ATTENTION,
-            func.json_extract(EmployeeRevision.validation_flags, '$.coding_incomplete') == 'true'
-        )
-    ).count()
-    
-    data_mismatches = db.query(EmployeeRevision).filter(
-        and_(
-            EmployeeRevision.session_id == session_uuid,
-            EmployeeRevision.validation_status == ValidationStatus.NEEDS_ATTENTION,
-            func.json_extract(EmployeeRevision.validation_flags, '$.amount_mismatch') == 'true'
-        )
-    ).count()
-    
-    # Needs attention: employees flagged or with missing / zero receipts
-    needs_attention = db.query(EmployeeRevision).filter(
-        and_(
-            EmployeeRevision.session_id == session_uuid,
-            or_(
-                EmployeeRevision.validation_status == ValidationStatus.NEEDS_ATTENTION,
-                EmployeeRevision.receipt_amount.is_(None),
-                EmployeeRevision.receipt_amount <= 0
-            )
-        )
-    ).count()
-    
-    # Calculate resolved issues (those with RESOLVED validation status)
-    resolved_count = db.query(EmployeeRevision).filter(
-        EmployeeRevision.session_id == session_uuid,
-        EmployeeRevision.validation_status == ValidationStatus.RESOLVED
-    ).count()
+    stats = get_session_statistics(db, session_uuid)
     
     return SessionSummaryStats(
-        total_employees=total_employees,
-        ready_for_export=ready_count,
-        needs_attention=needs_attention,
-        resolved_issues=resolved_count,
-        validation_success_rate=round((ready_count / total_employees) * 100, 1) if total_employees > 0 else 0.0
+        total_employees=stats["total_employees"],
+        # Ready for export: VALID with a receipt amount
+        ready_for_export=stats["ready_for_export"],
+        # Needs attention: employees flagged or with missing / zero receipts
+        needs_attention=stats["attention_required"],
+        resolved_issues=stats["resolved_employees"],
+        validation_success_rate=export_success_rate(stats)
     )
 
 
 def _calculate_comprehensive_statistics(db: Session, session_uuid) -> Dict[str, Any]:
     """
-    Efficient statistics calculation with database aggregation and chunked fallback
+    Session summary statistics from the maintained session_statistics row
     
-    Performance optimizations:
-    - Try database-level aggregation first (fastest)
-    - Fall back to memory-efficient chunked processing  
-    - Never load entire dataset into memory
-    - Graceful degradation for database issues
+    The counters are updated by triggers in the same transaction as every
+    revision write, so this is one primary key lookup regardless of session
+    size. Falls back to minimal stats if the lookup fails.
     """
     try:
-        # Method 1: Try efficient database aggregation first
-        stats = _try_database_aggregation(db, session_uuid)
-        if stats:
-            return stats
+        stats = get_session_statistics(db, session_uuid)
     except Exception as e:
         import logging
         logger = logging.getLogger(__name__)
-        logger.warning(f"Database aggregation failed, falling back to chunked processing: {e}")
-    
-    # Method 2: Fallback to memory-efficient chunked processing
-    try:
-        return _chunked_statistics_calculation(db, session_uuid)
-    except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"Chunked processing failed, using minimal stats: {e}")
+        logger.error(f"Session statistics lookup failed, using minimal stats: {e}")
         return _get_minimal_stats(db, session_uuid)
-
-
-def _try_database_aggregation(db: Session, session_uuid) -> Optional[Dict[str, Any]]:
-    """Try database-level aggregation for optimal performance"""
-    from typing import Optional
-    from sqlalchemy import func, and_, or_
-    
-    # Get basic issue stats (this works reliably)
-    issue_stats = _calculate_issue_statistics(db, session_uuid)
     
-    base_query = db.query(EmployeeRevision).filter(
-        EmployeeRevision.session_id == session_uuid
-    )
-    
-    # Try database JSON functions (may not be available in all SQLite versions)
-    try:
-        missing_receipts = base_query.filter(
-            or_(
-                func.json_extract(EmployeeRevision.validation_flags, '$.missing_receipt') == 'true',
-                func.json_extract(EmployeeRevision.validation_flags, '$.missing_receipt') == True,
-                func.json_extract(EmployeeRevision.validation_flags, '$.missing_receipt') == 1
-            )
-        ).count()
-        
-        coding_incomplete = base_query.filter(
-            and_(
-                EmployeeRevision.validation_status == ValidationStatus.NEEDS_ATTENTION,
-                or_(
-                    func.json_extract(EmployeeRevision.validation_flags, '$.coding_incomplete') == 'true',
-                    func.json_extract(EmployeeRevision.validation_flags, '$.coding_incomplete') == True,
-                    func.json_extract(EmployeeRevision.validation_flags, '$.coding_incomplete') == 1
-                )
-            )
-        ).count()
-        
-        data_mismatches = base_query.filter(
-            and_(
-                EmployeeRevision.validation_status == ValidationStatus.NEEDS_ATTENTION,
-                or_(
-                    func.json_extract(EmployeeRevision.validation_flags, '$.amount_mismatch') == 'true',
-                    func.json_extract(EmployeeRevision.validation_flags, '$.amount_mismatch') == True,
-                    func.json_extract(EmployeeRevision.validation_flags, '$.amount_mismatch') == 1
-                )
-            )
-        ).count()
-        
-    except Exception:
-        # JSON functions not available or failed
-        return None
-    
-    # Calculate processing time
-    processing_time = _calculate_processing_time(db, session_uuid)
+    ready_for_export = stats["ready_for_export"]
+    needs_attention = stats["attention_required"]
     
     return {
-        "total_employees": issue_stats.total_employees,
-        "ready_for_pvault": issue_stats.ready_for_export,
-        "need_attention": issue_stats.needs_attention,
-        "issues_breakdown": {
-            "missing_receipts": missing_receipts,
-            "coding_incomplete": coding_incomplete,
-            "data_mismatches": data_mismatches
-        },
-        "export_readiness": {
-            "percentage": issue_stats.validation_success_rate,
-            "ready_count": issue_stats.ready_for_export,
-            "total_count": issue_stats.total_employees
-        },
-        "status_message": f"{issue_stats.ready_for_export} ready for pVault | {issue_stats.needs_attention} need attention",
-        "processing_time": processing_time
-    }
-
-
-def _chunked_statistics_calculation(db: Session, session_uuid, chunk_size: int = 1000) -> Dict[str, Any]:
-    """
-    Memory-efficient chunked processing for large datasets
-    
-    Processes data in chunks to avoid:
-    - Memory exhaustion
-    - Database timeouts
-    - Connection issues
-    """
-    import gc
-    
-    # Initialize counters
-    total_employees = 0
-    missing_receipts = 0
-    coding_incomplete = 0 
-    data_mismatches = 0
-    needs_attention = 0
-    
-    # Process in chunks to avoid memory issues
-    offset = 0
-    processed_chunks = 0
-    
-    while True:
-        # Get chunk with only needed columns for efficiency
-        chunk = db.query(
-            EmployeeRevision.validation_status,
-            EmployeeRevision.validation_flags
-        ).filter(
-            EmployeeRevision.session_id == session_uuid
-        ).offset(offset).limit(chunk_size).all()
-        
-        if not chunk:
-            break
-        
-        # Process this chunk
-        for revision in chunk:
-            total_employees += 1
-            
-            # Count needs attention
-            if revision.validation_status == ValidationStatus.NEEDS_ATTENTION:
-                needs_attention += 1
-            
-            # Safe JSON parsing
-            flags = _parse_validation_flags_safely(revision.validation_flags)
-            
-            # Count specific issues
-            if flags.get('missing_receipt') is True:
-                missing_receipts += 1
-                
-            if flags.get('coding_incomplete') is True:
-                coding_incomplete += 1
-                
-            if flags.get('amount_mismatch') is True:
-                data_mismatches += 1
-        
-        offset += chunk_size
-        processed_chunks += 1
-        
-        # Memory management for very large datasets
-        if processed_chunks % 10 == 0:  # Every 10k records
-            gc.collect()
-    
-    # Calculate derived statistics
-    ready_for_export = total_employees - needs_attention
-    validation_success_rate = round((ready_for_export / total_employees) * 100, 1) if total_employees > 0 else 0.0
-    
-    # Calculate processing time
-    processing_time = _calculate_processing_time(db, session_uuid)
-    
-    return {
-        "total_employees": total_employees,
+        "total_employees": stats["total_employees"],
         "ready_for_pvault": ready_for_export,
         "need_attention": needs_attention,
         "issues_breakdown": {
-            "missing_receipts": missing_receipts,
-            "coding_incomplete": coding_incomplete,
-            "data_mismatches": data_mismatches
+            "missing_receipts": stats["missing_receipt_flagged"],
+            "coding_incomplete": stats["coding_incomplete"],
+            "data_mismatches": stats["amount_mismatch"]
         },
         "export_readiness": {
-            "percentage": validation_success_rate,
+            "percentage": export_success_rate(stats),
             "ready_count": ready_for_export,
-            "total_count": total_employees
+            "total_count": stats["total_employees"]
         },
         "status_message": f"{ready_for_export} ready for pVault | {needs_attention} need attention",
-        "processing_time": processing_time
+        "processing_time": _calculate_processing_time(db, session_uuid)
     }
 
 
-def _parse_validation_flags_safely(validation_flags) -> Dict[str, Any]:
-    """Safely parse validation flags with comprehensive error handling"""
-    if not validation_flags:
-        return {}
-    
-    try:
-        if isinstance(validation_flags, dict):
-            return validation_flags
-        elif isinstance(validation_flags, str):
-            import json
-            parsed = json.loads(validation_flags)
-            return parsed if isinstance(parsed, dict) else {}
-        else:
-            return {}
-    except (json.JSONDecodeError, TypeError, ValueError, AttributeError):
-        return {}
-
-
 def _calculate_processing_time(db: Session, session_uuid) -> Optional[str]:
     """Calculate formatted processing time for session"""
     try:
@@ -1070,7 +912,7 @@ async def get_session_results(
     sort_order: str = Query("asc", description="Sort order (asc/desc)"),
     limit: int = Query(100, ge=1, le=500, description="Maximum results to return"),
     offset: int = Query(0, ge=0, description="Results offset for pagination"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInfo = Depends(get_current_user)
 ):
     """
@@ -1079,123 +921,126 @@ async def get_session_results(
     Returns session information, summary statistics, and employee data
     with optional filtering, searching, and pagination.
     """
-    # Get session
-    session = db.query(ProcessingSession).filter(
-        ProcessingSession.session_id == session_id
-    ).first()
-    
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    # Check if session is completed
-    if session.status not in [SessionStatus.COMPLETED, SessionStatus.FAILED]:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Session results not available. Status: {session.status.value}"
-        )
-    
-    # Build employee query with filters
-    employee_query = db.query(EmployeeRevision).filter(
-        EmployeeRevision.session_id == session_id
-    )
-    
-    # Apply search filter
-    if search:
-        employee_query = employee_query.filter(
-            or_(
-                EmployeeRevision.employee_name.ilike(f"%{search}%"),
-                EmployeeRevision.employee_id.ilike(f"%{search}%")
+    def build_results(sync_db: Session) -> SessionResultsResponse:
+        # Get session
+        session = sync_db.query(ProcessingSession).filter(
+            ProcessingSession.session_id == session_id
+        ).first()
+        
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        
+        # Check if session is completed
+        if session.status not in [SessionStatus.COMPLETED, SessionStatus.FAILED]:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Session results not available. Status: {session.status.value}"
             )
+        
+        # Build employee query with filters
+        employee_query = sync_db.query(EmployeeRevision).filter(
+            EmployeeRevision.session_id == session_id
         )
-    
-    # Apply status filter
-    if status_filter:
-        try:
-            status_enum = ValidationStatus(status_filter.lower())
+        
+        # Apply search filter
+        if search:
             employee_query = employee_query.filter(
-                EmployeeRevision.validation_status == status_enum
+                or_(
+                    EmployeeRevision.employee_name.ilike(f"%{search}%"),
+                    EmployeeRevision.employee_id.ilike(f"%{search}%")
+                )
             )
-        except ValueError:
-            raise HTTPException(status_code=400, detail=f"Invalid status filter: {status_filter}")
-    
-    # Apply sorting
-    sort_column = getattr(EmployeeRevision, sort_by, None)
-    if not sort_column:
-        raise HTTPException(status_code=400, detail=f"Invalid sort field: {sort_by}")
-    
-    if sort_order.lower() == "desc":
-        employee_query = employee_query.order_by(desc(sort_column))
-    else:
-        employee_query = employee_query.order_by(asc(sort_column))
-    
-    # Apply pagination
-    employees = employee_query.offset(offset).limit(limit).all()
-    
-    # Calculate summary statistics
-    total_employees = db.query(func.count(EmployeeRevision.revision_id)).filter(
-        EmployeeRevision.session_id == session_id
-    ).scalar()
-    
-    ready_for_export = db.query(func.count(EmployeeRevision.revision_id)).filter(
-        EmployeeRevision.session_id == session_id,
-        EmployeeRevision.validation_status == ValidationStatus.VALID
-    ).scalar()
-    
-    needs_attention = db.query(func.count(EmployeeRevision.revision_id)).filter(
-        EmployeeRevision.session_id == session_id,
-        EmployeeRevision.validation_status == ValidationStatus.NEEDS_ATTENTION
-    ).scalar()
-    
-    resolved_issues = db.query(func.count(EmployeeRevision.revision_id)).filter(
-        EmployeeRevision.session_id == session_id,
-        EmployeeRevision.validation_status == ValidationStatus.RESOLVED
-    ).scalar()
-    
-    validation_success_rate = (ready_for_export / total_employees * 100) if total_employees > 0 else 0
-    
-    # Calculate delta information
-    delta_info = _calculate_delta_info(session, db)
-    
-    # Build session summary
-    session_summary = SessionSummaryStats(
-        total_employees=total_employees,
-        ready_for_export=ready_for_export,
-        needs_attention=needs_attention,
-        resolved_issues=resolved_issues,
-        validation_success_rate=round(validation_success_rate, 2),
-        **delta_info
-    )
-    
-    # Build employee results with delta information
-    employee_results = []
-    for employee in employees:
-        delta_employee_info = _get_employee_delta_info(employee, session)
         
-        employee_result = EmployeeResultsResponse(
-            revision_id=str(employee.revision_id),
-            employee_id=employee.employee_id,
-            employee_name=employee.employee_name,
-            car_amount=float(employee.car_amount) if employee.car_amount else None,
-            receipt_amount=float(employee.receipt_amount) if employee.receipt_amount else None,
-            validation_status=employee.validation_status.value,
-            validation_flags=employee.validation_flags or {},
-            resolved_by=employee.resolved_by,
-            resolution_notes=employee.resolution_notes,
-            created_at=employee.created_at,
-            updated_at=employee.updated_at,
-            **delta_employee_info
+        # Apply status filter
+        if status_filter:
+            try:
+                status_enum = ValidationStatus(status_filter.lower())
+                employee_query = employee_query.filter(
+                    EmployeeRevision.validation_status == status_enum
+                )
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid status filter: {status_filter}")
+        
+        # Apply sorting
+        sort_column = getattr(EmployeeRevision, sort_by, None)
+        if not sort_column:
+            raise HTTPException(status_code=400, detail=f"Invalid sort field: {sort_by}")
+        
+        if sort_order.lower() == "desc":
+            employee_query = employee_query.order_by(desc(sort_column))
+        else:
+            employee_query = employee_query.order_by(asc(sort_column))
+        
+        # Apply pagination
+        employees = employee_query.offset(offset).limit(limit).all()
+        
+        # Summary statistics from the maintained per-session counters
+        stats = get_session_statistics(sync_db, session_id)
+        total_employees = stats["total_employees"]
+        ready_for_export = stats["valid_employees"]
+        needs_attention = stats["needs_attention_employees"]
+        resolved_issues = stats["resolved_employees"]
+        
+        validation_success_rate = (ready_for_export / total_employees * 100) if total_employees > 0 else 0
+        
+        # Calculate delta information
+        delta_info = _calculate_delta_info(session, sync_db)
+        
+        # Build session summary
+        session_summary = SessionSummaryStats(
+            total_employees=total_employees,
+            ready_for_export=ready_for_export,
+            needs_attention=needs_attention,
+            resolved_issues=resolved_issues,
+            validation_success_rate=round(validation_success_rate, 2),
+            **delta_info
+        )
+        
+        # Build employee results with delta information
+        employee_results = []
+        for employee in employees:
+            delta_employee_info = _get_employee_delta_info(employee, session)
+            
+            employee_result = EmployeeResultsResponse(
+                revision_id=str(employee.revision_id),
+                employee_id=employee.employee_id,
+                employee_name=employee.employee_name,
+                car_amount=float(employee.car_amount) if employee.car_amount else None,
+                receipt_amount=float(employee.receipt_amount) if employee.receipt_amount else None,
+                validation_status=employee.validation_status.value,
+                validation_flags=employee.validation_flags or {},
+                resolved_by=employee.resolved_by,
+                resolution_notes=employee.resolution_notes,
+                created_at=employee.created_at,
+                updated_at=employee.updated_at,
+                **delta_employee_info
+            )
+            employee_results.append(employee_result)
+        
+        return SessionResultsResponse(
+            session_id=str(session.session_id),
+            session_name=session.session_name,
+            status=session.status.value,
+            created_by=session.created_by,
+            created_at=session.created_at,
+            updated_at=session.updated_at,
+            session_summary=session_summary,
+            employees=employee_results
         )
-        employee_results.append(employee_result)
     
-    return SessionResultsResponse(
-        session_id=str(session.session_id),
-        session_name=session.session_name,
-        status=session.status.value,
-        created_by=session.created_by,
-        created_at=session.created_at,
-        updated_at=session.updated_at,
-        session_summary=session_summary,
-        employees=employee_results
+    if not settings.cache_enabled:
+        return await db.run_sync(build_results)
+    
+    version_row = await db.run_sync(lambda sync_db: read_status_version(sync_db, session_id))
+    if version_row is None:
+        return await db.run_sync(build_results)
+    
+    # Keyed by status version and query: any write to the session yields a new key
+    version = status_etag(version_row.version, version_row.changed_at)
+    return await get_cache().get_or_compute_async(
+        f"results:{session_id}:{version}:{(search, status_filter, sort_by, sort_order, limit, offset)!r}",
+        lambda: db.run_sync(build_results),
+        tags=[session_tag(session_id)]
     )
 
 
@@ -1305,6 +1150,67 @@ async def get_enhanced_session_results(
         raise HTTPException(status_code=500, detail=f"Failed to retrieve results: {str(e)}")
 
 
+@router.get("/{session_id}/results/snapshot")
+async def get_session_results_snapshot(
+    request: Request,
+    session_id: str = Path(..., description="Session UUID"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(get_current_user)
+):
+    """
+    Complete results of a completed or failed session as its result snapshot
+    
+    Returns the stored JSON document (session row, every employee revision,
+    statistics and formatted summary). Clients accepting gzip receive the
+    stored file as-is. The strong ETag changes only when the session's data
+    does, so browsers and proxies can keep the document and revalidate it
+    with If-None-Match (access is checked on every request). A missing
+    snapshot is built here: the rows are read on the request's session and
+    the document is compressed and stored in a worker thread.
+    """
+    correlation_id = getattr(request.state, 'correlation_id', 'unknown')
+    
+    try:
+        session_uuid = _validate_session_id(session_id, correlation_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid session ID format")
+    
+    def load_snapshot(sync_db: Session):
+        _get_status_version_with_access_check(sync_db, session_uuid, current_user, correlation_id)
+        snapshot = load_result_snapshot(sync_db, session_uuid, build=False)
+        if snapshot is not None:
+            return snapshot, None
+        return None, collect_result_snapshot(sync_db, session_uuid)
+    
+    try:
+        snapshot, document = await db.run_sync(load_snapshot)
+    except PermissionError:
+        raise HTTPException(status_code=403, detail="Access denied to this session")
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Session not found")
+    except ConnectionError:
+        raise HTTPException(status_code=503, detail="Database temporarily unavailable")
+    
+    if snapshot is None and document is not None:
+        snapshot = await asyncio.to_thread(save_result_snapshot, document)
+    if snapshot is None:
+        raise HTTPException(status_code=400, detail="Session results not available")
+    
+    use_gzip = "gzip" in request.headers.get("accept-encoding", "").lower()
+    # Each content coding is a separate representation with its own strong tag
+    etag = snapshot.etag[:-1] + '-gzip"' if use_gzip else snapshot.etag
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=snapshot.content, media_type="application/json", headers=headers)
+    content = await asyncio.to_thread(gzip.decompress, snapshot.content)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
 @router.post("/{session_id}/employees/{revision_id}/resolve", response_model=ResolutionResponse)
 async def resolve_employee_issue(
     session_id: str = Path(..., description="Session UUID"),
@@ -1373,6 +1279,9 @@ async def resolve_employee_issue(
         session.updated_at = datetime.now(timezone.utc)
         
         db.commit()
+        record_status_change(session_id, employee.revision_id, ValidationStatus.RESOLVED)
+        invalidate_session_cache(session_id)
+        schedule_result_snapshot_refresh(session_id)
         
         return ResolutionResponse(
             revision_id=str(employee.revision_id),
@@ -1416,6 +1325,7 @@ async def bulk_resolve_issues(
     results = []
     successful_count = 0
     failed_count = 0
+    resolved_ids = []
     
     try:
         # Process each revision
@@ -1477,6 +1387,7 @@ async def bulk_resolve_issues(
                     created_by=current_user.username
                 )
                 db.add(activity)
+                resolved_ids.append(revision_id)
                 
                 results.append(ResolutionResponse(
                     revision_id=revision_id,
@@ -1502,6 +1413,10 @@ async def bulk_resolve_issues(
         
         # Commit all changes
         db.commit()
+        for revision_id in resolved_ids:
+            record_status_change(session_id, revision_id, ValidationStatus.RESOLVED)
+        invalidate_session_cache(session_id)
+        schedule_result_snapshot_refresh(session_id)
         
         return BulkResolutionResponse(
             total_requested=len(bulk_request.revision_ids),
@@ -3,26 +3,31 @@ Session Management API Endpoints
 Implements CRUD operations for processing sessions with proper authentication and authorization
 """
 
+import base64
+import json
 import uuid
 import logging
 import os
 import zipfile
 import time
-import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from contextlib import nullcontext
+from typing import Optional, List, Dict, Any, AsyncIterator, Awaitable, Callable
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, inspect, or_, select
 
-from ..database import get_db
+from ..config import settings
+from ..database import get_db, get_read_db, get_async_db
+from ..db_writer import run_write
 from ..auth import get_current_user, UserInfo
-from ..cache import cached, cache, invalidate_cache_pattern
+from ..cache import cached, cache, invalidate_cache_pattern, invalidate_session_cache
 from ..models import ProcessingSession, EmployeeRevision, ProcessingActivity, FileUpload, ValidationStatus, ActivityType, FileType
 from ..models import SessionStatus as ModelSessionStatus
 # Import from schemas.py directly (not the schemas package)
@@ -45,6 +50,13 @@ from ..schemas import (
 
 from ..utils.error_handlers import db_error_handler, db_transaction_handler, log_and_track_error
 from ..utils.performance_monitor import performance_monitor, export_metrics
+from ..services.session_counts import count_sessions
+from ..services.result_snapshots import delete_result_snapshots
+from ..services.export_artifacts import delete_export_artifacts
+from ..services.session_statistics import get_session_statistics
+from ..services.status_snapshot import (
+    StatusWatch, etag_matches, get_status_snapshot_cache, read_status_version, status_change_notifier, status_etag
+)
 from ..exceptions.export_exceptions import (
     ExportError, ExportGenerationError, ExportTrackingError, 
     DuplicateExportError, ExportValidationError
@@ -57,66 +69,6 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/sessions", tags=["sessions"])
 
 
-def retry_db_operation(func, max_retries=3, delay=0.1, db_session=None):
-    """
-    Retry database operations that fail due to locking or session state issues
-    
-    Args:
-        func: Function to retry
-        max_retries: Maximum number of retry attempts
-        delay: Initial delay between retries (seconds)
-        db_session: Optional SQLAlchemy session to reset on retry
-        
-    Returns:
-        Result of the function call
-        
-    Raises:
-        The last exception if all retries fail
-    """
-    last_exception = None
-    
-    for attempt in range(max_retries + 1):
-        try:
-            return func()
-        except (sqlite3.OperationalError, SQLAlchemyError) as e:
-            last_exception = e
-            error_msg = str(e).lower()
-            
-            # Retry for database lock errors, session rollback errors, or detached instance errors
-            should_retry = (
-                "database is locked" in error_msg or 
-                "database locked" in error_msg or
-                "transaction has been rolled back" in error_msg or
-                "session's transaction has been rolled back" in error_msg or
-                "not persistent within this session" in error_msg
-            )
-            
-            if should_retry and attempt < max_retries:
-                wait_time = delay * (2 ** attempt)  # Exponential backoff
-                
-                if "rollback" in error_msg:
-                    logger.warning(f"Database session rolled back, resetting and retrying in {wait_time:.2f}s (attempt {attempt + 1}/{max_retries + 1})")
-                    # Reset the database session if provided
-                    if db_session:
-                        try:
-                            db_session.rollback()
-                            # Force session state reset
-                            db_session.expunge_all()
-                        except Exception as reset_error:
-                            logger.warning(f"Error resetting database session: {reset_error}")
-                else:
-                    logger.warning(f"Database locked, retrying in {wait_time:.2f}s (attempt {attempt + 1}/{max_retries + 1})")
-                
-                time.sleep(wait_time)
-                continue
-            
-            # Re-raise immediately for non-retryable errors
-            raise e
-    
-    # If we get here, all retries failed
-    raise last_exception
-
-
 def check_session_access(db_session: ProcessingSession, current_user: UserInfo) -> bool:
     """
     Check if user has access to a session
@@ -288,7 +240,7 @@ async def create_session(
 
 @router.get("/active", tags=["Sessions"], summary="Get all active sessions")
 async def get_active_sessions(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: UserInfo = Depends(get_current_user)
 ):
     """Get all active sessions with detailed status information"""
@@ -351,22 +303,20 @@ async def get_active_sessions(
 
 @router.get("/dashboard/stats", tags=["Dashboard"], summary="Get dashboard statistics")
 async def get_dashboard_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: UserInfo = Depends(get_current_user)
 ):
     """Get statistics for the dashboard"""
     try:
-        # Count active sessions
-        active_sessions = db.query(ProcessingSession).filter(
-            ProcessingSession.status == ModelSessionStatus.PROCESSING
-        ).count()
+        # Count active sessions from the maintained counters
+        active_sessions = count_sessions(db, status=ModelSessionStatus.PROCESSING)
         
-        # Count completed today
-        today = datetime.now(timezone.utc).date()
-        completed_today = db.query(ProcessingSession).filter(
+        # Count completed today (range on the (status, updated_at) index)
+        start_of_day = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        completed_today = db.query(func.count(ProcessingSession.session_id)).filter(
             ProcessingSession.status == ModelSessionStatus.COMPLETED,
-            func.date(ProcessingSession.updated_at) == today
-        ).count()
+            ProcessingSession.updated_at >= start_of_day
+        ).scalar()
         
         # Get system health
         system_health = "Healthy"
@@ -526,12 +476,11 @@ async def update_session(
                 detail="Access denied to this session"
             )
         
-        # Update fields that were provided
-        updated_fields = []
+        # Collect the fields that were provided
+        changes = {}
         
         if request.session_name is not None:
-            db_session.session_name = request.session_name
-            updated_fields.append("session_name")
+            changes["session_name"] = request.session_name
         
         if request.status is not None:
             # Convert schema enum to model enum
@@ -549,48 +498,30 @@ async def update_session(
             if db_session.status != model_status:
                 logger.info(f"Status transition: {db_session.status} -> {model_status} for session {session_id}")
             
-            db_session.status = model_status
-            updated_fields.append("status")
+            changes["status"] = model_status
         
         if request.processing_options is not None:
-            db_session.processing_options = request.processing_options.model_dump()
-            updated_fields.append("processing_options")
+            changes["processing_options"] = request.processing_options.model_dump()
         
-        # Update timestamp
-        db_session.updated_at = datetime.now(timezone.utc)
-        
-        # Commit changes with retry logic for database locking
-        def commit_changes():
-            # Re-query the session to ensure it's attached after any rollback
-            current_session = db.query(ProcessingSession).filter(
+        def apply_changes(session: Session) -> bool:
+            current_session = session.query(ProcessingSession).filter(
                 ProcessingSession.session_id == session_uuid
             ).first()
-            
             if not current_session:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Session not found during update"
-                )
-            
-            # Reapply the changes to the fresh session object
-            if request.session_name is not None:
-                current_session.session_name = request.session_name
-                
-            if request.status is not None:
-                model_status = ModelSessionStatus(request.status.value)
-                current_session.status = model_status
-                
-            if request.processing_options is not None:
-                current_session.processing_options = request.processing_options.model_dump()
-            
-            # Update timestamp on the fresh object
+                return False
+            for field, value in changes.items():
+                setattr(current_session, field, value)
             current_session.updated_at = datetime.now(timezone.utc)
-            
-            db.commit()
-            db.refresh(current_session)
-            return current_session
+            return True
         
-        db_session = retry_db_operation(commit_changes, max_retries=3, delay=0.2, db_session=db)
+        # Written by the database writer, which serializes writes, so lock errors are not retried
+        if not await run_write(db, apply_changes):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Session not found during update"
+            )
+        db.refresh(db_session)
+        updated_fields = list(changes)
         
         logger.info(
             f"Session updated successfully - ID: {session_id}, "
@@ -620,22 +551,54 @@ async def update_session(
         )
 
 
+def encode_session_cursor(session: ProcessingSession) -> str:
+    """Opaque keyset cursor positioned after a session in (created_at, session_id) descending order"""
+    position = json.dumps([session.created_at.isoformat(), str(session.session_id)])
+    return base64.urlsafe_b64encode(position.encode()).decode().rstrip("=")
+
+
+def decode_session_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor from encode_session_cursor
+    
+    Returns:
+        (created_at, session_id) of the last session on the previous page
+        
+    Raises:
+        HTTPException: 400 for a malformed cursor
+    """
+    try:
+        created_at, session_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(created_at), uuid.UUID(session_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
 @router.get("", response_model=SessionListResponse)
 async def list_sessions(
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored when a cursor is given)"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     status_filter: Optional[SchemaSessionStatus] = Query(None, description="Filter by session status"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInfo = Depends(get_current_user)
 ):
     """
     List sessions with pagination and filtering
     
+    Sessions are ordered newest first by (created_at, session_id). Following
+    next_cursor continues after the last session returned (keyset pagination),
+    so deep pages cost the same as the first; page is kept for offset paging.
+    
     Args:
         page: Page number (1-based)
         page_size: Number of items per page (max 100)
         status_filter: Optional status filter
-        db: Database session
+        cursor: Optional keyset cursor (next_cursor of the previous page)
+        db: Async database session
         current_user: Current authenticated user
         
     Returns:
@@ -645,47 +608,68 @@ async def list_sessions(
         - Requires authentication
         - Admins see all sessions
         - Non-admins see only their own sessions
+        
+    Performance:
+        - total_count is summed from the session_status_counts counters
+        - Cursor pages seek on the (created_by, status, created_at) index
     """
     try:
         # Build base query
-        query = db.query(ProcessingSession)
+        query = select(ProcessingSession)
+        user_filter = None
+        model_status = None
         
         # Apply user-based filtering
         if not current_user.is_admin:
             # Non-admin users only see their own sessions
             user_filter = f"DOMAIN\\{current_user.username}"
-            query = query.filter(ProcessingSession.created_by == user_filter)
+            query = query.where(ProcessingSession.created_by == user_filter)
         
         # Apply status filter if provided
         if status_filter:
             model_status = ModelSessionStatus(status_filter.value)
-            query = query.filter(ProcessingSession.status == model_status)
-        
-        # Order by creation date (newest first)
-        query = query.order_by(ProcessingSession.created_at.desc())
-        
-        # Get total count
-        total_count = query.count()
+            query = query.where(ProcessingSession.status == model_status)
+        
+        # Get total count from the maintained counters
+        total_count = await db.run_sync(count_sessions, user_filter, model_status)
+        
+        # Order by creation date (newest first), session ID breaking ties
+        query = query.order_by(ProcessingSession.created_at.desc(), ProcessingSession.session_id.desc())
+        if cursor:
+            after_created_at, after_session_id = decode_session_cursor(cursor)
+            query = query.where(or_(
+                ProcessingSession.created_at < after_created_at,
+                and_(
+                    ProcessingSession.created_at == after_created_at,
+                    ProcessingSession.session_id < after_session_id
+                )
+            ))
+        else:
+            query = query.offset((page - 1) * page_size)
         
-        # Apply pagination
-        offset = (page - 1) * page_size
-        sessions = query.offset(offset).limit(page_size).all()
+        # One extra row tells whether another page follows
+        result = await db.scalars(query.limit(page_size + 1))
+        sessions = result.all()
+        next_cursor = encode_session_cursor(sessions[page_size - 1]) if len(sessions) > page_size else None
         
         # Convert to response models
-        session_responses = [convert_session_to_response(session) for session in sessions]
+        session_responses = [convert_session_to_response(session) for session in sessions[:page_size]]
         
         logger.info(
             f"Sessions listed - User: {current_user.username}, "
-            f"Page: {page}, Count: {len(session_responses)}, Total: {total_count}"
+            f"Page: {page if not cursor else 'cursor'}, Count: {len(session_responses)}, Total: {total_count}"
         )
         
         return SessionListResponse(
             sessions=session_responses,
             total_count=total_count,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            next_cursor=next_cursor
         )
         
+    except HTTPException:
+        raise
     except SQLAlchemyError as e:
         logger.error(f"Database error listing sessions: {str(e)}")
         raise HTTPException(
@@ -700,20 +684,26 @@ async def list_sessions(
         )
 
 
+def _relationship_loaded(instance, name: str) -> bool:
+    """Whether a relationship of an ORM object is already loaded (reading it issues no query)"""
+    state = inspect(instance, raiseerr=False)
+    return state is not None and name not in state.unloaded
+
+
 def calculate_progress_statistics(session: ProcessingSession, db: Session = None) -> dict:
     """
     Calculate comprehensive progress statistics for a processing session
-    Optimized to use preloaded relationships to prevent N+1 queries
+    Uses preloaded employee_revisions when loaded, otherwise the session_statistics row
     
     Args:
-        session: ProcessingSession database object with preloaded employee_revisions
-        db: Database session (optional, kept for backward compatibility)
+        session: ProcessingSession database object
+        db: Database session (required unless employee_revisions is preloaded)
         
     Returns:
         Dictionary containing progress statistics
     """
     # Use preloaded employee_revisions to avoid additional queries
-    if hasattr(session, 'employee_revisions') and session.employee_revisions:
+    if _relationship_loaded(session, 'employee_revisions') and session.employee_revisions:
         # Count by validation status using preloaded data
         status_counts = {}
         for revision in session.employee_revisions:
@@ -721,13 +711,13 @@ def calculate_progress_statistics(session: ProcessingSession, db: Session = None
             status_counts[status] = status_counts.get(status, 0) + 1
         employee_counts = [(status, count) for status, count in status_counts.items()]
     else:
-        # Fallback to database query if preloaded data not available
-        employee_counts = db.query(
-            EmployeeRevision.validation_status,
-            func.count(EmployeeRevision.revision_id).label('count')
-        ).filter(
-            EmployeeRevision.session_id == session.session_id
-        ).group_by(EmployeeRevision.validation_status).all()
+        # Otherwise read the maintained per-session counters (one row)
+        stats = get_session_statistics(db, session.session_id)
+        employee_counts = [
+            (ValidationStatus.VALID, stats['valid_employees']),
+            (ValidationStatus.NEEDS_ATTENTION, stats['needs_attention_employees']),
+            (ValidationStatus.RESOLVED, stats['resolved_employees'])
+        ]
     
     # Count by status type
     valid_employees = 0
@@ -785,11 +775,11 @@ def calculate_progress_statistics(session: ProcessingSession, db: Session = None
 def get_current_employee(session: ProcessingSession, db: Session = None) -> Optional[CurrentEmployee]:
     """
     Get information about the currently processing employee
-    Optimized to use preloaded relationships to prevent N+1 queries
+    Uses preloaded processing_activities when loaded, otherwise one indexed query
     
     Args:
-        session: ProcessingSession database object with preloaded processing_activities
-        db: Database session (optional, kept for backward compatibility)
+        session: ProcessingSession database object
+        db: Database session
         
     Returns:
         CurrentEmployee object if processing, None otherwise
@@ -798,7 +788,7 @@ def get_current_employee(session: ProcessingSession, db: Session = None) -> Opti
         return None
     
     # Use preloaded processing_activities to avoid additional queries
-    if hasattr(session, 'processing_activities') and session.processing_activities:
+    if _relationship_loaded(session, 'processing_activities') and session.processing_activities:
         # Find most recent processing activity with employee info from preloaded data
         recent_activity = None
         for activity in session.processing_activities:
@@ -960,10 +950,179 @@ def format_recent_activities(session: ProcessingSession, db: Session) -> List[Re
     ]
 
 
+def build_session_status(sync_db: Session, session_uuid: uuid.UUID) -> SessionStatusResponse:
+    """
+    Build the full status response for a session
+    
+    Args:
+        sync_db: Database session
+        session_uuid: Session UUID
+        
+    Returns:
+        SessionStatusResponse: Comprehensive session status information
+        
+    Raises:
+        HTTPException: 404 when the session does not exist
+    """
+    # Load only the session row: counts and recent activities come from
+    # aggregate/limited queries instead of hydrating every revision and activity
+    db_session = sync_db.query(ProcessingSession).filter(
+        ProcessingSession.session_id == session_uuid
+    ).first()
+    
+    if not db_session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+    
+    # Calculate progress statistics
+    progress_stats = calculate_progress_statistics(db_session, sync_db)
+    
+    # Get current processing employee
+    current_employee = get_current_employee(db_session, sync_db)
+    
+    # Calculate estimated time remaining
+    estimated_time = estimate_remaining_time(db_session, progress_stats, sync_db)
+    
+    # Get processing start time
+    processing_start = get_processing_start_time(db_session, sync_db)
+    
+    # Get uploaded files information
+    files_uploaded = get_files_uploaded(db_session, sync_db)
+    
+    # Get recent activities
+    recent_activities = format_recent_activities(db_session, sync_db)
+    
+    # Build comprehensive response
+    return SessionStatusResponse(
+        session_id=str(db_session.session_id),
+        session_name=db_session.session_name,
+        status=db_session.status,  # Pydantic Enum serialized to string in schema
+        created_by=db_session.created_by,
+        created_at=db_session.created_at,
+        updated_at=db_session.updated_at,
+        current_employee=current_employee,
+        total_employees=progress_stats['total_employees'],
+        percent_complete=progress_stats['percent_complete'],
+        completed_employees=progress_stats['completed_employees'],
+        ready_for_export=progress_stats['ready_for_export'],
+        valid_employees=progress_stats['valid_employees'],
+        processing_employees=progress_stats['processing_employees'],
+        issues_employees=progress_stats['issues_employees'],
+        resolved_employees=progress_stats['resolved_employees'],
+        pending_employees=progress_stats['pending_employees'],
+        estimated_time_remaining=estimated_time,
+        processing_start_time=processing_start,
+        files_uploaded=files_uploaded,
+        recent_activities=recent_activities
+    )
+
+
+async def load_session_status(db: AsyncSession, session_uuid: uuid.UUID, etag: str) -> SessionStatusResponse:
+    """
+    Get the status response for a session version from the snapshot cache,
+    building and caching it on a miss
+    
+    Call in the read transaction the version was read in, so the response matches the ETag.
+    """
+    snapshot_cache = get_status_snapshot_cache()
+    cached_status = snapshot_cache.get(str(session_uuid), etag)
+    if cached_status is not None:
+        return cached_status
+    
+    session_status = await db.run_sync(build_session_status, session_uuid)
+    snapshot_cache.put(str(session_uuid), etag, session_status)
+    return session_status
+
+
+def parse_session_uuid(session_id: str) -> uuid.UUID:
+    """Parse a session ID path parameter (400 when it is not a UUID)"""
+    try:
+        return uuid.UUID(session_id)
+    except ValueError:
+        logger.warning(f"Invalid session UUID format for status: {session_id}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid session ID format"
+        )
+
+
+async def read_authorized_status_version(db: AsyncSession, session_uuid: uuid.UUID, current_user: UserInfo):
+    """
+    Read a session's status version and check the user may see it
+    
+    Returns:
+        Row with created_by, version and changed_at (see read_status_version)
+        
+    Raises:
+        HTTPException: 404 for not found, 403 for access denied
+    """
+    # One primary key read: owner for the access check, version for the ETag
+    version_row = await db.run_sync(read_status_version, session_uuid)
+    
+    if not version_row:
+        logger.warning(f"Session not found for status: {session_uuid}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+    
+    # Check access permissions
+    if not check_session_access(version_row, current_user):
+        logger.warning(
+            f"User {current_user.username} attempted to access session status {session_uuid} without permission"
+        )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this session"
+        )
+    
+    return version_row
+
+
+async def wait_for_status_version(
+    db: AsyncSession,
+    watch: StatusWatch,
+    session_uuid: uuid.UUID,
+    version_row,
+    min_version: int,
+    timeout: float
+):
+    """
+    Wait until a session's status version reaches min_version or the timeout passes
+    
+    Wakes when the processing pipeline notifies a change and re-checks every
+    status_recheck_seconds for changes made elsewhere.
+    
+    Returns:
+        Latest version row (None when the session was deleted meanwhile)
+    """
+    deadline = time.monotonic() + timeout
+    while version_row is not None and (version_row.version or 0) < min_version:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        # End the read transaction: later reads see new commits, and the
+        # connection goes back to the pool while waiting
+        await db.rollback()
+        await watch.wait(min(remaining, settings.status_recheck_seconds))
+        version_row = await db.run_sync(read_status_version, session_uuid)
+    return version_row
+
+
 @router.get("/{session_id}/status", response_model=SessionStatusResponse)
 async def get_session_status(
     session_id: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    wait_for_version: Optional[int] = Query(
+        None, ge=0, description="Long-poll: respond once the status version (X-Status-Version) reaches this value"
+    ),
+    wait_timeout: Optional[float] = Query(
+        None, gt=0, description="Long-poll: seconds to wait before responding with the current status"
+    ),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserInfo = Depends(get_current_user)
 ):
     """
@@ -973,13 +1132,23 @@ async def get_session_status(
     including progress statistics, current processing state, and recent activities.
     Optimized for sub-200ms response times to support efficient polling.
     
+    With wait_for_version the request is held until the session's status
+    version (returned in X-Status-Version) reaches that value, or until
+    wait_timeout (capped at status_wait_max_seconds) passes. Clients pass
+    the last version they saw plus one and get one response per change.
+    
     Args:
         session_id: UUID of the session to get status for
-        db: Database session
+        request: Incoming request (If-None-Match)
+        response: Outgoing response (ETag, X-Status-Version)
+        wait_for_version: Optional status version to wait for (long-poll)
+        wait_timeout: Optional long-poll timeout in seconds
+        db: Async database session
         current_user: Current authenticated user
         
     Returns:
-        SessionStatusResponse: Comprehensive session status information
+        SessionStatusResponse: Comprehensive session status information, or 304
+        Not Modified when If-None-Match matches the current status ETag
         
     Raises:
         HTTPException: 400 for invalid UUID, 403 for access denied, 404 for not found
@@ -990,89 +1159,40 @@ async def get_session_status(
         - Non-admins can only access their own session status
         
     Performance:
-        - Optimized database queries with selective loading
+        - An unchanged session is answered from its status version (one primary
+          key read) with 304, or with the response cached for that version
+        - The full status is only rebuilt after the session changes
+        - Long-polls wait on pipeline notifications without holding a connection
+        - Queries run on the aiosqlite async engine and do not block the event loop
         - Target response time: <200ms for efficient polling
     """
     try:
-        # Validate UUID format
-        try:
-            session_uuid = uuid.UUID(session_id)
-        except ValueError:
-            logger.warning(f"Invalid session UUID format for status: {session_id}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid session ID format"
-            )
-        
-        # Query session with optimized loading using eager loading to prevent N+1 queries
-        db_session = db.query(ProcessingSession).options(
-            selectinload(ProcessingSession.employee_revisions),
-            selectinload(ProcessingSession.processing_activities),
-            selectinload(ProcessingSession.file_uploads)
-        ).filter(
-            ProcessingSession.session_id == session_uuid
-        ).first()
-        
-        if not db_session:
-            logger.warning(f"Session not found for status: {session_id}")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Session not found"
-            )
-        
-        # Check access permissions
-        if not check_session_access(db_session, current_user):
-            logger.warning(
-                f"User {current_user.username} attempted to access session status {session_id} without permission"
-            )
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied to this session"
-            )
-        
-        # Calculate progress statistics
-        progress_stats = calculate_progress_statistics(db_session, db)
-        
-        # Get current processing employee
-        current_employee = get_current_employee(db_session, db)
-        
-        # Calculate estimated time remaining
-        estimated_time = estimate_remaining_time(db_session, progress_stats, db)
-        
-        # Get processing start time
-        processing_start = get_processing_start_time(db_session, db)
-        
-        # Get uploaded files information
-        files_uploaded = get_files_uploaded(db_session, db)
+        session_uuid = parse_session_uuid(session_id)
+        
+        # Registered before the first read so a change right after it is not missed
+        watch = status_change_notifier.watch(session_uuid) if wait_for_version is not None else nullcontext()
+        with watch:
+            version_row = await read_authorized_status_version(db, session_uuid, current_user)
+            if wait_for_version is not None:
+                timeout = min(wait_timeout or settings.status_wait_max_seconds, settings.status_wait_max_seconds)
+                version_row = await wait_for_status_version(
+                    db, watch, session_uuid, version_row, wait_for_version, timeout
+                )
+                if version_row is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="Session not found"
+                    )
         
-        # Get recent activities
-        recent_activities = format_recent_activities(db_session, db)
+        etag = status_etag(version_row.version, version_row.changed_at)
+        headers = {"ETag": etag, "X-Status-Version": str(version_row.version or 0), "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
         
+        session_status = await load_session_status(db, session_uuid, etag)
         logger.info(f"Session status retrieved - ID: {session_id}, User: {current_user.username}")
-        
-        # Build comprehensive response
-        return SessionStatusResponse(
-            session_id=str(db_session.session_id),
-            session_name=db_session.session_name,
-            status=db_session.status,  # Pydantic Enum serialized to string in schema
-            created_by=db_session.created_by,
-            created_at=db_session.created_at,
-            updated_at=db_session.updated_at,
-            current_employee=current_employee,
-            total_employees=progress_stats['total_employees'],
-            percent_complete=progress_stats['percent_complete'],
-            completed_employees=progress_stats['completed_employees'],
-            ready_for_export=progress_stats['ready_for_export'],
-            valid_employees=progress_stats['valid_employees'],
-            processing_employees=progress_stats['processing_employees'],
-            issues_employees=progress_stats['issues_employees'],
-            resolved_employees=progress_stats['resolved_employees'],
-            pending_employees=progress_stats['pending_employees'],
-            estimated_time_remaining=estimated_time,
-            processing_start_time=processing_start,
-            files_uploaded=files_uploaded,
-            recent_activities=recent_activities
-        )
+        return session_status
         
     except HTTPException:
         raise
@@ -1090,6 +1210,104 @@ async def get_session_status(
         )
 
 
+async def status_events(
+    db: AsyncSession,
+    session_uuid: uuid.UUID,
+    last_version: Optional[int],
+    is_disconnected: Callable[[], Awaitable[bool]]
+) -> AsyncIterator[str]:
+    """
+    Server-Sent Events for a session's status
+    
+    Sends a "status" event (id = status version, data = status JSON) whenever the
+    version differs from the last one sent, a comment line as keep-alive, and a
+    "deleted" event before ending if the session is removed.
+    
+    Args:
+        db: Async database session (its read transaction is ended between events)
+        session_uuid: Session UUID
+        last_version: Version the client already has (Last-Event-ID), if any
+        is_disconnected: Coroutine function telling whether the client went away
+    """
+    yield f"retry: {int(settings.status_recheck_seconds * 1000)}\n\n"
+    try:
+        keepalive_due = time.monotonic() + settings.status_stream_keepalive_seconds
+        with status_change_notifier.watch(session_uuid) as watch:
+            while not await is_disconnected():
+                version_row = await db.run_sync(read_status_version, session_uuid)
+                if version_row is None:
+                    yield "event: deleted\ndata: {}\n\n"
+                    return
+                
+                version = version_row.version or 0
+                if version != last_version:
+                    etag = status_etag(version_row.version, version_row.changed_at)
+                    session_status = await load_session_status(db, session_uuid, etag)
+                    last_version = version
+                    keepalive_due = time.monotonic() + settings.status_stream_keepalive_seconds
+                    yield f"id: {version}\nevent: status\ndata: {session_status.model_dump_json()}\n\n"
+                
+                await db.rollback()
+                await watch.wait(min(settings.status_recheck_seconds, max(0.0, keepalive_due - time.monotonic())))
+                if time.monotonic() >= keepalive_due:
+                    keepalive_due = time.monotonic() + settings.status_stream_keepalive_seconds
+                    yield ": keepalive\n\n"
+    except SQLAlchemyError as e:
+        logger.error(f"Database error in status stream {session_uuid}: {str(e)}")
+
+
+@router.get("/{session_id}/status/stream")
+async def stream_session_status(
+    session_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserInfo = Depends(get_current_user)
+):
+    """
+    Stream status changes for a processing session as Server-Sent Events
+    
+    For clients without a WebSocket: one event per status version instead of
+    polling /status on a timer. Reconnecting clients send Last-Event-ID and
+    only receive the status again if it changed meanwhile.
+    
+    Args:
+        session_id: UUID of the session to stream status for
+        request: Incoming request (Last-Event-ID, disconnect detection)
+        db: Async database session
+        current_user: Current authenticated user
+        
+    Returns:
+        StreamingResponse: text/event-stream of status events (see status_events)
+        
+    Raises:
+        HTTPException: 400 for invalid UUID, 403 for access denied, 404 for not found
+    """
+    try:
+        session_uuid = parse_session_uuid(session_id)
+        await read_authorized_status_version(db, session_uuid, current_user)
+        await db.rollback()
+    except HTTPException:
+        raise
+    except SQLAlchemyError as e:
+        logger.error(f"Database error opening status stream {session_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve session status due to database error"
+        )
+    
+    try:
+        last_version = int(request.headers.get("last-event-id", ""))
+    except ValueError:
+        last_version = None
+    
+    logger.info(f"Session status stream opened - ID: {session_id}, User: {current_user.username}")
+    return StreamingResponse(
+        status_events(db, session_uuid, last_version, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/{session_id}/employee-analysis")
 async def get_employee_analysis(
     session_id: str,
@@ -1165,7 +1383,7 @@ async def get_employee_analysis(
         
         # Process documents with local processors
         from ..services.pdf_processor import CARProcessor, ReceiptProcessor
-        from ..services.employee_merger import EmployeeDataMerger
+        from ..services.merge_engine import MergeEngine
         
         logger.info(f"Starting employee analysis for session {session_id}")
         
@@ -1177,14 +1395,14 @@ async def get_employee_analysis(
         receipt_data = receipt_processor.parse_receipt_document(receipt_file.file_path)
         
         # Perform advanced merge analysis
-        merger = EmployeeDataMerger(similarity_threshold=0.8)
-        merge_result = merger.merge_employee_data(car_data, receipt_data)
+        merge_engine = MergeEngine(similarity_threshold=0.8)
+        merge_result = merge_engine.merge_documents(car_data, receipt_data)
         
         # Get splittable employees
-        splittable_employees = merger.get_splittable_employees(merge_result['employees'])
+        splittable_employees = merge_engine.merger.get_splittable_employees(merge_result['employees'])
         
         # Validate data
-        validation_report = merger.validate_employee_data(merge_result['employees'])
+        validation_report = merge_engine.merger.validate_employee_data(merge_result['employees'])
         
         # Generate expense analysis
         expense_analysis = _generate_expense_analysis(merge_result['employees'])
@@ -1318,7 +1536,7 @@ async def split_session_documents(
         
         # Import document splitter service
         from ..services.document_splitter import create_document_splitter
-        from ..services.employee_merger import EmployeeDataMerger
+        from ..services.merge_engine import MergeEngine
         from ..services.document_intelligence import DocumentProcessor
         
         # Find CAR and Receipt files
@@ -1355,8 +1573,7 @@ async def split_session_documents(
         receipt_data = doc_processor.process_receipt_document(receipt_file.file_path)
         
         # Merge employee data
-        merger = EmployeeDataMerger()
-        merged_employees = merger.merge_employee_data(car_data, receipt_data)
+        merged_employees = MergeEngine().merge_documents(car_data, receipt_data)['employees']
         
         if not merged_employees:
             raise HTTPException(
@@ -1486,7 +1703,7 @@ async def validate_split_requirements(
         
         # Import required services
         from ..services.document_splitter import create_document_splitter
-        from ..services.employee_merger import EmployeeDataMerger
+        from ..services.merge_engine import MergeEngine
         from ..services.document_intelligence import DocumentProcessor
         
         # Find CAR and Receipt files
@@ -1528,8 +1745,7 @@ async def validate_split_requirements(
             receipt_data = doc_processor.process_receipt_document(receipt_file.file_path)
             
             # Merge employee data
-            merger = EmployeeDataMerger()
-            merged_employees = merger.merge_employee_data(car_data, receipt_data)
+            merged_employees = MergeEngine().merge_documents(car_data, receipt_data)['employees']
             
             # Validate split requirements
             splitter = create_document_splitter()
@@ -2366,6 +2582,9 @@ async def delete_session(
             # Delete the session
             session_name = db_session.session_name or "Unnamed Session"
             db.delete(db_session)
+            invalidate_session_cache(session_uuid)
+            delete_result_snapshots(session_uuid)
+            delete_export_artifacts(session_uuid)
             
             logger.info(
                 f"Session {session_id} ('{session_name}') deleted by {current_user.username}. "
@@ -2443,40 +2662,3 @@ async def close_all_sessions(
     except Exception as e:
         logger.error(f"Failed to close all sessions: {e}")
         raise HTTPException(status_code=500, detail="Failed to close all sessions")
-
-
-@router.get("/dashboard/stats", tags=["Dashboard"], summary="Get dashboard statistics")
-async def get_dashboard_stats(
-    db: Session = Depends(get_db),
-    current_user: UserInfo = Depends(get_current_user)
-):
-    """Get statistics for the dashboard"""
-    try:
-        # Count active sessions
-        active_sessions = db.query(ProcessingSession).filter(
-            ProcessingSession.status == ModelSessionStatus.PROCESSING
-        ).count()
-        
-        # Count completed today
-        today = datetime.now(timezone.utc).date()
-        completed_today = db.query(ProcessingSession).filter(
-            ProcessingSession.status == ModelSessionStatus.COMPLETED,
-            func.date(ProcessingSession.updated_at) == today
-        ).count()
-        
-        # Get system health
-        system_health = "Healthy"
-        if active_sessions > 10:
-            system_health = "High Load"
-        elif active_sessions > 5:
-            system_health = "Moderate Load"
-        
-        return {
-            "active_sessions": active_sessions,
-            "completed_today": completed_today,
-            "system_health": system_health
-        }
-        
-    except Exception as e:
-        logger.error(f"Failed to get dashboard stats: {e}")
-        raise HTTPException(status_code=500, detail="Failed to get dashboard statistics")
\ No newline at end of file
@@ -33,6 +33,7 @@ from ..auth import get_current_user, UserInfo
 from ..models import ProcessingSession, FileUpload, FileType, UploadStatus, SessionStatus, ProcessingActivity, ActivityType
 from ..config import settings
 from ..websocket import notifier
+from ..services.page_similarity import compute_page_hashes, compute_minhash_signature
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -496,6 +497,9 @@ async def upload_files_to_session(
                 with open(file_path, 'wb') as f:
                     f.write(content)
                 
+                # Page-level similarity index for near-duplicate delta detection
+                page_hashes = compute_page_hashes(str(file_path))
+                
                 # Create file upload record
                 file_upload = FileUpload(
                     session_id=session_uuid,
@@ -504,6 +508,8 @@ async def upload_files_to_session(
                     file_path=str(file_path),
                     file_size=len(content),
                     checksum=checksum,
+                    page_hashes=page_hashes or None,
+                    minhash_signature=compute_minhash_signature(page_hashes) or None,
                     upload_status=UploadStatus.COMPLETED,
                     uploaded_by=f"DOMAIN\\{current_user.username}"
                 )
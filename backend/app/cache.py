@@ -1,70 +1,454 @@
 """
-Minimal cache module for Credit Card Processor.
-Provides basic cache statistics without complex caching implementation.
+Application cache for Credit Card Processor
+
+In-process cache for read-heavy responses. Entries carry their own time to
+live and are evicted least recently used first once the entry count or the
+approximate byte size of the cache exceeds its limits. Entries can be tagged
+(e.g. "session:<id>") so every response derived from a session is dropped
+together when the session is written to.
+
+Concurrent misses for the same key compute the value once: synchronous
+callers wait on a per-key lock, coroutines await the first caller's result.
+Hit, miss, eviction and error counts feed the health checks and the
+performance metrics endpoint.
 """
 
-from typing import Dict, Any
+import asyncio
+import fnmatch
+import functools
+import inspect
+import logging
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set
+
+from .config import settings
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Returned by TTLCache.get when a key is absent (None is a cacheable value)
+MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate memory footprint of a value in bytes
+
+    Walks containers and object attributes (including pydantic models) once,
+    counting shared objects a single time.
+    """
+    seen: Set[int] = set()
+    pending = [value]
+    total = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        try:
+            total += sys.getsizeof(obj)
+        except TypeError:
+            continue
+        if isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+            continue
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            pending.extend(obj)
+        elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+            pending.append(vars(obj))
+    return total
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "size", "tags")
+
+    def __init__(self, value: Any, expires_at: float, size: int, tags: frozenset):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.tags = tags
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry TTL, size limits and tag invalidation
+
+    Args:
+        max_entries: Entries kept before the least recently used is evicted
+        max_bytes: Approximate total size kept before evicting
+        default_ttl: Time to live in seconds for entries set without one
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024,
+                 default_ttl: float = 300.0):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Per-key [lock, number of callers using it] for synchronous computes
+        self._key_locks: Dict[str, list] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._metrics = {
+            "hits": 0, "misses": 0, "sets": 0, "evictions": 0,
+            "expirations": 0, "invalidations": 0, "errors": 0, "coalesced": 0
+        }
+
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        """Get a live entry's value (counts a hit or miss)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self._metrics["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._metrics["misses"] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._metrics["hits"] += 1
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()):
+        """
+        Store a value, evicting least recently used entries past the limits
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time to live in seconds (default_ttl when None)
+            tags: Tags the entry can be invalidated by
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            logger.debug(f"Not caching '{key}': {size} bytes exceeds the cache size limit")
+            return
+        entry = _Entry(value, time.monotonic() + ttl, size, frozenset(tags))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += size
+            for tag in entry.tags:
+                self._tags.setdefault(tag, set()).add(key)
+            self._metrics["sets"] += 1
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._metrics["evictions"] += 1
+
+    def delete(self, key: str) -> bool:
+        """Remove an entry; returns whether it existed"""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            self._metrics["invalidations"] += 1
+            return True
+
+    def invalidate_tag(self, tag: str) -> int:
+        """Remove every entry carrying a tag; returns the number removed"""
+        with self._lock:
+            keys = list(self._tags.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            self._metrics["invalidations"] += len(keys)
+            return len(keys)
+
+    def invalidate_pattern(self, pattern: str) -> int:
+        """
+        Remove entries whose key or one of whose tags matches a glob pattern
+
+        Args:
+            pattern: fnmatch pattern, e.g. "summary:*" or "session:<id>"
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = {key for key in self._entries if fnmatch.fnmatchcase(key, pattern)}
+            for tag, tagged in self._tags.items():
+                if fnmatch.fnmatchcase(tag, pattern):
+                    keys.update(tagged)
+            for key in keys:
+                self._remove(key)
+            self._metrics["invalidations"] += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """Remove expired entries; returns the number removed"""
+        now = time.monotonic()
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+            for key in keys:
+                self._remove(key)
+            self._metrics["expirations"] += len(keys)
+            return len(keys)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], ttl: Optional[float] = None,
+                       tags: Iterable[str] = ()) -> Any:
+        """
+        Get a value, computing and storing it on a miss (once across threads)
+
+        Args:
+            key: Cache key
+            compute: Builds the value; exceptions propagate and nothing is stored
+            ttl: Time to live in seconds
+            tags: Tags for the stored entry
+
+        Returns:
+            The cached or computed value
+        """
+        value = self.get(key)
+        if value is not MISSING:
+            return value
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            key_lock[1] += 1
+        try:
+            with key_lock[0]:
+                value = self._peek(key)
+                if value is not MISSING:
+                    with self._lock:
+                        self._metrics["coalesced"] += 1
+                    return value
+                value = self._compute(compute)
+                self.set(key, value, ttl, tags)
+                return value
+        finally:
+            with self._lock:
+                key_lock[1] -= 1
+                if not key_lock[1]:
+                    del self._key_locks[key]
+
+    async def get_or_compute_async(self, key: str, compute: Callable[[], Awaitable[Any]],
+                                   ttl: Optional[float] = None, tags: Iterable[str] = ()) -> Any:
+        """
+        Get a value, awaiting compute() on a miss
+
+        Coroutines missing the same key while a computation is in flight await
+        its result instead of starting their own. If that computation is
+        cancelled (e.g. its client disconnected) a waiter computes instead.
+
+        Args:
+            key: Cache key
+            compute: Coroutine function building the value
+            ttl: Time to live in seconds
+            tags: Tags for the stored entry
+
+        Returns:
+            The cached or computed value
+        """
+        value = self.get(key)
+        if value is not MISSING:
+            return value
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                future = self._inflight.get(key)
+                leader = future is None or future.get_loop() is not loop
+                if leader:
+                    future = loop.create_future()
+                    self._inflight[key] = future
+                else:
+                    self._metrics["coalesced"] += 1
+            if not leader:
+                try:
+                    return await asyncio.shield(future)
+                except asyncio.CancelledError:
+                    if not future.cancelled():
+                        raise
+                    continue
+            try:
+                value = self._peek(key)
+                if value is MISSING:
+                    try:
+                        value = await compute()
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception:
+                        with self._lock:
+                            self._metrics["errors"] += 1
+                        raise
+                    self.set(key, value, ttl, tags)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                # Retrieved by waiters if any; avoid "exception never retrieved"
+                future.exception()
+                raise
+            else:
+                future.set_result(value)
+                return value
+            finally:
+                with self._lock:
+                    if self._inflight.get(key) is future:
+                        del self._inflight[key]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Cache statistics"""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["entries"] = len(self._entries)
+            metrics["bytes"] = self._bytes
+        lookups = metrics["hits"] + metrics["misses"]
+        metrics["hit_rate"] = round(metrics["hits"] / lookups, 4) if lookups else 0.0
+        return metrics
+
+    def _peek(self, key: str) -> Any:
+        """Live value without touching statistics or recency"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                return MISSING
+            return entry.value
+
+    def _compute(self, compute: Callable[[], Any]) -> Any:
+        try:
+            return compute()
+        except Exception:
+            with self._lock:
+                self._metrics["errors"] += 1
+            raise
+
+    def _remove(self, key: str):
+        """Drop an entry and its tag references (caller holds the lock)"""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            tagged = self._tags.get(tag)
+            if tagged is not None:
+                tagged.discard(key)
+                if not tagged:
+                    del self._tags[tag]
+
+
+# Application cache
+_cache = TTLCache(
+    max_entries=settings.cache_max_entries,
+    max_bytes=settings.cache_max_mb * 1024 * 1024,
+    default_ttl=settings.cache_default_ttl_seconds
+)
+
+
+def get_cache() -> TTLCache:
+    """Get the application cache"""
+    return _cache
+
+
+def session_tag(session_id) -> str:
+    """Tag for cache entries derived from one session"""
+    try:
+        return f"session:{uuid.UUID(str(session_id))}"
+    except ValueError:
+        return f"session:{session_id}"
+
+
+def invalidate_session_cache(session_id) -> int:
+    """Drop every cached response derived from a session (call after writing to it)"""
+    return _cache.invalidate_tag(session_tag(session_id))
 
 
 def get_cache_stats() -> Dict[str, Any]:
     """
     Get cache statistics.
-    
+
     Returns:
-        Dictionary with cache statistics for health checks.
-        
-    Note:
-        This is a minimal implementation that returns basic stats
-        without actual caching functionality.
+        Dictionary with cache statistics for health checks and metrics.
     """
+    metrics = _cache.get_metrics()
     return {
-        "cache_enabled": False,
-        "cache_type": "disabled",
-        "total_keys": 0,
-        "hit_rate": 0.0,
-        "miss_rate": 0.0,
-        "memory_usage": "0 MB",
+        "cache_enabled": settings.cache_enabled,
+        "cache_type": "memory",
+        "total_keys": metrics["entries"],
+        "hit_rate": metrics["hit_rate"],
+        "miss_rate": round(1 - metrics["hit_rate"], 4) if metrics["hits"] + metrics["misses"] else 0.0,
+        "memory_usage": f"{metrics['bytes'] / (1024 * 1024):.1f} MB",
+        "max_entries": _cache.max_entries,
+        "max_memory": f"{_cache.max_bytes / (1024 * 1024):.1f} MB",
         "status": "healthy",
         "last_updated": datetime.now(timezone.utc).isoformat(),
-        "note": "Caching disabled - using minimal implementation"
+        **metrics
     }
 
 
 def clear_cache() -> bool:
     """
     Clear all cache entries.
-    
+
     Returns:
         True if cache was cleared successfully.
     """
+    _cache.clear()
     return True
 
 
 def get_cache_size() -> int:
     """
     Get current cache size.
-    
+
     Returns:
-        Number of items in cache (always 0 for minimal implementation).
+        Number of items in cache.
     """
-    return 0
+    return _cache.get_metrics()["entries"]
 
 
-def cached(ttl_seconds: int = 300):
+def cached(ttl_seconds: int = 300, tags: Iterable[str] = ()):
     """
     Decorator for caching function results.
-    
+
+    Results are keyed by the function and its arguments (which must have
+    stable reprs). Works for plain functions and coroutine functions.
+
     Args:
-        ttl_seconds: Time to live in seconds (ignored in minimal implementation)
-        
+        ttl_seconds: Time to live in seconds
+        tags: Tags for the stored entries
+
     Returns:
-        Decorator function that passes through without caching.
+        Decorator function.
     """
     def decorator(func):
+        prefix = f"{func.__module__}.{func.__qualname__}"
+
+        def make_key(args, kwargs) -> str:
+            return f"{prefix}:{args!r}:{sorted(kwargs.items())!r}"
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not settings.cache_enabled:
+                    return await func(*args, **kwargs)
+                return await _cache.get_or_compute_async(
+                    make_key(args, kwargs), lambda: func(*args, **kwargs), ttl_seconds, tags
+                )
+            return async_wrapper
+
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            # No caching - just call the function directly
-            return func(*args, **kwargs)
+            if not settings.cache_enabled:
+                return func(*args, **kwargs)
+            return _cache.get_or_compute(
+                make_key(args, kwargs), lambda: func(*args, **kwargs), ttl_seconds, tags
+            )
         return wrapper
     return decorator
 
@@ -72,37 +456,44 @@ def cached(ttl_seconds: int = 300):
 def cache(key: str, value: Any = None, ttl_seconds: int = 300):
     """
     Cache a value with a key.
-    
+
     Args:
         key: Cache key
         value: Value to cache (if None, attempts to retrieve)
-        ttl_seconds: Time to live in seconds (ignored)
-        
+        ttl_seconds: Time to live in seconds
+
     Returns:
-        None for set operations, None for get operations (no caching)
+        None for set operations, the cached value (or None) for get operations
     """
+    if value is None:
+        return _cache.get(key, None)
+    _cache.set(key, value, ttl_seconds)
     return None
 
 
 def invalidate_cache_pattern(pattern: str) -> int:
     """
     Invalidate cache entries matching a pattern.
-    
+
     Args:
-        pattern: Pattern to match cache keys
-        
+        pattern: Glob pattern matched against cache keys and tags
+
     Returns:
-        Number of invalidated entries (always 0 for minimal implementation)
+        Number of invalidated entries
     """
-    return 0
+    return _cache.invalidate_pattern(pattern)
 
 
 # Export main functions
 __all__ = [
+    'TTLCache',
+    'get_cache',
     'get_cache_stats',
-    'clear_cache', 
+    'clear_cache',
     'get_cache_size',
     'cached',
     'cache',
-    'invalidate_cache_pattern'
-]
\ No newline at end of file
+    'invalidate_cache_pattern',
+    'invalidate_session_cache',
+    'session_tag'
+]
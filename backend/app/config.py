@@ -22,10 +22,53 @@ class Settings(BaseSettings):
     
     # Database
     database_path: str = "./data/database.db"
+    # Single-writer service: queued writes share one connection and are group-committed
+    db_writer_enabled: bool = Field(default=True, alias="DB_WRITER_ENABLED")
+    db_writer_max_batch: int = Field(default=64, alias="DB_WRITER_MAX_BATCH")
+    db_writer_batch_window_ms: float = Field(default=0.0, alias="DB_WRITER_BATCH_WINDOW_MS")
+    # Activity log lines are buffered and written as multi-row inserts
+    activity_buffer_enabled: bool = Field(default=True, alias="ACTIVITY_BUFFER_ENABLED")
+    activity_buffer_max_entries: int = Field(default=100, alias="ACTIVITY_BUFFER_MAX_ENTRIES")
+    activity_buffer_flush_ms: float = Field(default=250.0, alias="ACTIVITY_BUFFER_FLUSH_MS")
+    # SQL instrumentation: per-request query counts and timings; flag a request
+    # running the same statement fingerprint more than this many times
+    query_metrics_enabled: bool = Field(default=True, alias="QUERY_METRICS_ENABLED")
+    n_plus_one_threshold: int = Field(default=10, alias="N_PLUS_ONE_THRESHOLD")
+    # Built status responses kept per session until its status version changes
+    status_snapshot_cache_size: int = Field(default=256, alias="STATUS_SNAPSHOT_CACHE_SIZE")
+    # Long-poll / SSE status: longest wait per request, re-check interval for
+    # changes made outside the processing pipeline, and SSE keep-alive interval
+    status_wait_max_seconds: float = Field(default=30.0, alias="STATUS_WAIT_MAX_SECONDS")
+    status_recheck_seconds: float = Field(default=2.0, alias="STATUS_RECHECK_SECONDS")
+    status_stream_keepalive_seconds: float = Field(default=15.0, alias="STATUS_STREAM_KEEPALIVE_SECONDS")
+    # In-process response cache (app.cache): entry and approximate size limits,
+    # and the time to live of entries stored without their own
+    cache_enabled: bool = Field(default=True, alias="CACHE_ENABLED")
+    cache_max_entries: int = Field(default=1024, alias="CACHE_MAX_ENTRIES")
+    cache_max_mb: int = Field(default=64, alias="CACHE_MAX_MB")
+    cache_default_ttl_seconds: float = Field(default=300.0, alias="CACHE_DEFAULT_TTL_SECONDS")
+    # Result snapshots: compressed results of completed sessions, rebuilt when
+    # the session's data version changes (see services.result_snapshots); writes
+    # to a session within the refresh delay share one background rewrite
+    result_snapshots_enabled: bool = Field(default=True, alias="RESULT_SNAPSHOTS_ENABLED")
+    result_snapshot_refresh_delay_seconds: float = Field(default=2.0, alias="RESULT_SNAPSHOT_REFRESH_DELAY_SECONDS")
+    # Export artifacts: generated export files kept per data version and served
+    # from disk (see services.export_artifacts); disabled builds every download.
+    # Files of a superseded version are kept until unused for the grace period
+    export_artifacts_enabled: bool = Field(default=True, alias="EXPORT_ARTIFACTS_ENABLED")
+    export_artifact_grace_seconds: float = Field(default=300.0, alias="EXPORT_ARTIFACT_GRACE_SECONDS")
+    # Degraded-mode fallback data (app.degradation): in-memory tier limits,
+    # on-disk tier size cap and the interval of background expiry sweeps
+    fallback_cache_memory_entries: int = Field(default=256, alias="FALLBACK_CACHE_MEMORY_ENTRIES")
+    fallback_cache_memory_mb: int = Field(default=16, alias="FALLBACK_CACHE_MEMORY_MB")
+    fallback_cache_disk_mb: int = Field(default=256, alias="FALLBACK_CACHE_DISK_MB")
+    fallback_cache_sweep_seconds: float = Field(default=60.0, alias="FALLBACK_CACHE_SWEEP_SECONDS")
     
     # File paths
     upload_path: str = "./data/uploads"
     export_path: str = "./data/exports"
+    snapshot_path: str = "./data/snapshots"
+    export_artifact_path: str = "./data/export_artifacts"
     
     # File size limits
     max_car_file_size_mb: int = 100
@@ -33,6 +76,8 @@ class Settings(BaseSettings):
     
     # Processing
     max_employees: int = 100
+    # Reuse extracted text of pages already seen in earlier uploads (keyed by page hash, opt-in)
+    page_cache_enabled: bool = Field(default=False, alias="PAGE_CACHE_ENABLED")
     # Line-level feature flags
     lines_enabled: bool = Field(default=False, alias="LINES_ENABLED")
     line_matching_enabled: bool = Field(default=False, alias="LINE_MATCHING_ENABLED")
@@ -235,4 +280,6 @@ def init_directories():
     """Create required directories if they don't exist"""
     Path(settings.upload_path).mkdir(parents=True, exist_ok=True)
     Path(settings.export_path).mkdir(parents=True, exist_ok=True)
+    Path(settings.snapshot_path).mkdir(parents=True, exist_ok=True)
+    Path(settings.export_artifact_path).mkdir(parents=True, exist_ok=True)
     Path(os.path.dirname(settings.database_path)).mkdir(parents=True, exist_ok=True)
\ No newline at end of file
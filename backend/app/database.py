@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker as async_sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 from .config import settings, init_directories
+from .metrics import install_query_instrumentation
 import logging
 import time
 import threading
@@ -30,16 +31,56 @@ engine = create_engine(
     echo=False  # Disable SQL echo for production
 )
 
-# Create asynchronous database engine for async operations
+# Create asynchronous database engine for async operations (hot read endpoints):
+# aiosqlite runs each connection on its own thread, so queries do not block the event loop
 async_engine = create_async_engine(
     f"sqlite+aiosqlite:///{settings.database_path}",
-    connect_args={"check_same_thread": False},
+    connect_args={
+        "check_same_thread": False,
+        "timeout": 60
+    },
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    pool_size=10,
+    max_overflow=15,
+    echo=False
+)
+
+# Pooled read-only engine for query endpoints (PRAGMA query_only)
+read_engine = create_engine(
+    f"sqlite:///{settings.database_path}",
+    connect_args={
+        "check_same_thread": False,
+        "timeout": 60
+    },
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    pool_size=10,
+    max_overflow=15,
     echo=False
 )
 
 # PRAGMA configuration lock to prevent race conditions
 _pragma_lock = threading.Lock()
 
+
+def _apply_sqlite_pragmas(cursor):
+    """Execute the connection PRAGMAs shared by all engines"""
+    # Enable WAL mode for better concurrency
+    cursor.execute("PRAGMA journal_mode=WAL")
+    
+    # Set busy timeout to 60 seconds for better concurrency
+    cursor.execute("PRAGMA busy_timeout=60000")
+    
+    # Enable foreign key constraints
+    cursor.execute("PRAGMA foreign_keys=ON")
+    
+    # Optimize SQLite performance
+    cursor.execute("PRAGMA synchronous=NORMAL")  # Faster than FULL, safer than OFF
+    cursor.execute("PRAGMA cache_size=10000")    # Increase cache size
+    cursor.execute("PRAGMA temp_store=MEMORY")   # Use memory for temp storage
+
+
 # Configure SQLite for better concurrency and reduced locking
 @event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
@@ -47,21 +88,9 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
     cursor = dbapi_connection.cursor()
     
     try:
+        # Switching to WAL can race when multiple connections try it simultaneously
         with _pragma_lock:
-            # Enable WAL mode for better concurrency - this is the critical operation
-            # that can cause race conditions if multiple connections try it simultaneously
-            cursor.execute("PRAGMA journal_mode=WAL")
-            
-            # Set busy timeout to 60 seconds for better concurrency
-            cursor.execute("PRAGMA busy_timeout=60000")
-            
-            # Enable foreign key constraints
-            cursor.execute("PRAGMA foreign_keys=ON")
-            
-            # Optimize SQLite performance
-            cursor.execute("PRAGMA synchronous=NORMAL")  # Faster than FULL, safer than OFF
-            cursor.execute("PRAGMA cache_size=10000")    # Increase cache size
-            cursor.execute("PRAGMA temp_store=MEMORY")   # Use memory for temp storage
+            _apply_sqlite_pragmas(cursor)
             
     except Exception as e:
         # Log PRAGMA configuration errors but don't fail connection
@@ -71,6 +100,73 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
     finally:
         cursor.close()
 
+
+def set_async_sqlite_pragma(dbapi_connection, connection_record):
+    """
+    Configure aiosqlite connections
+    
+    Same PRAGMAs without _pragma_lock: async connections are opened on the event
+    loop thread, where a thread lock held across the awaited PRAGMAs would block
+    the loop for every other connection being opened.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        _apply_sqlite_pragmas(cursor)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Error configuring SQLite PRAGMA settings: {e}")
+    finally:
+        cursor.close()
+
+
+def _begin_immediate(connection):
+    """Take the write lock when the writer's transaction starts (no lock upgrades)"""
+    connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def create_writer_engine(database_path: str):
+    """
+    Create the single-connection engine owned by a database writer thread (see db_writer)
+    
+    The driver runs in autocommit mode so SQLAlchemy controls transactions:
+    each transaction starts with BEGIN IMMEDIATE and per-unit SAVEPOINTs work.
+    
+    Args:
+        database_path: SQLite database file
+        
+    Returns:
+        SQLAlchemy engine with a pool of one connection
+    """
+    writer = create_engine(
+        f"sqlite:///{database_path}",
+        connect_args={
+            "check_same_thread": False,
+            "timeout": 60,
+            "isolation_level": None
+        },
+        pool_size=1,
+        max_overflow=0,
+        pool_recycle=1800,
+        echo=False
+    )
+    event.listen(writer, "connect", set_sqlite_pragma)
+    event.listen(writer, "begin", _begin_immediate)
+    return writer
+
+
+writer_engine = create_writer_engine(settings.database_path)
+event.listen(read_engine, "connect", set_sqlite_pragma)
+event.listen(async_engine.sync_engine, "connect", set_async_sqlite_pragma)
+
+
+@event.listens_for(read_engine, "connect")
+def set_query_only(dbapi_connection, connection_record):
+    """Reject writes on read-only connections"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
 # Connection and session monitoring 
 connection_metrics = {
     "active_connections": 0,
@@ -126,6 +222,9 @@ def on_close(dbapi_connection, connection_record):
         logger = logging.getLogger(__name__)
         logger.warning(f"Failed to track connection close event: {e}")
 
+# Per-statement timing, fingerprints and per-request query counts (see metrics.py)
+install_query_instrumentation()
+
 @event.listens_for(engine, "checkout")
 def on_checkout(dbapi_connection, connection_record, connection_proxy):
     """Track connection checkouts from pool"""
@@ -390,6 +489,9 @@ def get_session_metrics() -> Dict[str, any]:
 
 # Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+# Writer sessions keep loaded state after commit: results are handed to other threads
+WriterSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=writer_engine)
 AsyncSessionLocal = async_sessionmaker(
     bind=async_engine,
     class_=AsyncSession,
@@ -409,6 +511,15 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """Read-only database dependency for query endpoints (separate connection pool)"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 async def get_async_db():
     """Asynchronous database dependency for FastAPI endpoints"""
     async with AsyncSessionLocal() as session:
@@ -0,0 +1,296 @@
+"""
+SQLite Single-Writer Service
+
+SQLite allows one writer at a time, so writes from processing, progress
+updates, activity logging and user edits on separate pooled connections queue
+up on the database lock and need busy timeouts and retry loops. The
+DatabaseWriter owns one connection on a dedicated thread and executes queued
+write units in submission order. Units that are waiting together are committed
+as a group (one commit and WAL sync per group); each unit runs in its own
+SAVEPOINT so a failing unit only rolls back itself.
+
+A write unit is a callable taking the writer's Session. It should return plain
+values (IDs, counts) or objects it does not touch afterwards: returned ORM
+objects are detached from the writer session once the group commits. A unit
+returning False reports that it wrote nothing (e.g. row not found), which lets
+the inline path skip its commit.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .database import WriterSessionLocal, atomic_transaction, engine
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteUnit = Callable[[Session], T]
+
+
+class _WriteRequest:
+    """Queued write unit with the future receiving its result"""
+
+    __slots__ = ("unit", "future", "enqueued_at")
+
+    def __init__(self, unit: WriteUnit):
+        self.unit = unit
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class DatabaseWriter:
+    """
+    Executes write units in order on one connection with group commit
+
+    Args:
+        session_factory: Factory for the writer's Session (one connection)
+        max_batch: Maximum write units committed together
+        batch_window: Seconds to wait for more units before committing a group
+                      (0 commits whatever is queued at that moment)
+        name: Thread name
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_batch: int = 64,
+        batch_window: float = 0.0,
+        name: str = "db-writer"
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max(1, max_batch)
+        self.batch_window = max(0.0, batch_window)
+        self.name = name
+
+        self._queue: "queue.Queue[Optional[_WriteRequest]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lifecycle_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "units_executed": 0,
+            "units_failed": 0,
+            "groups_committed": 0,
+            "groups_failed": 0,
+            "max_group_size": 0,
+            "total_commit_seconds": 0.0,
+            "total_wait_seconds": 0.0
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the writer thread (no-op when running)"""
+        with self._lifecycle_lock:
+            if self.is_running:
+                return
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+            logger.info(f"Database writer '{self.name}' started")
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the writer after the queued units have been executed"""
+        with self._lifecycle_lock:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                return
+            self._queue.put(None)
+            thread.join(timeout=timeout)
+            self._thread = None
+            logger.info(f"Database writer '{self.name}' stopped")
+
+    def submit(self, unit: WriteUnit) -> Future:
+        """
+        Queue a write unit
+
+        Args:
+            unit: Callable taking the writer Session
+
+        Returns:
+            Future resolved with the unit's return value once its group commits
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Write units must not submit to the writer they run on")
+
+        self.start()
+        request = _WriteRequest(unit)
+        self._queue.put(request)
+        return request.future
+
+    def execute(self, unit: WriteUnit, timeout: Optional[float] = None) -> Any:
+        """Queue a write unit and block until it is committed"""
+        return self.submit(unit).result(timeout)
+
+    async def run(self, unit: WriteUnit) -> Any:
+        """Queue a write unit and await its commit without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(unit))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Throughput and group commit statistics"""
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        groups = metrics["groups_committed"]
+        units = metrics["units_executed"]
+        metrics.update({
+            "running": self.is_running,
+            "queue_depth": self._queue.qsize(),
+            "avg_group_size": round(units / groups, 2) if groups else 0.0,
+            "avg_commit_ms": round(metrics["total_commit_seconds"] * 1000 / groups, 3) if groups else 0.0,
+            "avg_wait_ms": round(metrics["total_wait_seconds"] * 1000 / units, 3) if units else 0.0
+        })
+        return metrics
+
+    def _next_group(self, first: _WriteRequest) -> tuple:
+        """Collect waiting units after the first one; returns (group, stop_requested)"""
+        group = [first]
+        deadline = time.perf_counter() + self.batch_window
+        while len(group) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                return group, True
+            group.append(request)
+        return group, False
+
+    def _run(self):
+        session = self.session_factory()
+        try:
+            while True:
+                first = self._queue.get()
+                if first is None:
+                    break
+                group, stop_requested = self._next_group(first)
+                self._commit_group(session, group)
+                if stop_requested:
+                    break
+        finally:
+            session.close()
+
+    def _commit_group(self, session: Session, group: List[_WriteRequest]):
+        """Run each unit in a SAVEPOINT, commit once, then resolve the futures"""
+        started = time.perf_counter()
+        outcomes = []
+        for request in group:
+            if not request.future.set_running_or_notify_cancel():
+                continue
+            try:
+                with session.begin_nested():
+                    value = request.unit(session)
+                outcomes.append((request, value, None))
+            except Exception as e:
+                outcomes.append((request, None, e))
+
+        try:
+            session.commit()
+        except Exception as e:
+            logger.error(f"Database writer group commit failed ({len(outcomes)} units): {e}")
+            session.rollback()
+            with self._metrics_lock:
+                self._metrics["groups_failed"] += 1
+                self._metrics["units_failed"] += len(outcomes)
+            for request, _, error in outcomes:
+                request.future.set_exception(error or e)
+            return
+        finally:
+            session.expunge_all()
+
+        committed = time.perf_counter()
+        failed = sum(1 for _, _, error in outcomes if error is not None)
+        with self._metrics_lock:
+            self._metrics["groups_committed"] += 1
+            self._metrics["units_executed"] += len(outcomes) - failed
+            self._metrics["units_failed"] += failed
+            self._metrics["max_group_size"] = max(self._metrics["max_group_size"], len(outcomes))
+            self._metrics["total_commit_seconds"] += committed - started
+            self._metrics["total_wait_seconds"] += sum(started - request.enqueued_at for request, _, _ in outcomes)
+
+        for request, value, error in outcomes:
+            if error is not None:
+                request.future.set_exception(error)
+            else:
+                request.future.set_result(value)
+
+
+# Application writer (created on first use)
+_database_writer: Optional[DatabaseWriter] = None
+_database_writer_lock = threading.Lock()
+
+
+def get_database_writer() -> DatabaseWriter:
+    """Get the application's database writer"""
+    global _database_writer
+    with _database_writer_lock:
+        if _database_writer is None:
+            _database_writer = DatabaseWriter(
+                WriterSessionLocal,
+                max_batch=settings.db_writer_max_batch,
+                batch_window=settings.db_writer_batch_window_ms / 1000.0
+            )
+        return _database_writer
+
+
+def start_database_writer():
+    """Start the application's database writer thread"""
+    if settings.db_writer_enabled:
+        get_database_writer().start()
+
+
+def stop_database_writer():
+    """Stop the application's database writer thread after draining its queue"""
+    if _database_writer is not None:
+        _database_writer.stop()
+
+
+def uses_database_writer(db: Optional[Session]) -> bool:
+    """Whether writes for this session go through the writer (application database only)"""
+    return settings.db_writer_enabled and (db is None or db.get_bind() is engine)
+
+
+async def run_write(db: Optional[Session], unit: WriteUnit) -> Any:
+    """
+    Execute a write unit for a caller holding a database session
+
+    On the application database the caller's pending work is committed first
+    (as the inline path always did) and the unit runs on the writer;
+    otherwise (e.g. another engine in tests, or the writer disabled) the unit
+    runs inline on the caller's session and is committed there.
+
+    Args:
+        db: Caller's database session (None: writer, or an isolated
+            transaction when the writer is disabled)
+        unit: Callable taking the Session to write with
+
+    Returns:
+        The unit's return value
+    """
+    if uses_database_writer(db):
+        if db is not None:
+            db.commit()
+        return await get_database_writer().run(unit)
+
+    if db is None:
+        with atomic_transaction() as session:
+            return unit(session)
+
+    value = unit(db)
+    if value is not False:
+        db.commit()
+    return value
+
+
+def get_writer_metrics() -> Dict[str, Any]:
+    """Database writer statistics (empty before first use)"""
+    return _database_writer.get_metrics() if _database_writer is not None else {}
@@ -3,17 +3,26 @@ Graceful degradation system for handling database unavailability
 
 This module provides fallback strategies for when database operations fail,
 ensuring the system remains partially functional during outages.
+
+Fallback data (last known statuses, results and exports, pending work) is
+kept in a two-tier FallbackCache: a bounded in-memory tier answers reads
+without touching the disk, and a size-capped on-disk tier keeps entries
+across restarts. A background sweep removes expired entries from both.
 """
 
+import hashlib
 import logging
 import json
+import os
 import time
 import threading
+from collections import OrderedDict
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Tuple
 from datetime import datetime, timezone
 from pathlib import Path
+from .cache import MISSING, TTLCache
 from .config import settings
 
 logger = logging.getLogger(__name__)
@@ -39,6 +48,284 @@ class DegradationState:
     last_recovery_attempt: Optional[datetime] = None
 
 
+class FallbackCache:
+    """
+    Two-tier cache for fallback data
+
+    Values are stored as JSON text: every read returns a fresh copy, exactly
+    as re-reading a file did, so callers may modify what they get. Writes go
+    to both tiers. Reads are answered from memory, and only a memory miss
+    (after a restart or an eviction) reads the entry's file, which is then
+    promoted back into memory. Disk entries are indexed in memory, so a miss
+    on an unknown key costs no file system access. The files of a previous
+    run are indexed on first use, so creating a cache (as importing the
+    module-level manager does) does not touch them.
+
+    Args:
+        cache_dir: Directory holding one file per entry
+        max_memory_entries: Entries kept in the memory tier
+        max_memory_bytes: Approximate size of the memory tier
+        max_disk_bytes: Total size of the entry files; the oldest are removed beyond it
+        sweep_interval: Seconds between background expiry sweeps
+        name: Sweeper thread name
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_memory_entries: int = 256,
+        max_memory_bytes: int = 16 * 1024 * 1024,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        sweep_interval: float = 60.0,
+        name: str = "fallback-cache-sweeper"
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_disk_bytes = max(1, max_disk_bytes)
+        self.sweep_interval = max(0.01, sweep_interval)
+        self.name = name
+
+        self._memory = TTLCache(max_entries=max_memory_entries, max_bytes=max_memory_bytes)
+        # key -> (file, expires_at as a wall clock time, file size), oldest write first
+        self._disk: "OrderedDict[str, Tuple[Path, float, int]]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._metrics = {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0,
+            "expirations": 0, "disk_evictions": 0, "errors": 0, "sweeps": 0
+        }
+        self._indexed = False
+        self._index_lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the expiry sweeper thread (no-op when running)"""
+        with self._lock:
+            if self.is_running:
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the expiry sweeper thread"""
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=timeout)
+            self._thread = None
+
+    def set(self, key: str, data: Any, ttl: int = 3600):
+        """
+        Store data in both tiers
+
+        Args:
+            key: Cache key
+            data: JSON-serializable data (other values are stored as strings)
+            ttl: Time to live in seconds
+        """
+        self._ensure_index()
+        cached_at = datetime.now(timezone.utc)
+        text = json.dumps(data, default=str)
+        self._memory.set(key, text, ttl=ttl)
+
+        entry = {"key": key, "cached_at": cached_at.isoformat(), "ttl": ttl, "data": data}
+        content = json.dumps(entry, default=str).encode("utf-8")
+        path = self._path_for(key)
+        with self._lock:
+            self._metrics["writes"] += 1
+        if len(content) > self.max_disk_bytes:
+            logger.debug(f"Fallback entry '{key}' exceeds the disk tier limit; kept in memory only")
+            self._forget(key)
+            return
+        try:
+            temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            temp_path.write_bytes(content)
+            os.replace(temp_path, path)
+        except OSError as e:
+            with self._lock:
+                self._metrics["errors"] += 1
+            logger.warning(f"Failed to write fallback entry '{key}' to disk: {e}")
+            return
+        with self._lock:
+            self._index(key, path, cached_at.timestamp() + ttl, len(content))
+            evicted = self._evict_over_limit()
+        self._unlink(evicted)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a live entry's data
+
+        Returns:
+            A fresh copy of the data, or None when the key is absent or expired
+        """
+        text = self._memory.get(key)
+        if text is not MISSING:
+            with self._lock:
+                self._metrics["memory_hits"] += 1
+            return json.loads(text)
+
+        self._ensure_index()
+        with self._lock:
+            indexed = self._disk.get(key)
+            if indexed is not None and indexed[1] <= time.time():
+                self._drop(key)
+                self._metrics["expirations"] += 1
+                expired_path, indexed = indexed[0], None
+            else:
+                expired_path = None
+            if indexed is None:
+                self._metrics["misses"] += 1
+        if expired_path is not None:
+            self._unlink([expired_path])
+        if indexed is None:
+            return None
+
+        path, expires_at, _ = indexed
+        try:
+            data = json.loads(path.read_bytes())["data"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Discarding unreadable fallback entry '{key}': {e}")
+            with self._lock:
+                if self._disk.get(key) == indexed:
+                    self._drop(key)
+                self._metrics["errors"] += 1
+                self._metrics["misses"] += 1
+            return None
+
+        self._memory.set(key, json.dumps(data), ttl=max(0.0, expires_at - time.time()))
+        with self._lock:
+            self._metrics["disk_hits"] += 1
+        return data
+
+    def delete(self, key: str):
+        """Remove an entry from both tiers"""
+        self._memory.delete(key)
+        self._ensure_index()
+        self._forget(key)
+
+    def sweep(self) -> int:
+        """
+        Remove expired entries from both tiers
+
+        Returns:
+            Number of expired disk entries removed
+        """
+        self._memory.purge_expired()
+        self._ensure_index()
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (_, expires_at, _) in self._disk.items() if expires_at <= now]
+            paths = [self._drop(key) for key in expired]
+            self._metrics["expirations"] += len(expired)
+            self._metrics["sweeps"] += 1
+        self._unlink(paths)
+        return len(expired)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rates and the size of each tier"""
+        self._ensure_index()
+        memory = self._memory.get_metrics()
+        with self._lock:
+            stats = dict(self._metrics)
+            stats["disk_entries"] = len(self._disk)
+            stats["disk_bytes"] = self._disk_bytes
+        stats["memory_entries"] = memory["entries"]
+        stats["memory_bytes"] = memory["bytes"]
+        stats["memory_evictions"] = memory["evictions"]
+        stats["expirations"] += memory["expirations"]
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        stats["memory_hit_rate"] = round(stats["memory_hits"] / lookups, 4) if lookups else 0.0
+        stats["sweeper_running"] = self.is_running
+        return stats
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def _ensure_index(self):
+        """Index the files of a previous run once, on first use"""
+        if self._indexed:
+            return
+        with self._index_lock:
+            if not self._indexed:
+                self._load_index()
+                self._indexed = True
+
+    def _load_index(self):
+        """Index the entry files left by a previous run, removing expired and unreadable ones"""
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                entry = json.loads(path.read_bytes())
+                cached_at = datetime.fromisoformat(entry["cached_at"]).timestamp()
+                expires_at = cached_at + entry["ttl"]
+                # Files written before entries recorded their key were named after it
+                key = entry.get("key", path.stem)
+            except (OSError, ValueError, KeyError, TypeError):
+                path.unlink(missing_ok=True)
+                continue
+            if expires_at <= time.time():
+                path.unlink(missing_ok=True)
+                continue
+            entries.append((cached_at, key, path, expires_at, path.stat().st_size))
+
+        with self._lock:
+            for _, key, path, expires_at, size in sorted(entries, key=lambda entry: entry[0]):
+                self._index(key, path, expires_at, size)
+            evicted = self._evict_over_limit()
+        self._unlink(evicted)
+
+    def _index(self, key: str, path: Path, expires_at: float, size: int):
+        """Record a written entry file as the newest (caller holds the lock)"""
+        previous = self._disk.pop(key, None)
+        if previous is not None:
+            self._disk_bytes -= previous[2]
+        self._disk[key] = (path, expires_at, size)
+        self._disk_bytes += size
+
+    def _drop(self, key: str) -> Path:
+        """Remove a key from the disk index; returns its file (caller holds the lock)"""
+        path, _, size = self._disk.pop(key)
+        self._disk_bytes -= size
+        return path
+
+    def _evict_over_limit(self) -> List[Path]:
+        """Drop the oldest entries past max_disk_bytes; returns their files (caller holds the lock)"""
+        evicted = []
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            evicted.append(self._drop(next(iter(self._disk))))
+            self._metrics["disk_evictions"] += 1
+        return evicted
+
+    def _forget(self, key: str):
+        with self._lock:
+            paths = [self._drop(key)] if key in self._disk else []
+        self._unlink(paths)
+
+    def _unlink(self, paths: List[Path]):
+        for path in paths:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Failed to remove fallback cache file {path}: {e}")
+
+    def _run(self):
+        while not self._stop_event.wait(self.sweep_interval):
+            try:
+                removed = self.sweep()
+                if removed:
+                    logger.debug(f"Fallback cache sweep removed {removed} expired entries")
+            except Exception as e:
+                logger.warning(f"Fallback cache sweep failed: {e}")
+
+
 class DegradationManager:
     """
     Manages system degradation states and fallback strategies
@@ -48,7 +335,13 @@ class DegradationManager:
         self._state = DegradationState()
         self._lock = threading.RLock()
         self._cache_dir = Path(settings.upload_path).parent / "cache"
-        self._cache_dir.mkdir(exist_ok=True)
+        self._cache = FallbackCache(
+            self._cache_dir,
+            max_memory_entries=settings.fallback_cache_memory_entries,
+            max_memory_bytes=settings.fallback_cache_memory_mb * 1024 * 1024,
+            max_disk_bytes=settings.fallback_cache_disk_mb * 1024 * 1024,
+            sweep_interval=settings.fallback_cache_sweep_seconds
+        )
         self._fallback_handlers: Dict[str, Callable] = {}
         
         # Initialize fallback handlers
@@ -114,6 +407,11 @@ class DegradationManager:
         """Get fallback handler for an operation"""
         return self._fallback_handlers.get(operation)
     
+    @property
+    def cache(self) -> FallbackCache:
+        """Fallback data cache"""
+        return self._cache
+    
     def cache_data(self, key: str, data: Any, ttl: int = 3600):
         """
         Cache data for fallback use
@@ -124,16 +422,8 @@ class DegradationManager:
             ttl: Time to live in seconds
         """
         try:
-            cache_entry = {
-                "data": data,
-                "cached_at": datetime.now(timezone.utc).isoformat(),
-                "ttl": ttl
-            }
-            
-            cache_file = self._cache_dir / f"{key}.json"
-            with open(cache_file, 'w') as f:
-                json.dump(cache_entry, f, default=str)
-            
+            self._cache.start()
+            self._cache.set(key, data, ttl)
             logger.debug(f"Cached data for key '{key}' with TTL {ttl}s")
             
         except Exception as e:
@@ -150,24 +440,7 @@ class DegradationManager:
             Cached data if available and not expired, None otherwise
         """
         try:
-            cache_file = self._cache_dir / f"{key}.json"
-            
-            if not cache_file.exists():
-                return None
-            
-            with open(cache_file, 'r') as f:
-                cache_entry = json.load(f)
-            
-            # Check if expired
-            cached_at = datetime.fromisoformat(cache_entry["cached_at"])
-            age = (datetime.now(timezone.utc) - cached_at).total_seconds()
-            
-            if age > cache_entry["ttl"]:
-                cache_file.unlink()  # Delete expired cache
-                return None
-            
-            logger.debug(f"Retrieved cached data for key '{key}' (age: {age:.1f}s)")
-            return cache_entry["data"]
+            return self._cache.get(key)
             
         except Exception as e:
             logger.warning(f"Failed to retrieve cached data for key '{key}': {e}")
@@ -403,6 +676,7 @@ class DegradationManager:
                 "last_recovery_attempt": self._state.last_recovery_attempt,
                 "available_handlers": list(self._fallback_handlers.keys()),
                 "cache_directory": str(self._cache_dir),
+                "cache": self._cache.get_stats(),
                 "user_message": self.get_user_message()
             }
 
@@ -10,6 +10,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES
 from .config import settings
 from .database import init_database
 from .logging_config import setup_logging, log_startup_event, log_shutdown_event, log_api_request, log_api_error
@@ -36,6 +37,10 @@ from .api.bulk_operations import router as bulk_operations_router
 from .websocket import websocket_endpoint
 from .cache import get_cache_stats
 from .database import engine
+from .db_writer import start_database_writer, stop_database_writer, get_writer_metrics
+from .activity_buffer import stop_activity_buffer, get_activity_buffer_metrics
+from .degradation import get_degradation_manager
+from .services.status_snapshot import get_status_snapshot_cache, status_change_notifier
 from .monitoring import (
     health_checker, 
     get_system_metrics, 
@@ -46,7 +51,8 @@ from .monitoring import (
 from .metrics import (
     metrics_collector,
     get_prometheus_metrics,
-    get_metrics_content_type
+    get_metrics_content_type,
+    query_metrics
 )
 from .alerting import alert_manager, run_alert_processing
 
@@ -150,6 +156,10 @@ async def lifespan(app: FastAPI):
         asyncio.create_task(run_alert_processing())
         log_startup_event("Alert processing background task started")
         
+        # Start the single database writer (queued, group-committed writes)
+        start_database_writer()
+        log_startup_event("Database writer started")
+        
         # Start processing timeout monitor
         from .api.processing import start_timeout_monitor
         start_timeout_monitor()
@@ -165,7 +175,10 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     log_shutdown_event("Application shutdown initiated")
-    # Add any cleanup logic here
+    # Buffered activity lines go through the writer, so flush them before it stops
+    stop_activity_buffer()
+    stop_database_writer()
+    get_degradation_manager().cache.stop()
     log_shutdown_event("Application shutdown completed")
 
 
@@ -251,8 +264,16 @@ async def rate_limit_middleware(request: Request, call_next) -> Response:
 # Add request logging middleware
 app.add_middleware(RequestLoggingMiddleware)
 
-# Add GZip compression middleware for better performance
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# Add GZip compression middleware for better performance (Excel and PDF
+# exports are already compressed and are served from disk as-is)
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=1000,
+    exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES + (
+        "application/pdf",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+)
 
 # Include API routers
 app.include_router(sessions_router)
@@ -318,7 +339,9 @@ def get_cors_headers():
         "X-Forwarded-User",
         "Auth-User",
         "x-correlation-id",
-        "x-request-id"
+        "x-request-id",
+        "If-None-Match",  # Conditional status polls
+        "Last-Event-ID"  # Status stream reconnects
     ]
     
     # Add development headers only in non-production
@@ -333,7 +356,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],  # Restrictive method list
     allow_headers=get_cors_headers(),
-    expose_headers=["X-Total-Count", "X-RateLimit-Limit", "X-RateLimit-Remaining"],
+    expose_headers=["X-Total-Count", "X-RateLimit-Limit", "X-RateLimit-Remaining", "ETag", "X-Status-Version"],
     max_age=600  # Cache preflight requests for 10 minutes
 )
 
@@ -567,7 +590,12 @@ async def get_performance_metrics() -> Dict[str, Any]:
                 "size": engine.pool.size(),
                 "checked_in": engine.pool.checkedin(),
                 "checked_out": engine.pool.checkedout()
-            } if hasattr(engine.pool, 'size') else None
+            } if hasattr(engine.pool, 'size') else None,
+            "writer": get_writer_metrics(),
+            "activity_buffer": get_activity_buffer_metrics(),
+            "queries": query_metrics.get_metrics(),
+            "status_snapshots": get_status_snapshot_cache().get_metrics(),
+            "status_waiters": status_change_notifier.get_metrics()
         },
         "uptime": "N/A",  # Could be calculated from startup time
         "status": "healthy"
@@ -1,11 +1,28 @@
 """
 Minimal metrics module for Credit Card Processor.
-Provides basic metrics functionality without complex monitoring setup.
+Provides basic metrics functionality without complex monitoring setup, and
+SQL query instrumentation: per-request query counts, database time and
+statement fingerprints, with detection of N+1 query patterns.
 """
 
-from typing import Dict, Any
+import contextvars
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+from functools import lru_cache
+from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
 
 class MetricsCollector:
     """
@@ -74,17 +91,228 @@ def record_request_metrics(method: str, path: str, status_code: int, duration: f
     pass
 
 
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+)(?:\s*,\s*(?:\?|%s|:\w+))+\s*\)")
+_VALUES_ROWS = re.compile(r"\(\?\.\.\.\)(?:\s*,\s*\(\?\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint_statement(statement: str) -> str:
+    """
+    Normalize a SQL statement so executions differing only in literals match
+    
+    Args:
+        statement: SQL text as sent to the driver
+        
+    Returns:
+        Statement with literals and placeholder lists collapsed to '?'
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(?...)", normalized)
+    normalized = _VALUES_ROWS.sub("(?...), ...", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+class RequestQueryStats:
+    """Queries executed while handling one HTTP request"""
+    
+    def __init__(self, correlation_id: Optional[str], path: str):
+        self.correlation_id = correlation_id
+        self.path = path
+        self.query_count = 0
+        self.db_time = 0.0
+        self.fingerprints: Counter = Counter()
+    
+    def record(self, fingerprint: str, duration: float):
+        self.query_count += 1
+        self.db_time += duration
+        self.fingerprints[fingerprint] += 1
+    
+    def repeated_fingerprints(self, threshold: int) -> Dict[str, int]:
+        """Fingerprints executed more than threshold times (N+1 candidates)"""
+        return {fingerprint: count for fingerprint, count in self.fingerprints.items() if count > threshold}
+
+
+_request_query_stats: contextvars.ContextVar = contextvars.ContextVar('request_query_stats', default=None)
+
+
+class QueryMetrics:
+    """
+    Process-wide SQL statistics aggregated by statement fingerprint and request
+    
+    Args:
+        max_fingerprints: Distinct fingerprints tracked (later ones count as '<other>')
+        max_flagged: Recent N+1 flagged requests kept
+    """
+    
+    def __init__(self, max_fingerprints: int = 500, max_flagged: int = 50):
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._fingerprints: Dict[str, Dict[str, float]] = {}
+        self._flagged = deque(maxlen=max_flagged)
+        self.reset()
+    
+    def reset(self):
+        """Clear all collected statistics"""
+        with self._lock:
+            self._fingerprints.clear()
+            self._flagged.clear()
+            self._totals = {
+                "queries": 0,
+                "failed_queries": 0,
+                "db_time": 0.0,
+                "requests": 0,
+                "request_queries": 0,
+                "max_request_queries": 0,
+                "flagged_requests": 0
+            }
+    
+    def record_query(self, fingerprint: str, duration: float, success: bool = True):
+        """Add one executed statement to the aggregates"""
+        with self._lock:
+            self._totals["queries"] += 1
+            self._totals["db_time"] += duration
+            if not success:
+                self._totals["failed_queries"] += 1
+            if fingerprint not in self._fingerprints and len(self._fingerprints) >= self.max_fingerprints:
+                fingerprint = "<other>"
+            stats = self._fingerprints.setdefault(fingerprint, {"count": 0, "total_time": 0.0, "max_time": 0.0})
+            stats["count"] += 1
+            stats["total_time"] += duration
+            stats["max_time"] = max(stats["max_time"], duration)
+    
+    def record_request(self, request_stats: RequestQueryStats, threshold: int) -> Dict[str, int]:
+        """
+        Add a finished request and flag repeated fingerprints
+        
+        Returns:
+            Fingerprints executed more than threshold times in the request
+        """
+        repeated = request_stats.repeated_fingerprints(threshold)
+        with self._lock:
+            self._totals["requests"] += 1
+            self._totals["request_queries"] += request_stats.query_count
+            self._totals["max_request_queries"] = max(
+                self._totals["max_request_queries"], request_stats.query_count
+            )
+            if repeated:
+                self._totals["flagged_requests"] += 1
+                self._flagged.append({
+                    "correlation_id": request_stats.correlation_id,
+                    "path": request_stats.path,
+                    "query_count": request_stats.query_count,
+                    "db_time_ms": round(request_stats.db_time * 1000, 3),
+                    "repeated": repeated,
+                    "timestamp": datetime.now(timezone.utc).isoformat()
+                })
+        return repeated
+    
+    def get_metrics(self, top: int = 10) -> Dict[str, Any]:
+        """Aggregates with the fingerprints that took the most database time"""
+        with self._lock:
+            totals = dict(self._totals)
+            fingerprints = sorted(
+                self._fingerprints.items(), key=lambda item: item[1]["total_time"], reverse=True
+            )[:top]
+            flagged = list(self._flagged)
+        requests = totals["requests"]
+        return {
+            "total_queries": totals["queries"],
+            "failed_queries": totals["failed_queries"],
+            "total_db_time_ms": round(totals["db_time"] * 1000, 3),
+            "requests_instrumented": requests,
+            "avg_queries_per_request": round(totals["request_queries"] / requests, 2) if requests else 0.0,
+            "max_queries_per_request": totals["max_request_queries"],
+            "top_fingerprints": [
+                {
+                    "fingerprint": fingerprint,
+                    "count": stats["count"],
+                    "total_ms": round(stats["total_time"] * 1000, 3),
+                    "avg_ms": round(stats["total_time"] * 1000 / stats["count"], 3),
+                    "max_ms": round(stats["max_time"] * 1000, 3)
+                }
+                for fingerprint, stats in fingerprints
+            ],
+            "n_plus_one": {
+                "threshold": settings.n_plus_one_threshold,
+                "flagged_requests": totals["flagged_requests"],
+                "recent": flagged
+            }
+        }
+
+
+# Global SQL query statistics
+query_metrics = QueryMetrics()
+
+
 def record_database_metrics(operation: str, duration: float, success: bool = True):
     """
     Record database operation metrics.
     
     Args:
-        operation: Database operation name
+        operation: Database operation name (statement fingerprint for SQL)
         duration: Operation duration in seconds
         success: Whether operation was successful
     """
-    # No-op for minimal implementation
-    pass
+    query_metrics.record_query(operation, duration, success)
+    request_stats = _request_query_stats.get()
+    if request_stats is not None:
+        request_stats.record(operation, duration)
+
+
+def begin_request_query_stats(correlation_id: Optional[str], path: str) -> RequestQueryStats:
+    """Start collecting the queries of the current request (context-local)"""
+    request_stats = RequestQueryStats(correlation_id, path)
+    _request_query_stats.set(request_stats)
+    return request_stats
+
+
+def finish_request_query_stats(request_stats: RequestQueryStats) -> Dict[str, int]:
+    """
+    Aggregate a finished request and log it when it repeats a statement too often
+    
+    Returns:
+        Fingerprints executed more than the N+1 threshold
+    """
+    threshold = settings.n_plus_one_threshold
+    repeated = query_metrics.record_request(request_stats, threshold)
+    for fingerprint, count in repeated.items():
+        logger.warning(
+            f"Possible N+1 query [{request_stats.correlation_id}] {request_stats.path}: "
+            f"{count} executions of {fingerprint[:200]}"
+        )
+    return repeated
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started_at")
+    if started:
+        record_database_metrics(fingerprint_statement(statement), time.perf_counter() - started.pop())
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    started = conn.info.get("query_started_at") if conn is not None else None
+    if started and exception_context.statement:
+        record_database_metrics(
+            fingerprint_statement(exception_context.statement), time.perf_counter() - started.pop(), success=False
+        )
+
+
+def install_query_instrumentation():
+    """Time every statement on every engine (sync, async and writer) when enabled"""
+    if not settings.query_metrics_enabled or event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
 
 
 # Export main functions
@@ -93,5 +321,10 @@ __all__ = [
     'get_prometheus_metrics',
     'get_metrics_content_type',
     'record_request_metrics',
-    'record_database_metrics'
+    'record_database_metrics',
+    'query_metrics',
+    'fingerprint_statement',
+    'begin_request_query_stats',
+    'finish_request_query_stats',
+    'install_query_instrumentation'
 ]
\ No newline at end of file
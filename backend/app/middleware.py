@@ -9,6 +9,7 @@ from datetime import datetime, timezone
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from .logging_config import logger, set_correlation_id
+from .metrics import RequestQueryStats, begin_request_query_stats, finish_request_query_stats
 from .config import settings
 import logging
 
@@ -37,6 +38,9 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         # Set correlation ID in logging context
         set_correlation_id(correlation_id)
         
+        # Collect the request's SQL queries under its correlation ID
+        query_stats = begin_request_query_stats(correlation_id, request.url.path)
+        
         # Extract user info securely from headers only (never query parameters)
         user_id = self._extract_user_from_headers(request)
         
@@ -51,10 +55,11 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         try:
             response = await call_next(request)
             duration = time.time() - start_time
+            finish_request_query_stats(query_stats)
             
             # Log successful request completion
             if settings.enable_request_logging:
-                self._log_request_end(request, response, correlation_id, user_id, duration)
+                self._log_request_end(request, response, correlation_id, user_id, duration, query_stats)
                 
             # Add correlation ID to response headers (use the same header names as frontend expects)
             response.headers['x-correlation-id'] = correlation_id
@@ -65,6 +70,7 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             
         except Exception as e:
             duration = time.time() - start_time
+            finish_request_query_stats(query_stats)
             
             # Log request error
             self._log_request_error(request, e, correlation_id, user_id, duration)
@@ -95,7 +101,8 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             request_logger.info(f"REQUEST START [{correlation_id}] {request.method} {request.url.path} - User: {user_id}")
     
     def _log_request_end(self, request: Request, response: Response, 
-                        correlation_id: str, user_id: str, duration: float):
+                        correlation_id: str, user_id: str, duration: float,
+                        query_stats: RequestQueryStats):
         """Log request completion"""
         log_data = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -108,6 +115,8 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             "user": user_id,
             "status_code": response.status_code,
             "duration_ms": round(duration * 1000, 2),
+            "db_queries": query_stats.query_count,
+            "db_time_ms": round(query_stats.db_time * 1000, 2),
             "response_size": response.headers.get("content-length"),
             "content_type": response.headers.get("content-type")
         }
@@ -116,7 +125,8 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             request_logger.info(json.dumps(log_data))
         else:
             request_logger.info(f"REQUEST END [{correlation_id}] {request.method} {request.url.path} - "
-                       f"Status: {response.status_code} - Duration: {duration:.2f}s")
+                       f"Status: {response.status_code} - Duration: {duration:.2f}s - "
+                       f"Queries: {query_stats.query_count} ({query_stats.db_time * 1000:.1f}ms)")
     
     def _log_request_error(self, request: Request, error: Exception, 
                           correlation_id: str, user_id: str, duration: float):
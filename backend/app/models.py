@@ -8,7 +8,7 @@ from typing import Optional, Dict, Any
 
 from sqlalchemy import (
     Column, String, DateTime, Text, Integer, BigInteger, Numeric,
-    ForeignKey, Boolean, JSON, Index, Enum
+    ForeignKey, Boolean, JSON, Index, Enum, Computed, DDL, event
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.dialects.sqlite import BLOB
@@ -174,12 +174,25 @@ class ProcessingSession(Base):
         Index('idx_session_created_by_status_created', 'created_by', 'status', 'created_at'),
         # Index for closed sessions filtering
         Index('idx_session_closed_status', 'is_closed', 'status'),
+        # Dashboard "completed today" range count
+        Index('idx_session_status_updated', 'status', 'updated_at'),
+        # Keyset pagination on (created_at, session_id), all sessions and per user
+        Index('idx_session_created_id', 'created_at', 'session_id'),
+        Index('idx_session_created_by_created_id', 'created_by', 'created_at', 'session_id'),
     )
     
     def __repr__(self):
         return f"<ProcessingSession(id={self.session_id}, name='{self.session_name}', status='{self.status.value}')>"
 
 
+def _json_flag_expression(flag: str, flags: str = "validation_flags") -> str:
+    """SQL: 1 when the validation flags JSON has the flag set to true, otherwise 0"""
+    return (
+        f"CASE WHEN json_valid({flags}) "
+        f"AND json_extract({flags}, '$.{flag}') IN (1, 'true') THEN 1 ELSE 0 END"
+    )
+
+
 class EmployeeRevision(Base):
     """Employee revision data from documents"""
     __tablename__ = "employee_revisions"
@@ -221,6 +234,14 @@ class EmployeeRevision(Base):
     previous_receipt_amount = Column(Numeric(precision=10, scale=2), nullable=True)
     amount_changed = Column(Boolean, default=False, nullable=False)
     
+    # SHA-256 of normalized ID, name and amounts (see services.employee_fingerprint)
+    content_fingerprint = Column(String(64), nullable=True)
+    
+    # Hot validation_flags keys as generated columns, so issue filters run on indexes
+    flag_missing_receipt = Column(Boolean, Computed(_json_flag_expression('missing_receipt'), persisted=False))
+    flag_amount_mismatch = Column(Boolean, Computed(_json_flag_expression('amount_mismatch'), persisted=False))
+    flag_coding_incomplete = Column(Boolean, Computed(_json_flag_expression('coding_incomplete'), persisted=False))
+    
     # Relationship to session
     session = relationship("ProcessingSession", back_populates="employee_revisions")
     
@@ -229,6 +250,16 @@ class EmployeeRevision(Base):
         Index('idx_employee_session_status', 'session_id', 'validation_status'),
         Index('idx_employee_name_session', 'employee_name', 'session_id'),
         Index('idx_employee_id_session', 'employee_id', 'session_id'),
+        # Keyset pagination of a session's employees in name order (delta comparison)
+        Index('idx_employee_session_name_revision', 'session_id', 'employee_name', 'revision_id'),
+        # A session's rows in export order (created_at, revision_id)
+        Index('idx_employee_session_created_revision', 'session_id', 'created_at', 'revision_id'),
+        # Fingerprint lookup for delta change detection
+        Index('idx_employee_session_fingerprint', 'session_id', 'content_fingerprint'),
+        # Issue type filters for the exceptions endpoint
+        Index('idx_employee_session_missing_receipt', 'session_id', 'flag_missing_receipt'),
+        Index('idx_employee_session_amount_mismatch', 'session_id', 'flag_amount_mismatch'),
+        Index('idx_employee_session_coding_incomplete', 'session_id', 'flag_coding_incomplete'),
         # Export tracking indexes for delta processing
         Index('idx_employee_export_status', 'exported_to_pvault', 'session_id'),
         Index('idx_employee_export_batch', 'export_batch_id'),
@@ -239,6 +270,257 @@ class EmployeeRevision(Base):
         return f"<EmployeeRevision(id={self.revision_id}, name='{self.employee_name}', status='{self.validation_status.value}')>"
 
 
+class SessionStatistics(Base):
+    """Per-session revision counts and totals, maintained by triggers on employee_revisions"""
+    __tablename__ = "session_statistics"
+    
+    # One row per session that has revisions
+    session_id = Column(GUID(), ForeignKey('processing_sessions.session_id', ondelete='CASCADE'), primary_key=True)
+    
+    # Counts by validation status
+    total_employees = Column(Integer, default=0, nullable=False)
+    valid_employees = Column(Integer, default=0, nullable=False)
+    needs_attention_employees = Column(Integer, default=0, nullable=False)
+    resolved_employees = Column(Integer, default=0, nullable=False)
+    
+    # Export readiness: VALID with a positive receipt amount
+    ready_for_export = Column(Integer, default=0, nullable=False)
+    # Flagged or missing / zero receipt amount
+    attention_required = Column(Integer, default=0, nullable=False)
+    missing_receipt_amount = Column(Integer, default=0, nullable=False)
+    exported_employees = Column(Integer, default=0, nullable=False)
+    
+    # Issue types from validation_flags (coding and mismatch only while NEEDS_ATTENTION)
+    missing_receipt_flagged = Column(Integer, default=0, nullable=False)
+    coding_incomplete = Column(Integer, default=0, nullable=False)
+    amount_mismatch = Column(Integer, default=0, nullable=False)
+    
+    # Amount totals
+    car_amount_total = Column(Numeric(precision=14, scale=2), default=0, nullable=False)
+    receipt_amount_total = Column(Numeric(precision=14, scale=2), default=0, nullable=False)
+    
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    
+    def __repr__(self):
+        return f"<SessionStatistics(session={self.session_id}, total={self.total_employees}, ready={self.ready_for_export})>"
+
+
+def _session_statistics_expressions(row: str) -> Dict[str, str]:
+    """Contribution of one employee_revisions row (NEW, OLD or a table alias) to each statistics column"""
+    missing_receipt = f"({row}.receipt_amount IS NULL OR {row}.receipt_amount <= 0)"
+    flags = f"{row}.validation_flags"
+    conditions = {
+        "valid_employees": f"{row}.validation_status = 'VALID'",
+        "needs_attention_employees": f"{row}.validation_status = 'NEEDS_ATTENTION'",
+        "resolved_employees": f"{row}.validation_status = 'RESOLVED'",
+        "ready_for_export": f"{row}.validation_status = 'VALID' AND {row}.receipt_amount > 0",
+        "attention_required": f"{row}.validation_status = 'NEEDS_ATTENTION' OR {missing_receipt}",
+        "missing_receipt_amount": missing_receipt,
+        "exported_employees": f"{row}.exported_to_pvault = 1",
+        "missing_receipt_flagged": f"({_json_flag_expression('missing_receipt', flags)}) = 1",
+        "coding_incomplete": (
+            f"{row}.validation_status = 'NEEDS_ATTENTION' AND ({_json_flag_expression('coding_incomplete', flags)}) = 1"
+        ),
+        "amount_mismatch": (
+            f"{row}.validation_status = 'NEEDS_ATTENTION' AND ({_json_flag_expression('amount_mismatch', flags)}) = 1"
+        ),
+    }
+    expressions = {"total_employees": "1"}
+    expressions.update({column: f"(CASE WHEN {condition} THEN 1 ELSE 0 END)" for column, condition in conditions.items()})
+    expressions["car_amount_total"] = f"COALESCE({row}.car_amount, 0)"
+    expressions["receipt_amount_total"] = f"COALESCE({row}.receipt_amount, 0)"
+    return expressions
+
+
+def _session_statistics_upsert(row: str) -> str:
+    expressions = _session_statistics_expressions(row)
+    columns = ", ".join(expressions)
+    values = ", ".join(expressions.values())
+    increments = ", ".join(f"{column} = {column} + excluded.{column}" for column in expressions)
+    return (
+        f"INSERT INTO session_statistics (session_id, {columns}, updated_at) "
+        f"VALUES ({row}.session_id, {values}, CURRENT_TIMESTAMP) "
+        f"ON CONFLICT(session_id) DO UPDATE SET {increments}, updated_at = excluded.updated_at;"
+    )
+
+
+def _session_statistics_subtract(row: str) -> str:
+    decrements = ", ".join(
+        f"{column} = {column} - {expression}" for column, expression in _session_statistics_expressions(row).items()
+    )
+    return (
+        f"UPDATE session_statistics SET {decrements}, updated_at = CURRENT_TIMESTAMP "
+        f"WHERE session_id = {row}.session_id;"
+    )
+
+
+# Keep session_statistics in the same transaction as every revision write,
+# including Core INSERT ... SELECT clones and bulk updates that bypass the ORM
+SESSION_STATISTICS_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS trg_session_statistics_insert AFTER INSERT ON employee_revisions "
+    f"BEGIN {_session_statistics_upsert('NEW')} END",
+    "CREATE TRIGGER IF NOT EXISTS trg_session_statistics_delete AFTER DELETE ON employee_revisions "
+    f"BEGIN {_session_statistics_subtract('OLD')} END",
+    "CREATE TRIGGER IF NOT EXISTS trg_session_statistics_update AFTER UPDATE OF "
+    "session_id, validation_status, validation_flags, car_amount, receipt_amount, exported_to_pvault "
+    f"ON employee_revisions BEGIN {_session_statistics_subtract('OLD')} {_session_statistics_upsert('NEW')} END",
+]
+
+_revision_expressions = _session_statistics_expressions("r")
+SESSION_STATISTICS_BACKFILL = (
+    f"INSERT INTO session_statistics (session_id, {', '.join(_revision_expressions)}, updated_at) "
+    f"SELECT r.session_id, {', '.join(f'SUM({expression})' for expression in _revision_expressions.values())}, "
+    "CURRENT_TIMESTAMP FROM employee_revisions r "
+    "WHERE r.session_id NOT IN (SELECT session_id FROM session_statistics) "
+    "GROUP BY r.session_id"
+)
+
+for _statement in SESSION_STATISTICS_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+
+@event.listens_for(SessionStatistics.__table__, "after_create")
+def _mark_session_statistics_created(target, connection, **kw):
+    connection.info["session_statistics_created"] = True
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _backfill_session_statistics(target, connection, **kw):
+    """Fill statistics for sessions that have revisions from before the table existed"""
+    if connection.info.pop("session_statistics_created", False) and connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(SESSION_STATISTICS_BACKFILL)
+
+
+class SessionStatusVersion(Base):
+    """Per-session change counter behind the status endpoint, bumped by triggers on every status input"""
+    __tablename__ = "session_status_versions"
+
+    # One row per session that changed since the table was added
+    session_id = Column(GUID(), ForeignKey('processing_sessions.session_id', ondelete='CASCADE'), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+    changed_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    def __repr__(self):
+        return f"<SessionStatusVersion(session={self.session_id}, version={self.version})>"
+
+
+def _session_status_version_bump(row: str) -> str:
+    return (
+        "INSERT INTO session_status_versions (session_id, version, changed_at) "
+        f"VALUES ({row}.session_id, 1, CURRENT_TIMESTAMP) "
+        "ON CONFLICT(session_id) DO UPDATE SET version = version + 1, changed_at = excluded.changed_at;"
+    )
+
+
+# Everything the status response is built from: the session row, its revisions
+# (progress counts), its activity log and its uploaded files
+SESSION_STATUS_VERSION_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS trg_status_version_{table}_{operation.lower()} AFTER {operation} ON {table} "
+    f"BEGIN {_session_status_version_bump('OLD' if operation == 'DELETE' else 'NEW')} END"
+    for table, operations in (
+        ("processing_sessions", ("INSERT", "UPDATE")),
+        ("employee_revisions", ("INSERT", "UPDATE", "DELETE")),
+        ("processing_activities", ("INSERT", "DELETE")),
+        ("file_uploads", ("INSERT", "UPDATE", "DELETE")),
+    )
+    for operation in operations
+]
+
+for _statement in SESSION_STATUS_VERSION_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+
+class SessionDataVersion(Base):
+    """Per-session change counter of the result data (session row and revisions), bumped by triggers"""
+    __tablename__ = "session_data_versions"
+
+    # Unlike session_status_versions, activity log lines and uploads do not
+    # count: result snapshots and export artifacts stay valid across them
+    session_id = Column(GUID(), ForeignKey('processing_sessions.session_id', ondelete='CASCADE'), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+    changed_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    def __repr__(self):
+        return f"<SessionDataVersion(session={self.session_id}, version={self.version})>"
+
+
+def _session_data_version_bump(row: str) -> str:
+    return (
+        "INSERT INTO session_data_versions (session_id, version, changed_at) "
+        f"VALUES ({row}.session_id, 1, CURRENT_TIMESTAMP) "
+        "ON CONFLICT(session_id) DO UPDATE SET version = version + 1, changed_at = excluded.changed_at;"
+    )
+
+
+# Everything session results and exports are built from
+SESSION_DATA_VERSION_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS trg_data_version_{table}_{operation.lower()} AFTER {operation} ON {table} "
+    f"BEGIN {_session_data_version_bump('OLD' if operation == 'DELETE' else 'NEW')} END"
+    for table, operations in (
+        ("processing_sessions", ("INSERT", "UPDATE")),
+        ("employee_revisions", ("INSERT", "UPDATE", "DELETE")),
+    )
+    for operation in operations
+]
+
+for _statement in SESSION_DATA_VERSION_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+
+class SessionStatusCount(Base):
+    """Number of sessions per creator and status, maintained by triggers on processing_sessions"""
+    __tablename__ = "session_status_counts"
+
+    created_by = Column(String(100), primary_key=True)
+    status = Column(Enum(SessionStatus), primary_key=True)
+    session_count = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<SessionStatusCount(created_by='{self.created_by}', status='{self.status}', count={self.session_count})>"
+
+
+def _session_status_count_change(row: str, delta: int) -> str:
+    return (
+        "INSERT INTO session_status_counts (created_by, status, session_count) "
+        f"VALUES ({row}.created_by, {row}.status, {delta}) "
+        f"ON CONFLICT(created_by, status) DO UPDATE SET session_count = session_count + ({delta});"
+    )
+
+
+# Session list totals and dashboard counts read these few rows instead of
+# counting processing_sessions on every request
+SESSION_STATUS_COUNT_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS trg_session_status_counts_insert AFTER INSERT ON processing_sessions "
+    f"BEGIN {_session_status_count_change('NEW', 1)} END",
+    "CREATE TRIGGER IF NOT EXISTS trg_session_status_counts_delete AFTER DELETE ON processing_sessions "
+    f"BEGIN {_session_status_count_change('OLD', -1)} END",
+    "CREATE TRIGGER IF NOT EXISTS trg_session_status_counts_update AFTER UPDATE OF created_by, status "
+    "ON processing_sessions WHEN OLD.created_by IS NOT NEW.created_by OR OLD.status IS NOT NEW.status "
+    f"BEGIN {_session_status_count_change('OLD', -1)} {_session_status_count_change('NEW', 1)} END",
+]
+
+SESSION_STATUS_COUNT_BACKFILL = (
+    "INSERT INTO session_status_counts (created_by, status, session_count) "
+    "SELECT created_by, status, COUNT(*) FROM processing_sessions WHERE true GROUP BY created_by, status "
+    "ON CONFLICT(created_by, status) DO UPDATE SET session_count = excluded.session_count"
+)
+
+for _statement in SESSION_STATUS_COUNT_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+
+@event.listens_for(SessionStatusCount.__table__, "after_create")
+def _mark_session_status_counts_created(target, connection, **kw):
+    connection.info["session_status_counts_created"] = True
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _backfill_session_status_counts(target, connection, **kw):
+    """Count sessions created before the table existed"""
+    if connection.info.pop("session_status_counts_created", False) and connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(SESSION_STATUS_COUNT_BACKFILL)
+
+
 class ProcessingActivity(Base):
     """Activity logging for processing sessions"""
     __tablename__ = "processing_activities"
@@ -291,6 +573,10 @@ class FileUpload(Base):
     file_size = Column(BigInteger, nullable=False)
     checksum = Column(String(64), nullable=False)  # SHA-256 hash
     
+    # Page-level similarity index (see services/page_similarity)
+    page_hashes = Column(JSON, nullable=True)  # Page content hashes in page order
+    minhash_signature = Column(JSON, nullable=True)  # MinHash over the page hashes
+    
     # Upload status
     upload_status = Column(Enum(UploadStatus), default=UploadStatus.UPLOADED, nullable=False, index=True)
     
@@ -193,7 +193,8 @@ class SessionListResponse(BaseModel):
                 ],
                 "total_count": 1,
                 "page": 1,
-                "page_size": 20
+                "page_size": 20,
+                "next_cursor": None
             }
         }
     )
@@ -202,6 +203,7 @@ class SessionListResponse(BaseModel):
     total_count: int = Field(..., ge=0, description="Total number of sessions")
     page: int = Field(default=1, ge=1, description="Current page number")
     page_size: int = Field(default=20, ge=1, le=100, description="Number of items per page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (None on the last page)")
 
 
 class FileUploadInfo(BaseModel):
@@ -401,6 +403,9 @@ class ProcessingConfig(BaseModel):
     employee_count: int = Field(default=45, ge=1, le=100, description="Number of mock employees to process (mock mode only)")
     processing_delay: float = Field(default=1.0, ge=0.1, le=5.0, description="Processing delay per employee in seconds (mock mode)")
     enable_mock_processing: bool = Field(default=True, description="Enable mock document processing simulation")
+    
+    # Exact-match execution mode
+    clone_exact_matches: bool = Field(default=False, description="Clone results of an earlier completed session with identical files instead of processing")
 
 
 class ProcessingStartRequest(BaseModel):
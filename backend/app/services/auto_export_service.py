@@ -22,6 +22,7 @@ from ..models import (
     ValidationStatus, FileUpload, ProcessingActivity, ActivityType
 )
 from ..websocket import notifier
+from .session_statistics import get_session_statistics
 
 logger = logging.getLogger(__name__)
 
@@ -82,7 +83,7 @@ class AutoExportService:
             ).all()
             
             # Calculate statistics
-            stats = self._calculate_export_statistics(employees)
+            stats = self._calculate_export_statistics(session_uuid)
             results["statistics"] = stats
             
             # Generate pVault CSV if we have ready employees
@@ -139,40 +140,19 @@ class AutoExportService:
             logger.error(f"Auto-export failed for session {session_id}: {str(e)}")
             raise
     
-    def _calculate_export_statistics(self, employees: List[EmployeeRevision]) -> Dict[str, int]:
-        """Calculate export statistics for employees"""
-        stats = {
-            "total_employees": len(employees),
-            "ready_for_pvault": 0,
-            "need_attention": 0,
-            "missing_receipts": 0,
-            "coding_incomplete": 0,
-            "data_mismatches": 0
-        }
-        
-        for emp in employees:
-            # Check if ready for pVault export
-            has_receipt_data = emp.receipt_amount and emp.receipt_amount > 0
-            is_valid = emp.validation_status == ValidationStatus.VALID
-            
-            if has_receipt_data and is_valid:
-                stats["ready_for_pvault"] += 1
-            else:
-                stats["need_attention"] += 1
-                
-                # Categorize issues
-                if not has_receipt_data:
-                    stats["missing_receipts"] += 1
-                
-                if emp.validation_status == ValidationStatus.NEEDS_ATTENTION:
-                    if emp.validation_flags:
-                        flags = emp.validation_flags
-                        if flags.get("coding_incomplete"):
-                            stats["coding_incomplete"] += 1
-                        if flags.get("amount_mismatch"):
-                            stats["data_mismatches"] += 1
+    def _calculate_export_statistics(self, session_id) -> Dict[str, int]:
+        """Calculate export statistics from the session's maintained counters"""
+        counters = get_session_statistics(self.db, session_id)
         
-        return stats
+        # Ready for pVault: VALID with receipt data; everything else needs attention
+        return {
+            "total_employees": counters["total_employees"],
+            "ready_for_pvault": counters["ready_for_export"],
+            "need_attention": counters["total_employees"] - counters["ready_for_export"],
+            "missing_receipts": counters["missing_receipt_amount"],
+            "coding_incomplete": counters["coding_incomplete"],
+            "data_mismatches": counters["amount_mismatch"]
+        }
     
     async def _generate_pvault_csv(
         self,
@@ -10,17 +10,19 @@ import logging
 import threading
 import time
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any, Tuple, Set
+from typing import Dict, List, Optional, Any, Tuple, Set, Iterable
 from decimal import Decimal
 
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, text
+from sqlalchemy import desc, text, and_, or_, func
 from sqlalchemy.exc import SQLAlchemyError
 
 from ..models import (
     ProcessingSession, EmployeeRevision, SessionStatus, 
     ValidationStatus, ActivityType
 )
+from ..services.employee_fingerprint import fingerprint_employee_data
+from ..services.session_cloner import clone_revisions
 from ..services.mock_processor import (
     simulate_document_processing, log_processing_activity, 
     update_session_status, generate_mock_employee_data
@@ -29,6 +31,12 @@ from ..services.mock_processor import (
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Base session rows fetched per keyset page during change analysis
+BASE_EMPLOYEE_PAGE_SIZE = 1000
+
+# Bound parameters per IN (...) lookup (fingerprints or names), below SQLite's variable limit
+DELTA_LOOKUP_CHUNK_SIZE = 500
+
 # Global locks for concurrent access protection
 _session_locks = {}
 _lock_manager_lock = threading.Lock()
@@ -43,13 +51,15 @@ class EmployeeChangeInfo:
         change_type: str,
         current_data: Optional[Dict] = None,
         previous_data: Optional[Dict] = None,
-        changes: Optional[Dict] = None
+        changes: Optional[Dict] = None,
+        base_revision_id: Optional[Any] = None
     ):
         self.employee_name = employee_name
         self.change_type = change_type  # 'new', 'modified', 'unchanged'
         self.current_data = current_data or {}
         self.previous_data = previous_data or {}
         self.changes = changes or {}
+        self.base_revision_id = base_revision_id  # Matched base session revision, if any
 
 
 class DeltaProcessingConfig:
@@ -70,6 +80,41 @@ class DeltaProcessingConfig:
         self.max_unchanged_skip_percentage = max_unchanged_skip_percentage
 
 
+def _employee_name(employee_data: Dict[str, Any]) -> str:
+    """Employee name of a current-session record ('name' or 'employee_name')"""
+    return employee_data.get('name') or employee_data.get('employee_name') or ''
+
+
+def _merge_join_by_name(current_sorted: Iterable[Tuple[str, Dict]], base_rows: Iterable[Any]):
+    """
+    Merge join of name-sorted current employees with name-sorted base rows
+    
+    When the base session has several rows with the same name the last one in
+    (employee_name, revision_id) order is used, matching the previous
+    name-keyed dict lookup. Current employees sharing a name all join it.
+    
+    Args:
+        current_sorted: (employee_name, employee_data) pairs sorted by name
+        base_rows: Base rows sorted by (employee_name, revision_id)
+        
+    Yields:
+        (employee_name, employee_data, base_row or None) for every current employee
+    """
+    base_iter = iter(base_rows)
+    base = next(base_iter, None)
+    joined_name, joined_row = None, None
+    
+    for name, employee_data in current_sorted:
+        if name != joined_name:
+            joined_name, joined_row = name, None
+            while base is not None and base.employee_name < name:
+                base = next(base_iter, None)
+            while base is not None and base.employee_name == name:
+                joined_row = base
+                base = next(base_iter, None)
+        yield name, employee_data, joined_row
+
+
 def _get_session_lock(session_id: str) -> threading.Lock:
     """Get or create a lock for a specific session to prevent concurrent processing"""
     with _lock_manager_lock:
@@ -189,80 +234,62 @@ class DeltaAwareProcessor:
         Returns:
             Dictionary containing change analysis results
         """
-        # MEMORY OPTIMIZATION: Load base employees with pagination to prevent memory issues
-        try:
-            # First get total count to decide on pagination strategy
-            total_base_employees = self.db.query(EmployeeRevision).filter(
-                EmployeeRevision.session_id == base_session.session_id
-            ).count()
-            
-            # Use pagination for large datasets to prevent memory exhaustion
-            BATCH_SIZE = 1000  # Process in batches to manage memory
-            base_employees = []
-            
-            if total_base_employees > BATCH_SIZE:
-                self.logger.info(f"Loading {total_base_employees} base employees in batches of {BATCH_SIZE}")
-                
-                for offset in range(0, total_base_employees, BATCH_SIZE):
-                    batch = self.db.query(EmployeeRevision).filter(
-                        EmployeeRevision.session_id == base_session.session_id
-                    ).offset(offset).limit(BATCH_SIZE).all()
-                    base_employees.extend(batch)
-                    
-                    # Periodic memory cleanup
-                    if offset % (BATCH_SIZE * 5) == 0:  # Every 5 batches
-                        import gc
-                        gc.collect()
-            else:
-                base_employees = self.db.query(EmployeeRevision).filter(
-                    EmployeeRevision.session_id == base_session.session_id
-                ).options(
-                    # Load all needed relationships in single query to prevent N+1
-                    # (add joinedload if there are relationships to load)
-                ).all()
-                
-        except SQLAlchemyError as e:
-            self.logger.error(f"Failed to load base session employees: {str(e)}")
-            raise
-        
-        # Create lookup for base employees by name
-        base_employee_map = {emp.employee_name: emp for emp in base_employees}
-        
         # Generate current session data (simulated from files)
-        current_employee_data = generate_mock_employee_data(
-            num_employees=45,  # Configurable based on file content
-            base_session_data=base_employees if config.enable_delta_processing else None
-        )
+        current_employee_data = generate_mock_employee_data(45)  # Configurable based on file content
         
-        # Analyze changes
         changes = []
         unchanged = []
         new_employees = []
         modified_employees = []
         
-        for current_emp_data in current_employee_data:
-            emp_name = current_emp_data['name']
+        try:
+            # Employees whose fingerprint exists in the base session are unchanged
+            fingerprints = [fingerprint_employee_data(emp_data) for emp_data in current_employee_data]
+            unchanged_fingerprints = self._find_unchanged_fingerprints(
+                base_session.session_id, set(fingerprints), config
+            )
             
-            if emp_name in base_employee_map:
-                base_emp = base_employee_map[emp_name]
-                change_info = self._compare_employee_data(
-                    current_emp_data, base_emp, config
-                )
-                
-                if change_info.change_type == 'unchanged':
-                    unchanged.append(change_info)
+            mismatched = []
+            for fingerprint, emp_data in zip(fingerprints, current_employee_data):
+                if fingerprint in unchanged_fingerprints:
+                    unchanged.append(EmployeeChangeInfo(
+                        employee_name=_employee_name(emp_data),
+                        change_type='unchanged',
+                        current_data=emp_data,
+                        base_revision_id=unchanged_fingerprints[fingerprint]
+                    ))
+                else:
+                    mismatched.append((_employee_name(emp_data), emp_data))
+            
+            # Only mismatched fingerprints get the detailed diff, in a single pass of
+            # a merge join against the base session sorted the same way
+            mismatched.sort(key=lambda item: item[0])
+            base_rows = self._iter_base_employees(
+                base_session.session_id, names={name for name, _ in mismatched}
+            )
+            for emp_name, current_emp_data, base_emp in _merge_join_by_name(mismatched, base_rows):
+                if base_emp is not None:
+                    change_info = self._compare_employee_data(
+                        current_emp_data, base_emp, config
+                    )
+                    
+                    if change_info.change_type == 'unchanged':
+                        unchanged.append(change_info)
+                    else:
+                        modified_employees.append(change_info)
+                        changes.append(change_info)
                 else:
-                    modified_employees.append(change_info)
+                    # New employee
+                    change_info = EmployeeChangeInfo(
+                        employee_name=emp_name,
+                        change_type='new',
+                        current_data=current_emp_data
+                    )
+                    new_employees.append(change_info)
                     changes.append(change_info)
-            else:
-                # New employee
-                change_info = EmployeeChangeInfo(
-                    employee_name=emp_name,
-                    change_type='new',
-                    current_data=current_emp_data
-                )
-                new_employees.append(change_info)
-                changes.append(change_info)
+        except SQLAlchemyError as e:
+            self.logger.error(f"Failed to load base session employees: {str(e)}")
+            raise
         
         # Calculate statistics
         total_employees = len(current_employee_data)
@@ -286,6 +313,103 @@ class DeltaAwareProcessor:
             'base_session_name': base_session.session_name
         }
     
+    def _find_unchanged_fingerprints(
+        self,
+        base_session_id: Any,
+        fingerprints: Set[str],
+        config: DeltaProcessingConfig
+    ) -> Dict[str, Any]:
+        """
+        Look up which content fingerprints exist in the base session
+        
+        Args:
+            base_session_id: Base session UUID
+            fingerprints: Fingerprints of the current session's employees
+            config: Delta processing configuration
+            
+        Returns:
+            Base revision ID (last by revision ID) per fingerprint that can be skipped as unchanged
+        """
+        found = {}
+        ordered = sorted(fingerprints)
+        
+        for start in range(0, len(ordered), DELTA_LOOKUP_CHUNK_SIZE):
+            query = self.db.query(
+                EmployeeRevision.content_fingerprint,
+                func.max(EmployeeRevision.revision_id).label('revision_id')
+            ).filter(
+                EmployeeRevision.session_id == base_session_id,
+                EmployeeRevision.content_fingerprint.in_(ordered[start:start + DELTA_LOOKUP_CHUNK_SIZE])
+            )
+            if config.force_reprocess_validation_issues:
+                # Employees that had issues are always reprocessed
+                query = query.filter(EmployeeRevision.validation_status == ValidationStatus.VALID)
+            found.update(
+                (row.content_fingerprint, row.revision_id)
+                for row in query.group_by(EmployeeRevision.content_fingerprint)
+            )
+        
+        return found
+    
+    def _iter_base_employees(
+        self,
+        base_session_id: Any,
+        page_size: int = BASE_EMPLOYEE_PAGE_SIZE,
+        names: Optional[Set[str]] = None
+    ):
+        """
+        Stream base session employees ordered by (employee_name, revision_id)
+        
+        Pages are fetched with a keyset predicate on the last seen key, so each
+        page is an index range scan instead of re-reading skipped rows, and only
+        one page of rows is held at a time.
+        
+        Args:
+            base_session_id: Base session UUID
+            page_size: Rows fetched per query
+            names: Restrict to these employee names (ignored above DELTA_LOOKUP_CHUNK_SIZE names)
+            
+        Yields:
+            Rows with the columns needed for change comparison
+        """
+        if names is not None and not names:
+            return
+        if names is not None and len(names) > DELTA_LOOKUP_CHUNK_SIZE:
+            names = None
+        
+        last_name = last_revision_id = None
+        
+        while True:
+            query = self.db.query(
+                EmployeeRevision.revision_id,
+                EmployeeRevision.employee_id,
+                EmployeeRevision.employee_name,
+                EmployeeRevision.car_amount,
+                EmployeeRevision.receipt_amount,
+                EmployeeRevision.validation_status
+            ).filter(EmployeeRevision.session_id == base_session_id)
+            
+            if names is not None:
+                query = query.filter(EmployeeRevision.employee_name.in_(sorted(names)))
+            if last_name is not None:
+                query = query.filter(or_(
+                    EmployeeRevision.employee_name > last_name,
+                    and_(
+                        EmployeeRevision.employee_name == last_name,
+                        EmployeeRevision.revision_id > last_revision_id
+                    )
+                ))
+            
+            page = query.order_by(
+                EmployeeRevision.employee_name, EmployeeRevision.revision_id
+            ).limit(page_size).all()
+            
+            yield from page
+            
+            if len(page) < page_size:
+                return
+            last_name, last_revision_id = page[-1].employee_name, page[-1].revision_id
+    
     def _compare_employee_data(
         self, 
         current_data: Dict, 
@@ -340,7 +464,7 @@ class DeltaAwareProcessor:
             change_type = 'unchanged'
         
         return EmployeeChangeInfo(
-            employee_name=current_data['name'],
+            employee_name=_employee_name(current_data),
             change_type=change_type,
             current_data=current_data,
             previous_data={
@@ -349,7 +473,8 @@ class DeltaAwareProcessor:
                 'validation_status': base_employee.validation_status.value,
                 'employee_id': base_employee.employee_id
             },
-            changes=changes
+            changes=changes,
+            base_revision_id=getattr(base_employee, 'revision_id', None)
         )
     
     async def _execute_delta_processing(
@@ -395,8 +520,9 @@ class DeltaAwareProcessor:
             
             if should_skip_unchanged:
                 # Copy unchanged employees from base session
-                await self._copy_unchanged_employees(session, base_session, change_analysis['unchanged'], user)
-                skipped_count = len(change_analysis['unchanged'])
+                skipped_count = await self._copy_unchanged_employees(
+                    session, base_session, change_analysis['unchanged'], user
+                )
                 
                 # Process only changed employees
                 employees_to_process = change_analysis['changes']
@@ -555,75 +681,66 @@ class DeltaAwareProcessor:
         base_session: ProcessingSession,
         unchanged_employees: List[EmployeeChangeInfo],
         user: str
-    ):
+    ) -> int:
         """
         Copy unchanged employees from base session to current session
-        OPTIMIZED: Uses bulk operations to prevent N+1 queries
+        OPTIMIZED: Set-based INSERT ... SELECT executed by the database
+        
+        The base revisions to clone are written to a temporary mapping table
+        (base revision ID -> new revision ID), then a single INSERT ... SELECT
+        joined on that table copies every row server-side without loading
+        employees into Python (see session_cloner.clone_revisions).
+        
+        Returns:
+            Number of employees copied
         """
         if not unchanged_employees:
-            return
+            return 0
         
         try:
-            # Get all employee names to copy (bulk query preparation)
-            employee_names = [emp.employee_name for emp in unchanged_employees]
-            
-            # PERFORMANCE FIX: Single query instead of N queries
-            base_employees = self.db.query(EmployeeRevision).filter(
-                EmployeeRevision.session_id == base_session.session_id,
-                EmployeeRevision.employee_name.in_(employee_names)
-            ).all()
-            
-            # Create lookup map for fast access
-            base_emp_map = {emp.employee_name: emp for emp in base_employees}
-            
-            # Prepare bulk insert data
-            new_employees = []
-            current_time = datetime.now(timezone.utc)
-            
-            for emp_change in unchanged_employees:
-                base_emp = base_emp_map.get(emp_change.employee_name)
-                if base_emp:
-                    new_employee = EmployeeRevision(
-                        session_id=current_session.session_id,
-                        employee_id=base_emp.employee_id,
-                        employee_name=base_emp.employee_name,
-                        car_amount=base_emp.car_amount,
-                        receipt_amount=base_emp.receipt_amount,
-                        validation_status=base_emp.validation_status,
-                        validation_flags=base_emp.validation_flags.copy() if base_emp.validation_flags else {},
-                        created_at=current_time,
-                        updated_at=current_time,
-                        resolved_by=base_emp.resolved_by,
-                        resolution_notes=f"Copied from base session {base_session.session_name} (unchanged)"
-                    )
-                    new_employees.append(new_employee)
-            
-            # MEMORY & PERFORMANCE OPTIMIZATION: Batch bulk inserts for large datasets
-            # Note: Transaction management handled at higher level
-            if new_employees:
-                BULK_INSERT_BATCH_SIZE = 500  # Prevent memory issues with large bulk inserts
-                total_employees = len(new_employees)
-                
-                if total_employees > BULK_INSERT_BATCH_SIZE:
-                    self.logger.info(f"Bulk inserting {total_employees} employees in batches of {BULK_INSERT_BATCH_SIZE}")
-                    
-                    for i in range(0, total_employees, BULK_INSERT_BATCH_SIZE):
-                        batch = new_employees[i:i + BULK_INSERT_BATCH_SIZE]
-                        self.db.bulk_save_objects(batch)
-                        
-                        # Periodic memory cleanup for large datasets
-                        if i % (BULK_INSERT_BATCH_SIZE * 5) == 0:  # Every 5 batches
-                            import gc
-                            gc.collect()
-                else:
-                    self.db.bulk_save_objects(new_employees)
-                # Don't commit here - let the main transaction handle it
+            base_revision_ids = self._resolve_base_revision_ids(base_session, unchanged_employees)
+            if not base_revision_ids:
+                return 0
+            
+            copied = len(clone_revisions(
+                self.db, base_session.session_id, current_session.session_id, base_revision_ids,
+                f"Copied from base session {base_session.session_name} (unchanged)"
+            ))
+            # Don't commit here - let the main transaction handle it
+            
+            self.logger.info(f"Copied {copied} unchanged employees from base session {base_session.session_id}")
+            return copied
                 
         except Exception as e:
             self.logger.error(f"Failed to copy unchanged employees: {str(e)}")
             # Don't rollback here - let the main transaction handle it
             raise
     
+    def _resolve_base_revision_ids(
+        self,
+        base_session: ProcessingSession,
+        unchanged_employees: List[EmployeeChangeInfo]
+    ) -> List[Any]:
+        """
+        Base revision IDs of unchanged employees
+        
+        Uses the revision ID recorded during change analysis and falls back to
+        a name lookup (last revision per name) for entries without one.
+        """
+        revision_ids = {emp.base_revision_id for emp in unchanged_employees if emp.base_revision_id is not None}
+        missing_names = sorted({emp.employee_name for emp in unchanged_employees if emp.base_revision_id is None})
+        
+        for start in range(0, len(missing_names), DELTA_LOOKUP_CHUNK_SIZE):
+            rows = self.db.query(
+                func.max(EmployeeRevision.revision_id).label('revision_id')
+            ).filter(
+                EmployeeRevision.session_id == base_session.session_id,
+                EmployeeRevision.employee_name.in_(missing_names[start:start + DELTA_LOOKUP_CHUNK_SIZE])
+            ).group_by(EmployeeRevision.employee_name).all()
+            revision_ids.update(row.revision_id for row in rows)
+        
+        return sorted(revision_ids, key=str)
+    
     async def _process_regular_session(
         self, 
         session: ProcessingSession, 
@@ -691,6 +808,7 @@ class DeltaAwareProcessor:
                 created_at=datetime.now(timezone.utc),
                 updated_at=datetime.now(timezone.utc)
             )
+            employee.content_fingerprint = fingerprint_employee_data(employee_data)
             
             self.db.add(employee)
             # Transaction management handled at higher level
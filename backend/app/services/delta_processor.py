@@ -12,12 +12,14 @@ from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple, Any
 from enum import Enum
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 from sqlalchemy import desc, and_, or_, text
 from sqlalchemy.exc import SQLAlchemyError
 
 from ..models import ProcessingSession, FileUpload, SessionStatus, FileType
 from ..database import get_db
+from .page_similarity import MIN_PAGE_SIMILARITY, PageDelta, estimate_similarity
+from .session_cloner import clone_session_results
 
 # Configure logger for security events
 security_logger = logging.getLogger('security.delta_processor')
@@ -28,6 +30,9 @@ MIN_CHECKSUM_LENGTH = 64
 VALID_CHECKSUM_PATTERN = re.compile(r'^[a-f0-9]{64}$')
 MAX_SESSION_ID_LENGTH = 36  # UUID length
 
+# Most recent earlier uploads compared by MinHash signature during page-level detection
+MAX_SIMILARITY_CANDIDATES = 200
+
 
 class DeltaMatchType(str, Enum):
     """Types of delta matches found"""
@@ -195,6 +200,127 @@ class DeltaProcessor:
             processing_time_estimate=self._estimate_full_processing_time()
         )
     
+    def clone_exact_match(
+        self,
+        target_session: ProcessingSession,
+        current_user: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Execution mode for exact matches: reuse results instead of processing
+        
+        When an earlier COMPLETED session of the same owner has identical CAR
+        and Receipt checksums, its revisions, line artifacts and export files
+        are cloned into the target session, which is marked COMPLETED without
+        parsing either document.
+        
+        Args:
+            target_session: Session whose files were just uploaded
+            current_user: User requesting processing (recorded on the clone)
+        
+        Returns:
+            Clone summary, or None when there is no exact match to clone from
+        """
+        if not target_session.car_checksum or not target_session.receipt_checksum:
+            return None
+        
+        detection = self.detect_delta_files(
+            target_session.car_checksum,
+            target_session.receipt_checksum,
+            target_session.created_by,
+            exclude_session_id=str(target_session.session_id)
+        )
+        
+        # Several exact matches are all identical; the most recent one is used
+        comparisons = detection.file_comparisons
+        base_session = detection.base_session
+        if not (comparisons.get("car_match") and comparisons.get("receipt_match")):
+            return None
+        if base_session is None or base_session.total_employees <= 0:
+            return None
+        
+        security_logger.info(
+            f"Cloning session {base_session.session_id} into {target_session.session_id} "
+            f"for user {current_user} (identical files)"
+        )
+        return clone_session_results(self.db, base_session, target_session, current_user)
+    
+    def detect_page_delta(
+        self,
+        session_id: str,
+        current_user: str,
+        min_similarity: float = MIN_PAGE_SIMILARITY
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Page-level delta detection against the most similar earlier files
+        
+        Whole-file checksums miss near duplicates such as a receipt PDF with
+        pages appended. For each uploaded file of the session, the MinHash
+        signatures of the user's completed sessions' uploads of the same type
+        are compared, and the page hashes of the most similar one are diffed
+        to report which pages are new or changed.
+        
+        Args:
+            session_id: Session whose uploads are analysed
+            current_user: Session owner (only their sessions are compared)
+            min_similarity: Minimum estimated similarity for a base file
+        
+        Returns:
+            Per file type ('car', 'receipt'): base session/upload, similarity
+            and page delta, or None when no earlier file is similar enough
+        """
+        if not self._validate_session_id(str(session_id)):
+            security_logger.warning(f"Invalid session ID: {session_id}")
+            raise ValueError("Invalid session identifier")
+        if not self._validate_user_input(current_user):
+            security_logger.warning(f"Invalid user input: {current_user}")
+            raise ValueError("Invalid user identifier")
+        
+        uploads = self.db.query(FileUpload).filter(FileUpload.session_id == session_id).all()
+        return {
+            upload.file_type.value: self._find_similar_upload(upload, current_user, min_similarity)
+            for upload in uploads
+        }
+    
+    def _find_similar_upload(
+        self,
+        upload: FileUpload,
+        current_user: str,
+        min_similarity: float
+    ) -> Optional[Dict[str, Any]]:
+        """Most similar earlier upload of the same type with its page delta"""
+        if not upload.minhash_signature or not upload.page_hashes:
+            return None
+        
+        # Page hashes are only loaded for the best candidate
+        candidates = self.db.query(FileUpload).options(defer(FileUpload.page_hashes)).join(
+            ProcessingSession, ProcessingSession.session_id == FileUpload.session_id
+        ).filter(
+            ProcessingSession.status == SessionStatus.COMPLETED,
+            ProcessingSession.created_by == current_user,  # User isolation
+            FileUpload.file_type == upload.file_type,
+            FileUpload.session_id != upload.session_id,
+            FileUpload.minhash_signature.isnot(None)
+        ).order_by(desc(FileUpload.uploaded_at)).limit(MAX_SIMILARITY_CANDIDATES).all()
+        
+        best_upload, best_similarity = None, 0.0
+        for candidate in candidates:
+            similarity = estimate_similarity(upload.minhash_signature, candidate.minhash_signature)
+            if similarity > best_similarity:
+                best_upload, best_similarity = candidate, similarity
+        
+        if best_upload is None or best_similarity < min_similarity or not best_upload.page_hashes:
+            return None
+        
+        delta = PageDelta(best_upload.page_hashes, upload.page_hashes)
+        return {
+            "base_session_id": str(best_upload.session_id),
+            "base_upload_id": str(best_upload.upload_id),
+            "base_checksum": best_upload.checksum,
+            "estimated_similarity": best_similarity,
+            "exact_match": best_upload.checksum == upload.checksum,
+            **delta.to_dict()
+        }
+    
     def _handle_exact_matches(
         self,
         matches: List[ProcessingSession],
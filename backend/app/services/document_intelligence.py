@@ -12,7 +12,6 @@ import logging
 import os
 import json
 from typing import Dict, List, Optional, Any
-from decimal import Decimal
 from abc import ABC, abstractmethod
 
 from ..config import settings
@@ -944,7 +943,7 @@ class DocumentProcessor:
     
     def _merge_employee_data(self, car_employees: List[Dict], receipt_employees: List[Dict]) -> List[Dict]:
         """
-        Merge employee data from CAR and Receipt documents using advanced merger service
+        Merge employee data from CAR and Receipt documents using the merge engine
         
         Args:
             car_employees: Employee data from CAR document
@@ -953,102 +952,21 @@ class DocumentProcessor:
         Returns:
             List of merged employee records
         """
-        try:
-            # Convert list format to dict format for merger service
-            car_dict = {f"car_{i}": emp for i, emp in enumerate(car_employees)}
-            receipt_dict = {f"receipt_{i}": emp for i, emp in enumerate(receipt_employees)}
-            
-            # Use advanced merger service
-            from .employee_merger import EmployeeDataMerger
-            merger = EmployeeDataMerger(similarity_threshold=0.8)
-            merge_result = merger.merge_employee_data(car_dict, receipt_dict)
-            
-            # Log merger summary
-            summary = merge_result['summary']
-            logger.info(f"Employee merge completed: {summary['matched_count']} matched, "
-                       f"{summary['car_only_count']} CAR-only, {summary['receipt_only_count']} Receipt-only")
-            
-            # Convert back to list format for API compatibility
-            merged_list = []
-            for emp_key, employee in merge_result['employees'].items():
-                merged_employee = {
-                    "employee_name": employee["employee_name"],
-                    "employee_id": employee["employee_id"],
-                    "car_amount": Decimal(str(employee["car_total"])),
-                    "receipt_amount": Decimal(str(employee["receipt_total"])),
-                    "sources": employee["sources"],
-                    "confidence": employee.get("match_score", 0.5),
-                    "match_status": employee["match_status"],
-                    
-                    # Additional merger service data
-                    "card_number": employee.get("card_number"),
-                    "car_page_range": employee.get("car_page_range", []),
-                    "receipt_page_range": employee.get("receipt_page_range", []),
-                    "fuel_total": employee.get("fuel_total", 0.0),
-                    "maintenance_total": employee.get("maintenance_total", 0.0),
-                    "expense_categories": employee.get("expense_categories", []),
-                    "total_expenses": employee["total_expenses"],
-                    "splittable": employee["has_car_data"] and employee["has_receipt_data"]
-                }
-                merged_list.append(merged_employee)
-            
-            # Sort by total expenses (highest first) for better presentation
-            merged_list.sort(key=lambda emp: emp["total_expenses"], reverse=True)
-            
-            return merged_list
-            
-        except Exception as e:
-            logger.error(f"Advanced merge failed, falling back to simple merge: {str(e)}")
-            
-            # Fallback to simple merge if advanced merger fails
-            return self._simple_merge_employee_data(car_employees, receipt_employees)
-    
-    def _simple_merge_employee_data(self, car_employees: List[Dict], receipt_employees: List[Dict]) -> List[Dict]:
-        """
-        Simple fallback merge for employee data
-        """
-        # Create lookup maps by employee name
-        car_map = {emp["employee_name"]: emp for emp in car_employees}
-        receipt_map = {emp["employee_name"]: emp for emp in receipt_employees}
+        from .merge_engine import MergeEngine
         
-        # Get all unique employee names
-        all_names = set(car_map.keys()) | set(receipt_map.keys())
+        merged_list = []
+        for employee in MergeEngine(similarity_threshold=0.8).merge(car_employees, receipt_employees):
+            employee["total_expenses"] = float(employee["car_amount"] or 0) + float(employee["receipt_amount"] or 0)
+            employee["splittable"] = employee["match_status"] == "matched"
+            merged_list.append(employee)
         
-        merged_employees = []
-        for name in all_names:
-            car_data = car_map.get(name, {})
-            receipt_data = receipt_map.get(name, {})
-            
-            # Merge data with preference for more complete records
-            merged_employee = {
-                "employee_name": name,
-                "employee_id": car_data.get("employee_id") or receipt_data.get("employee_id"),
-                "car_amount": car_data.get("car_amount", Decimal('0.00')),
-                "receipt_amount": receipt_data.get("receipt_amount", Decimal('0.00')),
-                "sources": []
-            }
-            
-            # Track which documents contained this employee
-            if car_data:
-                merged_employee["sources"].append("car")
-            if receipt_data:
-                merged_employee["sources"].append("receipt")
-            
-            # Calculate confidence as average of source confidences
-            confidences = []
-            if car_data.get("confidence"):
-                confidences.append(car_data["confidence"])
-            if receipt_data.get("confidence"):
-                confidences.append(receipt_data["confidence"])
-            
-            merged_employee["confidence"] = sum(confidences) / len(confidences) if confidences else 0.5
-            
-            merged_employees.append(merged_employee)
+        logger.info(f"Employee merge completed: {sum(1 for emp in merged_list if emp['splittable'])} matched "
+                   f"out of {len(merged_list)} merged employees")
         
-        # Sort by employee name for consistency
-        merged_employees.sort(key=lambda emp: emp["employee_name"])
+        # Sort by total expenses (highest first) for better presentation
+        merged_list.sort(key=lambda emp: emp["total_expenses"], reverse=True)
         
-        return merged_employees
+        return merged_list
 
 
 # Factory function for easy integration
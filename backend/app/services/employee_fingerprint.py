@@ -0,0 +1,112 @@
+"""
+Employee Content Fingerprints
+
+Stable SHA-256 fingerprint of the fields that define an employee's processed
+content (normalized ID, name and amounts). Written to
+EmployeeRevision.content_fingerprint when revisions are persisted, so delta
+detection can find unchanged employees with an indexed lookup instead of
+comparing every employee field by field.
+
+Extracted records and stored revisions are fingerprinted from the same
+canonical fields, all of which EmployeeRevision persists, so a revision
+re-fingerprinted after a database round trip matches the fingerprint of the
+record it was stored from.
+"""
+
+import hashlib
+import re
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Any, Dict
+
+# Bump when the normalization changes; older fingerprints then never match
+FINGERPRINT_VERSION = "2"
+
+_WHITESPACE = re.compile(r"\s+")
+_CENTS = Decimal("0.01")
+
+
+def _normalize_text(value: Any) -> str:
+    """Upper-case text with collapsed whitespace ('' for missing values)"""
+    if value is None:
+        return ""
+    return _WHITESPACE.sub(" ", str(value)).strip().upper()
+
+
+def _normalize_amount(value: Any) -> str:
+    """Amount rounded to cents (missing counts as zero, raw text when unparseable)"""
+    if value is None:
+        value = 0
+    try:
+        return str(Decimal(str(value)).quantize(_CENTS, rounding=ROUND_HALF_UP))
+    except (InvalidOperation, ValueError):
+        return _normalize_text(value)
+
+
+def compute_employee_fingerprint(
+    employee_id: Any,
+    employee_name: Any,
+    car_amount: Any,
+    receipt_amount: Any
+) -> str:
+    """
+    Compute the content fingerprint of an employee
+
+    Both extracted records and stored revisions are fingerprinted here.
+    Missing amounts count as zero because some writers store 0 for them.
+
+    Args:
+        employee_id: Employee ID
+        employee_name: Employee name
+        car_amount: CAR amount
+        receipt_amount: Receipt amount
+
+    Returns:
+        Hex SHA-256 fingerprint
+    """
+    content = "|".join((
+        FINGERPRINT_VERSION,
+        _normalize_text(employee_id),
+        _normalize_text(employee_name),
+        _normalize_amount(car_amount),
+        _normalize_amount(receipt_amount)
+    ))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def fingerprint_employee_data(employee_data: Dict[str, Any]) -> str:
+    """
+    Fingerprint an employee record as produced by the processing pipeline
+
+    The name may be keyed 'employee_name' or 'name'. Fields EmployeeRevision
+    does not store (e.g. page ranges) are not part of the fingerprint.
+
+    Args:
+        employee_data: Employee data dictionary
+
+    Returns:
+        Hex SHA-256 fingerprint
+    """
+    return compute_employee_fingerprint(
+        employee_data.get("employee_id"),
+        employee_data.get("employee_name") or employee_data.get("name"),
+        employee_data.get("car_amount"),
+        employee_data.get("receipt_amount")
+    )
+
+
+def fingerprint_revision(revision: Any) -> str:
+    """
+    Fingerprint an EmployeeRevision from its stored columns
+
+    Args:
+        revision: EmployeeRevision instance
+
+    Returns:
+        Hex SHA-256 fingerprint
+    """
+    return compute_employee_fingerprint(
+        revision.employee_id,
+        revision.employee_name,
+        revision.car_amount,
+        revision.receipt_amount
+    )
@@ -5,15 +5,158 @@ Merges employee data from CAR and Receipt documents, identifies matches,
 and prepares data for document splitting functionality.
 """
 
+import heapq
 import logging
 import re
+from collections import Counter, defaultdict
 from typing import Dict, List, Any, Optional, Tuple, Set
 from decimal import Decimal
 from difflib import SequenceMatcher
 
+# Optional dependencies
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Maximum contribution of partial employee ID similarity to a match score
+ID_SIMILARITY_WEIGHT = 0.3
+
+# Slack when comparing vectorized score bounds with exact scores
+BOUND_TOLERANCE = 1e-9
+
+# Assignment modes for pairing CAR employees with receipt employees
+ASSIGNMENT_BEST_MATCH = "best_match"    # Each CAR employee independently takes its best receipt
+ASSIGNMENT_ONE_TO_ONE = "one_to_one"    # Global greedy assignment, each receipt used at most once
+ASSIGNMENT_MODES = (ASSIGNMENT_BEST_MATCH, ASSIGNMENT_ONE_TO_ONE)
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys('BFPV', '1'),
+    **dict.fromkeys('CGJKQSXZ', '2'),
+    **dict.fromkeys('DT', '3'),
+    'L': '4',
+    **dict.fromkeys('MN', '5'),
+    'R': '6',
+}
+
+
+def _soundex(token: str) -> str:
+    """
+    American Soundex code for a name token (e.g. 'SMITH' and 'SMYTH' -> 'S530')
+    """
+    letters = [ch for ch in token.upper() if ch.isalpha()]
+    if not letters:
+        return ""
+    
+    code = letters[0]
+    previous = _SOUNDEX_CODES.get(letters[0], '')
+    for ch in letters[1:]:
+        digit = _SOUNDEX_CODES.get(ch, '')
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if ch not in 'HW':
+            previous = digit
+    
+    return code.ljust(4, '0')
+
+
+class _ReceiptBounds:
+    """
+    Upper bounds on match scores against every receipt employee at once
+    
+    SequenceMatcher.ratio() never exceeds quick_ratio(), which only counts the
+    characters two strings have in common. Receipt names and IDs are kept as
+    character count matrices so the bound for all receipts takes one
+    vectorized step per CAR employee. Without numpy every receipt is returned
+    and the per-pair bound in the scoring loop does the pruning.
+    """
+    
+    def __init__(self, receipt_items: List[Tuple[str, Dict[str, Any]]]):
+        self.size = len(receipt_items)
+        if not NUMPY_AVAILABLE:
+            return
+        
+        employees = [employee for _, employee in receipt_items]
+        self._names = self._count_matrix([employee['normalized_name'] or '' for employee in employees])
+        self._ids = self._count_matrix([employee.get('employee_id') or '' for employee in employees])
+        self._has_id = np.array([bool(employee.get('employee_id')) for employee in employees], dtype=bool)
+    
+    def bounds(self, car_name: str, car_id: Optional[str], id_index: Dict[str, List[int]]):
+        """
+        Upper bound on _score_pair for every receipt position (None without numpy)
+        """
+        if not NUMPY_AVAILABLE:
+            return None
+        
+        bound = self._quick_ratios(self._names, car_name)
+        if car_id:
+            id_bonus = self._quick_ratios(self._ids, car_id) * ID_SIMILARITY_WEIGHT
+            bound = bound + np.where(self._has_id, id_bonus, 0.0)
+            bound[id_index.get(car_id, [])] = 1.0
+        return np.minimum(bound, 1.0)
+    
+    def positions_reaching(self, bound, floor: float, limit: Optional[int] = None) -> List[int]:
+        """
+        Receipt positions (below limit, in order) whose bound reaches floor
+        """
+        stop = self.size if limit is None else limit
+        if bound is None:
+            return list(range(stop))
+        return np.flatnonzero(bound[:stop] >= floor - BOUND_TOLERANCE).tolist()
+    
+    def order(self, bound, positions: Optional[Set[int]], floor: float) -> List[Tuple[int, float]]:
+        """
+        (position, bound) pairs reaching floor, highest bound first then by position
+        
+        Args:
+            bound: Result of bounds() for the CAR employee
+            positions: Restrict to these positions (all receipts when None)
+        """
+        if bound is None:
+            # Without bounds every pair must be scored; 1.0 never stops the scan
+            selected = range(self.size) if positions is None else sorted(positions)
+            return [(position, 1.0) for position in selected]
+        
+        selected = np.flatnonzero(bound >= floor - BOUND_TOLERANCE)
+        if positions is not None:
+            selected = np.intersect1d(selected, np.fromiter(positions, dtype=np.int64, count=len(positions)))
+        selected = selected[np.lexsort((selected, -bound[selected]))]
+        return list(zip(selected.tolist(), bound[selected].tolist()))
+    
+    @staticmethod
+    def _count_matrix(values: List[str]) -> Tuple[Dict[str, int], Any, Any]:
+        alphabet = {}
+        rows = [Counter(value) for value in values]
+        for row in rows:
+            for ch in row:
+                alphabet.setdefault(ch, len(alphabet))
+        
+        matrix = np.zeros((len(values), max(len(alphabet), 1)), dtype=np.int32)
+        for position, row in enumerate(rows):
+            for ch, count in row.items():
+                matrix[position, alphabet[ch]] = count
+        return alphabet, matrix, matrix.sum(axis=1)
+    
+    @staticmethod
+    def _quick_ratios(counts: Tuple[Dict[str, int], Any, Any], value: str):
+        """SequenceMatcher.quick_ratio() of value against every row"""
+        alphabet, matrix, lengths = counts
+        query = np.zeros(matrix.shape[1], dtype=np.int32)
+        for ch, count in Counter(value).items():
+            if ch in alphabet:
+                query[alphabet[ch]] = count
+        
+        common = np.minimum(matrix, query).sum(axis=1)
+        total = lengths + len(value)
+        return np.where(total > 0, 2.0 * common / np.maximum(total, 1), 1.0)
+
 
 class EmployeeMergerError(Exception):
     """Base exception for employee merger errors"""
@@ -26,14 +169,19 @@ class EmployeeDataMerger:
     Provides functionality for data validation and splitting preparation
     """
     
-    def __init__(self, similarity_threshold: float = 0.8):
+    def __init__(self, similarity_threshold: float = 0.8, assignment_mode: str = ASSIGNMENT_BEST_MATCH):
         """
         Initialize merger with similarity threshold for name matching
         
         Args:
             similarity_threshold: Minimum similarity score for name matching (0.0 to 1.0)
+            assignment_mode: 'best_match' (per CAR employee) or 'one_to_one' (global assignment)
         """
+        if assignment_mode not in ASSIGNMENT_MODES:
+            raise ValueError(f"Unknown assignment mode: {assignment_mode}")
+        
         self.similarity_threshold = similarity_threshold
+        self.assignment_mode = assignment_mode
         self.name_variations = {
             # Common name variations that should be treated as same person
             'WILLIAM': ['WILLIAMBURT', 'BILL'],
@@ -173,53 +321,226 @@ class EmployeeDataMerger:
     def _find_employee_matches(self, car_data: Dict, receipt_data: Dict) -> List[Dict[str, Any]]:
         """
         Find matches between CAR and Receipt employees
+        
+        In 'one_to_one' mode the pairs are resolved globally instead, see
+        _assign_one_to_one. Candidates come from an exact employee ID hash join
+        and name blocking (tokens, trigrams, Soundex). Blocks alone can miss
+        pairs, e.g. names sharing no block that still match through the
+        partial ID bonus, so every other receipt whose score bound (see
+        _ReceiptBounds) can still beat the best blocked score is scored as
+        well. Only pairs proven unable to win are skipped, so the selected
+        matches equal an exhaustive scan with the first-best-wins rule.
         """
+        receipt_items = list(receipt_data.items())
+        id_index, name_blocks = self._build_blocking_index(receipt_items)
+        bounds = _ReceiptBounds(receipt_items)
+        
+        if self.assignment_mode == ASSIGNMENT_ONE_TO_ONE:
+            return self._assign_one_to_one(car_data, receipt_items, id_index, bounds)
+        
         matches = []
         
         for car_key, car_employee in car_data.items():
-            best_match = None
-            best_score = 0.0
+            best_position, best_score, best_name_similarity = self._best_receipt(
+                car_employee, receipt_items, id_index, name_blocks, bounds
+            )
             
+            if best_position is not None:
+                receipt_key, receipt_employee = receipt_items[best_position]
+                matches.append(self._build_match(
+                    car_key, car_employee, receipt_key, receipt_employee, best_score, best_name_similarity
+                ))
+        
+        return matches
+    
+    def _best_receipt(self, car_employee: Dict[str, Any], receipt_items: List[Tuple[str, Dict[str, Any]]],
+                      id_index: Dict[str, List[int]], name_blocks: Dict[str, List[int]],
+                      bounds: '_ReceiptBounds') -> Tuple[Optional[int], float, Optional[float]]:
+        """
+        Highest scoring receipt position for a CAR employee (earliest on ties)
+        
+        Blocked candidates are scored first, highest bound first, then the rest
+        of the receipts in the same order; scanning stops once no remaining
+        bound can beat the best score found.
+        
+        Returns:
+            (position, score, name similarity), position None when nothing reaches the threshold
+        """
+        car_name = car_employee['normalized_name']
+        car_id = car_employee.get('employee_id')
+        
+        def score(position):
+            receipt_employee = receipt_items[position][1]
+            return self._score_pair(car_name, car_id, receipt_employee['normalized_name'], receipt_employee.get('employee_id'))
+        
+        # Exact ID hash join: an ID hit scores 1.0, so only earlier receipts
+        # that also score 1.0 can still win the (first best wins) tie-break
+        id_hit = id_index.get(car_id, [None])[0] if car_id else None
+        bound = bounds.bounds(car_name, car_id, id_index)
+        if id_hit is not None:
+            for position in bounds.positions_reaching(bound, 1.0, limit=id_hit):
+                pair_score, name_similarity = score(position)
+                if pair_score >= 1.0:
+                    return position, pair_score, name_similarity
+            return id_hit, 1.0, None
+        
+        best_position, best_score, best_name_similarity = None, 0.0, None
+        scored = set()
+        for positions in (self._candidate_positions(car_name, name_blocks), None):
+            for position, upper in bounds.order(bound, positions, max(self.similarity_threshold, best_score)):
+                if upper < max(self.similarity_threshold, best_score) - BOUND_TOLERANCE:
+                    break
+                if position in scored or (upper <= best_score and best_position is not None and position > best_position):
+                    continue
+                scored.add(position)
+                
+                pair_score, name_similarity = score(position)
+                if pair_score < self.similarity_threshold:
+                    continue
+                if pair_score > best_score or (pair_score == best_score and position < best_position):
+                    best_position, best_score, best_name_similarity = position, pair_score, name_similarity
+        
+        return best_position, best_score, best_name_similarity
+    
+    def _assign_one_to_one(self, car_data: Dict, receipt_items: List[Tuple[str, Dict[str, Any]]],
+                           id_index: Dict[str, List[int]], bounds: '_ReceiptBounds') -> List[Dict[str, Any]]:
+        """
+        Resolve all candidate pairs with a stable greedy assignment over a score heap
+        
+        Every pair whose upper bound reaches the threshold is scored and pushed
+        once if it does; pairs are then accepted highest score first (ties by
+        CAR then receipt order) while neither side is taken. Runs in
+        O(k log k) for k candidates.
+        """
+        heap = []
+        
+        for car_index, (car_key, car_employee) in enumerate(car_data.items()):
             car_name = car_employee['normalized_name']
             car_id = car_employee.get('employee_id')
             
-            for receipt_key, receipt_employee in receipt_data.items():
+            bound = bounds.bounds(car_name, car_id, id_index)
+            for position in bounds.positions_reaching(bound, self.similarity_threshold):
+                receipt_employee = receipt_items[position][1]
                 receipt_name = receipt_employee['normalized_name']
                 receipt_id = receipt_employee.get('employee_id')
                 
-                # Calculate match score
-                score = self._calculate_match_score(
-                    car_name, car_id,
-                    receipt_name, receipt_id
-                )
+                if self._score_upper_bound(car_name, car_id, receipt_name, receipt_id) < self.similarity_threshold:
+                    continue
                 
-                if score > best_score and score >= self.similarity_threshold:
-                    best_score = score
-                    best_match = {
-                        'car_key': car_key,
-                        'receipt_key': receipt_key,
-                        'car_employee': car_employee,
-                        'receipt_employee': receipt_employee,
-                        'match_score': score,
-                        'match_reason': self._get_match_reason(car_name, car_id, receipt_name, receipt_id)
-                    }
+                score, name_similarity = self._score_pair(car_name, car_id, receipt_name, receipt_id)
+                if score >= self.similarity_threshold:
+                    heap.append((-score, car_index, position, car_key, name_similarity))
+        
+        heapq.heapify(heap)
+        
+        assigned = {}
+        used_receipts = set()
+        while heap and len(assigned) < len(car_data) and len(used_receipts) < len(receipt_items):
+            neg_score, car_index, position, car_key, name_similarity = heapq.heappop(heap)
+            if car_key in assigned or position in used_receipts:
+                continue
             
-            if best_match:
-                matches.append(best_match)
-                logger.debug(f"Found match: {car_employee['employee_name']} <-> "
-                           f"{best_match['receipt_employee']['employee_name']} "
-                           f"(score: {best_score:.2f})")
+            receipt_key, receipt_employee = receipt_items[position]
+            assigned[car_key] = self._build_match(
+                car_key, car_data[car_key], receipt_key, receipt_employee, -neg_score, name_similarity
+            )
+            used_receipts.add(position)
         
-        return matches
+        # Report matches in CAR order like the per-employee mode
+        return [assigned[car_key] for car_key in car_data if car_key in assigned]
     
-    def _calculate_match_score(self, car_name: str, car_id: str, receipt_name: str, receipt_id: str) -> float:
+    def _build_match(self, car_key: str, car_employee: Dict[str, Any], receipt_key: str,
+                     receipt_employee: Dict[str, Any], score: float, name_similarity: Optional[float]) -> Dict[str, Any]:
         """
-        Calculate similarity score between two employee records
+        Build a match record for an accepted CAR/receipt pair
+        """
+        logger.debug(f"Found match: {car_employee['employee_name']} <-> "
+                   f"{receipt_employee['employee_name']} "
+                   f"(score: {score:.2f})")
+        
+        return {
+            'car_key': car_key,
+            'receipt_key': receipt_key,
+            'car_employee': car_employee,
+            'receipt_employee': receipt_employee,
+            'match_score': score,
+            'match_reason': self._get_match_reason(
+                car_employee['normalized_name'], car_employee.get('employee_id'),
+                receipt_employee['normalized_name'], receipt_employee.get('employee_id'),
+                name_similarity=name_similarity
+            )
+        }
+    
+    def _candidate_positions(self, normalized_name: str, name_blocks: Dict[str, List[int]]) -> Set[int]:
+        """
+        Receipt positions sharing at least one name block with the given name
+        """
+        candidates = set()
+        for block_key in self._blocking_keys(normalized_name):
+            candidates.update(name_blocks.get(block_key, ()))
+        return candidates
+    
+    def _build_blocking_index(self, receipt_items: List[Tuple[str, Dict[str, Any]]]) -> Tuple[Dict[str, List[int]], Dict[str, List[int]]]:
+        """
+        Build the employee ID hash index and name blocks over receipt positions
+        """
+        id_index = defaultdict(list)
+        name_blocks = defaultdict(list)
+        
+        for position, (receipt_key, receipt_employee) in enumerate(receipt_items):
+            receipt_id = receipt_employee.get('employee_id')
+            if receipt_id:
+                id_index[receipt_id].append(position)
+            for block_key in self._blocking_keys(receipt_employee['normalized_name']):
+                name_blocks[block_key].append(position)
+        
+        return id_index, name_blocks
+    
+    def _blocking_keys(self, normalized_name: str) -> Set[str]:
+        """
+        Blocking keys for a normalized name: tokens, Soundex codes and character trigrams
+        """
+        keys = set()
+        if not normalized_name:
+            keys.add('empty:')
+            return keys
+        
+        compact = normalized_name.replace(' ', '')
+        keys.add(f"name:{compact}")
+        
+        for token in normalized_name.split():
+            keys.add(f"tok:{token}")
+            phonetic = _soundex(token)
+            if phonetic:
+                keys.add(f"snd:{phonetic}")
+        
+        for i in range(len(compact) - 2):
+            keys.add(f"tri:{compact[i:i + 3]}")
+        
+        return keys
+    
+    def _score_upper_bound(self, car_name: str, car_id: str, receipt_name: str, receipt_id: str) -> float:
+        """
+        Cheap upper bound on _calculate_match_score used to skip hopeless candidates
         """
-        # Exact ID match has highest priority
         if car_id and receipt_id and car_id == receipt_id:
             return 1.0
         
+        matcher = SequenceMatcher(None, car_name, receipt_name)
+        id_bonus = ID_SIMILARITY_WEIGHT if car_id and receipt_id else 0.0
+        bound = matcher.real_quick_ratio() + id_bonus
+        if bound >= 1.0:
+            bound = matcher.quick_ratio() + id_bonus
+        return min(1.0, bound)
+    
+    def _score_pair(self, car_name: str, car_id: str, receipt_name: str, receipt_id: str) -> Tuple[float, Optional[float]]:
+        """
+        Calculate match score and the underlying name similarity (None for exact ID matches)
+        """
+        # Exact ID match has highest priority
+        if car_id and receipt_id and car_id == receipt_id:
+            return 1.0, None
+        
         # Name similarity
         name_similarity = SequenceMatcher(None, car_name, receipt_name).ratio()
         
@@ -227,11 +548,19 @@ class EmployeeDataMerger:
         id_bonus = 0.0
         if car_id and receipt_id:
             id_similarity = SequenceMatcher(None, car_id, receipt_id).ratio()
-            id_bonus = id_similarity * 0.3  # Weight ID similarity lower than name
+            id_bonus = id_similarity * ID_SIMILARITY_WEIGHT  # Weight ID similarity lower than name
         
-        return min(1.0, name_similarity + id_bonus)
+        return min(1.0, name_similarity + id_bonus), name_similarity
+    
+    def _calculate_match_score(self, car_name: str, car_id: str, receipt_name: str, receipt_id: str) -> float:
+        """
+        Calculate similarity score between two employee records
+        """
+        score, _ = self._score_pair(car_name, car_id, receipt_name, receipt_id)
+        return score
     
-    def _get_match_reason(self, car_name: str, car_id: str, receipt_name: str, receipt_id: str) -> str:
+    def _get_match_reason(self, car_name: str, car_id: str, receipt_name: str, receipt_id: str,
+                          name_similarity: Optional[float] = None) -> str:
         """
         Generate human-readable reason for the match
         """
@@ -240,8 +569,9 @@ class EmployeeDataMerger:
         elif car_name == receipt_name:
             return "Exact name match"
         else:
-            similarity = SequenceMatcher(None, car_name, receipt_name).ratio()
-            return f"Name similarity ({similarity:.2f})"
+            if name_similarity is None:
+                name_similarity = SequenceMatcher(None, car_name, receipt_name).ratio()
+            return f"Name similarity ({name_similarity:.2f})"
     
     def _create_merged_dataset(self, car_data: Dict, receipt_data: Dict, matches: List[Dict]) -> Dict[str, Dict[str, Any]]:
         """
@@ -455,14 +785,16 @@ class EmployeeDataMerger:
         }
 
 
-def create_employee_merger(similarity_threshold: float = 0.8) -> EmployeeDataMerger:
+def create_employee_merger(similarity_threshold: float = 0.8,
+                           assignment_mode: str = ASSIGNMENT_BEST_MATCH) -> EmployeeDataMerger:
     """
     Factory function to create EmployeeDataMerger instance
     
     Args:
         similarity_threshold: Minimum similarity for name matching (default: 0.8)
+        assignment_mode: 'best_match' or 'one_to_one' (default: 'best_match')
         
     Returns:
         EmployeeDataMerger instance
     """
-    return EmployeeDataMerger(similarity_threshold=similarity_threshold)
\ No newline at end of file
+    return EmployeeDataMerger(similarity_threshold=similarity_threshold, assignment_mode=assignment_mode)
\ No newline at end of file
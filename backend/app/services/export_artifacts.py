@@ -0,0 +1,287 @@
+"""
+Export Artifacts
+
+Export files (pVault CSV, follow-up Excel, issues PDF and their enhanced
+variants) depend only on a session's data, yet every download generated the
+file again. An export artifact is a generated file stored under its content
+hash in a per-version directory of the session, with an index mapping each
+export key (the export type and its options) to the file built for a data
+version (session_data_versions, see services.result_snapshots).
+
+Downloads are served from the stored file with FileResponse, which supports
+Range requests, under a strong ETag derived from the content hash. Text
+exports (CSV) also get a gzip-compressed copy, served as-is to clients that
+accept gzip. A file is built again only when the session's data version has
+changed, so repeated downloads by several reviewers cost one index read
+each. Identical content built for different keys of a version is stored once.
+
+Files are never removed while they may still be served: a version's directory
+is deleted only once it is no longer current and has not been stored to or
+served from for settings.export_artifact_grace_seconds, so a download that
+looked a file up just before the data changed (in this or another worker
+process) can still open it.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from .result_snapshots import data_version_token, read_data_version
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.json"
+
+# Generated content: the whole file, or text/bytes chunks written as they come
+ArtifactContent = Union[bytes, Iterable[Union[str, bytes]]]
+
+
+@dataclass
+class ExportArtifact:
+    """
+    A stored export file
+
+    Attributes:
+        path: Stored file
+        sha256: Hex digest of the file content
+        size: File size in bytes
+        filename: Download filename given when the file was built
+        media_type: Content type to serve
+        version: Data version token the file was built for
+        gzip_path: gzip-compressed copy (text exports only)
+    """
+    path: Path
+    sha256: str
+    size: int
+    filename: str
+    media_type: str
+    version: str
+    gzip_path: Optional[Path] = None
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.sha256[:32]}"'
+
+
+class ExportArtifactStore:
+    """
+    Export files under base_path/<session_id>/<data version>/<sha256><extension> (plus
+    <extension>.gz for text exports) with an index.json per session
+
+    Args:
+        base_path: Directory holding one sub-directory per session
+    """
+
+    def __init__(self, base_path: str):
+        self.base_path = Path(base_path)
+        self._lock = threading.Lock()
+
+    def session_dir(self, session_id) -> Path:
+        return self.base_path / str(uuid.UUID(str(session_id)))
+
+    def lookup(self, session_id, export_key: str, version: str) -> Optional[ExportArtifact]:
+        """
+        Stored file of an export for a data version
+
+        Returns:
+            ExportArtifact, or None when the export has not been built for this version
+        """
+        directory = self.session_dir(session_id)
+        entry = self._read_index(directory).get(export_key)
+        if entry is None or entry["version"] != version:
+            return None
+        artifact = self._artifact(directory, entry)
+        try:
+            # Marks the version as in use so it outlives the grace period after being superseded
+            os.utime(artifact.path.parent)
+        except FileNotFoundError:
+            return None
+        if not artifact.path.is_file() or (artifact.gzip_path and not artifact.gzip_path.is_file()):
+            return None
+        return artifact
+
+    def store(
+        self,
+        session_id,
+        export_key: str,
+        version: str,
+        content: ArtifactContent,
+        filename: str,
+        media_type: str
+    ) -> ExportArtifact:
+        """
+        Write an export file and index it for a data version
+
+        Content given as chunks is written and hashed as it is produced.
+        Entries of other data versions are dropped from the index; their
+        files are removed once unused for the grace period.
+
+        Args:
+            session_id: Session UUID
+            export_key: Export type and options
+            version: Data version token the content was built from
+            content: File content (bytes, or str/bytes chunks)
+            filename: Download filename
+            media_type: Content type to serve
+
+        Returns:
+            The stored ExportArtifact
+        """
+        directory = self.session_dir(session_id)
+        version_dir = directory / version
+        version_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = version_dir / f".{uuid.uuid4().hex}.tmp"
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(temp_path, "wb") as f:
+                for chunk in ([content] if isinstance(content, bytes) else content):
+                    data = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+                    digest.update(data)
+                    size += len(data)
+                    f.write(data)
+            blob = f"{digest.hexdigest()}{Path(filename).suffix}"
+            gzip_blob = f"{blob}.gz" if media_type.startswith("text/") else None
+            if gzip_blob and not (version_dir / gzip_blob).exists():
+                self._compress(temp_path, version_dir / gzip_blob)
+            os.replace(temp_path, version_dir / blob)
+            os.utime(version_dir)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+        entry = {
+            "version": version,
+            "blob": blob,
+            "gzip_blob": gzip_blob,
+            "sha256": digest.hexdigest(),
+            "size": size,
+            "filename": filename,
+            "media_type": media_type
+        }
+        with self._lock:
+            index = {
+                key: value for key, value in self._read_index(directory).items()
+                if value["version"] == version
+            }
+            index[export_key] = entry
+            self._write_index(directory, index)
+        self._remove_superseded(directory, version)
+
+        logger.info(f"Stored export artifact {export_key} ({version}) for session {session_id}: {size} bytes")
+        return self._artifact(directory, entry)
+
+    def delete(self, session_id):
+        """Remove every export file of a session"""
+        shutil.rmtree(self.session_dir(session_id), ignore_errors=True)
+
+    def _remove_superseded(self, directory: Path, version: str):
+        """Remove other versions' directories unused (not stored to or served from) for the grace period"""
+        cutoff = time.time() - settings.export_artifact_grace_seconds
+        for path in directory.iterdir():
+            if path.name in (INDEX_FILENAME, version) or path.name.startswith("."):
+                continue
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    continue
+                if path.is_dir():
+                    # Renamed first so a concurrent lookup finds the version gone, not half deleted
+                    trash = directory / f".{uuid.uuid4().hex}.removed"
+                    os.replace(path, trash)
+                    shutil.rmtree(trash, ignore_errors=True)
+                else:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _artifact(self, directory: Path, entry: Dict[str, Any]) -> ExportArtifact:
+        gzip_blob = entry.get("gzip_blob")
+        version_dir = directory / entry["version"]
+        return ExportArtifact(
+            path=version_dir / entry["blob"],
+            sha256=entry["sha256"],
+            size=entry["size"],
+            filename=entry["filename"],
+            media_type=entry["media_type"],
+            version=entry["version"],
+            gzip_path=version_dir / gzip_blob if gzip_blob else None
+        )
+
+    def _compress(self, source: Path, target: Path):
+        """Write a gzip copy of a file (fixed mtime, so equal content compresses to equal bytes)"""
+        temp_path = target.with_name(f".{uuid.uuid4().hex}.gz.tmp")
+        try:
+            with open(source, "rb") as src, open(temp_path, "wb") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as dst:
+                    shutil.copyfileobj(src, dst)
+            os.replace(temp_path, target)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    def _read_index(self, directory: Path) -> Dict[str, Dict[str, Any]]:
+        try:
+            return json.loads((directory / INDEX_FILENAME).read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable export artifact index in {directory}: {e}")
+            return {}
+
+    def _write_index(self, directory: Path, index: Dict[str, Dict[str, Any]]):
+        temp_path = directory / f".{uuid.uuid4().hex}.index.tmp"
+        temp_path.write_text(json.dumps(index, indent=2))
+        os.replace(temp_path, directory / INDEX_FILENAME)
+
+
+# Application store
+export_artifact_store = ExportArtifactStore(settings.export_artifact_path)
+
+
+def get_export_artifact(
+    db: Session,
+    session_id,
+    export_key: str,
+    media_type: str,
+    build: Callable[[], Tuple[ArtifactContent, str]]
+) -> Tuple[ExportArtifact, bool]:
+    """
+    Stored export file for the session's current data, building it when missing
+
+    Args:
+        db: Database session
+        session_id: Session UUID
+        export_key: Export type and options (e.g. "pvault-resolved")
+        media_type: Content type to serve
+        build: Returns (content, download filename); called only when the
+            export has not been built for the current data version (always
+            when export artifacts are disabled). Exceptions propagate.
+
+    Returns:
+        (artifact, built) where built tells whether build() was called
+    """
+    row = read_data_version(db, session_id)
+    version = data_version_token(row.version, row.changed_at) if row is not None else "v0"
+    if settings.export_artifacts_enabled:
+        artifact = export_artifact_store.lookup(session_id, export_key, version)
+        if artifact is not None:
+            return artifact, False
+
+    content, filename = build()
+    return export_artifact_store.store(session_id, export_key, version, content, filename, media_type), True
+
+
+def delete_export_artifacts(session_id):
+    """Remove a deleted session's export files"""
+    export_artifact_store.delete(session_id)
@@ -5,17 +5,21 @@ Export Generator for Credit Card Processor
 Provides comprehensive export generation services for multiple file formats.
 Handles pVault CSV exports, follow-up Excel reports, and issue PDF reports
 with proper formatting and MIME type handling.
+
+CSV exports are streamed: revisions are read with yield_per and only the
+columns the file needs, and the CSV is produced in chunks, so memory use
+does not grow with the session and the first bytes go out immediately.
 """
 
 import io
 import csv
 import logging
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional, Tuple, BinaryIO
+from typing import List, Dict, Any, Optional, Tuple, BinaryIO, Iterable, Iterator, Sequence
 from decimal import Decimal
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, select
 
 # Optional dependencies
 try:
@@ -42,9 +46,107 @@ from ..models import (
     ValidationStatus,
     ActivityType
 )
+from .result_snapshots import SESSION_ROW_ORDER, load_session_employees
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip and approximate characters per chunk when streaming CSV
+EXPORT_BATCH_SIZE = 500
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+# Columns of the pVault CSV (the enhanced variant adds validation_flags when details are requested)
+PVAULT_COLUMNS = (
+    EmployeeRevision.employee_id,
+    EmployeeRevision.employee_name,
+    EmployeeRevision.car_amount,
+    EmployeeRevision.receipt_amount,
+    EmployeeRevision.validation_status,
+    EmployeeRevision.created_at,
+    EmployeeRevision.resolved_by,
+    EmployeeRevision.resolution_notes
+)
+
+
+def export_statuses(include_resolved: bool = True) -> List[ValidationStatus]:
+    """Validation statuses included in pVault exports"""
+    if include_resolved:
+        # Include valid and resolved employees
+        return [ValidationStatus.VALID, ValidationStatus.RESOLVED]
+    # Only valid employees
+    return [ValidationStatus.VALID]
+
+
+def has_session_rows(db: Session, session_id, statuses: Iterable[ValidationStatus]) -> bool:
+    """Whether a session has any revision with one of the given statuses"""
+    return db.query(EmployeeRevision.revision_id).filter(
+        EmployeeRevision.session_id == session_id,
+        EmployeeRevision.validation_status.in_(list(statuses))
+    ).first() is not None
+
+
+def iter_session_rows(
+    db: Session,
+    session_id,
+    columns: Sequence[Any],
+    statuses: Optional[Iterable[ValidationStatus]] = None,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[Any]:
+    """
+    Stream a session's revisions as rows of the given columns
+
+    Rows are fetched batch_size at a time in SESSION_ROW_ORDER (created_at,
+    then revision_id), the order load_session_employees returns, walking the
+    (session_id, created_at, revision_id) index. Statuses are filtered here
+    (columns must include validation_status when statuses are given). The
+    query starts on the first iteration, so a caller may commit on db before
+    streaming.
+
+    Args:
+        db: Database session
+        session_id: Session UUID
+        columns: EmployeeRevision columns to read
+        statuses: Validation statuses to keep (all when None)
+        batch_size: Rows per fetch
+
+    Yields:
+        Rows with the columns as attributes
+    """
+    statuses = set(statuses) if statuses is not None else None
+    result = db.execute(
+        select(*columns).where(
+            EmployeeRevision.session_id == session_id
+        ).order_by(*SESSION_ROW_ORDER).execution_options(yield_per=batch_size)
+    )
+    try:
+        for row in result:
+            if statuses is None or row.validation_status in statuses:
+                yield row
+    finally:
+        result.close()
+
+
+def iter_csv_chunks(
+    headers: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    Write CSV rows (after the header row) and yield the text in chunks
+
+    The output is identical to writing every row with one csv.writer.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
 
 class ExportGenerator:
     """
@@ -85,86 +187,112 @@ class ExportGenerator:
         Returns:
             Tuple of (StringIO buffer, filename)
         """
+        chunks, filename = self.stream_pvault_csv(session, include_resolved, include_validation_details)
         try:
-            # Get employees for export
-            employees = self._get_employees_for_export(session, include_resolved)
-            
-            # Create CSV buffer
             csv_buffer = io.StringIO()
-            
-            # Define CSV headers for pVault compatibility
-            headers = [
-                "Employee_ID",
-                "Employee_Name", 
-                "Car_Allowance_Amount",
-                "Receipt_Amount",
-                "Amount_Difference",
-                "Validation_Status",
-                "Department",
-                "Position",
-                "Manager",
-                "Cost_Center",
-                "Processing_Date",
-                "Source_Document",
-                "Confidence_Score",
-                "Resolved_By",
-                "Resolution_Notes"
-            ]
-            
-            # Add validation details if requested
-            if include_validation_details:
-                headers.extend([
-                    "Validation_Issues",
-                    "Issue_Count",
-                    "Highest_Severity",
-                    "Requires_Review"
-                ])
-            
-            writer = csv.writer(csv_buffer)
-            writer.writerow(headers)
-            
-            # Write employee data
-            for employee in employees:
-                row_data = [
-                    employee.employee_id or "",
-                    employee.employee_name or "",
-                    self._format_amount_for_csv(employee.car_amount),
-                    self._format_amount_for_csv(employee.receipt_amount),
-                    self._calculate_amount_difference_csv(employee),
-                    employee.validation_status.value if employee.validation_status else "unknown",
-                    getattr(employee, 'department', '') or "",
-                    getattr(employee, 'position', '') or "",
-                    getattr(employee, 'manager', '') or "",
-                    getattr(employee, 'cost_center', '') or "",
-                    employee.created_at.strftime("%Y-%m-%d %H:%M:%S") if employee.created_at else "",
-                    employee.source or "system",
-                    employee.confidence if employee.confidence is not None else 1.0,
-                    employee.resolved_by or "",
-                    employee.resolution_notes or ""
-                ]
-                
-                # Add validation details if requested
-                if include_validation_details:
-                    flags = employee.validation_flags or {}
-                    row_data.extend([
-                        self._format_validation_issues_csv(flags),
-                        flags.get("total_issues", 0),
-                        flags.get("highest_severity", "none"),
-                        flags.get("requires_review", False)
-                    ])
-                
-                writer.writerow(row_data)
-            
-            # Generate filename
-            filename = self._generate_filename(session, "pvault", "csv")
-            
-            logger.info(f"Generated pVault CSV with {len(employees)} employees for session {session.session_name}")
+            for chunk in chunks:
+                csv_buffer.write(chunk)
             return csv_buffer, filename
             
         except Exception as e:
             logger.error(f"pVault CSV generation error: {str(e)}")
             raise ValueError(f"Failed to generate pVault CSV: {str(e)}")
     
+    def stream_pvault_csv(
+        self,
+        session: ProcessingSession,
+        include_resolved: bool = True,
+        include_validation_details: bool = False
+    ) -> Tuple[Iterator[str], str]:
+        """
+        Stream a pVault-compatible CSV file
+        
+        Args:
+            session: Processing session
+            include_resolved: Whether to include resolved issues
+            include_validation_details: Whether to include validation flags
+            
+        Returns:
+            Tuple of (iterator of CSV text chunks, filename); rows are read
+            while the chunks are consumed
+        """
+        # Define CSV headers for pVault compatibility
+        headers = [
+            "Employee_ID",
+            "Employee_Name", 
+            "Car_Allowance_Amount",
+            "Receipt_Amount",
+            "Amount_Difference",
+            "Validation_Status",
+            "Department",
+            "Position",
+            "Manager",
+            "Cost_Center",
+            "Processing_Date",
+            "Source_Document",
+            "Confidence_Score",
+            "Resolved_By",
+            "Resolution_Notes"
+        ]
+        columns = list(PVAULT_COLUMNS)
+        
+        # Add validation details if requested
+        if include_validation_details:
+            headers.extend([
+                "Validation_Issues",
+                "Issue_Count",
+                "Highest_Severity",
+                "Requires_Review"
+            ])
+            columns.append(EmployeeRevision.validation_flags)
+        
+        # Generate filename
+        filename = self._generate_filename(session, "pvault", "csv")
+        
+        def rows():
+            count = 0
+            employees = iter_session_rows(self.db, session.session_id, columns, export_statuses(include_resolved))
+            for employee in employees:
+                count += 1
+                yield self._pvault_row(employee, include_validation_details)
+            logger.info(f"Generated pVault CSV with {count} employees for session {session.session_name}")
+        
+        return iter_csv_chunks(headers, rows()), filename
+    
+    def _pvault_row(self, employee: Any, include_validation_details: bool) -> List[Any]:
+        """pVault CSV values of one revision (a model instance or a projected row)"""
+        # Source and confidence are not revision columns; defaults unless an object carries them
+        confidence = getattr(employee, 'confidence', None)
+        row_data = [
+            employee.employee_id or "",
+            employee.employee_name or "",
+            self._format_amount_for_csv(employee.car_amount),
+            self._format_amount_for_csv(employee.receipt_amount),
+            self._calculate_amount_difference_csv(employee),
+            employee.validation_status.value if employee.validation_status else "unknown",
+            getattr(employee, 'department', '') or "",
+            getattr(employee, 'position', '') or "",
+            getattr(employee, 'manager', '') or "",
+            getattr(employee, 'cost_center', '') or "",
+            employee.created_at.strftime("%Y-%m-%d %H:%M:%S") if employee.created_at else "",
+            getattr(employee, 'source', None) or "system",
+            confidence if confidence is not None else 1.0,
+            employee.resolved_by or "",
+            employee.resolution_notes or ""
+        ]
+        
+        # Add validation details if requested
+        if include_validation_details:
+            flags = employee.validation_flags or {}
+            row_data.extend([
+                self._format_validation_issues_csv(flags),
+                flags.get("total_issues", 0),
+                flags.get("highest_severity", "none"),
+                flags.get("requires_review", False)
+            ])
+        
+        return row_data
+    
     def generate_followup_excel(
         self,
         session: ProcessingSession,
@@ -372,38 +500,9 @@ class ExportGenerator:
     
     # Private helper methods
     
-    def _get_employees_for_export(
-        self,
-        session: ProcessingSession,
-        include_resolved: bool = True
-    ) -> List[EmployeeRevision]:
-        """Get employees for export based on criteria"""
-        query = self.db.query(EmployeeRevision).filter(
-            EmployeeRevision.session_id == session.session_id
-        )
-        
-        if include_resolved:
-            # Include valid and resolved employees
-            query = query.filter(
-                EmployeeRevision.validation_status.in_([
-                    ValidationStatus.VALID,
-                    ValidationStatus.RESOLVED
-                ])
-            )
-        else:
-            # Only valid employees
-            query = query.filter(
-                EmployeeRevision.validation_status == ValidationStatus.VALID
-            )
-        
-        return query.all()
-    
     def _get_employees_needing_attention(self, session: ProcessingSession) -> List[EmployeeRevision]:
         """Get employees that need manual attention"""
-        return self.db.query(EmployeeRevision).filter(
-            EmployeeRevision.session_id == session.session_id,
-            EmployeeRevision.validation_status == ValidationStatus.NEEDS_ATTENTION
-        ).all()
+        return load_session_employees(self.db, session.session_id, [ValidationStatus.NEEDS_ATTENTION])
     
     def _format_amount_for_csv(self, amount: Optional[Decimal]) -> str:
         """Format amount for CSV output"""
@@ -0,0 +1,484 @@
+"""
+Incremental Validation for Credit Card Processor
+
+Keeps the validation state of a session in memory: per-employee rule
+outcomes, the batch validation context (duplicate counts) and status
+statistics. Issue resolutions and receipt reprocessing apply their changes
+to this state, which re-runs only the rules depending on the changed fields
+for the changed employees (plus duplicate peers), updates the context by
+delta and keeps the statistics current without rescanning the session.
+
+A cached state is tagged with the session's data version and reloaded when
+another request or worker has changed the session's revisions since.
+"""
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from ..models import EmployeeRevision, SessionDataVersion, ValidationStatus
+from .validation_engine import (
+    ValidationEngine,
+    ValidationIssueType,
+    ValidationRule,
+    create_validation_engine,
+    _normalize_id_key,
+    _normalize_name_key
+)
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Employee fields validation rules read from an EmployeeRevision
+VALIDATED_FIELDS = ("employee_id", "employee_name", "car_amount", "receipt_amount")
+
+# Number of session states kept in memory (least recently used are dropped)
+MAX_CACHED_SESSIONS = 32
+
+# validation_flags keys owned by the rules; other keys (e.g. line counts) are kept
+ISSUE_FLAG_KEYS = frozenset(issue_type.value for issue_type in ValidationIssueType)
+
+
+def _state_key(value: Any) -> str:
+    """Canonical string form of a session or revision UUID"""
+    try:
+        return str(uuid.UUID(str(value)))
+    except (ValueError, TypeError):
+        return str(value)
+
+
+def _normalize_amount(value: Any) -> Any:
+    """Decimal view of an amount so float and Numeric values compare equal"""
+    if value is None or isinstance(value, Decimal):
+        return value
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return value
+
+
+def revision_to_employee(revision: Any) -> Dict[str, Any]:
+    """
+    Extract the validated fields from an EmployeeRevision (or row with the same attributes)
+
+    Args:
+        revision: EmployeeRevision instance or query row
+
+    Returns:
+        Employee data dictionary for the validation rules (missing amounts are
+        omitted so the rules apply their defaults)
+    """
+    employee = {
+        "employee_id": revision.employee_id,
+        "employee_name": revision.employee_name
+    }
+    for field in ("car_amount", "receipt_amount"):
+        value = getattr(revision, field)
+        if value is not None:
+            employee[field] = _normalize_amount(value)
+    return employee
+
+
+class SessionValidationState:
+    """
+    In-memory validation state of one processing session
+
+    Employees are keyed by revision ID. Rule outcomes are stored per rule so a
+    change only replaces the outcomes of the rules it can affect.
+    """
+
+    def __init__(self, session_id: str, engine: Optional[ValidationEngine] = None):
+        """
+        Initialize an empty session validation state
+
+        Args:
+            session_id: Processing session UUID
+            engine: Validation engine providing the rules (default engine when None)
+        """
+        self.session_id = _state_key(session_id)
+        self.data_version: Optional[tuple] = None
+        self.engine = engine or create_validation_engine()
+        self.context = self.engine.build_context([])
+        self.employees: Dict[str, Dict[str, Any]] = {}
+        self.statuses: Dict[str, ValidationStatus] = {}
+        self.issues: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.status_counts: Dict[ValidationStatus, int] = {status: 0 for status in ValidationStatus}
+        self.issue_type_counts: Dict[str, int] = {}
+        self._batch_rules = [rule for rule in self.engine.rules if rule.required_indexes]
+        self._name_members: Dict[str, Set[str]] = defaultdict(set)
+        self._id_members: Dict[str, Set[str]] = defaultdict(set)
+        self._lock = threading.RLock()
+
+    def load(self, employees: Dict[str, Dict[str, Any]], statuses: Dict[str, ValidationStatus]):
+        """
+        Load all employees of the session and evaluate every rule once
+
+        Args:
+            employees: Employee data keyed by revision ID
+            statuses: Current validation status keyed by revision ID
+        """
+        with self._lock:
+            self.employees = dict(employees)
+            self.context = self.engine.build_context(list(self.employees.values()))
+            for key, employee in self.employees.items():
+                self._add_members(key, employee)
+            for key, employee in self.employees.items():
+                self._store_issues(key, self._run_rules(employee, self.engine.rules))
+                self.set_status(key, statuses.get(key, ValidationStatus.VALID))
+
+    def apply_changes(self, changes: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, ValidationStatus]:
+        """
+        Apply changed, added (new key) or removed (None) employees and revalidate incrementally
+
+        Args:
+            changes: Employee data keyed by revision ID, None for removed employees
+
+        Returns:
+            New validation status for every remaining employee whose data or rule outcomes changed
+        """
+        with self._lock:
+            updated: Dict[str, Set[str]] = {}
+            peers: Set[str] = set()
+
+            for key, employee in changes.items():
+                previous = self.employees.get(key)
+                if employee is None:
+                    if previous is not None:
+                        peers |= self._peers(previous)
+                        self._remove(key, previous)
+                    continue
+
+                if previous is None:
+                    changed_fields = set(employee)
+                else:
+                    changed_fields = {field for field in set(employee) | set(previous)
+                                      if employee.get(field) != previous.get(field)}
+                if not changed_fields:
+                    continue
+
+                # Duplicate peers are affected only when a batch rule's fields changed
+                affects_peers = any(not rule.depends_on or changed_fields.intersection(rule.depends_on)
+                                    for rule in self._batch_rules)
+                if previous is not None:
+                    if affects_peers:
+                        peers |= self._peers(previous)
+                    self._remove_members(key, previous)
+                    self.context.remove_employee(previous)
+                self.employees[key] = employee
+                self._add_members(key, employee)
+                self.context.add_employee(employee)
+                if affects_peers:
+                    peers |= self._peers(employee)
+                updated[key] = changed_fields
+
+            # Batch counts are final now; re-run the affected rules
+            results: Dict[str, ValidationStatus] = {}
+            for key, changed_fields in updated.items():
+                rules = self.engine.rules if key not in self.statuses else self.engine.rules_for_fields(changed_fields)
+                self._revalidate(key, rules)
+                results[key] = self.statuses[key]
+
+            for key in peers - set(updated):
+                if key in self.employees and self._revalidate(key, self._batch_rules):
+                    results[key] = self.statuses[key]
+
+            return results
+
+    def set_status(self, key: str, status: ValidationStatus):
+        """
+        Record a status change (e.g. an issue resolution) without revalidating
+
+        Args:
+            key: Revision ID
+            status: New validation status
+        """
+        with self._lock:
+            previous = self.statuses.get(key)
+            if previous == status:
+                return
+            if previous is not None:
+                self.status_counts[previous] -= 1
+            self.statuses[key] = status
+            self.status_counts[status] += 1
+
+    def validation_flags(self, key: str, existing: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Validation flags for an employee in the processing pipeline schema
+
+        Args:
+            key: Revision ID
+            existing: Current validation_flags of the revision
+
+        Returns:
+            Flags with one true entry per current issue type (e.g.
+            {"missing_receipt": True}) and the existing non-issue keys
+        """
+        flags = {name: value for name, value in (existing or {}).items() if name not in ISSUE_FLAG_KEYS}
+        for issue in self.issues.get(key, {}).values():
+            flags[issue["type"]] = True
+        return flags
+
+    def statistics(self) -> Dict[str, Any]:
+        """
+        Current session statistics, maintained by delta
+
+        Returns:
+            Status and issue type counts
+        """
+        with self._lock:
+            return {
+                "total_employees": len(self.statuses),
+                "valid_employees": self.status_counts[ValidationStatus.VALID],
+                "needs_attention": self.status_counts[ValidationStatus.NEEDS_ATTENTION],
+                "resolved_employees": self.status_counts[ValidationStatus.RESOLVED],
+                "issue_counts": {issue_type: count for issue_type, count in self.issue_type_counts.items() if count}
+            }
+
+    def _revalidate(self, key: str, rules: List[ValidationRule]) -> bool:
+        """
+        Re-run rules for one employee, keeping the outcomes of the other rules
+
+        Returns:
+            True when the employee's issue types changed
+        """
+        previous = self.issues.get(key, {})
+        outcomes = {name: issue for name, issue in previous.items()
+                    if name not in {rule.name for rule in rules}}
+        outcomes.update(self._run_rules(self.employees[key], rules))
+
+        previous_types = {issue["type"] for issue in previous.values()}
+        current_types = {issue["type"] for issue in outcomes.values()}
+        self._store_issues(key, outcomes)
+
+        status = self.statuses.get(key)
+        if not current_types:
+            new_status = ValidationStatus.VALID
+        elif status == ValidationStatus.RESOLVED and current_types <= previous_types:
+            # A resolution stands until a change introduces a new kind of issue
+            new_status = ValidationStatus.RESOLVED
+        else:
+            new_status = ValidationStatus.NEEDS_ATTENTION
+        self.set_status(key, new_status)
+
+        return current_types != previous_types
+
+    def _run_rules(self, employee: Dict[str, Any], rules: Iterable[ValidationRule]) -> Dict[str, Dict[str, Any]]:
+        """Evaluate rules for one employee against the session context"""
+        context = {"index": self.context}
+        detected_at = datetime.now(timezone.utc).isoformat()
+        outcomes = {}
+        for rule in rules:
+            try:
+                issue = rule.validate(employee, context)
+            except Exception as e:
+                logger.error(f"Error in validation rule {rule.name}: {str(e)}")
+                continue
+            if issue:
+                issue["rule_name"] = rule.name
+                issue["detected_at"] = detected_at
+                outcomes[rule.name] = issue
+        return outcomes
+
+    def _store_issues(self, key: str, outcomes: Dict[str, Dict[str, Any]]):
+        """Replace an employee's rule outcomes and adjust issue type counts"""
+        for issue in self.issues.get(key, {}).values():
+            self.issue_type_counts[issue["type"]] -= 1
+        self.issues[key] = outcomes
+        for issue in outcomes.values():
+            self.issue_type_counts[issue["type"]] = self.issue_type_counts.get(issue["type"], 0) + 1
+
+    def _remove(self, key: str, employee: Dict[str, Any]):
+        """Drop an employee from the state"""
+        self._remove_members(key, employee)
+        self.context.remove_employee(employee)
+        self._store_issues(key, {})
+        del self.issues[key]
+        del self.employees[key]
+        status = self.statuses.pop(key, None)
+        if status is not None:
+            self.status_counts[status] -= 1
+
+    def _peers(self, employee: Dict[str, Any]) -> Set[str]:
+        """Employees sharing a normalized name or ID with this employee"""
+        if not self._batch_rules:
+            return set()
+        name_key = _normalize_name_key(employee.get("employee_name"))
+        id_key = _normalize_id_key(employee.get("employee_id"))
+        peers = set(self._name_members.get(name_key, ())) if name_key else set()
+        if id_key:
+            peers |= self._id_members.get(id_key, set())
+        return peers
+
+    def _add_members(self, key: str, employee: Dict[str, Any]):
+        """Register an employee under its duplicate keys"""
+        name_key = _normalize_name_key(employee.get("employee_name"))
+        id_key = _normalize_id_key(employee.get("employee_id"))
+        if name_key:
+            self._name_members[name_key].add(key)
+        if id_key:
+            self._id_members[id_key].add(key)
+
+    def _remove_members(self, key: str, employee: Dict[str, Any]):
+        """Unregister an employee from its duplicate keys"""
+        for members, member_key in ((self._name_members, _normalize_name_key(employee.get("employee_name"))),
+                                    (self._id_members, _normalize_id_key(employee.get("employee_id")))):
+            if member_key and member_key in members:
+                members[member_key].discard(key)
+                if not members[member_key]:
+                    del members[member_key]
+
+
+# Session states keyed by session ID, most recently used last
+_session_states: "OrderedDict[str, SessionValidationState]" = OrderedDict()
+_states_lock = threading.Lock()
+
+
+def _read_data_version(db: Session, session_id: str) -> Optional[tuple]:
+    """Session data version (counter and change time), None before the first change"""
+    row = db.query(SessionDataVersion.version, SessionDataVersion.changed_at).filter(
+        SessionDataVersion.session_id == session_id
+    ).first()
+    return (row.version, row.changed_at) if row else None
+
+
+def get_validation_state(db: Session, session_id: str, build: bool = True) -> Optional[SessionValidationState]:
+    """
+    Get the cached validation state of a session, loading it from the database when needed
+
+    A cached state is reused only while the session's data version matches
+    the one it was loaded or last written at.
+
+    Args:
+        db: Database session (None to return the cached state unchecked)
+        session_id: Processing session UUID
+        build: Load the state when it is not cached (otherwise return None)
+
+    Returns:
+        SessionValidationState, or None when not cached and build is False
+    """
+    key = _state_key(session_id)
+    data_version = _read_data_version(db, session_id) if db is not None else None
+    with _states_lock:
+        state = _session_states.get(key)
+        if state is not None and (db is None or state.data_version == data_version):
+            _session_states.move_to_end(key)
+            return state
+        if state is not None:
+            # Changed elsewhere since the state was built
+            del _session_states[key]
+
+    if not build or db is None:
+        return None
+
+    rows = db.query(
+        EmployeeRevision.revision_id,
+        EmployeeRevision.employee_id,
+        EmployeeRevision.employee_name,
+        EmployeeRevision.car_amount,
+        EmployeeRevision.receipt_amount,
+        EmployeeRevision.validation_status
+    ).filter(EmployeeRevision.session_id == session_id).all()
+
+    state = SessionValidationState(key)
+    state.data_version = data_version
+    state.load(
+        {_state_key(row.revision_id): revision_to_employee(row) for row in rows},
+        {_state_key(row.revision_id): row.validation_status for row in rows}
+    )
+    logger.debug(f"Loaded validation state for session {key} ({len(rows)} employees)")
+
+    with _states_lock:
+        _session_states[key] = state
+        _session_states.move_to_end(key)
+        while len(_session_states) > MAX_CACHED_SESSIONS:
+            _session_states.popitem(last=False)
+    return state
+
+
+def invalidate_validation_state(session_id: str):
+    """
+    Drop the cached validation state of a session (e.g. after a full reprocess)
+
+    Args:
+        session_id: Processing session UUID
+    """
+    with _states_lock:
+        _session_states.pop(_state_key(session_id), None)
+
+
+def record_status_change(session_id: str, revision_id: str, status: ValidationStatus):
+    """
+    Apply a status-only change (issue resolution) to a cached session state
+
+    Args:
+        session_id: Processing session UUID
+        revision_id: Employee revision UUID
+        status: New validation status
+    """
+    state = get_validation_state(None, session_id, build=False)
+    if state is not None:
+        state.set_status(_state_key(revision_id), status)
+
+
+def revalidate_revisions(db: Session,
+                         session_id: str,
+                         revisions: Iterable[EmployeeRevision],
+                         state: Optional[SessionValidationState] = None) -> Dict[str, Any]:
+    """
+    Revalidate changed employee revisions and persist the new outcomes
+
+    Revisions whose validated fields changed are revalidated (affected rules
+    only) and receive new validation status and flags; revisions whose data is
+    unchanged only have their status synced into the state. Duplicate peers
+    whose outcome changed are updated as well. The caller commits.
+
+    Changes are detected against the state, so it must hold the data from
+    before the revisions were modified: pass the state obtained with
+    get_validation_state before applying the changes.
+
+    Args:
+        db: Database session
+        session_id: Processing session UUID
+        revisions: Added or modified EmployeeRevision instances (flushed, with IDs)
+        state: Validation state captured before the changes (cached state when None)
+
+    Returns:
+        Dictionary with revalidation counts and the refreshed statistics
+    """
+    if state is None:
+        state = get_validation_state(db, session_id)
+    revisions_by_key = {_state_key(revision.revision_id): revision for revision in revisions}
+
+    results = state.apply_changes({key: revision_to_employee(revision) for key, revision in revisions_by_key.items()})
+
+    for key, revision in revisions_by_key.items():
+        if key not in results:
+            state.set_status(key, revision.validation_status)
+
+    peer_keys = [key for key in results if key not in revisions_by_key]
+    if peer_keys:
+        peers = db.query(EmployeeRevision).filter(EmployeeRevision.revision_id.in_(peer_keys)).all()
+        revisions_by_key.update({_state_key(peer.revision_id): peer for peer in peers})
+
+    for key, status in results.items():
+        revision = revisions_by_key.get(key)
+        if revision is None:
+            continue
+        revision.validation_status = status
+        revision.validation_flags = state.validation_flags(key, revision.validation_flags)
+
+    # The state now reflects this transaction's writes
+    db.flush()
+    state.data_version = _read_data_version(db, session_id)
+
+    logger.info(f"Revalidated {len(results)} employees for session {session_id}")
+    return {
+        "revalidated_employees": len(results),
+        "statistics": state.statistics()
+    }
@@ -19,6 +19,8 @@ from ..models import (
     ValidationStatus,
     ActivityType
 )
+from .incremental_validation import record_status_change
+from .session_statistics import get_session_statistics
 
 logger = logging.getLogger(__name__)
 
@@ -161,6 +163,9 @@ class IssueResolutionManager:
             # Commit changes
             self.db.commit()
             
+            # Keep cached session statistics current without recounting
+            record_status_change(employee.session_id, revision_id, ValidationStatus.RESOLVED)
+            
             logger.info(f"Issue resolved for revision {revision_id} by {resolved_by}")
             return resolution_result
             
@@ -257,8 +262,6 @@ class IssueResolutionManager:
             Dictionary with resolution statistics
         """
         try:
-            from sqlalchemy import func
-            
             # Get session
             session = self.db.query(ProcessingSession).filter(
                 ProcessingSession.session_id == session_id
@@ -271,35 +274,26 @@ class IssueResolutionManager:
                     "session_id": session_id
                 }
             
-            # Count by validation status
-            status_counts = self.db.query(
-                EmployeeRevision.validation_status,
-                func.count(EmployeeRevision.revision_id).label('count')
-            ).filter(
-                EmployeeRevision.session_id == session_id
-            ).group_by(EmployeeRevision.validation_status).all()
+            # Status counts come from the trigger-maintained session_statistics row
+            session_stats = get_session_statistics(self.db, session_id)
+            issue_counts = {
+                "missing_receipt": session_stats["missing_receipt_flagged"],
+                "amount_mismatch": session_stats["amount_mismatch"],
+                "coding_incomplete": session_stats["coding_incomplete"]
+            }
             
             statistics = {
                 "session_id": session_id,
                 "session_name": session.session_name,
-                "total_employees": sum(count for _, count in status_counts),
-                "valid_employees": 0,
-                "needs_attention": 0,
-                "resolved_employees": 0,
+                "total_employees": session_stats["total_employees"],
+                "valid_employees": session_stats["valid_employees"],
+                "needs_attention": session_stats["needs_attention_employees"],
+                "resolved_employees": session_stats["resolved_employees"],
                 "resolution_rate": 0.0,
-                "pending_issues": 0
+                "pending_issues": session_stats["needs_attention_employees"],
+                "issue_counts": {issue_type: count for issue_type, count in issue_counts.items() if count}
             }
             
-            # Process status counts
-            for status, count in status_counts:
-                if status == ValidationStatus.VALID:
-                    statistics["valid_employees"] = count
-                elif status == ValidationStatus.NEEDS_ATTENTION:
-                    statistics["needs_attention"] = count
-                    statistics["pending_issues"] = count
-                elif status == ValidationStatus.RESOLVED:
-                    statistics["resolved_employees"] = count
-            
             # Calculate resolution rate
             total_issues = statistics["needs_attention"] + statistics["resolved_employees"]
             if total_issues > 0:
@@ -0,0 +1,296 @@
+"""
+Employee Merge Engine
+
+Single merge path for CAR and Receipt employee records. Receipt records are
+indexed by normalized employee ID, CAR records are streamed through a hash
+join, and only the records left over after the join are fuzzy-matched by name
+(blocked, one-to-one) using EmployeeDataMerger. Merged records are emitted in
+the shape the persistence stage (EmployeeRevision batches) consumes, with the
+source dicts referenced rather than copied.
+"""
+
+import logging
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from ..models import ValidationStatus
+from .employee_merger import EmployeeDataMerger, ASSIGNMENT_ONE_TO_ONE
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+_NON_DIGITS = re.compile(r"\D+")
+
+
+def normalize_employee_id(value: Any) -> Optional[str]:
+    """
+    Normalize an employee ID to digits only for reliable matching
+
+    Args:
+        value: Raw employee ID as extracted from a document
+
+    Returns:
+        Digits-only ID, or None when the value has no digits
+    """
+    if value is None:
+        return None
+    norm = _NON_DIGITS.sub("", str(value))
+    return norm if norm else None
+
+
+def _non_positive(amount: Any) -> bool:
+    """True when an amount is missing, unparseable or not greater than zero"""
+    if amount is None:
+        return True
+    try:
+        return float(amount) <= 0
+    except (TypeError, ValueError):
+        return True
+
+
+class EmployeeRecord:
+    """
+    Compact view of one source employee record used during merging
+    """
+    __slots__ = ("source", "position", "employee_id", "employee_name", "amount", "raw")
+
+    def __init__(self, source: str, position: int, employee_id: Optional[str],
+                 employee_name: Optional[str], amount: Any, raw: Dict[str, Any]):
+        self.source = source
+        self.position = position
+        self.employee_id = employee_id
+        self.employee_name = employee_name
+        self.amount = amount
+        self.raw = raw
+
+    @classmethod
+    def from_source(cls, raw: Dict[str, Any], source: str, position: int,
+                    id_normalizer: Callable[[Any], Optional[str]]) -> "EmployeeRecord":
+        """
+        Build a record from a processor dict ('car_amount'/'receipt_amount',
+        falling back to the parser's 'car_total'/'receipt_total')
+        """
+        amount = raw.get(f"{source}_amount")
+        if amount is None:
+            amount = raw.get(f"{source}_total")
+        return cls(
+            source=source,
+            position=position,
+            employee_id=id_normalizer(raw.get("employee_id")),
+            employee_name=raw.get("employee_name"),
+            amount=amount,
+            raw=raw
+        )
+
+
+class MergeEngine:
+    """
+    Hash-join-then-fuzzy merge of CAR and Receipt employee records
+    """
+
+    def __init__(self, similarity_threshold: float = 0.8, fuzzy_matching: bool = True,
+                 id_normalizer: Callable[[Any], Optional[str]] = normalize_employee_id):
+        """
+        Initialize merge engine
+
+        Args:
+            similarity_threshold: Minimum name similarity for fuzzy matching leftovers
+            fuzzy_matching: Fuzzy-match records left over after the ID join
+            id_normalizer: Function normalizing raw employee IDs for the join
+        """
+        self.similarity_threshold = similarity_threshold
+        self.fuzzy_matching = fuzzy_matching
+        self.id_normalizer = id_normalizer
+        self.merger = EmployeeDataMerger(
+            similarity_threshold=similarity_threshold,
+            assignment_mode=ASSIGNMENT_ONE_TO_ONE
+        )
+
+    def merge(self, car_employees: Iterable[Dict[str, Any]],
+              receipt_employees: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Merge CAR and Receipt employees
+
+        Receipts are materialized into the join index; CAR employees are streamed
+        and ID-joined records are yielded immediately. CAR and receipt records
+        without an ID partner are fuzzy-matched afterwards, then the remaining
+        receipt-only records are yielded in document order.
+
+        Args:
+            car_employees: Employee records from the CAR document
+            receipt_employees: Employee records from the Receipt document
+
+        Yields:
+            Merged employee dicts ready for persistence
+        """
+        receipts: List[EmployeeRecord] = []
+        receipt_index: Dict[str, EmployeeRecord] = {}
+        for position, raw in enumerate(receipt_employees):
+            record = EmployeeRecord.from_source(raw, "receipt", position, self.id_normalizer)
+            receipts.append(record)
+            if record.employee_id and record.employee_id not in receipt_index:
+                receipt_index[record.employee_id] = record
+
+        joined_positions = set()
+        car_leftovers: List[EmployeeRecord] = []
+
+        for position, raw in enumerate(car_employees):
+            car = EmployeeRecord.from_source(raw, "car", position, self.id_normalizer)
+            receipt = receipt_index.pop(car.employee_id, None) if car.employee_id else None
+            if receipt is not None:
+                joined_positions.add(receipt.position)
+                yield self._emit(car, receipt, 1.0, "Exact Employee ID match")
+            else:
+                car_leftovers.append(car)
+
+        receipt_leftovers = [r for r in receipts if r.position not in joined_positions]
+
+        fuzzy_matches = {}
+        if self.fuzzy_matching and car_leftovers and receipt_leftovers:
+            fuzzy_matches = self._match_leftovers(car_leftovers, receipt_leftovers)
+
+        matched_receipts = set()
+        for car in car_leftovers:
+            match = fuzzy_matches.get(car.position)
+            if match is not None:
+                receipt, score, reason = match
+                matched_receipts.add(receipt.position)
+                yield self._emit(car, receipt, score, reason)
+            else:
+                yield self._emit(car, None, 0.0, "No receipt data found")
+
+        for receipt in receipt_leftovers:
+            if receipt.position not in matched_receipts:
+                yield self._emit(None, receipt, 0.0, "No CAR data found")
+
+    def merge_documents(self, car_employees: Dict[str, Dict[str, Any]],
+                        receipt_employees: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge keyed employee data from the CAR and Receipt document parsers
+
+        Pairs are found by merge(); the result keeps the shape of
+        EmployeeDataMerger.merge_employee_data (employees with page ranges
+        keyed by CAR key or "receipt_<key>", summary and matches) used by
+        employee analysis and document splitting.
+
+        Args:
+            car_employees: CAR employees keyed as returned by the parser
+            receipt_employees: Receipt employees keyed as returned by the parser
+
+        Returns:
+            Dictionary with 'employees', 'summary' and 'matches'
+        """
+        car_normalized = self.merger._normalize_employee_data(car_employees, 'car')
+        receipt_normalized = self.merger._normalize_employee_data(receipt_employees, 'receipt')
+        car_keys = {id(raw): key for key, raw in car_employees.items()}
+        receipt_keys = {id(raw): key for key, raw in receipt_employees.items()}
+
+        matches = []
+        for record in self.merge(car_employees.values(), receipt_employees.values()):
+            if record["match_status"] != "matched":
+                continue
+            car_key = car_keys[id(record["car_data"])]
+            receipt_key = receipt_keys[id(record["receipt_data"])]
+            matches.append({
+                "car_key": car_key,
+                "receipt_key": receipt_key,
+                "car_employee": car_normalized[car_key],
+                "receipt_employee": receipt_normalized[receipt_key],
+                "match_score": record["match_score"],
+                "match_reason": record["match_reason"]
+            })
+
+        employees = self.merger._create_merged_dataset(car_normalized, receipt_normalized, matches)
+        return {
+            "employees": employees,
+            "summary": self.merger._generate_merge_summary(employees, matches),
+            "matches": matches
+        }
+
+    def _match_leftovers(self, car_leftovers: List[EmployeeRecord],
+                         receipt_leftovers: List[EmployeeRecord]) -> Dict[int, Any]:
+        """
+        One-to-one fuzzy name matching of records not resolved by the ID join
+        """
+        merger = self.merger
+
+        def candidates(records: List[EmployeeRecord]) -> Dict[int, Dict[str, Any]]:
+            return {
+                record.position: {
+                    "employee_id": record.employee_id,
+                    "employee_name": record.employee_name,
+                    "normalized_name": merger._normalize_name(record.employee_name or ""),
+                    "record": record
+                }
+                for record in records
+            }
+
+        matches = merger._find_employee_matches(candidates(car_leftovers), candidates(receipt_leftovers))
+        logger.debug(f"Fuzzy matched {len(matches)} of {len(car_leftovers)} leftover CAR employees")
+
+        return {
+            match["car_key"]: (match["receipt_employee"]["record"], match["match_score"], match["match_reason"])
+            for match in matches
+        }
+
+    def _emit(self, car: Optional[EmployeeRecord], receipt: Optional[EmployeeRecord],
+              score: float, reason: str) -> Dict[str, Any]:
+        """
+        Build the persistence record for a CAR/receipt pair (either side may be missing)
+        """
+        car_raw = car.raw if car is not None else {}
+        receipt_raw = receipt.raw if receipt is not None else {}
+
+        if car is not None:
+            employee_id = car.employee_id or (receipt.employee_id if receipt is not None else None)
+            employee_name = car.employee_name or receipt_raw.get("employee_name")
+            match_status = "matched" if receipt is not None else "car_only"
+        else:
+            employee_id = receipt.employee_id
+            employee_name = receipt.employee_name
+            match_status = "receipt_only"
+
+        car_amount = car.amount if car is not None else None
+        receipt_amount = receipt.amount if receipt is not None else None
+
+        # Receipt-only records, nameless records and records without any positive amount need attention
+        validation_status = ValidationStatus.VALID
+        if car is None or not employee_name or (_non_positive(car_amount) and _non_positive(receipt_amount)):
+            validation_status = ValidationStatus.NEEDS_ATTENTION
+
+        confidences = [c for c in (car_raw.get("confidence"), receipt_raw.get("confidence")) if c]
+
+        return {
+            "employee_id": employee_id,
+            "employee_name": employee_name,
+            "department": car_raw.get("department", receipt_raw.get("department")),
+            "position": car_raw.get("position", receipt_raw.get("position")),
+            "car_amount": car_amount,
+            "receipt_amount": receipt_amount,
+            "car_data": car_raw,
+            "receipt_data": receipt_raw,
+            "validation_status": validation_status,
+            "match_status": match_status,
+            "match_score": score,
+            "match_reason": reason,
+            "sources": [source for source, record in (("car", car), ("receipt", receipt)) if record is not None],
+            "confidence": sum(confidences) / len(confidences) if confidences else 0.5
+        }
+
+
+def merge_employees(car_employees: Iterable[Dict[str, Any]], receipt_employees: Iterable[Dict[str, Any]],
+                    similarity_threshold: float = 0.8, fuzzy_matching: bool = True) -> List[Dict[str, Any]]:
+    """
+    Merge CAR and Receipt employees into a list of persistence records
+
+    Args:
+        car_employees: Employee records from the CAR document
+        receipt_employees: Employee records from the Receipt document
+        similarity_threshold: Minimum name similarity for fuzzy matching leftovers
+        fuzzy_matching: Fuzzy-match records left over after the ID join
+
+    Returns:
+        Merged employee records
+    """
+    engine = MergeEngine(similarity_threshold=similarity_threshold, fuzzy_matching=fuzzy_matching)
+    return list(engine.merge(car_employees, receipt_employees))
@@ -7,7 +7,6 @@ Generates employee data, simulates validation issues, and tracks progress increm
 import asyncio
 import logging
 import random
-import time
 import uuid
 from datetime import datetime, timezone
 from decimal import Decimal
@@ -19,10 +18,19 @@ from ..models import (
     ProcessingSession, SessionStatus, EmployeeRevision, ProcessingActivity,
     ValidationStatus, ActivityType
 )
+from .employee_fingerprint import fingerprint_employee_data
+from ..db_writer import run_write, uses_database_writer
+from ..activity_buffer import activity_row, buffers_activity, flush_activity_buffer, get_activity_buffer
+from .status_snapshot import notify_status_change
+from ..cache import invalidate_session_cache
+from .result_snapshots import RESULT_SNAPSHOT_STATUSES, refresh_result_snapshot_async
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Statuses that end processing (buffered activities are flushed first)
+FINAL_SESSION_STATUSES = (SessionStatus.COMPLETED, SessionStatus.FAILED, SessionStatus.CANCELLED)
+
 # Mock employee names for realistic simulation
 MOCK_FIRST_NAMES = [
     "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
@@ -205,38 +213,59 @@ async def log_processing_activity(
     activity_type: ActivityType,
     message: str,
     employee_id: Optional[str] = None,
-    created_by: str = "SYSTEM"
+    created_by: str = "SYSTEM",
+    immediate: bool = False
 ):
     """
     Log processing activity to database with error handling
     
+    Entries are buffered and written in batches (see activity_buffer), except
+    session lifecycle types and entries logged with immediate=True, which are
+    written before returning.
+    
     Args:
-        db: Database session
+        db: Database session (None to write without a caller session)
         session_id: UUID of the processing session
         activity_type: Type of activity being logged
         message: Activity message
         employee_id: Optional employee ID if activity is employee-specific
         created_by: User who created the activity
+        immediate: Write synchronously instead of buffering
     """
-    try:
-        activity = ProcessingActivity(
+    def add_activity(session: Session):
+        session.add(ProcessingActivity(
             session_id=uuid.UUID(session_id),
             activity_type=activity_type,
             activity_message=message,
             employee_id=employee_id,
             created_by=created_by
-        )
-        
-        db.add(activity)
-        db.commit()
-        
+        ))
+    
+    try:
+        if not immediate and buffers_activity(db, activity_type):
+            if db is not None:
+                # The caller's pending work is committed, as the inline path always did
+                db.commit()
+            get_activity_buffer().add(activity_row(session_id, activity_type, message, employee_id, created_by))
+        else:
+            if uses_database_writer(db):
+                # Buffered lines logged earlier are written first to keep the log in order
+                await flush_buffered_activities()
+            await run_write(db, add_activity)
+            notify_status_change(session_id)
         logger.debug(f"Activity logged - Session: {session_id}, Type: {activity_type.value}, Message: {message}")
         
     except Exception as e:
-        db.rollback()
+        if db is not None:
+            db.rollback()
         logger.error(f"Failed to log activity for session {session_id}: {str(e)}")
 
 
+async def flush_buffered_activities() -> int:
+    """Write buffered activity log lines without blocking the event loop"""
+    return await asyncio.to_thread(flush_activity_buffer)
+
+
 async def update_session_status(
     db: Session,
     session_id: str,
@@ -245,81 +274,52 @@ async def update_session_status(
     total_employees: Optional[int] = None
 ):
     """
-    Update session status and processing statistics with retry logic
+    Update session status and processing statistics
+    
+    Executed by the database writer, which serializes writes on one
+    connection, so no lock-timeout retries are needed.
     
     Args:
-        db: Database session
+        db: Database session (None to write without a caller session)
         session_id: UUID of the processing session
         new_status: New status to set
         processed_employees: Optional count of processed employees
         total_employees: Optional total count of employees
     """
-    import time
-    import sqlite3
-    from sqlalchemy.exc import SQLAlchemyError
-    
-    def perform_update():
-        session_uuid = uuid.UUID(session_id)
-        db_session = db.query(ProcessingSession).filter(
-            ProcessingSession.session_id == session_uuid
+    def apply_update(session: Session) -> bool:
+        db_session = session.query(ProcessingSession).filter(
+            ProcessingSession.session_id == uuid.UUID(session_id)
         ).first()
         
-        if db_session:
-            db_session.status = new_status
-            
-            if processed_employees is not None:
-                db_session.processed_employees = processed_employees
-            
-            if total_employees is not None:
-                db_session.total_employees = total_employees
-            
-            db.commit()
+        if not db_session:
+            return False
+        
+        db_session.status = new_status
+        
+        if processed_employees is not None:
+            db_session.processed_employees = processed_employees
+        
+        if total_employees is not None:
+            db_session.total_employees = total_employees
+        return True
+    
+    try:
+        if new_status in FINAL_SESSION_STATUSES and uses_database_writer(db):
+            # The session's activity log is complete before its final status is visible
+            await flush_buffered_activities()
+        if await run_write(db, apply_update):
+            notify_status_change(session_id)
+            invalidate_session_cache(session_id)
+            if new_status in RESULT_SNAPSHOT_STATUSES:
+                await refresh_result_snapshot_async(session_id)
             logger.debug(f"Session status updated - ID: {session_id}, Status: {new_status.value}")
         else:
             logger.warning(f"Session not found for status update: {session_id}")
-    
-    # Retry logic for database operations
-    max_retries = 3
-    for attempt in range(max_retries + 1):
-        try:
-            perform_update()
-            return  # Success
             
-        except (sqlite3.OperationalError, SQLAlchemyError) as e:
-            error_msg = str(e).lower()
-            
-            # Check if it's a retryable error
-            is_retryable = (
-                "database is locked" in error_msg or 
-                "database locked" in error_msg or
-                "transaction has been rolled back" in error_msg or
-                "session's transaction has been rolled back" in error_msg
-            )
-            
-            if is_retryable and attempt < max_retries:
-                wait_time = 0.1 * (2 ** attempt)  # Exponential backoff
-                logger.warning(f"Database error updating session status, retrying in {wait_time:.2f}s (attempt {attempt + 1}/{max_retries + 1}): {str(e)}")
-                
-                # Reset database session state
-                try:
-                    db.rollback()
-                    db.expunge_all()  # Clear session state
-                except Exception as reset_error:
-                    logger.warning(f"Error resetting database session: {reset_error}")
-                
-                time.sleep(wait_time)
-                continue
-            else:
-                # Non-retryable error or max retries reached
-                db.rollback()
-                logger.error(f"Failed to update session status for {session_id} after {max_retries + 1} attempts: {str(e)}")
-                break
-                
-        except Exception as e:
-            # Non-database error
+    except Exception as e:
+        if db is not None:
             db.rollback()
-            logger.error(f"Unexpected error updating session status for {session_id}: {str(e)}")
-            break
+        logger.error(f"Failed to update session status for {session_id}: {str(e)}")
 
 
 def calculate_progress(processed: int, total: int = 45) -> int:
@@ -445,7 +445,8 @@ async def simulate_document_processing(
                 car_amount=employee_data['car_amount'],
                 receipt_amount=employee_data['receipt_amount'],
                 validation_status=employee_data['validation_status'],
-                validation_flags=employee_data['validation_flags']
+                validation_flags=employee_data['validation_flags'],
+                content_fingerprint=fingerprint_employee_data(employee_data)
             )
             
             db.add(employee_revision)
@@ -0,0 +1,278 @@
+"""
+Page-Level Similarity Index
+
+Per-page content hashes and a MinHash signature over them, computed at upload
+and stored on FileUpload. Delta detection uses the signatures to find the most
+similar earlier file of the same type when whole-file checksums differ (e.g.
+pages appended to a receipt PDF) and diffs the page hashes to report which
+pages are new or changed. Page hashes also key the extracted page text cache
+used by the PDF processors, so only new or changed pages are re-extracted.
+"""
+
+import hashlib
+import logging
+import os
+import random
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+from ..config import settings
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Number of hash permutations in a MinHash signature
+MINHASH_PERMUTATIONS = 64
+
+# Minimum estimated similarity for an earlier file to count as a near duplicate
+MIN_PAGE_SIMILARITY = 0.5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+# Fixed seed: signatures must stay comparable across processes and restarts
+_rng = random.Random(20240301)
+_PERMUTATIONS = [
+    (_rng.randint(1, _MERSENNE_PRIME - 1), _rng.randint(0, _MERSENNE_PRIME - 1))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+# Subset fonts are named e.g. "ABCDEF+Arial" with a per-file random tag
+_SUBSET_TAG = re.compile(r'^[A-Z]{6}\+')
+
+# Indirect object reference ("12 0 R") in a PDF object's source
+_OBJECT_REF = re.compile(r'(\d+)\s+\d+\s+R')
+
+# Font descriptor keys of the embedded font program (Type 1, TrueType, CFF/OpenType)
+_FONT_FILE_KEYS = ("FontFile", "FontFile2", "FontFile3")
+
+# Bump when hash_page changes; hashes (and cached page text) of older versions never match
+PAGE_HASH_VERSION = "3"
+
+
+def _stream_digest(doc: Any, xref: int) -> str:
+    return hashlib.sha256(doc.xref_stream_raw(xref) or b"").hexdigest()
+
+
+def _referenced_xref(doc: Any, xref: int, key: str) -> Optional[int]:
+    """Object number a dictionary key refers to (the first one for an array), or None"""
+    kind, value = doc.xref_get_key(xref, key)
+    if kind == "xref":
+        target = int(value.split()[0])
+        if key != "DescendantFonts":
+            return target
+        # An indirect DescendantFonts array
+        value = doc.xref_object(target, compressed=True)
+    elif kind != "array":
+        return None
+    match = _OBJECT_REF.search(value)
+    return int(match.group(1)) if match else None
+
+
+def _font_digest(doc: Any, font: tuple) -> str:
+    """
+    Identity of a page font from its ToUnicode CMap and embedded font program
+
+    Subset fonts with the same name map glyph codes to different characters
+    in different files, so the streams are hashed rather than the name. The
+    base font name (subset tag stripped) identifies fonts that are not
+    embedded.
+    """
+    xref, _, font_type, basefont, resource_name, encoding = font[:6]
+    streams = []
+    to_unicode = _referenced_xref(doc, xref, "ToUnicode")
+    if to_unicode:
+        streams.append(_stream_digest(doc, to_unicode))
+    # Type0 fonts keep the font program in their descendant CIDFont
+    descendant = _referenced_xref(doc, xref, "DescendantFonts") or xref
+    descriptor = _referenced_xref(doc, descendant, "FontDescriptor")
+    if descriptor:
+        for key in _FONT_FILE_KEYS:
+            font_file = _referenced_xref(doc, descriptor, key)
+            if font_file:
+                streams.append(f"{key}={_stream_digest(doc, font_file)}")
+    embedded = any(stream.startswith("FontFile") for stream in streams)
+    name = "" if embedded else _SUBSET_TAG.sub("", basefont or "")
+    return f"{resource_name}:{font_type}:{encoding or ''}:{name}:{','.join(streams)}"
+
+
+def hash_page(page: Any, font_digests: Optional[Dict[int, str]] = None) -> str:
+    """
+    Content hash of a PDF page
+
+    Covers the page content stream, the page size, the fonts it uses (their
+    ToUnicode and font program streams) and the streams of the form XObjects
+    and images it draws (including nested ones), so identical pages hash the
+    same across files even when the surrounding document changed, while
+    pages that differ only inside an XObject or a font subset do not.
+
+    Args:
+        page: PyMuPDF page
+        font_digests: Font digests by object number, shared by the pages of
+            one document so each font is hashed once
+
+    Returns:
+        Hex SHA-256 page hash
+    """
+    doc = page.parent
+    if font_digests is None:
+        font_digests = {}
+    hasher = hashlib.sha256(PAGE_HASH_VERSION.encode("ascii"))
+    hasher.update(page.read_contents())
+    hasher.update(f"|{page.rect.width:.1f}x{page.rect.height:.1f}".encode("ascii"))
+    fonts = []
+    for font in page.get_fonts():
+        if font[0] not in font_digests:
+            font_digests[font[0]] = _font_digest(doc, font)
+        fonts.append(font_digests[font[0]])
+    hasher.update("|".join(sorted(fonts)).encode("utf-8"))
+
+    # Object numbers differ between files, so XObjects are identified by name and stream
+    xobjects = sorted(
+        f"{name}:{','.join(f'{value:.1f}' for value in bbox)}:{_stream_digest(doc, xref)}"
+        for xref, name, _, bbox in page.get_xobjects()
+    )
+    images = sorted(
+        f"{image[7]}:{_stream_digest(doc, image[0])}"
+        for image in page.get_images(full=True)
+    )
+    hasher.update("|".join(xobjects + images).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def compute_page_hashes(pdf_path: str) -> List[str]:
+    """
+    Page hashes of a PDF in page order ([] when the file cannot be read)
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        List of hex page hashes
+    """
+    if fitz is None:
+        return []
+    try:
+        with fitz.open(pdf_path) as doc:
+            font_digests: Dict[int, str] = {}
+            return [hash_page(page, font_digests) for page in doc]
+    except Exception as e:
+        logger.warning(f"Failed to hash pages of {pdf_path}: {e}")
+        return []
+
+
+def compute_minhash_signature(page_hashes: Sequence[str]) -> List[int]:
+    """
+    MinHash signature over the set of page hashes
+
+    Args:
+        page_hashes: Hex page hashes
+
+    Returns:
+        MINHASH_PERMUTATIONS minimum hash values ([] for an empty document)
+    """
+    values = {int(page_hash[:16], 16) for page_hash in page_hashes}
+    if not values:
+        return []
+    return [
+        min((a * value + b) % _MERSENNE_PRIME for value in values)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def estimate_similarity(signature_a: Optional[Sequence[int]], signature_b: Optional[Sequence[int]]) -> float:
+    """
+    Estimated Jaccard similarity of two page sets from their MinHash signatures
+
+    Returns:
+        Similarity between 0.0 and 1.0 (0.0 for missing or incompatible signatures)
+    """
+    if not signature_a or not signature_b or len(signature_a) != len(signature_b):
+        return 0.0
+    return sum(1 for a, b in zip(signature_a, signature_b) if a == b) / len(signature_a)
+
+
+class PageDelta:
+    """Page-level differences between a file and an earlier, similar file"""
+
+    def __init__(self, base_hashes: Sequence[str], current_hashes: Sequence[str]):
+        base_pages: Dict[str, int] = {}
+        for page_number, page_hash in enumerate(base_hashes, 1):
+            base_pages.setdefault(page_hash, page_number)
+        current_set = set(current_hashes)
+
+        self.page_count = len(current_hashes)
+        self.base_page_count = len(base_hashes)
+        self.reused_pages: Dict[int, int] = {}  # current page -> identical base page
+        self.new_pages: List[int] = []
+        self.changed_pages: List[int] = []
+
+        for page_number, page_hash in enumerate(current_hashes, 1):
+            if page_hash in base_pages:
+                self.reused_pages[page_number] = base_pages[page_hash]
+            elif page_number <= len(base_hashes) and base_hashes[page_number - 1] not in current_set:
+                # The base page at this position is gone: treat as an edit in place
+                self.changed_pages.append(page_number)
+            else:
+                self.new_pages.append(page_number)
+
+        self.removed_pages = [
+            page_number for page_number, page_hash in enumerate(base_hashes, 1)
+            if page_hash not in current_set
+        ]
+        union = set(base_hashes) | current_set
+        self.similarity = len(set(base_hashes) & current_set) / len(union) if union else 1.0
+
+    @property
+    def pages_to_extract(self) -> List[int]:
+        """Pages that need extraction (new or changed)"""
+        return sorted(self.new_pages + self.changed_pages)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "similarity": round(self.similarity, 4),
+            "page_count": self.page_count,
+            "base_page_count": self.base_page_count,
+            "new_pages": self.new_pages,
+            "changed_pages": self.changed_pages,
+            "removed_pages": self.removed_pages,
+            "reused_page_count": len(self.reused_pages)
+        }
+
+
+class PageTextCache:
+    """
+    Content-addressed cache of extracted page text keyed by page hash
+
+    Files live under <data>/page_cache/<hash[:2]>/<hash>.txt, next to the
+    upload directory; entries are immutable so concurrent writers are safe.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path(settings.upload_path).parent / "page_cache"
+
+    def _path(self, page_hash: str) -> Path:
+        return self.cache_dir / page_hash[:2] / f"{page_hash}.txt"
+
+    def get(self, page_hash: str) -> Optional[str]:
+        """Cached text of a page, or None"""
+        try:
+            return self._path(page_hash).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def put(self, page_hash: str, text: str):
+        """Store the text of a page (best-effort)"""
+        path = self._path(page_hash)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.debug(f"Failed to cache page text {page_hash[:12]}: {e}")
@@ -15,10 +15,65 @@ try:
 except ImportError:
     fitz = None
 
+from ..config import settings
+from .page_similarity import PageTextCache, hash_page
+
 # Configure logger
 logger = logging.getLogger(__name__)
 
 
+def _extract_page_text(page) -> str:
+    """Raw text of a page from its text blocks and spans (one line per text line)"""
+    # Use "dict" option for better text extraction with formatting and encoding preservation
+    page_text = page.get_text("dict")
+    
+    # Extract text from blocks and spans with proper encoding
+    extracted_text = ""
+    for block in page_text.get("blocks", []):
+        if "lines" in block:  # Text block
+            for line in block["lines"]:
+                for span in line["spans"]:
+                    text = span.get("text", "")
+                    # Ensure proper Unicode handling and normalize whitespace
+                    if text.strip():
+                        extracted_text += text + " "
+                extracted_text += "\n"  # Line break
+    return extracted_text
+
+
+def _extract_page_texts(doc) -> Dict[int, str]:
+    """
+    Raw text of every page (1-indexed), reusing cached text of known pages
+    
+    Pages are looked up in the page text cache by content hash, so when a
+    document shares pages with an earlier upload only new or changed pages
+    are extracted.
+    """
+    cache = PageTextCache() if settings.page_cache_enabled else None
+    page_texts: Dict[int, str] = {}
+    font_digests: Dict[int, str] = {}
+    reused = 0
+    
+    for page_num in range(len(doc)):
+        page = doc.load_page(page_num)
+        if cache is None:
+            page_texts[page_num + 1] = _extract_page_text(page)
+            continue
+        
+        page_hash = hash_page(page, font_digests)
+        text = cache.get(page_hash)
+        if text is None:
+            text = _extract_page_text(page)
+            cache.put(page_hash, text)
+        else:
+            reused += 1
+        page_texts[page_num + 1] = text
+    
+    if reused:
+        logger.info(f"Reused cached text for {reused} of {len(page_texts)} pages")
+    return page_texts
+
+
 class PDFProcessorError(Exception):
     """Base exception for PDF processing errors"""
     pass
@@ -75,28 +130,12 @@ class CARProcessor:
             full_text = ""
             page_text_mapping = {}
             
-            # Extract text from all pages with proper encoding handling
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                # Use "dict" option for better text extraction with formatting and encoding preservation
-                page_text = page.get_text("dict")
-                
-                # Extract text from blocks and spans with proper encoding
-                extracted_text = ""
-                for block in page_text.get("blocks", []):
-                    if "lines" in block:  # Text block
-                        for line in block["lines"]:
-                            for span in line["spans"]:
-                                text = span.get("text", "")
-                                # Ensure proper Unicode handling and normalize whitespace
-                                if text.strip():
-                                    extracted_text += text + " "
-                            extracted_text += "\n"  # Line break
-                    
+            # Extract text from all pages (cached pages are reused)
+            for page_number, extracted_text in _extract_page_texts(doc).items():
                 # Clean and normalize the text
                 extracted_text = self._normalize_text(extracted_text)
-                page_text_mapping[page_num + 1] = extracted_text  # 1-indexed pages
-                full_text += f"\n--- PAGE {page_num + 1} ---\n" + extracted_text
+                page_text_mapping[page_number] = extracted_text  # 1-indexed pages
+                full_text += f"\n--- PAGE {page_number} ---\n" + extracted_text
             
             doc.close()
             
@@ -391,28 +430,12 @@ class ReceiptProcessor:
             full_text = ""
             page_text_mapping = {}
             
-            # Extract text from all pages with proper encoding handling
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                # Use "dict" option for better text extraction with formatting and encoding preservation
-                page_text = page.get_text("dict")
-                
-                # Extract text from blocks and spans with proper encoding
-                extracted_text = ""
-                for block in page_text.get("blocks", []):
-                    if "lines" in block:  # Text block
-                        for line in block["lines"]:
-                            for span in line["spans"]:
-                                text = span.get("text", "")
-                                # Ensure proper Unicode handling and normalize whitespace
-                                if text.strip():
-                                    extracted_text += text + " "
-                            extracted_text += "\n"  # Line break
-                    
+            # Extract text from all pages (cached pages are reused)
+            for page_number, extracted_text in _extract_page_texts(doc).items():
                 # Clean and normalize the text
                 extracted_text = self._normalize_text(extracted_text)
-                page_text_mapping[page_num + 1] = extracted_text  # 1-indexed pages
-                full_text += f"\n--- PAGE {page_num + 1} ---\n" + extracted_text
+                page_text_mapping[page_number] = extracted_text  # 1-indexed pages
+                full_text += f"\n--- PAGE {page_number} ---\n" + extracted_text
             
             doc.close()
             
@@ -459,21 +482,10 @@ class ReceiptProcessor:
         """Open PDF and reuse page extraction logic to build entries quickly."""
         try:
             doc = fitz.open(pdf_path)
-            page_text_mapping: Dict[int, str] = {}
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                page_text = page.get_text("dict")
-                extracted_text = ""
-                for block in page_text.get("blocks", []):
-                    if "lines" in block:
-                        for line in block["lines"]:
-                            for span in line["spans"]:
-                                t = span.get("text", "")
-                                if t.strip():
-                                    extracted_text += t + " "
-                            extracted_text += "\n"
-                extracted_text = self._normalize_text(extracted_text)
-                page_text_mapping[page_num + 1] = extracted_text
+            page_text_mapping: Dict[int, str] = {
+                page_number: self._normalize_text(extracted_text)
+                for page_number, extracted_text in _extract_page_texts(doc).items()
+            }
             doc.close()
             # Reuse existing logic on mapping
             full_text = "\n".join([f"--- PAGE {p} ---\n" + txt for p, txt in page_text_mapping.items()])
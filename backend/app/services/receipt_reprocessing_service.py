@@ -19,9 +19,11 @@ from sqlalchemy import and_, or_
 
 from ..models import (
     ProcessingSession, EmployeeRevision, ReceiptVersion, EmployeeChangeLog,
-    SessionStatus, ValidationStatus, ActivityType
+    ProcessingActivity, SessionStatus, ValidationStatus, ActivityType
 )
 from ..schemas import UserInfo
+from .incremental_validation import get_validation_state, revalidate_revisions
+from .employee_fingerprint import fingerprint_revision
 
 logger = logging.getLogger(__name__)
 
@@ -443,10 +445,14 @@ class ReceiptReprocessingService:
         """Apply detected changes to the database"""
         logger.info(f"Applying changes for session {session_id}, version {version_number}")
         
+        # Capture the validation state before the revisions are modified
+        validation_state = get_validation_state(self.db, session_id)
+        touched = []
+        
         # Process new employees
         for new_emp_data in changes['new_employees']:
             new_emp = new_emp_data['employee']
-            self._create_new_employee(session_id, new_emp, version_number, changed_by)
+            touched.append(self._create_new_employee(session_id, new_emp, version_number, changed_by))
         
         # Process changed employees
         for changed_emp_data in changes['changed_employees']:
@@ -455,18 +461,25 @@ class ReceiptReprocessingService:
             changes_detail = changed_emp_data['changes']
             
             self._update_employee(old_emp, new_emp, changes_detail, version_number, changed_by)
+            touched.append(old_emp)
         
         # Process removed employees (mark as removed, don't delete)
         for removed_emp_data in changes['removed_employees']:
             old_emp = removed_emp_data['employee']
             self._mark_employee_removed(old_emp, version_number, changed_by)
+            touched.append(old_emp)
+        
+        # Revalidate only the touched employees (and their duplicate peers)
+        if touched:
+            self.db.flush()
+            revalidate_revisions(self.db, session_id, touched, validation_state)
     
     def _create_new_employee(self, 
                             session_id: str, 
                             new_emp: Dict[str, Any], 
                             version_number: int, 
                             created_by: str):
-        """Create a new employee revision"""
+        """Create a new employee revision and return it"""
         employee = EmployeeRevision(
             session_id=session_id,
             employee_id=new_emp['employee_id'],
@@ -475,6 +488,7 @@ class ReceiptReprocessingService:
             validation_status=ValidationStatus.VALID,
             receipt_version_processed=version_number
         )
+        employee.content_fingerprint = fingerprint_revision(employee)
         
         self.db.add(employee)
         
@@ -483,6 +497,8 @@ class ReceiptReprocessingService:
             session_id, employee.employee_id, employee.employee_name,
             'new', None, new_emp, version_number, created_by, 1.0
         )
+        
+        return employee
     
     def _update_employee(self, 
                         old_emp: EmployeeRevision, 
@@ -504,6 +520,7 @@ class ReceiptReprocessingService:
         old_emp.receipt_amount = new_emp['amount']
         old_emp.receipt_version_processed = version_number
         old_emp.amount_changed = changes_detail['amount_changed']
+        old_emp.content_fingerprint = fingerprint_revision(old_emp)
         old_emp.updated_at = datetime.now(timezone.utc)
         
         # Store previous amounts for delta tracking
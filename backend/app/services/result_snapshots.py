@@ -0,0 +1,449 @@
+"""
+Result Snapshots
+
+Once a session is COMPLETED (or FAILED) its results change only through issue
+resolution, export marking or reprocessing. A result snapshot is a
+gzip-compressed JSON document holding the session row, every revision (column
+values in row order), the session statistics and the formatted session
+summary, served as-is to clients that fetch a session's complete results. It
+is written when processing completes and rewritten in the background after
+writes made through the API. Paged, filtered and summary reads do not use it:
+they are indexed queries and the maintained session_statistics row.
+
+Snapshots are versioned by the session's data version (session_data_versions,
+bumped by triggers on every session and revision write), which is part of the
+file name: a reader reads the version with one primary key lookup and then the
+matching file, and a write made anywhere else simply leaves no file for the new
+version, so it is rebuilt on first use. A loaded snapshot holds only the stored
+bytes; the document is decoded on first use, revisions as transient
+EmployeeRevision objects, so the existing formatting code runs unchanged.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import DateTime, Enum, Numeric
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import (
+    GUID, EmployeeRevision, ProcessingSession, SessionDataVersion, SessionStatus, ValidationStatus
+)
+from .results_formatter import ResultsFormatter
+from .session_statistics import get_session_statistics
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Order of a session's revisions in snapshots, exports and full-session reads
+SESSION_ROW_ORDER = (EmployeeRevision.created_at, EmployeeRevision.revision_id)
+
+# Bumped when the document layout changes; older files are rebuilt
+SNAPSHOT_FORMAT = 1
+
+# Sessions whose results are readable (and therefore snapshotted)
+RESULT_SNAPSHOT_STATUSES = (SessionStatus.COMPLETED, SessionStatus.FAILED)
+
+
+def read_data_version(db: Session, session_id):
+    """
+    Read a session's owner, status and data version with one primary key lookup
+
+    Args:
+        db: Database session
+        session_id: Session UUID
+
+    Returns:
+        Row with created_by, status, version and changed_at (version and
+        changed_at are None until the session's data first changes), or None
+        when the session does not exist
+    """
+    return db.query(
+        ProcessingSession.created_by,
+        ProcessingSession.status,
+        SessionDataVersion.version,
+        SessionDataVersion.changed_at
+    ).outerjoin(
+        SessionDataVersion, SessionDataVersion.session_id == ProcessingSession.session_id
+    ).filter(
+        ProcessingSession.session_id == session_id
+    ).first()
+
+
+def data_version_token(version: Optional[int], changed_at: Optional[datetime]) -> str:
+    """
+    File-name-safe token for a data version
+
+    The change time guards against counters restarting after a database reset.
+    """
+    if not version:
+        return "v0"
+    return f"v{version}-{changed_at:%Y%m%d%H%M%S}" if changed_at else f"v{version}"
+
+
+def _encode_value(column, value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(column.type, GUID):
+        return str(value)
+    if isinstance(column.type, Enum):
+        return value.name
+    if isinstance(column.type, DateTime):
+        return value.isoformat()
+    if isinstance(column.type, Numeric):
+        return str(value)
+    return value
+
+
+def _decode_value(column, value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(column.type, GUID):
+        return uuid.UUID(value)
+    if isinstance(column.type, Enum):
+        return column.type.enum_class[value]
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Numeric):
+        return Decimal(value)
+    return value
+
+
+def _encode_row(obj) -> Dict[str, Any]:
+    """Column values of a loaded row in JSON form"""
+    return {
+        column.key: _encode_value(column, getattr(obj, column.key))
+        for column in obj.__table__.columns
+    }
+
+
+def _decode_row(model, values: Dict[str, Any]):
+    """Transient model instance (never added to a database session) from JSON column values"""
+    columns = model.__table__.columns
+    return model(**{key: _decode_value(columns[key], value) for key, value in values.items()})
+
+
+class SessionSnapshot:
+    """
+    Results of one session as of a data version
+
+    Holds the stored bytes; the document is decompressed and parsed, and the
+    session and revisions decoded, only when one of those attributes is first
+    read, so serving the stored file decodes nothing.
+
+    Attributes:
+        session: Transient ProcessingSession
+        employees: Transient EmployeeRevision objects in row order
+        statistics: get_session_statistics() result
+        session_summary: ResultsFormatter.format_session_summary() result
+        base_session_name: Name of the delta base session, if any
+        version: Data version token the snapshot was built for
+        etag: Strong entity tag of the stored (compressed) document
+        content: The stored gzip-compressed document
+    """
+
+    def __init__(self, content: bytes, version: str, document: Optional[Dict[str, Any]] = None):
+        self.content = content
+        self.version = version
+        self.etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+        self._document = document
+        self._session: Optional[ProcessingSession] = None
+        self._employees: Optional[List[EmployeeRevision]] = None
+
+    @property
+    def document(self) -> Dict[str, Any]:
+        if self._document is None:
+            self._document = json.loads(gzip.decompress(self.content))
+        return self._document
+
+    @property
+    def session(self) -> ProcessingSession:
+        if self._session is None:
+            self._session = _decode_row(ProcessingSession, self.document["session"])
+        return self._session
+
+    @property
+    def employees(self) -> List[EmployeeRevision]:
+        if self._employees is None:
+            self._employees = [_decode_row(EmployeeRevision, values) for values in self.document["employees"]]
+        return self._employees
+
+    @property
+    def statistics(self) -> Dict[str, Any]:
+        return self.document["statistics"]
+
+    @property
+    def session_summary(self) -> Dict[str, Any]:
+        return self.document["session_summary"]
+
+    @property
+    def base_session_name(self) -> Optional[str]:
+        return self.document.get("base_session_name")
+
+    @property
+    def generated_at(self) -> str:
+        return self.document["generated_at"]
+
+
+class ResultSnapshotStore:
+    """
+    Snapshot files under base_path/<session_id>/<data version>-f<format>.json.gz
+
+    Args:
+        base_path: Directory holding one sub-directory per session
+    """
+
+    def __init__(self, base_path: str):
+        self.base_path = Path(base_path)
+
+    def path_for(self, session_id, version: str) -> Path:
+        # The format is part of the name so loading never has to parse the document
+        return self.base_path / str(uuid.UUID(str(session_id))) / f"{version}-f{SNAPSHOT_FORMAT}.json.gz"
+
+    def load(self, db: Session, session_id, build: bool = True) -> Optional[SessionSnapshot]:
+        """
+        Load the snapshot of a session's current data version (the file is read, not decoded)
+
+        Args:
+            db: Database session
+            session_id: Session UUID
+            build: Build and store the snapshot when there is none for the current version
+
+        Returns:
+            SessionSnapshot, or None when the session does not exist, its results
+            are not available yet, or there is no snapshot and build is False
+        """
+        row = read_data_version(db, session_id)
+        if row is None or row.status not in RESULT_SNAPSHOT_STATUSES:
+            return None
+        version = data_version_token(row.version, row.changed_at)
+        path = self.path_for(session_id, version)
+        try:
+            return SessionSnapshot(path.read_bytes(), version)
+        except FileNotFoundError:
+            pass
+        if not build:
+            return None
+        return self.save(self._collect(db, session_id, version))
+
+    def write(self, db: Session, session_id) -> Optional[SessionSnapshot]:
+        """
+        Build and store the snapshot of a session's current data (after a write)
+
+        Returns:
+            SessionSnapshot, or None when the session's results are not available
+        """
+        document = self.collect(db, session_id)
+        return self.save(document) if document is not None else None
+
+    def collect(self, db: Session, session_id) -> Optional[Dict[str, Any]]:
+        """
+        Read the snapshot document of a session's current data version
+
+        The document is stored with save(), which needs no database session and
+        can run in a worker thread.
+
+        Returns:
+            Document, or None when the session's results are not available
+        """
+        row = read_data_version(db, session_id)
+        if row is None or row.status not in RESULT_SNAPSHOT_STATUSES:
+            return None
+        return self._collect(db, session_id, data_version_token(row.version, row.changed_at))
+
+    def save(self, document: Dict[str, Any]) -> SessionSnapshot:
+        """Compress and store a collected document, replacing older versions of the session"""
+        session_id = document["session_id"]
+        version = document["data_version"]
+        raw = json.dumps(document, separators=(",", ":"), default=str).encode("utf-8")
+        content = gzip.compress(raw, mtime=0)
+
+        path = self.path_for(session_id, version)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_bytes(content)
+        os.replace(temp_path, path)
+        for stale in path.parent.glob("*.json.gz"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+
+        logger.info(f"Wrote result snapshot {version} for session {session_id} ({len(document['employees'])} employees, {len(content)} bytes)")
+        return SessionSnapshot(content, version)
+
+    def delete(self, session_id):
+        """Remove every snapshot of a session"""
+        shutil.rmtree(self.base_path / str(uuid.UUID(str(session_id))), ignore_errors=True)
+
+    def _collect(self, db: Session, session_id, version: str) -> Dict[str, Any]:
+        session = db.query(ProcessingSession).filter(ProcessingSession.session_id == session_id).one()
+        employees = db.query(EmployeeRevision).filter(
+            EmployeeRevision.session_id == session_id
+        ).order_by(*SESSION_ROW_ORDER).all()
+        base_session_name = None
+        if session.delta_session_id:
+            base_session_name = db.query(ProcessingSession.session_name).filter(
+                ProcessingSession.session_id == session.delta_session_id
+            ).scalar()
+
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "session_id": str(session.session_id),
+            "data_version": version,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "session": _encode_row(session),
+            "statistics": get_session_statistics(db, session.session_id),
+            "session_summary": ResultsFormatter(db).format_session_summary(session, len(employees)),
+            "base_session_name": base_session_name,
+            "employees": [_encode_row(employee) for employee in employees]
+        }
+
+
+# Application store
+result_snapshot_store = ResultSnapshotStore(settings.snapshot_path)
+
+# Background rewrites per session (see schedule_result_snapshot_refresh)
+_refresh_tasks: Dict[str, asyncio.Task] = {}
+_refresh_requested: set = set()
+
+
+def load_result_snapshot(db: Session, session_id, build: bool = True) -> Optional[SessionSnapshot]:
+    """
+    Snapshot of a session's current results
+
+    Args:
+        db: Database session
+        session_id: Session UUID
+        build: Build the snapshot when there is none for the current data version
+
+    Returns:
+        SessionSnapshot, or None when snapshots are disabled, the session does
+        not exist or its results are not available, there is no snapshot and
+        build is False, or it cannot be built
+    """
+    if not settings.result_snapshots_enabled:
+        return None
+    try:
+        return result_snapshot_store.load(db, session_id, build=build)
+    except Exception as e:
+        logger.warning(f"Result snapshot unavailable for session {session_id}: {e}")
+        return None
+
+
+def collect_result_snapshot(db: Session, session_id) -> Optional[Dict[str, Any]]:
+    """Snapshot document of a session's current results, to be stored with save_result_snapshot (None when unavailable)"""
+    if not settings.result_snapshots_enabled:
+        return None
+    try:
+        return result_snapshot_store.collect(db, session_id)
+    except Exception as e:
+        logger.warning(f"Result snapshot unavailable for session {session_id}: {e}")
+        return None
+
+
+def save_result_snapshot(document: Dict[str, Any]) -> Optional[SessionSnapshot]:
+    """Store a collected snapshot document (failures are logged, not raised)"""
+    try:
+        return result_snapshot_store.save(document)
+    except Exception as e:
+        logger.warning(f"Failed to store result snapshot for session {document.get('session_id')}: {e}")
+        return None
+
+
+def refresh_result_snapshot(db: Session, session_id) -> Optional[SessionSnapshot]:
+    """Rewrite a session's snapshot after a committed write (failures are logged, not raised)"""
+    if not settings.result_snapshots_enabled:
+        return None
+    try:
+        return result_snapshot_store.write(db, session_id)
+    except Exception as e:
+        logger.warning(f"Failed to refresh result snapshot for session {session_id}: {e}")
+        return None
+
+
+async def refresh_result_snapshot_async(session_id):
+    """Rewrite a session's snapshot from a worker thread with its own read session (e.g. at completion)"""
+    from ..database import ReadSessionLocal
+
+    def refresh():
+        with ReadSessionLocal() as db:
+            refresh_result_snapshot(db, session_id)
+
+    await asyncio.to_thread(refresh)
+
+
+def schedule_result_snapshot_refresh(session_id):
+    """
+    Rewrite a session's snapshot in the background after a committed write
+
+    Request handlers call this instead of refresh_result_snapshot so the
+    rewrite stays off the request path. The rewrite starts after
+    settings.result_snapshot_refresh_delay_seconds, so a burst of writes to
+    one session shares a single rewrite; a write made while it runs schedules
+    one more. Must be called from the event loop.
+    """
+    if not settings.result_snapshots_enabled:
+        return
+    key = str(session_id)
+    _refresh_requested.add(key)
+    if key not in _refresh_tasks:
+        _refresh_tasks[key] = asyncio.get_running_loop().create_task(_run_refreshes(key))
+
+
+async def _run_refreshes(key: str):
+    try:
+        while key in _refresh_requested:
+            await asyncio.sleep(settings.result_snapshot_refresh_delay_seconds)
+            _refresh_requested.discard(key)
+            await refresh_result_snapshot_async(key)
+    finally:
+        _refresh_tasks.pop(key, None)
+
+
+def delete_result_snapshots(session_id):
+    """Remove a deleted session's snapshots"""
+    result_snapshot_store.delete(session_id)
+
+
+def load_session_employees(
+    db: Session,
+    session_id,
+    statuses: Optional[Iterable[ValidationStatus]] = None,
+    limit: Optional[int] = None
+) -> List[EmployeeRevision]:
+    """
+    A session's revisions (optionally with the given validation statuses) in SESSION_ROW_ORDER
+
+    Complete sessions are read from the stored result snapshot when there is
+    one for the current data version (it is not built here); filtered or
+    limited reads are one query on the session's indexes.
+
+    Args:
+        db: Database session
+        session_id: Session UUID
+        statuses: Only revisions with these validation statuses
+        limit: At most this many revisions
+    """
+    if statuses is None and limit is None:
+        snapshot = load_result_snapshot(db, session_id, build=False)
+        if snapshot is not None:
+            try:
+                return list(snapshot.employees)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Discarding unreadable result snapshot {snapshot.version} of session {session_id}: {e}")
+    query = db.query(EmployeeRevision).filter(EmployeeRevision.session_id == session_id)
+    if statuses is not None:
+        query = query.filter(EmployeeRevision.validation_status.in_(list(statuses)))
+    query = query.order_by(*SESSION_ROW_ORDER)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
@@ -21,6 +21,7 @@ from ..models import (
     ValidationStatus,
     SessionStatus
 )
+from .session_statistics import get_session_statistics
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +77,9 @@ class ResultsFormatter:
                 # Format validation flags with enhanced details
                 validation_flags = self._enhance_validation_flags(employee.validation_flags or {})
                 
+                # Source and confidence are not stored on every revision
+                confidence = getattr(employee, "confidence", None)
+                
                 # Build formatted employee data
                 employee_data = {
                     "revision_id": str(employee.revision_id),
@@ -97,8 +101,8 @@ class ResultsFormatter:
                     "amount_difference": self._calculate_amount_difference(employee),
                     
                     # Meta information
-                    "source": employee.source or "system",
-                    "confidence": employee.confidence if employee.confidence is not None else 1.0,
+                    "source": getattr(employee, "source", None) or "system",
+                    "confidence": confidence if confidence is not None else 1.0,
                 }
                 
                 # Add delta information if available
@@ -296,25 +300,12 @@ class ResultsFormatter:
     
     def _calculate_session_statistics(self, session_id: str) -> Dict[str, Any]:
         """Calculate comprehensive session statistics"""
-        # Count by validation status
-        total_employees = self.db.query(func.count(EmployeeRevision.revision_id)).filter(
-            EmployeeRevision.session_id == session_id
-        ).scalar()
-        
-        ready_for_export = self.db.query(func.count(EmployeeRevision.revision_id)).filter(
-            EmployeeRevision.session_id == session_id,
-            EmployeeRevision.validation_status == ValidationStatus.VALID
-        ).scalar()
-        
-        needs_attention = self.db.query(func.count(EmployeeRevision.revision_id)).filter(
-            EmployeeRevision.session_id == session_id,
-            EmployeeRevision.validation_status == ValidationStatus.NEEDS_ATTENTION
-        ).scalar()
-        
-        resolved_issues = self.db.query(func.count(EmployeeRevision.revision_id)).filter(
-            EmployeeRevision.session_id == session_id,
-            EmployeeRevision.validation_status == ValidationStatus.RESOLVED
-        ).scalar()
+        # Counts by validation status from the maintained per-session counters
+        stats = get_session_statistics(self.db, session_id)
+        total_employees = stats["total_employees"]
+        ready_for_export = stats["valid_employees"]
+        needs_attention = stats["needs_attention_employees"]
+        resolved_issues = stats["resolved_employees"]
         
         # Calculate success rate
         validation_success_rate = (ready_for_export / total_employees * 100) if total_employees > 0 else 0
@@ -458,14 +449,14 @@ class ResultsFormatter:
             "session_type": "delta" if session.delta_session_id else "full",
             "processing_engine_version": "3.0",
             "data_source_info": {
-                "car_document_processed": any(e.source == "car_document" for e in employees),
-                "receipt_document_processed": any(e.source == "receipt_document" for e in employees),
-                "manual_entries": len([e for e in employees if e.source == "manual"])
+                "car_document_processed": any(getattr(e, "source", None) == "car_document" for e in employees),
+                "receipt_document_processed": any(getattr(e, "source", None) == "receipt_document" for e in employees),
+                "manual_entries": len([e for e in employees if getattr(e, "source", None) == "manual"])
             },
             "quality_metrics": {
-                "avg_confidence": sum(e.confidence or 0 for e in employees) / len(employees) if employees else 0,
-                "high_confidence_count": len([e for e in employees if (e.confidence or 0) >= 0.9]),
-                "low_confidence_count": len([e for e in employees if (e.confidence or 0) < 0.7])
+                "avg_confidence": sum(getattr(e, "confidence", None) or 0 for e in employees) / len(employees) if employees else 0,
+                "high_confidence_count": len([e for e in employees if (getattr(e, "confidence", None) or 0) >= 0.9]),
+                "low_confidence_count": len([e for e in employees if (getattr(e, "confidence", None) or 0) < 0.7])
             }
         }
 
@@ -0,0 +1,406 @@
+"""
+Session Result Cloning
+
+Set-based cloning of processed results between sessions. Revisions are copied
+with a single INSERT ... SELECT joined on a temporary base -> new revision ID
+mapping table, so no employee rows are loaded into Python. Used by delta
+processing to carry unchanged employees forward and by exact-match cloning,
+which copies a whole completed session (revisions, parsed line artifacts and
+export files) when identical files are uploaded again.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import Column, MetaData, Table, insert, literal, select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import (
+    ActivityType, EmployeeRevision, ExportHistory, ProcessingActivity,
+    ProcessingSession, SessionStatus
+)
+from .incremental_validation import invalidate_validation_state
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Line-level artifacts written under <upload_path>/<session_id>/parsed
+PARSED_ARTIFACT_DIR = "parsed"
+
+# Auto-export file prefixes (see auto_export_service)
+EXPORT_FILE_PREFIXES = ("pVault", "Exceptions")
+
+_INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
+
+# Temporary base -> new revision ID mapping used for set-based cloning (per connection)
+CLONE_MAP_TABLE = Table(
+    'delta_clone_map', MetaData(),
+    Column('base_revision_id', EmployeeRevision.__table__.c.revision_id.type, primary_key=True),
+    Column('new_revision_id', EmployeeRevision.__table__.c.revision_id.type, nullable=False),
+    prefixes=['TEMPORARY']
+)
+
+
+def build_clone_statement(
+    clone_map: Table,
+    target_session_id: Any,
+    base_session_id: Any,
+    timestamp: datetime,
+    resolution_notes: str,
+    preserve_export_state: bool = False
+):
+    """
+    INSERT ... SELECT copying the mapped base revisions into the target session
+
+    Content columns, validation results and the fingerprint are copied; change
+    tracking starts fresh. Export tracking is copied only when
+    preserve_export_state is set (the export files are cloned as well).
+
+    Args:
+        clone_map: Mapping table (base_revision_id -> new_revision_id)
+        target_session_id: Session receiving the copies
+        base_session_id: Session the revisions are copied from
+        timestamp: created_at/updated_at of the copies
+        resolution_notes: Note recorded on every copy
+        preserve_export_state: Copy pVault export tracking columns
+
+    Returns:
+        Insert statement
+    """
+    revisions = EmployeeRevision.__table__
+    columns = revisions.c
+
+    copied = {
+        'revision_id': clone_map.c.new_revision_id,
+        'session_id': literal(target_session_id, columns.session_id.type),
+        'employee_id': columns.employee_id,
+        'employee_name': columns.employee_name,
+        'car_amount': columns.car_amount,
+        'receipt_amount': columns.receipt_amount,
+        'validation_status': columns.validation_status,
+        'validation_flags': columns.validation_flags,
+        'created_at': literal(timestamp, columns.created_at.type),
+        'updated_at': literal(timestamp, columns.updated_at.type),
+        'resolved_by': columns.resolved_by,
+        'resolution_notes': literal(resolution_notes, columns.resolution_notes.type),
+        'receipt_version_processed': literal(1, columns.receipt_version_processed.type),
+        'amount_changed': literal(False, columns.amount_changed.type),
+        'content_fingerprint': columns.content_fingerprint
+    }
+    if preserve_export_state:
+        copied.update({
+            'exported_to_pvault': columns.exported_to_pvault,
+            'export_timestamp': columns.export_timestamp,
+            'export_batch_id': columns.export_batch_id
+        })
+    else:
+        copied['exported_to_pvault'] = literal(False, columns.exported_to_pvault.type)
+
+    source = select(*copied.values()).select_from(
+        revisions.join(clone_map, clone_map.c.base_revision_id == columns.revision_id)
+    ).where(columns.session_id == base_session_id)
+
+    return insert(revisions).from_select(list(copied.keys()), source)
+
+
+def clone_revisions(
+    db: Session,
+    base_session_id: Any,
+    target_session_id: Any,
+    base_revision_ids: Iterable[Any],
+    resolution_notes: str,
+    preserve_export_state: bool = False
+) -> Dict[str, uuid.UUID]:
+    """
+    Copy revisions of the base session into the target session
+
+    Does not commit; the caller's transaction owns the inserted rows.
+
+    Args:
+        db: Database session
+        base_session_id: Session the revisions are copied from
+        target_session_id: Session receiving the copies
+        base_revision_ids: Revision IDs (of the base session) to copy
+        resolution_notes: Note recorded on every copy
+        preserve_export_state: Copy pVault export tracking columns
+
+    Returns:
+        Mapping of base revision ID (string) to new revision ID
+    """
+    revision_map = {
+        str(revision_id): uuid.uuid4() for revision_id in base_revision_ids
+    }
+    if not revision_map:
+        return {}
+
+    connection = db.connection()
+    CLONE_MAP_TABLE.create(bind=connection, checkfirst=True)
+    connection.execute(CLONE_MAP_TABLE.delete())
+    connection.execute(CLONE_MAP_TABLE.insert(), [
+        {'base_revision_id': uuid.UUID(base_id), 'new_revision_id': new_id}
+        for base_id, new_id in revision_map.items()
+    ])
+
+    copied = connection.execute(build_clone_statement(
+        CLONE_MAP_TABLE, target_session_id, base_session_id,
+        datetime.now(timezone.utc), resolution_notes, preserve_export_state
+    )).rowcount
+    connection.execute(CLONE_MAP_TABLE.delete())
+
+    if copied != len(revision_map):
+        # Requested IDs missing from the base session were not copied
+        copied_ids = {
+            str(row.revision_id) for row in db.query(EmployeeRevision.revision_id).filter(
+                EmployeeRevision.session_id == target_session_id
+            )
+        }
+        revision_map = {
+            base_id: new_id for base_id, new_id in revision_map.items() if str(new_id) in copied_ids
+        }
+
+    return revision_map
+
+
+def _sanitize_session_name(session_name: Optional[str]) -> str:
+    """Session name as used in export filenames"""
+    return _INVALID_FILENAME_CHARS.sub('_', session_name or "Session").replace(' ', '_')
+
+
+def _link_or_copy(source: Path, destination: Path):
+    """Hard-link a file (instant, no extra space) or copy it when linking fails"""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+def _rewrite_artifact(payload: Any, target_session_id: str, revision_map: Dict[str, uuid.UUID]) -> Any:
+    """Point a parsed artifact at the target session and its cloned revisions"""
+    if isinstance(payload, dict):
+        payload = dict(payload)
+        if 'session_id' in payload:
+            payload['session_id'] = target_session_id
+        employees = payload.get('employees')
+        if isinstance(employees, list):
+            payload['employees'] = [
+                {**entry, 'revision_id': str(revision_map[str(entry['revision_id'])])}
+                if isinstance(entry, dict) and str(entry.get('revision_id')) in revision_map
+                else entry
+                for entry in employees
+            ]
+    return payload
+
+
+def copy_line_artifacts(
+    base_session_id: str,
+    target_session_id: str,
+    revision_map: Dict[str, uuid.UUID]
+) -> int:
+    """
+    Copy parsed/*.json line artifacts of the base session to the target session
+
+    Session IDs and the revision IDs in index.json are rewritten; unreadable
+    artifacts are skipped (they are non-fatal for processing as well).
+
+    Returns:
+        Number of artifacts copied
+    """
+    source_dir = Path(settings.upload_path) / base_session_id / PARSED_ARTIFACT_DIR
+    if not source_dir.is_dir():
+        return 0
+
+    target_dir = Path(settings.upload_path) / target_session_id / PARSED_ARTIFACT_DIR
+    target_dir.mkdir(parents=True, exist_ok=True)
+
+    copied = 0
+    for source in sorted(source_dir.glob("*.json")):
+        try:
+            with open(source, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable line artifact {source}: {e}")
+            continue
+
+        destination = target_dir / source.name
+        tmp = destination.with_suffix(destination.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(_rewrite_artifact(payload, target_session_id, revision_map), f, ensure_ascii=False, indent=2)
+        os.replace(tmp, destination)
+        copied += 1
+
+    return copied
+
+
+def _cloned_export_name(filename: str, base_session: ProcessingSession, target_session: ProcessingSession) -> str:
+    """Export filename for the target session (session name and ID prefix replaced)"""
+    base_id = str(base_session.session_id)[:8]
+    target_id = str(target_session.session_id)[:8]
+    base_name = _sanitize_session_name(base_session.session_name)
+    target_name = _sanitize_session_name(target_session.session_name)
+
+    for prefix in EXPORT_FILE_PREFIXES:
+        marker = f"{prefix}_{base_name}_{base_id}_"
+        if filename.startswith(marker):
+            return f"{prefix}_{target_name}_{target_id}_{filename[len(marker):]}"
+
+    if f"_{base_id}_" in filename:
+        return filename.replace(f"_{base_id}_", f"_{target_id}_", 1)
+    return f"{target_id}_{filename}"
+
+
+def copy_export_files(
+    db: Session,
+    base_session: ProcessingSession,
+    target_session: ProcessingSession,
+    user: str
+) -> int:
+    """
+    Copy the base session's export files and ExportHistory rows to the target session
+
+    Covers files recorded in ExportHistory and auto-export files found in the
+    export directory by their session-ID naming. Does not commit.
+
+    Returns:
+        Number of export files copied
+    """
+    export_dir = Path(settings.export_path)
+    base_id = str(base_session.session_id)[:8]
+
+    history_by_path = {
+        Path(record.file_path).resolve(): record
+        for record in db.query(ExportHistory).filter(
+            ExportHistory.session_id == base_session.session_id
+        )
+        if record.file_path
+    }
+    sources = set(history_by_path)
+    if export_dir.is_dir():
+        sources.update(
+            path.resolve() for prefix in EXPORT_FILE_PREFIXES
+            for path in export_dir.glob(f"{prefix}_*_{base_id}_*.csv")
+        )
+
+    copied = 0
+    for source in sorted(sources):
+        if not source.is_file():
+            continue
+
+        destination = source.with_name(_cloned_export_name(source.name, base_session, target_session))
+        if not destination.exists():
+            _link_or_copy(source, destination)
+        copied += 1
+
+        record = history_by_path.get(source)
+        if record is not None:
+            db.add(ExportHistory(
+                session_id=target_session.session_id,
+                export_type=record.export_type,
+                export_batch_id=record.export_batch_id,
+                employee_count=record.employee_count,
+                exported_by=user,
+                file_size=destination.stat().st_size,
+                file_path=str(destination),
+                delta_only=record.delta_only,
+                new_employees=record.new_employees,
+                changed_employees=record.changed_employees,
+                previously_exported=record.previously_exported,
+                export_status=record.export_status,
+                error_message=record.error_message
+            ))
+
+    return copied
+
+
+def clone_session_results(
+    db: Session,
+    base_session: ProcessingSession,
+    target_session: ProcessingSession,
+    user: str
+) -> Dict[str, Any]:
+    """
+    Clone a completed session's results into a session with identical files
+
+    Copies every revision in one INSERT ... SELECT, the parsed line artifacts
+    and the export files, then marks the target session COMPLETED in the same
+    transaction. No document is parsed.
+
+    Args:
+        db: Database session
+        base_session: Completed session with the same CAR and Receipt checksums
+        target_session: Session to populate
+        user: User requesting the clone
+
+    Returns:
+        Summary with counts and duration
+    """
+    started = time.perf_counter()
+    base_session_id = str(base_session.session_id)
+    target_session_id = str(target_session.session_id)
+
+    try:
+        base_revision_ids = [
+            row.revision_id for row in db.query(EmployeeRevision.revision_id).filter(
+                EmployeeRevision.session_id == base_session.session_id
+            )
+        ]
+        revision_map = clone_revisions(
+            db, base_session.session_id, target_session.session_id, base_revision_ids,
+            f"Cloned from session {base_session.session_name} (identical files)",
+            preserve_export_state=True
+        )
+        exports_copied = copy_export_files(db, base_session, target_session, user)
+
+        target_session.status = SessionStatus.COMPLETED
+        target_session.total_employees = len(revision_map)
+        target_session.processed_employees = len(revision_map)
+        target_session.delta_session_id = base_session.session_id
+        target_session.processing_options = {
+            **(target_session.processing_options or {}),
+            'cloned_from_session_id': base_session_id
+        }
+        db.add(ProcessingActivity(
+            session_id=target_session.session_id,
+            activity_type=ActivityType.PROCESSING_COMPLETED,
+            activity_message=(
+                f"Results cloned from session {base_session.session_name} "
+                f"({len(revision_map)} employees, identical files; no parsing performed)"
+            ),
+            created_by=user
+        ))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to clone session {base_session_id} into {target_session_id}: {e}")
+        raise
+
+    # Artifacts follow the committed rows; they are best-effort like at processing time
+    try:
+        artifacts_copied = copy_line_artifacts(base_session_id, target_session_id, revision_map)
+    except OSError as e:
+        logger.warning(f"Line-artifact copy failed for session {target_session_id} (non-fatal): {e}")
+        artifacts_copied = 0
+
+    invalidate_validation_state(target_session_id)
+
+    duration_ms = int((time.perf_counter() - started) * 1000)
+    logger.info(
+        f"Cloned session {base_session_id} into {target_session_id}: {len(revision_map)} employees, "
+        f"{artifacts_copied} artifacts, {exports_copied} exports in {duration_ms}ms"
+    )
+    return {
+        'base_session_id': base_session_id,
+        'session_id': target_session_id,
+        'employees_cloned': len(revision_map),
+        'artifacts_copied': artifacts_copied,
+        'exports_copied': exports_copied,
+        'duration_ms': duration_ms
+    }
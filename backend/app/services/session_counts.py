@@ -0,0 +1,39 @@
+"""
+Session Counts
+
+Reads the session_status_counts rows that triggers on processing_sessions keep
+up to date as sessions are created, change status or are deleted (see
+models.SessionStatusCount). The session list total and the dashboard read a
+handful of counter rows instead of counting processing_sessions per request.
+"""
+
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..models import SessionStatus, SessionStatusCount
+
+
+def count_sessions(
+    db: Session,
+    created_by: Optional[str] = None,
+    status: Optional[SessionStatus] = None
+) -> int:
+    """
+    Count sessions from the maintained counters
+
+    Args:
+        db: Database session
+        created_by: Only sessions created by this user (exact match)
+        status: Only sessions in this status
+
+    Returns:
+        Number of matching sessions
+    """
+    query = select(func.coalesce(func.sum(SessionStatusCount.session_count), 0))
+    if created_by is not None:
+        query = query.where(SessionStatusCount.created_by == created_by)
+    if status is not None:
+        query = query.where(SessionStatusCount.status == status)
+    return int(db.execute(query).scalar_one())
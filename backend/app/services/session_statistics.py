@@ -0,0 +1,54 @@
+"""
+Session Statistics
+
+Reads the session_statistics row that triggers on employee_revisions keep up
+to date in the same transaction as every revision insert, status change,
+export flag or delete (see models.SessionStatistics). Summary endpoints,
+the results formatter and auto-export read these counters with one primary
+key lookup instead of rescanning the session's revisions.
+"""
+
+from typing import Any, Dict
+
+from sqlalchemy.orm import Session
+
+from ..models import SessionStatistics
+
+COUNT_COLUMNS = (
+    "total_employees",
+    "valid_employees",
+    "needs_attention_employees",
+    "resolved_employees",
+    "ready_for_export",
+    "attention_required",
+    "missing_receipt_amount",
+    "exported_employees",
+    "missing_receipt_flagged",
+    "coding_incomplete",
+    "amount_mismatch",
+)
+AMOUNT_COLUMNS = ("car_amount_total", "receipt_amount_total")
+
+
+def get_session_statistics(db: Session, session_id) -> Dict[str, Any]:
+    """
+    Get the maintained statistics for a session
+
+    Args:
+        db: Database session
+        session_id: Session UUID (or its string form)
+
+    Returns:
+        Counts and amount totals keyed by column name (zeros for a session
+        without revisions)
+    """
+    row = db.query(SessionStatistics).filter(SessionStatistics.session_id == session_id).first()
+    stats = {column: int(getattr(row, column) or 0) if row else 0 for column in COUNT_COLUMNS}
+    stats.update({column: float(getattr(row, column) or 0) if row else 0.0 for column in AMOUNT_COLUMNS})
+    return stats
+
+
+def export_success_rate(stats: Dict[str, Any], digits: int = 1) -> float:
+    """Percentage of the session's employees ready for export"""
+    total = stats["total_employees"]
+    return round(stats["ready_for_export"] / total * 100, digits) if total > 0 else 0.0
@@ -0,0 +1,243 @@
+"""
+Session Status Snapshots
+
+The status endpoint is polled every few seconds by every open session view.
+Triggers on processing_sessions, employee_revisions, processing_activities and
+file_uploads bump a per-session counter in session_status_versions in the same
+transaction as each write (see models.SessionStatusVersion). A poll reads the
+counter with one primary key lookup; when the client's If-None-Match still
+matches it is answered with 304, otherwise the response built for that
+version is served from an in-memory cache and only rebuilt after a change.
+
+Long-poll (?wait_for_version=N) and Server-Sent Events clients wait on the
+StatusChangeNotifier instead of re-requesting on a timer. The processing
+pipeline notifies it after each write that changes a session; waiters then
+re-read the version, and also re-check every few seconds so writes made
+elsewhere (API edits, other workers) are picked up.
+"""
+
+import asyncio
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import ProcessingSession, SessionStatusVersion
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def read_status_version(db: Session, session_id):
+    """
+    Read a session's owner and status version with one primary key lookup
+
+    Args:
+        db: Database session
+        session_id: Session UUID
+
+    Returns:
+        Row with created_by, version and changed_at (version and changed_at are
+        None until the session first changes), or None when the session does not exist
+    """
+    return db.query(
+        ProcessingSession.created_by,
+        SessionStatusVersion.version,
+        SessionStatusVersion.changed_at
+    ).outerjoin(
+        SessionStatusVersion, SessionStatusVersion.session_id == ProcessingSession.session_id
+    ).filter(
+        ProcessingSession.session_id == session_id
+    ).first()
+
+
+def status_etag(version: Optional[int], changed_at: Optional[datetime]) -> str:
+    """
+    Weak entity tag for a status version
+
+    The change time guards against counters restarting after a database reset.
+    Weak because the estimated time remaining is computed when the response is built.
+    """
+    if not version:
+        return 'W/"0"'
+    return f'W/"{version}-{changed_at:%Y%m%d%H%M%S}"' if changed_at else f'W/"{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches an entity tag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+class StatusSnapshotCache:
+    """
+    Least recently used cache of built status responses keyed by session
+
+    Args:
+        max_entries: Sessions kept before the least recently polled is evicted
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, session_id: str, etag: str) -> Optional[Any]:
+        """Get the response built for this version of the session, if cached"""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None or entry[0] != etag:
+                self._metrics["misses"] += 1
+                return None
+            self._entries.move_to_end(session_id)
+            self._metrics["hits"] += 1
+            return entry[1]
+
+    def put(self, session_id: str, etag: str, response: Any):
+        """Store the response built for a version, replacing older versions"""
+        with self._lock:
+            self._entries[session_id] = (etag, response)
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._metrics["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Cache statistics"""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["entries"] = len(self._entries)
+        return metrics
+
+
+# Application cache (created on first use)
+_status_snapshot_cache: Optional[StatusSnapshotCache] = None
+_status_snapshot_cache_lock = threading.Lock()
+
+
+def get_status_snapshot_cache() -> StatusSnapshotCache:
+    """Get the application's status snapshot cache"""
+    global _status_snapshot_cache
+    with _status_snapshot_cache_lock:
+        if _status_snapshot_cache is None:
+            _status_snapshot_cache = StatusSnapshotCache(settings.status_snapshot_cache_size)
+        return _status_snapshot_cache
+
+
+def _session_key(session_id) -> str:
+    """Canonical string form of a session ID (as passed by the pipeline or parsed from a URL)"""
+    try:
+        return str(uuid.UUID(str(session_id)))
+    except ValueError:
+        return str(session_id)
+
+
+class StatusWatch:
+    """
+    Registration of one waiter for changes to a session (see StatusChangeNotifier.watch)
+
+    Notifications arriving between waits are kept, so a change made right
+    after the version was read still ends the next wait.
+    """
+
+    def __init__(self, notifier: "StatusChangeNotifier", session_key: str):
+        self.notifier = notifier
+        self.session_key = session_key
+        self.loop = asyncio.get_running_loop()
+        self.event = asyncio.Event()
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Wait for a notification
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            True when notified, False on timeout
+        """
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout=max(0.0, timeout))
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.event.clear()
+
+    def __enter__(self) -> "StatusWatch":
+        self.notifier._register(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.notifier._unregister(self)
+
+
+class StatusChangeNotifier:
+    """Wakes status waiters on the event loop when a session changes (callable from any thread)"""
+
+    def __init__(self):
+        self._watches: Dict[str, Set[StatusWatch]] = {}
+        self._lock = threading.Lock()
+        self._metrics = {"notifications": 0, "wakeups": 0}
+
+    def watch(self, session_id) -> StatusWatch:
+        """Create a watch for a session; use as a context manager on the event loop"""
+        return StatusWatch(self, _session_key(session_id))
+
+    def notify(self, session_id):
+        """Wake everyone waiting on a session"""
+        with self._lock:
+            watches = list(self._watches.get(_session_key(session_id), ()))
+            self._metrics["notifications"] += 1
+            self._metrics["wakeups"] += len(watches)
+        for watch in watches:
+            try:
+                watch.loop.call_soon_threadsafe(watch.event.set)
+            except RuntimeError:
+                # Event loop already closed
+                pass
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Notification statistics"""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["waiting"] = sum(len(watches) for watches in self._watches.values())
+        return metrics
+
+    def _register(self, watch: StatusWatch):
+        with self._lock:
+            self._watches.setdefault(watch.session_key, set()).add(watch)
+
+    def _unregister(self, watch: StatusWatch):
+        with self._lock:
+            watches = self._watches.get(watch.session_key)
+            if watches is not None:
+                watches.discard(watch)
+                if not watches:
+                    del self._watches[watch.session_key]
+
+
+# Application notifier
+status_change_notifier = StatusChangeNotifier()
+
+
+def notify_status_change(session_id):
+    """Tell status waiters that a session changed (called by the processing pipeline after its writes)"""
+    status_change_notifier.notify(session_id)
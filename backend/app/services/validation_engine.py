@@ -7,18 +7,31 @@ detailed validation flags, and helpful suggestions for issue resolution.
 Task 9.2: Enhanced Validation Engine
 """
 
+import bisect
 import logging
 from datetime import datetime, timezone
 from decimal import Decimal, InvalidOperation
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Iterable, Set
 from enum import Enum
 
 from ..models import ValidationStatus
 from ..config import settings
 
+# Optional dependencies
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Slack applied to float comparisons in columnar masks; rows near a threshold
+# are re-checked by the exact Decimal rule, so masks may only over-select
+COLUMNAR_TOLERANCE = 1e-6
+
 
 class ValidationSeverity(str, Enum):
     """Validation issue severity levels"""
@@ -41,9 +54,250 @@ class ValidationIssueType(str, Enum):
     CUSTOM_RULE_VIOLATION = "custom_rule_violation"
 
 
+class ContextIndex(str, Enum):
+    """Batch-level indexes a validation rule can request from the validation context"""
+    NAME_COUNTS = "name_counts"       # Occurrences per normalized employee name
+    ID_COUNTS = "id_counts"           # Occurrences per normalized employee ID
+    AMOUNT_STATS = "amount_stats"     # Aggregates and percentiles of CAR/receipt amounts
+
+
+def _normalize_name_key(value: Any) -> str:
+    """Normalize an employee name for duplicate counting"""
+    return str(value or "").strip().lower()
+
+
+def _normalize_id_key(value: Any) -> str:
+    """Normalize an employee ID for duplicate counting"""
+    return str(value or "").strip()
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Convert an amount to float, None when missing or invalid"""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError, InvalidOperation):
+        return None
+
+
+class ValidationContext:
+    """
+    Precomputed batch context shared by all rules during validate_batch
+    
+    Built once per batch with only the indexes the configured rules declare,
+    so rules answer batch-level questions (duplicates, amount distribution)
+    with O(1) lookups instead of scanning every employee.
+    """
+    
+    PERCENTILES = (50, 90, 95, 99)
+    AMOUNT_FIELDS = ("car_amount", "receipt_amount")
+    
+    def __init__(self, employees: List[Dict[str, Any]], indexes: Iterable[str] = None):
+        """
+        Build the requested indexes over a batch of employees
+        
+        Args:
+            employees: Employee data dictionaries in the batch
+            indexes: ContextIndex values to build (all when None)
+        """
+        requested = {ContextIndex(index) for index in indexes} if indexes is not None else set(ContextIndex)
+        
+        self.employee_count = len(employees)
+        self.indexes: Set[ContextIndex] = requested
+        self.name_counts: Dict[str, int] = {}
+        self.id_counts: Dict[str, int] = {}
+        # Per-row normalized keys, aligned with the batch order
+        self.name_keys: List[str] = []
+        self.id_keys: List[str] = []
+        self.amount_stats: Dict[str, Dict[str, float]] = {}
+        
+        build_names = ContextIndex.NAME_COUNTS in requested
+        build_ids = ContextIndex.ID_COUNTS in requested
+        build_amounts = ContextIndex.AMOUNT_STATS in requested
+        amounts: Dict[str, List[float]] = {field: [] for field in self.AMOUNT_FIELDS}
+        
+        for employee in employees:
+            if build_names:
+                name_key = _normalize_name_key(employee.get("employee_name"))
+                self.name_keys.append(name_key)
+                if name_key:
+                    self.name_counts[name_key] = self.name_counts.get(name_key, 0) + 1
+            if build_ids:
+                id_key = _normalize_id_key(employee.get("employee_id"))
+                self.id_keys.append(id_key)
+                if id_key:
+                    self.id_counts[id_key] = self.id_counts.get(id_key, 0) + 1
+            if build_amounts:
+                for field in self.AMOUNT_FIELDS:
+                    value = _to_float(employee.get(field))
+                    if value is not None:
+                        amounts[field].append(value)
+        
+        # Sorted amounts are kept so add_employee/remove_employee can update stats by delta
+        self._ordered_amounts: Dict[str, List[float]] = {}
+        if build_amounts:
+            for field, values in amounts.items():
+                values.sort()
+                self._ordered_amounts[field] = values
+                self.amount_stats[field] = self._summarize(values, sum(values))
+    
+    @classmethod
+    def _summarize(cls, ordered: List[float], total: float) -> Dict[str, float]:
+        """Aggregates and linear-interpolated percentiles of a sorted list of amounts"""
+        if not ordered:
+            return {"count": 0, "total": 0.0}
+        
+        count = len(ordered)
+        stats = {
+            "count": count,
+            "total": total,
+            "min": ordered[0],
+            "max": ordered[-1],
+            "mean": total / count
+        }
+        for percentile in cls.PERCENTILES:
+            rank = (count - 1) * percentile / 100
+            lower = int(rank)
+            upper = min(lower + 1, count - 1)
+            stats[f"p{percentile}"] = ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+        return stats
+    
+    def add_employee(self, employee: Dict[str, Any]):
+        """
+        Add one employee to the built indexes (delta update)
+        
+        Per-row keys (name_keys/id_keys) describe the original batch order only
+        and are cleared, so columnar masks fall back to per-row evaluation.
+        """
+        self._apply_delta(employee, 1)
+    
+    def remove_employee(self, employee: Dict[str, Any]):
+        """Remove one previously added employee from the built indexes (delta update)"""
+        self._apply_delta(employee, -1)
+    
+    def _apply_delta(self, employee: Dict[str, Any], delta: int):
+        """Adjust counts and amount stats for an added (+1) or removed (-1) employee"""
+        self.employee_count += delta
+        self.name_keys = []
+        self.id_keys = []
+        
+        if ContextIndex.NAME_COUNTS in self.indexes:
+            self._adjust_count(self.name_counts, _normalize_name_key(employee.get("employee_name")), delta)
+        if ContextIndex.ID_COUNTS in self.indexes:
+            self._adjust_count(self.id_counts, _normalize_id_key(employee.get("employee_id")), delta)
+        if ContextIndex.AMOUNT_STATS in self.indexes:
+            for field in self.AMOUNT_FIELDS:
+                value = _to_float(employee.get(field))
+                if value is None:
+                    continue
+                ordered = self._ordered_amounts.setdefault(field, [])
+                total = self.amount_stats.get(field, {}).get("total", 0.0)
+                if delta > 0:
+                    bisect.insort(ordered, value)
+                    total += value
+                else:
+                    position = bisect.bisect_left(ordered, value)
+                    if position == len(ordered) or ordered[position] != value:
+                        continue
+                    del ordered[position]
+                    total -= value
+                self.amount_stats[field] = self._summarize(ordered, total)
+    
+    @staticmethod
+    def _adjust_count(counts: Dict[str, int], key: str, delta: int):
+        """Increment or decrement a count, dropping keys that reach zero"""
+        if not key:
+            return
+        count = counts.get(key, 0) + delta
+        if count > 0:
+            counts[key] = count
+        else:
+            counts.pop(key, None)
+    
+    def name_count(self, employee_name: Any) -> int:
+        """Number of employees in the batch with this normalized name"""
+        return self.name_counts.get(_normalize_name_key(employee_name), 0)
+    
+    def id_count(self, employee_id: Any) -> int:
+        """Number of employees in the batch with this normalized employee ID"""
+        return self.id_counts.get(_normalize_id_key(employee_id), 0)
+    
+    def amount_stat(self, field: str, stat: str) -> Optional[float]:
+        """Aggregate or percentile (e.g. 'p95', 'mean') for 'car_amount' or 'receipt_amount'"""
+        return self.amount_stats.get(field, {}).get(stat)
+
+
+class EmployeeColumns:
+    """
+    Columnar NumPy view of a batch of employees for vectorized rule masks
+    
+    Columns are loaded lazily, once per batch, the first time a rule asks for
+    them: each field is projected out of the employee dicts in one pass and
+    converted by NumPy in a single call. Batches holding values NumPy cannot
+    convert the same way as the row rules (text amounts, non-numeric
+    confidence) fall back to converting those columns value by value.
+    Amounts are float64 with NaN for missing or unparseable values.
+    """
+    
+    # Value types NumPy converts to float64 exactly like _to_float (None becomes NaN)
+    NUMERIC_TYPES = frozenset((int, float, Decimal, type(None)))
+    
+    def __init__(self, employees: List[Dict[str, Any]]):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("Columnar validation requires numpy")
+        
+        self.employees = employees
+        self.size = len(employees)
+        self._amounts: Dict[str, Any] = {}
+        self._blank: Dict[str, Any] = {}
+        self._confidence = None
+    
+    def project(self, field: str, default: Any = None) -> List[Any]:
+        """Values of one field across the batch"""
+        return [employee.get(field, default) for employee in self.employees]
+    
+    def amount(self, field: str):
+        """Float amounts for a field (NaN when missing or invalid)"""
+        if field not in self._amounts:
+            values = self.project(field)
+            if not self.NUMERIC_TYPES.issuperset(map(type, values)):
+                values = [_to_float(value) for value in values]
+            self._amounts[field] = np.array(values, dtype=np.float64)
+        return self._amounts[field]
+    
+    def blank(self, field: str):
+        """True where a field is None or whitespace only"""
+        if field not in self._blank:
+            values = np.fromiter(self.project(field), dtype=object, count=self.size)
+            missing = np.equal(values, None)
+            text = np.where(missing, "", values).astype(str)
+            self._blank[field] = missing | (np.char.strip(text) == "")
+        return self._blank[field]
+    
+    def confidence(self):
+        """Confidence scores (1.0 when absent, NaN when not numeric)"""
+        if self._confidence is None:
+            values = self.project("confidence", 1.0)
+            if not {int, float}.issuperset(map(type, values)):
+                values = [
+                    value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+                    for value in values
+                ]
+            self._confidence = np.array(values, dtype=np.float64)
+        return self._confidence
+
+
 class ValidationRule:
     """Base class for validation rules"""
     
+    # Context indexes (ContextIndex values) this rule reads in validate_batch
+    required_indexes: Tuple[ContextIndex, ...] = ()
+    
+    # Employee fields this rule reads; incremental revalidation re-runs the rule
+    # only when one of them changes (empty means re-run on any change)
+    depends_on: Tuple[str, ...] = ()
+    
     def __init__(self, name: str, description: str, severity: ValidationSeverity):
         self.name = name
         self.description = description
@@ -55,17 +309,34 @@ class ValidationRule:
         
         Args:
             employee_data: Employee data to validate
-            context: Additional context for validation (e.g., other employees, configuration)
+            context: Additional context for validation; in batch mode "all_employees"
+                holds the batch and "index" the ValidationContext built from it
             
         Returns:
             Validation issue dictionary if rule fails, None if passes
         """
         raise NotImplementedError("Validation rules must implement validate method")
+    
+    def candidate_mask(self, columns: EmployeeColumns, context: Dict[str, Any] = None):
+        """
+        Vectorized pre-check for columnar batch validation
+        
+        Args:
+            columns: Columnar view of the batch
+            context: Batch validation context
+            
+        Returns:
+            Boolean array marking rows validate() must run on (every row that can
+            fail must be marked), or None if the rule has no columnar support
+        """
+        return None
 
 
 class MissingReceiptRule(ValidationRule):
     """Rule to detect missing receipt information"""
     
+    depends_on = ("receipt_amount", "employee_name")
+    
     def __init__(self):
         super().__init__(
             name="missing_receipt",
@@ -88,11 +359,17 @@ class MissingReceiptRule(ValidationRule):
             }
         
         return None
+    
+    def candidate_mask(self, columns: EmployeeColumns, context: Dict[str, Any] = None):
+        receipt = columns.amount("receipt_amount")
+        return np.isnan(receipt) | (receipt == 0)
 
 
 class AmountMismatchRule(ValidationRule):
     """Rule to detect amount mismatches between CAR and Receipt"""
     
+    depends_on = ("car_amount", "receipt_amount")
+    
     def __init__(self, threshold_dollars: float = 5.00, threshold_percentage: float = 0.05):
         super().__init__(
             name="amount_mismatch",
@@ -151,11 +428,31 @@ class AmountMismatchRule(ValidationRule):
             }
         
         return None
+    
+    def candidate_mask(self, columns: EmployeeColumns, context: Dict[str, Any] = None):
+        car = columns.amount("car_amount")
+        receipt = columns.amount("receipt_amount")
+        
+        # Missing or invalid amounts may produce INVALID_AMOUNT issues, so always re-check them
+        unknown = np.isnan(car) | np.isnan(receipt)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            difference = np.abs(car - receipt)
+            larger = np.maximum(car, receipt)
+            percentage = np.where(larger > 0, difference / larger, 0.0)
+        
+        mismatch = (
+            (car != 0) & (receipt != 0) &
+            (difference > self.threshold_dollars - COLUMNAR_TOLERANCE) &
+            (percentage > self.threshold_percentage - COLUMNAR_TOLERANCE)
+        )
+        return unknown | mismatch
 
 
 class MissingEmployeeIDRule(ValidationRule):
     """Rule to detect missing employee IDs"""
     
+    depends_on = ("employee_id", "employee_name")
+    
     def __init__(self):
         super().__init__(
             name="missing_employee_id",
@@ -177,11 +474,16 @@ class MissingEmployeeIDRule(ValidationRule):
             }
         
         return None
+    
+    def candidate_mask(self, columns: EmployeeColumns, context: Dict[str, Any] = None):
+        return columns.blank("employee_id")
 
 
 class PolicyViolationRule(ValidationRule):
     """Rule to detect policy violations (amount limits)"""
     
+    depends_on = ("car_amount", "receipt_amount")
+    
     def __init__(self, max_amount: float = 2000.00):
         super().__init__(
             name="policy_violation",
@@ -221,11 +523,20 @@ class PolicyViolationRule(ValidationRule):
             }
         
         return None
+    
+    def candidate_mask(self, columns: EmployeeColumns, context: Dict[str, Any] = None):
+        car = columns.amount("car_amount")
+        receipt = columns.amount("receipt_amount")
+        limit = float(self.max_amount) - COLUMNAR_TOLERANCE
+        return np.isnan(car) | np.isnan(receipt) | (car > limit) | (receipt > limit)
 
 
 class DuplicateEmployeeRule(ValidationRule):
     """Rule to detect duplicate employee entries within a session"""
     
+    required_indexes = (ContextIndex.NAME_COUNTS, ContextIndex.ID_COUNTS)
+    depends_on = ("employee_name", "employee_id")
+    
     def __init__(self):
         super().__init__(
             name="duplicate_employee",
@@ -234,28 +545,25 @@ class DuplicateEmployeeRule(ValidationRule):
         )
     
     def validate(self, employee_data: Dict[str, Any], context: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
-        if not context or "all_employees" not in context:
+        if not context:
             return None
         
-        employee_name = employee_data.get("employee_name", "").strip().lower()
-        employee_id = employee_data.get("employee_id", "").strip()
+        index = context.get("index")
+        if index is None:
+            if "all_employees" not in context:
+                return None
+            # No precomputed context (single-employee callers): index the list on the fly
+            index = ValidationContext(context["all_employees"], self.required_indexes)
+        
+        employee_name = _normalize_name_key(employee_data.get("employee_name"))
+        employee_id = _normalize_id_key(employee_data.get("employee_id"))
         
         if not employee_name and not employee_id:
             return None
         
         # Count occurrences of this employee
-        all_employees = context["all_employees"]
-        name_matches = 0
-        id_matches = 0
-        
-        for emp in all_employees:
-            emp_name = emp.get("employee_name", "").strip().lower()
-            emp_id = emp.get("employee_id", "").strip()
-            
-            if employee_name and emp_name == employee_name:
-                name_matches += 1
-            if employee_id and emp_id == employee_id:
-                id_matches += 1
+        name_matches = index.name_count(employee_name) if employee_name else 0
+        id_matches = index.id_count(employee_id) if employee_id else 0
         
         if name_matches > 1 or id_matches > 1:
             return {
@@ -272,11 +580,24 @@ class DuplicateEmployeeRule(ValidationRule):
             }
         
         return None
+    
+    def candidate_mask(self, columns: EmployeeColumns, context: Dict[str, Any] = None):
+        index = (context or {}).get("index")
+        if index is None or len(index.name_keys) != columns.size or len(index.id_keys) != columns.size:
+            return None
+        mask = np.zeros(columns.size, dtype=bool)
+        for keys, counts in ((index.name_keys, index.name_counts), (index.id_keys, index.id_counts)):
+            repeated = {key for key, count in counts.items() if count > 1}
+            if repeated:
+                mask |= np.fromiter(map(repeated.__contains__, keys), dtype=bool, count=columns.size)
+        return mask
 
 
 class LowConfidenceRule(ValidationRule):
     """Rule to detect low confidence scores from document processing"""
     
+    depends_on = ("confidence", "employee_name")
+    
     def __init__(self, min_confidence: float = 0.8):
         super().__init__(
             name="low_confidence",
@@ -303,6 +624,10 @@ class LowConfidenceRule(ValidationRule):
             }
         
         return None
+    
+    def candidate_mask(self, columns: EmployeeColumns, context: Dict[str, Any] = None):
+        confidence = columns.confidence()
+        return np.isnan(confidence) | (confidence < self.min_confidence + COLUMNAR_TOLERANCE)
 
 
 class IncompleteDataRule(ValidationRule):
@@ -315,6 +640,7 @@ class IncompleteDataRule(ValidationRule):
             severity=ValidationSeverity.MEDIUM
         )
         self.required_fields = required_fields or ["employee_name", "employee_id"]
+        self.depends_on = tuple(self.required_fields)
     
     def validate(self, employee_data: Dict[str, Any], context: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
         missing_fields = []
@@ -338,6 +664,12 @@ class IncompleteDataRule(ValidationRule):
             }
         
         return None
+    
+    def candidate_mask(self, columns: EmployeeColumns, context: Dict[str, Any] = None):
+        mask = np.zeros(columns.size, dtype=bool)
+        for field in self.required_fields:
+            mask |= columns.blank(field)
+        return mask
 
 
 class ValidationEngine:
@@ -402,6 +734,34 @@ class ValidationEngine:
         self.rules.append(rule)
         logger.info(f"Added custom validation rule: {rule.name}")
     
+    def build_context(self, employees: List[Dict[str, Any]]) -> ValidationContext:
+        """
+        Build the batch validation context with the indexes required by the configured rules
+        
+        Args:
+            employees: List of employee data dictionaries
+            
+        Returns:
+            ValidationContext for the batch
+        """
+        indexes = set()
+        for rule in self.rules:
+            indexes.update(getattr(rule, "required_indexes", ()))
+        return ValidationContext(employees, indexes)
+    
+    def rules_for_fields(self, changed_fields: Iterable[str]) -> List[ValidationRule]:
+        """
+        Rules whose outcome can change when the given employee fields change
+        
+        Args:
+            changed_fields: Names of the changed employee fields
+            
+        Returns:
+            Rules declaring a dependency on a changed field, plus rules without declared dependencies
+        """
+        changed = set(changed_fields)
+        return [rule for rule in self.rules if not rule.depends_on or changed.intersection(rule.depends_on)]
+    
     def validate_employee_data(self, employee_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Validate employee data against all configured rules
@@ -459,59 +819,72 @@ class ValidationEngine:
                 "validation_summary": "Validation engine encountered an error"
             }
     
-    def validate_batch(self, employees: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def validate_batch(self, employees: List[Dict[str, Any]], columnar: Optional[bool] = None) -> List[Dict[str, Any]]:
         """
         Validate a batch of employees with context-aware validation
         
         Args:
             employees: List of employee data dictionaries
+            columnar: Use vectorized rule masks (defaults to the "columnar_validation"
+                config value, enabled when numpy is installed)
             
         Returns:
             List of validation results for each employee
         """
-        results = []
+        # Build batch context once with the indexes the configured rules need
+        context = {
+            "all_employees": employees,
+            "index": self.build_context(employees)
+        }
+        detected_at = datetime.now(timezone.utc).isoformat()
+        
+        if columnar is None:
+            columnar = self.config.get("columnar_validation", True)
+        
+        rule_masks = None
+        candidate_rows = range(len(employees))
+        if columnar and NUMPY_AVAILABLE and employees:
+            rule_masks = self._build_rule_masks(employees, context)
+            if all(mask is not None for mask in rule_masks):
+                # Rows no rule can fail are valid without building any issue
+                candidate_rows = np.flatnonzero(np.logical_or.reduce(rule_masks)).tolist()
         
-        for i, employee_data in enumerate(employees):
+        results = [self._valid_result() for _ in employees] if rule_masks is not None else [None] * len(employees)
+        
+        for i in candidate_rows:
+            employee_data = employees[i]
             try:
                 validation_issues = []
                 
-                # Create context with all employees for duplicate detection
-                context = {"all_employees": employees}
-                
                 # Run each validation rule with full context
-                for rule in self.rules:
+                for rule_index, rule in enumerate(self.rules):
+                    if rule_masks is not None and rule_masks[rule_index] is not None and not rule_masks[rule_index][i]:
+                        continue
                     try:
                         issue = rule.validate(employee_data, context)
                         if issue:
                             issue["rule_name"] = rule.name
-                            issue["detected_at"] = datetime.now(timezone.utc).isoformat()
+                            issue["detected_at"] = detected_at
                             validation_issues.append(issue)
                     except Exception as e:
                         logger.error(f"Error in validation rule {rule.name} for employee {i}: {str(e)}")
                 
-                # Determine validation status
                 if not validation_issues:
-                    validation_status = ValidationStatus.VALID
-                else:
-                    # Any validation issues should trigger NEEDS_ATTENTION
-                    validation_status = ValidationStatus.NEEDS_ATTENTION
+                    results[i] = self._valid_result()
+                    continue
                 
-                # Generate validation flags
-                validation_flags = self.generate_validation_flags(validation_issues)
-                
-                result = {
-                    "validation_status": validation_status,
-                    "validation_flags": validation_flags,
+                # Any validation issues should trigger NEEDS_ATTENTION
+                results[i] = {
+                    "validation_status": ValidationStatus.NEEDS_ATTENTION,
+                    "validation_flags": self.generate_validation_flags(validation_issues),
                     "issues_count": len(validation_issues),
                     "highest_severity": self._get_highest_severity(validation_issues),
                     "validation_summary": self._generate_summary(validation_issues)
                 }
                 
-                results.append(result)
-                
             except Exception as e:
                 logger.error(f"Batch validation error for employee {i}: {str(e)}")
-                results.append({
+                results[i] = {
                     "validation_status": ValidationStatus.NEEDS_ATTENTION,
                     "validation_flags": {
                         "validation_error": True,
@@ -521,10 +894,37 @@ class ValidationEngine:
                     "issues_count": 1,
                     "highest_severity": ValidationSeverity.HIGH.value,
                     "validation_summary": "Validation encountered an error"
-                })
+                }
         
         return results
     
+    def _build_rule_masks(self, employees: List[Dict[str, Any]], context: Dict[str, Any]) -> List[Optional[Any]]:
+        """
+        Compute per-rule candidate masks over a columnar view of the batch
+        
+        Returns:
+            One boolean array per rule (None where the rule has no columnar support)
+        """
+        columns = EmployeeColumns(employees)
+        masks = []
+        for rule in self.rules:
+            try:
+                masks.append(rule.candidate_mask(columns, context))
+            except Exception as e:
+                logger.warning(f"Columnar mask failed for rule {rule.name}, evaluating per row: {str(e)}")
+                masks.append(None)
+        return masks
+    
+    def _valid_result(self) -> Dict[str, Any]:
+        """Validation result for an employee without issues"""
+        return {
+            "validation_status": ValidationStatus.VALID,
+            "validation_flags": {},
+            "issues_count": 0,
+            "highest_severity": ValidationSeverity.LOW.value,
+            "validation_summary": "All validations passed"
+        }
+    
     def generate_validation_flags(self, issues: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Generate validation flags from validation issues
@@ -0,0 +1,81 @@
+"""add_session_status_counts_table
+
+Revision ID: b3d5f7a9c128
+Revises: a7c2e4f8b016
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d5f7a9c128'
+down_revision: Union[str, Sequence[str], None] = 'a7c2e4f8b016'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Status enum values and trigger DDL as of this revision
+SESSION_STATUSES = [
+    'PENDING', 'UPLOADING', 'PROCESSING', 'EXTRACTING', 'ANALYZING', 'PAUSED', 'COMPLETED',
+    'FAILED', 'CANCELLED', 'CLOSED', 'RECEIPT_REPROCESSING', 'COMPARING_RECEIPTS'
+]
+
+
+def _count_change(row: str, delta: int) -> str:
+    return (
+        "INSERT INTO session_status_counts (created_by, status, session_count) "
+        f"VALUES ({row}.created_by, {row}.status, {delta}) "
+        f"ON CONFLICT(created_by, status) DO UPDATE SET session_count = session_count + ({delta});"
+    )
+
+
+SESSION_STATUS_COUNT_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS trg_session_status_counts_insert AFTER INSERT ON processing_sessions "
+    f"BEGIN {_count_change('NEW', 1)} END",
+    "CREATE TRIGGER IF NOT EXISTS trg_session_status_counts_delete AFTER DELETE ON processing_sessions "
+    f"BEGIN {_count_change('OLD', -1)} END",
+    "CREATE TRIGGER IF NOT EXISTS trg_session_status_counts_update AFTER UPDATE OF created_by, status "
+    "ON processing_sessions WHEN OLD.created_by IS NOT NEW.created_by OR OLD.status IS NOT NEW.status "
+    f"BEGIN {_count_change('OLD', -1)} {_count_change('NEW', 1)} END",
+]
+
+SESSION_STATUS_COUNT_BACKFILL = (
+    "INSERT INTO session_status_counts (created_by, status, session_count) "
+    "SELECT created_by, status, COUNT(*) FROM processing_sessions WHERE true GROUP BY created_by, status "
+    "ON CONFLICT(created_by, status) DO UPDATE SET session_count = excluded.session_count"
+)
+
+
+def upgrade() -> None:
+    """Create session_status_counts with its triggers and backfill, and add session list/dashboard indexes."""
+    op.create_table(
+        'session_status_counts',
+        sa.Column('created_by', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.Enum(*SESSION_STATUSES, name='sessionstatus'), nullable=False),
+        sa.Column('session_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('created_by', 'status')
+    )
+    for statement in SESSION_STATUS_COUNT_TRIGGERS:
+        op.execute(statement)
+    op.execute(SESSION_STATUS_COUNT_BACKFILL)
+
+    op.create_index('idx_session_status_updated', 'processing_sessions', ['status', 'updated_at'])
+    op.create_index('idx_session_created_id', 'processing_sessions', ['created_at', 'session_id'])
+    op.create_index(
+        'idx_session_created_by_created_id', 'processing_sessions', ['created_by', 'created_at', 'session_id']
+    )
+
+
+def downgrade() -> None:
+    """Drop session list/dashboard indexes and session_status_counts."""
+    op.drop_index('idx_session_created_by_created_id', 'processing_sessions')
+    op.drop_index('idx_session_created_id', 'processing_sessions')
+    op.drop_index('idx_session_status_updated', 'processing_sessions')
+    for trigger in (
+        'trg_session_status_counts_update', 'trg_session_status_counts_delete', 'trg_session_status_counts_insert'
+    ):
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.drop_table('session_status_counts')
@@ -0,0 +1,31 @@
+"""add_employee_keyset_index
+
+Revision ID: b7c41e2d9f10
+Revises: phase4_models
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c41e2d9f10'
+down_revision: Union[str, Sequence[str], None] = 'phase4_models'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add (session_id, employee_name, revision_id) index for keyset pagination."""
+    op.create_index(
+        'idx_employee_session_name_revision',
+        'employee_revisions',
+        ['session_id', 'employee_name', 'revision_id']
+    )
+
+
+def downgrade() -> None:
+    """Remove keyset pagination index."""
+    op.drop_index('idx_employee_session_name_revision', 'employee_revisions')
@@ -0,0 +1,35 @@
+"""add_employee_content_fingerprint
+
+Revision ID: c2d8a5f3e611
+Revises: b7c41e2d9f10
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d8a5f3e611'
+down_revision: Union[str, Sequence[str], None] = 'b7c41e2d9f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add content fingerprint column and lookup index to employee_revisions table."""
+    op.add_column('employee_revisions', sa.Column('content_fingerprint', sa.String(64), nullable=True))
+    op.create_index(
+        'idx_employee_session_fingerprint',
+        'employee_revisions',
+        ['session_id', 'content_fingerprint']
+    )
+    # Existing revisions keep a NULL fingerprint and always take the detailed comparison
+
+
+def downgrade() -> None:
+    """Remove content fingerprint column and index."""
+    op.drop_index('idx_employee_session_fingerprint', 'employee_revisions')
+    op.drop_column('employee_revisions', 'content_fingerprint')
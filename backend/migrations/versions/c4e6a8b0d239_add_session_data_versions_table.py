@@ -0,0 +1,61 @@
+"""add_session_data_versions_table
+
+Revision ID: c4e6a8b0d239
+Revises: b3d5f7a9c128
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e6a8b0d239'
+down_revision: Union[str, Sequence[str], None] = 'b3d5f7a9c128'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _version_bump(row: str) -> str:
+    return (
+        "INSERT INTO session_data_versions (session_id, version, changed_at) "
+        f"VALUES ({row}.session_id, 1, CURRENT_TIMESTAMP) "
+        "ON CONFLICT(session_id) DO UPDATE SET version = version + 1, changed_at = excluded.changed_at;"
+    )
+
+
+# Triggers as this revision creates them (later model changes belong in new migrations)
+SESSION_DATA_VERSION_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS trg_data_version_{table}_{operation.lower()} AFTER {operation} ON {table} "
+    f"BEGIN {_version_bump('OLD' if operation == 'DELETE' else 'NEW')} END"
+    for table, operations in (
+        ('processing_sessions', ('INSERT', 'UPDATE')),
+        ('employee_revisions', ('INSERT', 'UPDATE', 'DELETE')),
+    )
+    for operation in operations
+]
+
+
+def upgrade() -> None:
+    """Create session_data_versions table and the triggers that bump it."""
+    # No backfill: a session without a row is at version 0 until it next changes
+    op.create_table(
+        'session_data_versions',
+        sa.Column('session_id', sa.CHAR(length=36), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['session_id'], ['processing_sessions.session_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('session_id')
+    )
+    for statement in SESSION_DATA_VERSION_TRIGGERS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Drop session_data_versions triggers and table."""
+    for statement in reversed(SESSION_DATA_VERSION_TRIGGERS):
+        trigger = statement.split()[5]
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.drop_table('session_data_versions')
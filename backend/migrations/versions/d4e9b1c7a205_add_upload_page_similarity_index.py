@@ -0,0 +1,31 @@
+"""add_upload_page_similarity_index
+
+Revision ID: d4e9b1c7a205
+Revises: c2d8a5f3e611
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e9b1c7a205'
+down_revision: Union[str, Sequence[str], None] = 'c2d8a5f3e611'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add page hash and MinHash signature columns to file_uploads table."""
+    op.add_column('file_uploads', sa.Column('page_hashes', sa.JSON(), nullable=True))
+    op.add_column('file_uploads', sa.Column('minhash_signature', sa.JSON(), nullable=True))
+    # Existing uploads have no page index and only take part in whole-file checksum matching
+
+
+def downgrade() -> None:
+    """Remove page similarity columns."""
+    op.drop_column('file_uploads', 'minhash_signature')
+    op.drop_column('file_uploads', 'page_hashes')
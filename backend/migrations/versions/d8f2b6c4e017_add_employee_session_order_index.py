@@ -0,0 +1,31 @@
+"""add_employee_session_order_index
+
+Revision ID: d8f2b6c4e017
+Revises: c4e6a8b0d239
+Create Date: 2026-10-18 23:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f2b6c4e017'
+down_revision: Union[str, Sequence[str], None] = 'c4e6a8b0d239'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add (session_id, created_at, revision_id) index for ordered session exports."""
+    op.create_index(
+        'idx_employee_session_created_revision',
+        'employee_revisions',
+        ['session_id', 'created_at', 'revision_id']
+    )
+
+
+def downgrade() -> None:
+    """Remove ordered session export index."""
+    op.drop_index('idx_employee_session_created_revision', 'employee_revisions')
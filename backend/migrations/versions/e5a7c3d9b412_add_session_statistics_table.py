@@ -0,0 +1,123 @@
+"""add_session_statistics_table
+
+Revision ID: e5a7c3d9b412
+Revises: d4e9b1c7a205
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c3d9b412'
+down_revision: Union[str, Sequence[str], None] = 'd4e9b1c7a205'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNT_COLUMNS = [
+    'total_employees', 'valid_employees', 'needs_attention_employees', 'resolved_employees',
+    'ready_for_export', 'attention_required', 'missing_receipt_amount', 'exported_employees',
+    'missing_receipt_flagged', 'coding_incomplete', 'amount_mismatch'
+]
+
+
+# Statistics trigger and backfill DDL as of this revision
+def _flag_set(flags: str, flag: str) -> str:
+    return (
+        f"CASE WHEN json_valid({flags}) "
+        f"AND json_extract({flags}, '$.{flag}') IN (1, 'true') THEN 1 ELSE 0 END"
+    )
+
+
+def _statistics_expressions(row: str) -> dict:
+    """Contribution of one employee_revisions row to each statistics column"""
+    missing_receipt = f"({row}.receipt_amount IS NULL OR {row}.receipt_amount <= 0)"
+    flags = f"{row}.validation_flags"
+    conditions = {
+        'valid_employees': f"{row}.validation_status = 'VALID'",
+        'needs_attention_employees': f"{row}.validation_status = 'NEEDS_ATTENTION'",
+        'resolved_employees': f"{row}.validation_status = 'RESOLVED'",
+        'ready_for_export': f"{row}.validation_status = 'VALID' AND {row}.receipt_amount > 0",
+        'attention_required': f"{row}.validation_status = 'NEEDS_ATTENTION' OR {missing_receipt}",
+        'missing_receipt_amount': missing_receipt,
+        'exported_employees': f"{row}.exported_to_pvault = 1",
+        'missing_receipt_flagged': f"({_flag_set(flags, 'missing_receipt')}) = 1",
+        'coding_incomplete': (
+            f"{row}.validation_status = 'NEEDS_ATTENTION' AND ({_flag_set(flags, 'coding_incomplete')}) = 1"
+        ),
+        'amount_mismatch': (
+            f"{row}.validation_status = 'NEEDS_ATTENTION' AND ({_flag_set(flags, 'amount_mismatch')}) = 1"
+        ),
+    }
+    expressions = {'total_employees': '1'}
+    expressions.update({column: f"(CASE WHEN {condition} THEN 1 ELSE 0 END)" for column, condition in conditions.items()})
+    expressions['car_amount_total'] = f"COALESCE({row}.car_amount, 0)"
+    expressions['receipt_amount_total'] = f"COALESCE({row}.receipt_amount, 0)"
+    return expressions
+
+
+def _statistics_upsert(row: str) -> str:
+    expressions = _statistics_expressions(row)
+    increments = ", ".join(f"{column} = {column} + excluded.{column}" for column in expressions)
+    return (
+        f"INSERT INTO session_statistics (session_id, {', '.join(expressions)}, updated_at) "
+        f"VALUES ({row}.session_id, {', '.join(expressions.values())}, CURRENT_TIMESTAMP) "
+        f"ON CONFLICT(session_id) DO UPDATE SET {increments}, updated_at = excluded.updated_at;"
+    )
+
+
+def _statistics_subtract(row: str) -> str:
+    decrements = ", ".join(
+        f"{column} = {column} - {expression}" for column, expression in _statistics_expressions(row).items()
+    )
+    return (
+        f"UPDATE session_statistics SET {decrements}, updated_at = CURRENT_TIMESTAMP "
+        f"WHERE session_id = {row}.session_id;"
+    )
+
+
+SESSION_STATISTICS_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS trg_session_statistics_insert AFTER INSERT ON employee_revisions "
+    f"BEGIN {_statistics_upsert('NEW')} END",
+    "CREATE TRIGGER IF NOT EXISTS trg_session_statistics_delete AFTER DELETE ON employee_revisions "
+    f"BEGIN {_statistics_subtract('OLD')} END",
+    "CREATE TRIGGER IF NOT EXISTS trg_session_statistics_update AFTER UPDATE OF "
+    "session_id, validation_status, validation_flags, car_amount, receipt_amount, exported_to_pvault "
+    f"ON employee_revisions BEGIN {_statistics_subtract('OLD')} {_statistics_upsert('NEW')} END",
+]
+
+_revision_expressions = _statistics_expressions('r')
+SESSION_STATISTICS_BACKFILL = (
+    f"INSERT INTO session_statistics (session_id, {', '.join(_revision_expressions)}, updated_at) "
+    f"SELECT r.session_id, {', '.join(f'SUM({expression})' for expression in _revision_expressions.values())}, "
+    "CURRENT_TIMESTAMP FROM employee_revisions r "
+    "WHERE r.session_id NOT IN (SELECT session_id FROM session_statistics) "
+    "GROUP BY r.session_id"
+)
+
+
+def upgrade() -> None:
+    """Create session_statistics table, its maintenance triggers, and backfill existing sessions."""
+    op.create_table(
+        'session_statistics',
+        sa.Column('session_id', sa.CHAR(length=36), nullable=False),
+        *[sa.Column(name, sa.Integer(), nullable=False) for name in COUNT_COLUMNS],
+        sa.Column('car_amount_total', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column('receipt_amount_total', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['session_id'], ['processing_sessions.session_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('session_id')
+    )
+    for statement in SESSION_STATISTICS_TRIGGERS:
+        op.execute(statement)
+    op.execute(SESSION_STATISTICS_BACKFILL)
+
+
+def downgrade() -> None:
+    """Drop session_statistics triggers and table."""
+    for trigger in ('trg_session_statistics_update', 'trg_session_statistics_delete', 'trg_session_statistics_insert'):
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.drop_table('session_statistics')
@@ -0,0 +1,55 @@
+"""add_employee_flag_columns
+
+Revision ID: f1b8d2e6a903
+Revises: e5a7c3d9b412
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b8d2e6a903'
+down_revision: Union[str, Sequence[str], None] = 'e5a7c3d9b412'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FLAGS = ['missing_receipt', 'amount_mismatch', 'coding_incomplete']
+
+
+def _flag_expression(flag: str) -> str:
+    return (
+        f"CASE WHEN json_valid(validation_flags) "
+        f"AND json_extract(validation_flags, '$.{flag}') IN (1, 'true') THEN 1 ELSE 0 END"
+    )
+
+
+def upgrade() -> None:
+    """Add generated validation flag columns and (session_id, flag) indexes to employee_revisions table."""
+    for flag in FLAGS:
+        op.add_column(
+            'employee_revisions',
+            sa.Column(f'flag_{flag}', sa.Boolean(), sa.Computed(_flag_expression(flag), persisted=False))
+        )
+    # Virtual columns are computed from validation_flags on read; building the
+    # indexes evaluates them for every existing revision (the backfill)
+    for flag in FLAGS:
+        op.create_index(f'idx_employee_session_{flag}', 'employee_revisions', ['session_id', f'flag_{flag}'])
+
+
+def downgrade() -> None:
+    """Remove generated validation flag columns and indexes."""
+    for flag in reversed(FLAGS):
+        op.drop_index(f'idx_employee_session_{flag}', 'employee_revisions')
+    # The batch rebuild of employee_revisions drops its triggers; recreate them as found
+    triggers = op.get_bind().execute(sa.text(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'employee_revisions'"
+    )).scalars().all()
+    with op.batch_alter_table('employee_revisions') as batch_op:
+        for flag in reversed(FLAGS):
+            batch_op.drop_column(f'flag_{flag}')
+    for statement in triggers:
+        op.execute(statement)
@@ -4,14 +4,19 @@ Test configuration and fixtures for Credit Card Processor backend.
 
 import pytest
 import asyncio
-from httpx import AsyncClient
-from sqlalchemy import create_engine, StaticPool
+from datetime import datetime, timezone
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, event, StaticPool
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
 # Import your FastAPI app and database dependencies
+from app import main
 from app.main import app
-from app.database import Base, get_db, get_async_db
+from app.auth import UserInfo, get_current_user
+from app.database import (
+    Base, get_db, get_async_db, get_read_db, set_async_sqlite_pragma, set_sqlite_pragma
+)
 
 
 # Test database setup
@@ -95,6 +100,102 @@ async def async_client(async_db_session):
     app.dependency_overrides.clear()
 
 
+class FileDatabase:
+    """
+    File-backed SQLite test database, shared by a synchronous engine and the
+    aiosqlite engines run_client creates for the async read path
+    
+    Attributes:
+        path: Database file
+        engine: Synchronous engine (application connection pragmas)
+        Session: Session factory bound to engine
+    """
+    
+    def __init__(self, path):
+        self.path = str(path)
+        self.engine = create_engine(f"sqlite:///{self.path}", connect_args={"check_same_thread": False})
+        event.listen(self.engine, "connect", set_sqlite_pragma)
+        Base.metadata.create_all(bind=self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+    
+    def authenticate_as(self, username: str, is_admin: bool = False):
+        """Authenticate every request to the app as the given user"""
+        app.dependency_overrides[get_current_user] = lambda: UserInfo(
+            username=username, is_admin=is_admin, is_authenticated=True, auth_method="test",
+            timestamp=datetime.now(timezone.utc)
+        )
+    
+    def run_client(self, scenario, session_source=None, **engine_options):
+        """
+        Run scenario(client, sessions, statements) against the app in a new event loop
+        
+        get_async_db yields sessions from sessions(), an aiosqlite session
+        factory on this database (or session_source, e.g. a stand-in session);
+        statements collects the SQL the async engine runs. The engine is
+        disposed afterwards.
+        
+        Returns:
+            The scenario's result
+        """
+        async def run():
+            async_engine = create_async_engine(f"sqlite+aiosqlite:///{self.path}", **engine_options)
+            event.listen(async_engine.sync_engine, "connect", set_async_sqlite_pragma)
+            statements = []
+            event.listen(
+                async_engine.sync_engine, "before_cursor_execute",
+                lambda conn, cursor, statement, *args: statements.append(statement)
+            )
+            sessions = session_source or async_sessionmaker(async_engine, class_=AsyncSession)
+            
+            async def override_get_async_db():
+                async with sessions() as session:
+                    yield session
+            
+            app.dependency_overrides[get_async_db] = override_get_async_db
+            try:
+                async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+                    return await scenario(client, sessions, statements)
+            finally:
+                await async_engine.dispose()
+        
+        return asyncio.run(run())
+    
+    def get_all(self, requests):
+        """Issue (url, headers) GET requests, or (method, url, headers) requests, in order"""
+        async def scenario(client, sessions, statements):
+            responses = []
+            for request in requests:
+                method, url, headers = request if len(request) == 3 else ("GET", *request)
+                responses.append(await client.request(method, url, headers=headers))
+            return responses
+        
+        return self.run_client(scenario)
+
+
+@pytest.fixture(scope="function")
+def file_db(tmp_path, monkeypatch):
+    """
+    App endpoints on a file-backed database (FileDatabase under tmp_path)
+    
+    Synchronous request sessions (get_db, get_read_db) come from the database,
+    the rate limiter admits every request and requests are authenticated as
+    the non-admin user rcox. Overrides are cleared afterwards.
+    """
+    database = FileDatabase(tmp_path / "test.db")
+    
+    def override_get_db():
+        with database.Session() as db:
+            yield db
+    
+    monkeypatch.setattr(main.rate_limiter, "is_allowed", lambda client_ip: True)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    database.authenticate_as("rcox")
+    yield database
+    app.dependency_overrides.clear()
+    database.engine.dispose()
+
+
 @pytest.fixture(scope="function")
 def mock_user_headers():
     """Standard mock user headers for authenticated requests."""
@@ -0,0 +1,160 @@
+"""
+Tests for the buffered processing activity writer
+Covers size and interval flushes, flush on stop, and the synchronous path
+for session lifecycle entries through log_processing_activity
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app import activity_buffer, db_writer
+from app.activity_buffer import ActivityBuffer, activity_row, insert_activity_rows
+from app.database import Base, create_writer_engine
+from app.db_writer import DatabaseWriter
+from app.models import ActivityType, ProcessingActivity, ProcessingSession, SessionStatus
+from app.services.mock_processor import log_processing_activity, update_session_status
+
+
+class _RecordingWriter:
+    """Collects the row batches an ActivityBuffer writes"""
+
+    def __init__(self):
+        self.batches = []
+        self.written = threading.Event()
+
+    def __call__(self, rows):
+        self.batches.append([row["activity_message"] for row in rows])
+        self.written.set()
+
+
+SESSION_ID = str(uuid.uuid4())
+
+
+def _row(message, activity_type=ActivityType.PROCESSING_PROGRESS):
+    return activity_row(SESSION_ID, activity_type, message)
+
+
+class TestActivityBuffer:
+    """Test suite for ActivityBuffer"""
+
+    def test_flushes_one_batch_when_full(self):
+        """Test reaching max_entries writes the pending rows together"""
+        writer = _RecordingWriter()
+        buffer = ActivityBuffer(writer, max_entries=5, flush_interval=60)
+        try:
+            for i in range(5):
+                buffer.add(_row(f"line {i}"))
+
+            assert writer.written.wait(5)
+            assert writer.batches == [[f"line {i}" for i in range(5)]]
+        finally:
+            buffer.stop()
+
+    def test_flushes_after_interval(self):
+        """Test a partial batch is written once the interval has passed"""
+        writer = _RecordingWriter()
+        buffer = ActivityBuffer(writer, max_entries=100, flush_interval=0.05)
+        try:
+            started = time.monotonic()
+            buffer.add(_row("only line"))
+
+            assert writer.written.wait(5)
+            assert time.monotonic() - started >= 0.05
+            assert writer.batches == [["only line"]]
+        finally:
+            buffer.stop()
+
+    def test_stop_writes_pending_rows(self):
+        """Test shutdown flushes what is still buffered"""
+        writer = _RecordingWriter()
+        buffer = ActivityBuffer(writer, max_entries=100, flush_interval=60)
+        buffer.add(_row("a"))
+        buffer.add(_row("b"))
+
+        buffer.stop()
+
+        assert writer.batches == [["a", "b"]]
+        assert buffer.get_metrics()["entries_written"] == 2
+
+    def test_failed_write_is_counted_as_dropped(self):
+        """Test a failing write does not stop later flushes"""
+        def failing(rows):
+            raise RuntimeError("database is locked")
+
+        buffer = ActivityBuffer(failing, max_entries=100, flush_interval=60)
+        buffer.add(_row("lost"))
+
+        assert buffer.flush() == 0
+        buffer.stop()
+        assert buffer.get_metrics()["entries_dropped"] == 1
+
+
+@pytest.fixture
+def application_writer(tmp_path, monkeypatch):
+    """Database writer and activity buffer on a temporary database, installed as the application's"""
+    engine = create_writer_engine(str(tmp_path / "activities.db"))
+    Base.metadata.create_all(bind=engine)
+    writer = DatabaseWriter(sessionmaker(bind=engine, expire_on_commit=False))
+    session_id = uuid.uuid4()
+    writer.execute(lambda session: session.add(ProcessingSession(
+        session_id=session_id, session_name="Activities", status=SessionStatus.PROCESSING,
+        created_by="DOMAIN\\testuser", created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc)
+    )))
+    buffer = ActivityBuffer(
+        lambda rows: writer.execute(lambda session: insert_activity_rows(session, rows)),
+        max_entries=100, flush_interval=60
+    )
+    monkeypatch.setattr(db_writer.settings, "db_writer_enabled", True)
+    monkeypatch.setattr(db_writer, "_database_writer", writer)
+    monkeypatch.setattr(activity_buffer, "_activity_buffer", buffer)
+    yield writer, buffer, str(session_id)
+    buffer.stop()
+    writer.stop()
+    engine.dispose()
+
+
+def _messages(writer):
+    return writer.execute(lambda session: [
+        activity.activity_message
+        for activity in session.query(ProcessingActivity).order_by(ProcessingActivity.created_at)
+    ])
+
+
+class TestLogProcessingActivity:
+    """Test suite for log_processing_activity with the activity buffer"""
+
+    def test_progress_is_buffered_and_lifecycle_written_in_order(self, application_writer):
+        """Test progress lines wait in the buffer and a lifecycle entry writes them first"""
+        writer, buffer, session_id = application_writer
+
+        async def run():
+            for i in range(3):
+                await log_processing_activity(None, session_id, ActivityType.PROCESSING_PROGRESS, f"employee {i}")
+            buffered = _messages(writer)
+            await log_processing_activity(None, session_id, ActivityType.PROCESSING_COMPLETED, "completed")
+            return buffered
+
+        buffered = asyncio.run(run())
+
+        assert buffered == []
+        assert _messages(writer) == ["employee 0", "employee 1", "employee 2", "completed"]
+        assert buffer.get_metrics()["flushes"] == 1
+
+    def test_final_status_flushes_buffer(self, application_writer):
+        """Test a session reaching a final status has its activity log written"""
+        writer, _, session_id = application_writer
+
+        async def run():
+            await log_processing_activity(None, session_id, ActivityType.PROCESSING, "batch 1")
+            await update_session_status(None, session_id, SessionStatus.COMPLETED)
+
+        asyncio.run(run())
+
+        assert _messages(writer) == ["batch 1"]
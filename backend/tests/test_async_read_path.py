@@ -0,0 +1,144 @@
+"""
+Tests for the async read path of the hot polling endpoints
+Covers session status, list, results, summary and exceptions on AsyncSession
+and their equivalence with the synchronous Session read path (the polling
+latency benchmark is docs/performance/status_poll_benchmark.py)
+"""
+
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.models import (
+    ActivityType, EmployeeRevision, ProcessingActivity, ProcessingSession, SessionStatus, ValidationStatus
+)
+
+POOL_SIZE = 10
+EMPLOYEES = 150
+
+
+@pytest.fixture
+def database(file_db):
+    """File database seeded with one completed session, shared by sync and async engines"""
+    file_db.authenticate_as("rcox", is_admin=True)
+    session_id = uuid.uuid4()
+    with file_db.Session() as db:
+        db.add(ProcessingSession(
+            session_id=session_id, session_name="Polling", status=SessionStatus.COMPLETED,
+            created_by="DOMAIN\\rcox", total_employees=EMPLOYEES, processed_employees=EMPLOYEES,
+            created_at=datetime.now(timezone.utc), updated_at=datetime.now(timezone.utc)
+        ))
+        db.add_all(
+            EmployeeRevision(
+                revision_id=uuid.uuid4(), session_id=session_id, employee_id=f"EMP{i:04d}",
+                employee_name=f"EMPLOYEE {i:04d}", car_amount=Decimal("100.00"),
+                receipt_amount=Decimal("100.00") if i % 5 else Decimal("0"),
+                validation_status=ValidationStatus.VALID if i % 5 else ValidationStatus.NEEDS_ATTENTION,
+                validation_flags={} if i % 5 else {"missing_receipt": True}
+            )
+            for i in range(EMPLOYEES)
+        )
+        db.add_all(
+            ProcessingActivity(
+                session_id=session_id, activity_type=ActivityType.PROCESSING,
+                activity_message=f"Processed batch {i}", created_by="DOMAIN\\rcox"
+            )
+            for i in range(20)
+        )
+        db.commit()
+
+    return str(session_id), file_db
+
+
+class _BlockingSession:
+    """Runs read builders on a synchronous Session in the event loop (the previous behaviour)"""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.session, *args, **kwargs)
+
+    async def scalars(self, statement):
+        return self.session.scalars(statement)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.session.close()
+
+
+class TestAsyncReadEndpoints:
+    """Test suite for the hot read endpoints on AsyncSession"""
+
+    def test_read_endpoints(self, database):
+        """Test each endpoint answers from the async engine"""
+        session_id, file_db = database
+
+        async def scenario(client, sessions, statements):
+            return (
+                await client.get(f"/api/sessions/{session_id}/status"),
+                await client.get("/api/sessions", params={"page_size": 5}),
+                await client.get(f"/api/sessions/{session_id}/results", params={"limit": 10}),
+                await client.get(f"/api/sessions/{session_id}/summary"),
+                await client.get(f"/api/sessions/{session_id}/exceptions")
+            )
+
+        status_response, list_response, results, summary, exceptions = file_db.run_client(
+            scenario, pool_size=POOL_SIZE, max_overflow=0
+        )
+
+        assert status_response.status_code == 200
+        assert status_response.json()["valid_employees"] == 120
+        assert len(status_response.json()["recent_activities"]) == 5
+        assert list_response.json()["total_count"] == 1
+        assert list_response.json()["sessions"][0]["session_id"] == session_id
+        assert results.json()["session_summary"]["needs_attention"] == 30
+        assert len(results.json()["employees"]) == 10
+        assert summary.json()["issues_breakdown"]["missing_receipts"] == 30
+        assert exceptions.json()["total_count"] == 30
+
+    def test_missing_session(self, database):
+        """Test not-found errors keep their status codes"""
+        _, file_db = database
+
+        async def scenario(client, sessions, statements):
+            return (
+                await client.get(f"/api/sessions/{uuid.uuid4()}/status"),
+                await client.get(f"/api/sessions/{uuid.uuid4()}/summary")
+            )
+
+        status_response, summary = file_db.run_client(scenario)
+
+        assert (status_response.status_code, summary.status_code) == (404, 404)
+
+
+class TestReadPathEquivalence:
+    """Test suite for equivalence of the synchronous and async read paths"""
+
+    def test_sync_and_async_paths_return_identical_results(self, database):
+        """Test every read endpoint answers the same on a synchronous Session and on AsyncSession"""
+        session_id, file_db = database
+        requests = [
+            (f"/api/sessions/{session_id}/status", None),
+            ("/api/sessions", {"page_size": 5}),
+            (f"/api/sessions/{session_id}/results", {"limit": 10}),
+            (f"/api/sessions/{session_id}/summary", None),
+            (f"/api/sessions/{session_id}/exceptions", None)
+        ]
+
+        async def fetch(client, sessions, statements):
+            responses = []
+            for url, params in requests:
+                response = await client.get(url, params=params)
+                responses.append((response.status_code, response.json()))
+            return responses
+
+        sync_responses = file_db.run_client(fetch, session_source=lambda: _BlockingSession(file_db.Session()))
+        async_responses = file_db.run_client(fetch, pool_size=POOL_SIZE, max_overflow=0)
+
+        assert [status for status, _ in sync_responses] == [200] * len(requests)
+        assert async_responses == sync_responses
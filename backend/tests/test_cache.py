@@ -0,0 +1,222 @@
+"""
+Tests for the application cache
+Covers TTL expiry, LRU eviction by entry count and size, tag and pattern
+invalidation, single computation of concurrent misses, the statistics read by
+the health check, and the cached session summary and results endpoints
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app import cache as app_cache
+from app.cache import MISSING, TTLCache, get_cache_stats, invalidate_cache_pattern, session_tag
+from app.models import EmployeeRevision, ProcessingSession, SessionStatus, ValidationStatus
+from app.monitoring import HealthChecker
+
+
+class TestTTLCache:
+    """Test suite for TTLCache"""
+
+    def test_entries_expire(self):
+        """Test entries are served until their TTL and then counted as expired"""
+        cache = TTLCache(default_ttl=0.05)
+        cache.set("short", 1)
+        cache.set("long", 2, ttl=60)
+
+        assert cache.get("short") == 1
+        time.sleep(0.06)
+
+        assert cache.get("short") is MISSING
+        assert cache.get("long") == 2
+        metrics = cache.get_metrics()
+        assert (metrics["hits"], metrics["misses"], metrics["expirations"]) == (2, 1, 1)
+
+    def test_lru_eviction_by_count_and_size(self):
+        """Test the least recently used entry goes first when either limit is exceeded"""
+        cache = TTLCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is MISSING
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+        sized = TTLCache(max_bytes=3000)
+        sized.set("x", "x" * 1000)
+        sized.set("y", "y" * 1000)
+        sized.set("z", "z" * 1000)
+
+        assert sized.get("x") is MISSING
+        assert sized.get_metrics()["bytes"] <= 3000
+        assert sized.get_metrics()["evictions"] == 1
+
+    def test_tag_and_pattern_invalidation(self):
+        """Test tags drop every entry derived from a session and patterns match keys or tags"""
+        cache = TTLCache()
+        session_id = uuid.uuid4()
+        cache.set("summary:1", {}, tags=[session_tag(session_id)])
+        cache.set("results:1", [], tags=[session_tag(str(session_id))])
+        cache.set("summary:2", {}, tags=["session:other"])
+
+        assert cache.invalidate_tag(session_tag(session_id)) == 2
+        assert cache.invalidate_pattern("summary:*") == 1
+        assert cache.get_metrics()["entries"] == 0
+
+    def test_concurrent_sync_misses_compute_once(self):
+        """Test threads missing the same key wait for one computation"""
+        cache = TTLCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["value"] * 5
+        assert len(calls) == 1
+
+    def test_concurrent_async_misses_compute_once(self):
+        """Test coroutines share one computation, and failures are not cached"""
+        cache = TTLCache()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        async def run():
+            values = await asyncio.gather(*(cache.get_or_compute_async("k", compute) for _ in range(5)))
+            with pytest.raises(RuntimeError):
+                await cache.get_or_compute_async("bad", fail)
+            return values
+
+        assert asyncio.run(run()) == [1] * 5
+        assert len(calls) == 1
+        assert cache.get("bad") is MISSING
+        assert cache.get_metrics()["errors"] == 1
+
+    def test_stats_feed_health_check(self, monkeypatch):
+        """Test get_cache_stats reports real counts to HealthChecker._check_cache"""
+        monkeypatch.setattr(app_cache, "_cache", TTLCache())
+        app_cache.cache("key", "value")
+        app_cache.cache("key")
+        app_cache.cache("missing")
+
+        stats = get_cache_stats()
+        check = asyncio.run(HealthChecker()._check_cache())
+
+        assert (stats["hits"], stats["misses"], stats["total_keys"]) == (1, 1, 1)
+        assert check["status"] == "healthy"
+        assert check["details"]["hit_rate_percent"] == 50.0
+        assert invalidate_cache_pattern("k*") == 1
+
+
+@pytest.fixture
+def results_app(file_db, monkeypatch):
+    """Summary and results endpoints on a file database with one completed session"""
+    session_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    with file_db.Session() as db:
+        db.add(ProcessingSession(
+            session_id=session_id, session_name="Cached", status=SessionStatus.COMPLETED,
+            created_by="DOMAIN\\rcox", total_employees=3, created_at=now, updated_at=now
+        ))
+        db.add_all(
+            EmployeeRevision(
+                session_id=session_id, employee_id=f"EMP{i:03d}", employee_name=f"EMPLOYEE {i}",
+                car_amount=Decimal("100.00"), receipt_amount=Decimal("100.00"),
+                validation_status=ValidationStatus.VALID, validation_flags={}
+            )
+            for i in range(3)
+        )
+        db.commit()
+
+    monkeypatch.setattr(app_cache, "_cache", TTLCache())
+    return str(session_id), file_db
+
+
+def _run(file_db, steps):
+    """Run (url, before) steps in order; returns [(response, queries)]"""
+    async def scenario(client, sessions, statements):
+        results = []
+        for url, before in steps:
+            if before:
+                before()
+            del statements[:]
+            results.append((await client.get(url), len(statements)))
+        return results
+
+    return file_db.run_client(scenario)
+
+
+def _flag_employee(file_db):
+    with file_db.Session() as db:
+        revision = db.query(EmployeeRevision).filter(EmployeeRevision.employee_id == "EMP000").one()
+        revision.validation_status = ValidationStatus.NEEDS_ATTENTION
+        db.commit()
+
+
+class TestCachedResultEndpoints:
+    """Test suite for caching GET /summary and /results by session status version"""
+
+    def test_summary_cached_until_session_changes(self, results_app):
+        """Test a repeat summary costs one query and a write produces fresh statistics"""
+        session_id, file_db = results_app
+        url = f"/api/sessions/{session_id}/summary"
+
+        (first, built), (second, queries), (third, _) = _run(file_db, [
+            (url, None), (url, None), (url, lambda: _flag_employee(file_db))
+        ])
+
+        assert second.json() == first.json()
+        assert built > queries == 1
+        assert third.json()["need_attention"] == first.json()["need_attention"] + 1
+
+    def test_summary_access_checked_on_cache_hit(self, results_app):
+        """Test another user is refused even when the summary is cached"""
+        session_id, file_db = results_app
+        url = f"/api/sessions/{session_id}/summary"
+
+        (first, _), (second, _) = _run(file_db, [(url, None), (url, lambda: file_db.authenticate_as("someoneelse"))])
+
+        assert first.status_code == 200
+        assert second.status_code == 403
+
+    def test_results_cached_per_query(self, results_app):
+        """Test results are cached per query string and refreshed after a write"""
+        session_id, file_db = results_app
+        url = f"/api/sessions/{session_id}/results"
+
+        (first, built), (repeat, queries), (filtered, _), (changed, _) = _run(file_db, [
+            (url, None),
+            (url, None),
+            (url + "?status_filter=valid", None),
+            (url, lambda: _flag_employee(file_db))
+        ])
+
+        assert repeat.json() == first.json()
+        assert built > queries == 1
+        assert len(filtered.json()["employees"]) == 3
+        statuses = sorted(employee["validation_status"] for employee in changed.json()["employees"])
+        assert statuses == ["needs_attention", "valid", "valid"]
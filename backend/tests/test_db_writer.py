@@ -0,0 +1,160 @@
+"""
+Tests for the SQLite single-writer service
+Covers ordered group commit, per-unit savepoint isolation, the inline
+fallback used for sessions on other engines and pipeline batch inserts
+"""
+
+import asyncio
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app import db_writer
+from app.api.processing import _process_employee_batch
+from app.database import Base, create_writer_engine
+from app.db_writer import DatabaseWriter
+from app.models import ActivityType, EmployeeRevision, ProcessingActivity, ProcessingSession, SessionStatus
+from app.services.mock_processor import log_processing_activity, update_session_status
+
+items = Table(
+    "writer_items", MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("name", String(50), nullable=False)
+)
+
+
+@pytest.fixture
+def writer(tmp_path):
+    engine = create_writer_engine(str(tmp_path / "writer.db"))
+    items.create(engine)
+    writer = DatabaseWriter(sessionmaker(bind=engine, expire_on_commit=False))
+    yield writer
+    writer.stop()
+    engine.dispose()
+
+
+def _insert(name):
+    def unit(session):
+        return session.execute(items.insert().values(name=name)).inserted_primary_key[0]
+    return unit
+
+
+def _block(writer):
+    """Occupy the writer until the returned event is set, so later units queue up"""
+    started, release = threading.Event(), threading.Event()
+    future = writer.submit(lambda session: started.set() or release.wait(5))
+    started.wait(5)
+    return future, release
+
+
+def _names(writer):
+    return writer.execute(
+        lambda session: [row.name for row in session.execute(select(items.c.name).order_by(items.c.id))]
+    )
+
+
+class TestDatabaseWriter:
+    """Test suite for DatabaseWriter"""
+
+    def test_waiting_units_commit_as_one_group_in_order(self, writer):
+        """Test units queued behind a running group are committed together, in order"""
+        blocker, release = _block(writer)
+        futures = [writer.submit(_insert(f"item-{i}")) for i in range(10)]
+        release.set()
+
+        assert [future.result(5) for future in futures] == list(range(1, 11))
+        assert blocker.result(5) is True
+        metrics = writer.get_metrics()
+        assert (metrics["groups_committed"], metrics["max_group_size"]) == (2, 10)
+        assert _names(writer) == [f"item-{i}" for i in range(10)]
+
+    def test_failing_unit_rolls_back_only_itself(self, writer):
+        """Test a unit raising inside a group does not undo its neighbours"""
+        def failing(session):
+            session.execute(items.insert().values(name="broken"))
+            raise ValueError("invalid edit")
+
+        _, release = _block(writer)
+        futures = [writer.submit(_insert("first")), writer.submit(failing), writer.submit(_insert("last"))]
+        release.set()
+
+        with pytest.raises(ValueError):
+            futures[1].result(5)
+        assert _names(writer) == ["first", "last"]
+        assert writer.get_metrics()["units_failed"] == 1
+
+    def test_concurrent_submitters(self, writer):
+        """Test many threads writing at once never hit lock errors"""
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: writer.execute(_insert(f"w{i}"), timeout=10), range(200)))
+
+        assert sorted(results) == list(range(1, 201))
+        assert writer.execute(lambda session: session.scalar(select(func.count()).select_from(items))) == 200
+
+    def test_async_run(self, writer):
+        """Test awaiting a unit from the event loop"""
+        assert asyncio.run(writer.run(_insert("async"))) == 1
+
+
+class TestInlineFallback:
+    """Test suite for writes on sessions outside the application database"""
+
+    def test_status_and_activity_written_on_caller_session(self, db_session):
+        """Test helpers write through the caller's session when it is not on the app engine"""
+        session = ProcessingSession(
+            session_id=uuid.uuid4(), session_name="Writer", status=SessionStatus.PENDING,
+            created_by="DOMAIN\\testuser", created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc)
+        )
+        db_session.add(session)
+        db_session.commit()
+        session_id = str(session.session_id)
+
+        asyncio.run(update_session_status(db_session, session_id, SessionStatus.PROCESSING, 3, 10))
+        asyncio.run(log_processing_activity(db_session, session_id, ActivityType.PROCESSING, "started"))
+
+        db_session.refresh(session)
+        assert (session.status, session.processed_employees, session.total_employees) == (
+            SessionStatus.PROCESSING, 3, 10
+        )
+        assert db_session.query(ProcessingActivity).count() == 1
+
+
+class TestPipelineWrites:
+    """Test suite for processing pipeline writes executed by the writer"""
+
+    def test_employee_batch_inserted_by_writer(self, tmp_path, monkeypatch):
+        """Test a batch of revisions is one write unit on the application writer"""
+        engine = create_writer_engine(str(tmp_path / "pipeline.db"))
+        Base.metadata.create_all(bind=engine)
+        writer = DatabaseWriter(sessionmaker(bind=engine, expire_on_commit=False))
+        monkeypatch.setattr(db_writer, "_database_writer", writer)
+        Session = sessionmaker(bind=engine)
+        session_id = uuid.uuid4()
+        with Session() as db:
+            db.add(ProcessingSession(
+                session_id=session_id, session_name="Pipeline", status=SessionStatus.PROCESSING,
+                created_by="DOMAIN\\testuser"
+            ))
+            db.commit()
+        batch = [
+            {"employee_id": f"EMP{i}", "employee_name": f"EMPLOYEE {i}", "car_amount": 10.0, "receipt_amount": 10.0 * (i % 2)}
+            for i in range(5)
+        ]
+
+        try:
+            succeeded = asyncio.run(_process_employee_batch(batch, session_id, 1, 0, []))
+            with Session() as db:
+                count = db.query(EmployeeRevision).filter(EmployeeRevision.session_id == session_id).count()
+        finally:
+            writer.stop()
+            engine.dispose()
+
+        assert succeeded is True
+        assert count == 5
+        assert writer.get_metrics()["units_executed"] == 1
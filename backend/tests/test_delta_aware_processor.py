@@ -0,0 +1,193 @@
+"""
+Tests for the delta-aware processing engine
+Covers keyset streaming of base session employees, the name merge join and
+fingerprint-based change detection
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.models import EmployeeRevision, ProcessingSession, SessionStatus, ValidationStatus
+from app.services import delta_aware_processor
+from app.services.delta_aware_processor import DeltaAwareProcessor, DeltaProcessingConfig, _merge_join_by_name
+from app.services.employee_fingerprint import (
+    compute_employee_fingerprint,
+    fingerprint_employee_data,
+    fingerprint_revision
+)
+
+
+def _base_row(name, revision):
+    return SimpleNamespace(employee_name=name, revision_id=revision)
+
+
+def _create_session(db_session, name="Base Session"):
+    session = ProcessingSession(
+        session_id=uuid.uuid4(),
+        session_name=name,
+        status=SessionStatus.COMPLETED,
+        created_by="DOMAIN\\testuser",
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc)
+    )
+    db_session.add(session)
+    return session
+
+
+def _current(name, car, receipt, employee_id="EMP001"):
+    return {"employee_id": employee_id, "employee_name": name,
+            "car_amount": Decimal(car), "receipt_amount": Decimal(receipt)}
+
+
+class TestMergeJoin:
+    """Test suite for the sorted name merge join"""
+
+    def test_joins_matches_and_new_employees(self):
+        """Test every current employee is emitted once with its base row or None"""
+        current = [("ANN LEE", {"n": 1}), ("BOB RAY", {"n": 2}), ("ZED QUINN", {"n": 3})]
+        base = [_base_row("ANN LEE", "1"), _base_row("CARL DOE", "2"), _base_row("ZED QUINN", "3")]
+
+        joined = [(name, row.revision_id if row else None) for name, _, row in _merge_join_by_name(current, base)]
+
+        assert joined == [("ANN LEE", "1"), ("BOB RAY", None), ("ZED QUINN", "3")]
+
+    def test_duplicate_names(self):
+        """Test the last base row of a name wins and repeated current names reuse it"""
+        current = [("ANN LEE", {}), ("ANN LEE", {})]
+        base = [_base_row("ANN LEE", "1"), _base_row("ANN LEE", "2")]
+
+        assert [row.revision_id for _, _, row in _merge_join_by_name(current, base)] == ["2", "2"]
+
+
+class TestBaseEmployeeStreaming:
+    """Test suite for keyset-paginated base session streaming"""
+
+    def test_pages_cover_all_rows_in_order(self, db_session):
+        """Test keyset pages return every row once, ordered by name then revision"""
+        session = _create_session(db_session)
+        names = ["MARY JONES", "ANN LEE", "ANN LEE", "BOB RAY", "ZED QUINN", "ANN LEE", "CARL DOE"]
+        for name in names:
+            db_session.add(EmployeeRevision(
+                session_id=session.session_id,
+                employee_name=name,
+                car_amount=Decimal("10.00"),
+                validation_status=ValidationStatus.VALID,
+                validation_flags={}
+            ))
+        db_session.commit()
+
+        processor = DeltaAwareProcessor(db_session)
+        rows = list(processor._iter_base_employees(session.session_id, page_size=2))
+
+        assert [row.employee_name for row in rows] == sorted(names)
+        assert len({row.revision_id for row in rows}) == len(names)
+
+
+class TestFingerprintDetection:
+    """Test suite for content fingerprint change detection"""
+
+    def test_fingerprint_normalization(self):
+        """Test formatting differences keep the fingerprint and content changes alter it"""
+        base = compute_employee_fingerprint("EMP001", "John  Smith", Decimal("100.00"), 50.5)
+        assert compute_employee_fingerprint(" emp001", "JOHN SMITH", 100, "50.50") == base
+        assert compute_employee_fingerprint("EMP001", "John Smith", Decimal("100.01"), 50.5) != base
+        assert compute_employee_fingerprint("EMP001", "John Smith", None, 0) == \
+            compute_employee_fingerprint("EMP001", "John Smith", 0, None)
+
+    def test_stored_revision_fingerprint_round_trip(self, db_session):
+        """Test a revision stored from extracted data re-fingerprints to the stored value"""
+        session = _create_session(db_session)
+        extracted = {
+            "employee_id": " emp001", "employee_name": "John  Smith", "car_amount": 100.456,
+            "receipt_amount": None, "car_data": {"car_page_range": [3, 4]}
+        }
+        db_session.add(EmployeeRevision(
+            session_id=session.session_id, employee_id=extracted["employee_id"],
+            employee_name=extracted["employee_name"], car_amount=extracted["car_amount"],
+            receipt_amount=extracted["receipt_amount"], validation_status=ValidationStatus.VALID,
+            validation_flags={}, content_fingerprint=fingerprint_employee_data(extracted)
+        ))
+        db_session.commit()
+        db_session.expire_all()
+
+        stored = db_session.query(EmployeeRevision).filter(EmployeeRevision.session_id == session.session_id).one()
+        assert fingerprint_revision(stored) == stored.content_fingerprint
+        assert fingerprint_employee_data(extracted) == stored.content_fingerprint
+
+    def test_unchanged_found_by_fingerprint(self, db_session, monkeypatch):
+        """Test fingerprint hits skip the diff while mismatches and issues are compared"""
+        session = _create_session(db_session)
+        base = [
+            (_current("ANN LEE", "10.00", "10.00"), ValidationStatus.VALID),
+            (_current("BOB RAY", "20.00", "20.00"), ValidationStatus.VALID),
+            (_current("CARL DOE", "30.00", "30.00"), ValidationStatus.NEEDS_ATTENTION),
+        ]
+        for data, status in base:
+            db_session.add(EmployeeRevision(
+                session_id=session.session_id, employee_id=data["employee_id"],
+                employee_name=data["employee_name"], car_amount=data["car_amount"],
+                receipt_amount=data["receipt_amount"], validation_status=status,
+                validation_flags={}, content_fingerprint=fingerprint_employee_data(data)
+            ))
+        db_session.commit()
+
+        current = [
+            _current("ANN LEE", "10.00", "10.00"),
+            _current("BOB RAY", "25.00", "20.00"),
+            _current("CARL DOE", "30.00", "30.00"),
+            _current("DAN FOX", "40.00", "40.00"),
+        ]
+        monkeypatch.setattr(delta_aware_processor, "generate_mock_employee_data", lambda count: current)
+
+        processor = DeltaAwareProcessor(db_session)
+        analysis = asyncio.run(processor.identify_changed_employees(session, session, DeltaProcessingConfig()))
+
+        assert [c.employee_name for c in analysis["unchanged"]] == ["ANN LEE"]
+        assert sorted(c.employee_name for c in analysis["modified"]) == ["BOB RAY", "CARL DOE"]
+        assert [c.employee_name for c in analysis["new"]] == ["DAN FOX"]
+
+
+class TestUnchangedEmployeeCloning:
+    """Test suite for set-based copying of unchanged employees"""
+
+    def test_clone_copies_rows_server_side(self, db_session):
+        """Test unchanged base revisions are cloned into the new session with fresh IDs"""
+        base = _create_session(db_session)
+        current = _create_session(db_session, "Current Session")
+        revisions = []
+        for name, status in (("ANN LEE", ValidationStatus.VALID), ("BOB RAY", ValidationStatus.RESOLVED),
+                             ("CARL DOE", ValidationStatus.VALID)):
+            revision = EmployeeRevision(
+                session_id=base.session_id, employee_id="E1", employee_name=name,
+                car_amount=Decimal("12.34"), receipt_amount=Decimal("12.34"),
+                validation_status=status, validation_flags={"note": name},
+                resolved_by="DOMAIN\\reviewer", exported_to_pvault=True, content_fingerprint=name
+            )
+            db_session.add(revision)
+            revisions.append(revision)
+        db_session.commit()
+
+        unchanged = [
+            delta_aware_processor.EmployeeChangeInfo("ANN LEE", "unchanged", base_revision_id=revisions[0].revision_id),
+            delta_aware_processor.EmployeeChangeInfo("BOB RAY", "unchanged"),
+        ]
+        processor = DeltaAwareProcessor(db_session)
+        copied = asyncio.run(processor._copy_unchanged_employees(current, base, unchanged, "tester"))
+        db_session.commit()
+
+        clones = db_session.query(EmployeeRevision).filter(
+            EmployeeRevision.session_id == current.session_id
+        ).order_by(EmployeeRevision.employee_name).all()
+
+        assert copied == 2
+        assert [c.employee_name for c in clones] == ["ANN LEE", "BOB RAY"]
+        assert {c.revision_id for c in clones}.isdisjoint({r.revision_id for r in revisions})
+        assert clones[1].validation_status == ValidationStatus.RESOLVED
+        assert clones[1].validation_flags == {"note": "BOB RAY"}
+        assert clones[0].car_amount == Decimal("12.34")
+        assert clones[0].content_fingerprint == "ANN LEE"
+        assert clones[0].exported_to_pvault is False
+        assert clones[0].resolution_notes == "Copied from base session Base Session (unchanged)"
@@ -0,0 +1,208 @@
+"""
+Tests for the employee data merger service
+Covers candidate blocking and match selection between CAR and Receipt employees
+"""
+
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from app.services.employee_merger import EmployeeDataMerger, ASSIGNMENT_ONE_TO_ONE, _soundex
+
+
+def _car(name, employee_id=None, total=100.0):
+    return {"employee_name": name, "employee_id": employee_id, "car_total": total}
+
+
+def _receipt(name, employee_id=None, total=50.0):
+    return {"employee_name": name, "employee_id": employee_id, "receipt_total": total}
+
+
+def _exhaustive_best(merger, car_data, receipt_data):
+    """Reference all-pairs scan with the original first-best-wins rule"""
+    result = {}
+    for car_key, car_emp in car_data.items():
+        best_key, best_score = None, 0.0
+        for receipt_key, receipt_emp in receipt_data.items():
+            score = merger._calculate_match_score(
+                car_emp["normalized_name"], car_emp.get("employee_id"),
+                receipt_emp["normalized_name"], receipt_emp.get("employee_id")
+            )
+            if score > best_score and score >= merger.similarity_threshold:
+                best_key, best_score = receipt_key, score
+        if best_key is not None:
+            result[car_key] = (best_key, best_score)
+    return result
+
+
+def _exhaustive_one_to_one(merger, car_data, receipt_data):
+    """Reference greedy assignment over every scored pair"""
+    pairs = sorted(
+        (-merger._calculate_match_score(
+            car_emp["normalized_name"], car_emp.get("employee_id"),
+            receipt_emp["normalized_name"], receipt_emp.get("employee_id")
+        ), car_index, receipt_index, car_key, receipt_key)
+        for car_index, (car_key, car_emp) in enumerate(car_data.items())
+        for receipt_index, (receipt_key, receipt_emp) in enumerate(receipt_data.items())
+    )
+    assigned, used = {}, set()
+    for neg_score, _, _, car_key, receipt_key in pairs:
+        if -neg_score >= merger.similarity_threshold and car_key not in assigned and receipt_key not in used:
+            assigned[car_key] = receipt_key
+            used.add(receipt_key)
+    return [(car_key, assigned[car_key]) for car_key in car_data if car_key in assigned]
+
+
+def _random_side(rnd, make, prefix):
+    """Short names over a small alphabet with similar IDs, so pairs often share no name block"""
+    return {
+        f"{prefix}{i}": make(
+            "".join(rnd.choice("ABC ") for _ in range(rnd.randint(3, 8))),
+            rnd.choice([None, "E2" + "".join(rnd.choice("12") for _ in range(2))])
+        )
+        for i in range(6)
+    }
+
+
+class TestBlockingIndex:
+    """Test suite for blocked candidate generation"""
+
+    def test_soundex_codes(self):
+        """Test phonetic keys group common spelling variants"""
+        assert _soundex("SMITH") == _soundex("SMYTH") == "S530"
+        assert _soundex("ROBERT") == "R163"
+        assert _soundex("") == ""
+
+    def test_exact_id_join(self):
+        """Test exact employee ID match wins regardless of name"""
+        merger = EmployeeDataMerger()
+        result = merger.merge_employee_data(
+            {"c1": _car("JOHN SMITH", "E100")},
+            {"r1": _receipt("MARY JONES"), "r2": _receipt("J SMITH", "E100")}
+        )
+
+        match = result["matches"][0]
+        assert match["receipt_key"] == "r2"
+        assert match["match_score"] == 1.0
+        assert match["match_reason"] == "Exact Employee ID match"
+
+    def test_fuzzy_name_match(self):
+        """Test near-identical names are matched with a similarity reason"""
+        merger = EmployeeDataMerger()
+        result = merger.merge_employee_data(
+            {"c1": _car("KEVIN JOHNSON")},
+            {"r1": _receipt("KEVEN JOHNSON"), "r2": _receipt("ALICE BROWN")}
+        )
+
+        match = result["matches"][0]
+        expected = SequenceMatcher(None, "KEVIN JOHNSON", "KEVEN JOHNSON").ratio()
+        assert match["receipt_key"] == "r1"
+        assert match["match_reason"] == f"Name similarity ({expected:.2f})"
+
+    @pytest.mark.parametrize("threshold", [0.6, 0.8, 0.9])
+    def test_matches_equal_exhaustive_scan(self, threshold):
+        """Test blocked matching selects the same pairs as the all-pairs scan"""
+        first = ["JOHN", "JON", "MARY", "MARIE", "WILLIAM", "ANNA", "KEVIN", "AARON"]
+        last = ["SMITH", "SMYTH", "JONES", "JOHNSON", "BROWN", "BRAUN", "LEE", "NGUYEN"]
+        car = {
+            f"c{i}": _car(f"{first[i % 8]} {last[(i * 3) % 8]}", f"E{i:03d}" if i % 3 == 0 else None)
+            for i in range(40)
+        }
+        receipts = {
+            f"r{i}": _receipt(f"{first[(i * 5) % 8]} {last[(i * 7) % 8]}", f"E{i:03d}" if i % 4 == 0 else None)
+            for i in range(40)
+        }
+
+        merger = EmployeeDataMerger(similarity_threshold=threshold)
+        car_norm = merger._normalize_employee_data(car, "car")
+        receipt_norm = merger._normalize_employee_data(receipts, "receipt")
+
+        matches = merger._find_employee_matches(car_norm, receipt_norm)
+        blocked = {m["car_key"]: (m["receipt_key"], m["match_score"]) for m in matches}
+
+        assert blocked == _exhaustive_best(merger, car_norm, receipt_norm)
+
+
+    def test_id_bonus_match_outside_name_blocks(self):
+        """Test a pair sharing no name block still matches through the partial ID bonus"""
+        merger = EmployeeDataMerger()
+        result = merger.merge_employee_data({"c1": _car("ACA", "E222")}, {"r1": _receipt("CAC", "E212")})
+
+        assert [m["receipt_key"] for m in result["matches"]] == ["r1"]
+
+    @pytest.mark.parametrize("threshold", [0.6, 0.8, 0.9])
+    def test_randomized_matches_equal_exhaustive_scan(self, threshold):
+        """Test randomized short names and IDs select the same pairs as the all-pairs scan"""
+        rnd = random.Random(threshold)
+        merger = EmployeeDataMerger(similarity_threshold=threshold)
+
+        for _ in range(300):
+            car_norm = merger._normalize_employee_data(_random_side(rnd, _car, "c"), "car")
+            receipt_norm = merger._normalize_employee_data(_random_side(rnd, _receipt, "r"), "receipt")
+
+            matches = merger._find_employee_matches(car_norm, receipt_norm)
+
+            assert {m["car_key"]: (m["receipt_key"], m["match_score"]) for m in matches} == \
+                _exhaustive_best(merger, car_norm, receipt_norm)
+
+
+class TestOneToOneAssignment:
+    """Test suite for global one-to-one employee assignment"""
+
+    def test_invalid_assignment_mode(self):
+        """Test unknown assignment modes are rejected"""
+        with pytest.raises(ValueError):
+            EmployeeDataMerger(assignment_mode="hungarian")
+
+    def test_best_match_mode_allows_shared_receipt(self):
+        """Test per-employee mode lets two CAR employees claim one receipt"""
+        merger = EmployeeDataMerger()
+        result = merger.merge_employee_data(
+            {"c1": _car("JOHN SMITH"), "c2": _car("JOHN SMYTH")},
+            {"r1": _receipt("JOHN SMITH")}
+        )
+
+        assert [m["receipt_key"] for m in result["matches"]] == ["r1", "r1"]
+
+    def test_receipt_assigned_to_best_scoring_employee(self):
+        """Test a contested receipt goes to the higher score and the loser falls back"""
+        merger = EmployeeDataMerger(assignment_mode=ASSIGNMENT_ONE_TO_ONE)
+        result = merger.merge_employee_data(
+            {"c1": _car("JOHN SMYTH"), "c2": _car("JOHN SMITH")},
+            {"r1": _receipt("JOHN SMITH"), "r2": _receipt("JOHN SMYTHE")}
+        )
+
+        pairs = {m["car_key"]: m["receipt_key"] for m in result["matches"]}
+        assert pairs == {"c1": "r2", "c2": "r1"}
+        assert result["summary"]["matched_count"] == 2
+        assert result["summary"]["receipt_only_count"] == 0
+
+    def test_each_receipt_used_once(self):
+        """Test no receipt employee is assigned to more than one CAR employee"""
+        car = {f"c{i}": _car(name) for i, name in enumerate(
+            ["ANNA LEE", "ANA LEE", "ANNA LI", "MARY JONES", "MARIE JONES"])}
+        receipts = {f"r{i}": _receipt(name) for i, name in enumerate(
+            ["ANNA LEE", "MARY JONES", "ANNE LEE"])}
+
+        merger = EmployeeDataMerger(similarity_threshold=0.7, assignment_mode=ASSIGNMENT_ONE_TO_ONE)
+        result = merger.merge_employee_data(car, receipts)
+
+        receipt_keys = [m["receipt_key"] for m in result["matches"]]
+        assert len(receipt_keys) == len(set(receipt_keys))
+        assert ("c0", "r0") in {(m["car_key"], m["receipt_key"]) for m in result["matches"]}
+        assert ("c3", "r1") in {(m["car_key"], m["receipt_key"]) for m in result["matches"]}
+
+    def test_randomized_assignment_equals_exhaustive(self):
+        """Test randomized short names and IDs give the same assignment as scoring every pair"""
+        rnd = random.Random(27)
+        merger = EmployeeDataMerger(similarity_threshold=0.7, assignment_mode=ASSIGNMENT_ONE_TO_ONE)
+
+        for _ in range(300):
+            car_norm = merger._normalize_employee_data(_random_side(rnd, _car, "c"), "car")
+            receipt_norm = merger._normalize_employee_data(_random_side(rnd, _receipt, "r"), "receipt")
+
+            matches = merger._find_employee_matches(car_norm, receipt_norm)
+
+            assert [(m["car_key"], m["receipt_key"]) for m in matches] == \
+                _exhaustive_one_to_one(merger, car_norm, receipt_norm)
@@ -0,0 +1,200 @@
+"""
+Tests for export artifacts
+Covers storing export files by content hash per data version, keeping
+superseded versions for the grace period, building files off the event loop,
+serving repeat downloads from the stored file with ETag revalidation and Range
+requests, and rebuilding only after the session's data changes
+"""
+
+import gzip
+import os
+import threading
+import time
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from app.config import settings
+from app.models import (
+    ActivityType, EmployeeRevision, ProcessingActivity, ProcessingSession, SessionStatus, ValidationStatus
+)
+from app.services import export_artifacts
+from app.services.export_artifacts import ExportArtifactStore, get_export_artifact
+
+
+class TestExportArtifactStore:
+    """Test suite for ExportArtifactStore"""
+
+    def test_store_lookup_and_versions(self, tmp_path):
+        """Test files are found by key and version, shared by content and pruned with old versions"""
+        store = ExportArtifactStore(str(tmp_path))
+        session_id = uuid.uuid4()
+
+        csv = store.store(session_id, "pvault", "v1", ["a,b\r\n", "1,2\r\n"], "export.csv", "text/csv")
+        same = store.store(session_id, "pvault_copy", "v1", b"a,b\r\n1,2\r\n", "copy.csv", "text/csv")
+
+        assert csv.path == same.path and csv.etag == same.etag
+        assert csv.path.read_bytes() == b"a,b\r\n1,2\r\n" and csv.size == 10
+        assert store.lookup(session_id, "pvault", "v1").filename == "export.csv"
+        assert store.lookup(session_id, "pvault", "v2") is None
+
+        newer = store.store(session_id, "pvault", "v2", b"a,b\r\n3,4\r\n", "export.csv", "text/csv")
+
+        assert store.lookup(session_id, "pvault_copy", "v1") is None
+        assert csv.path.exists()
+        assert gzip.decompress(newer.gzip_path.read_bytes()) == newer.path.read_bytes()
+
+        _backdate(csv.path.parent, settings.export_artifact_grace_seconds + 1)
+        store.store(session_id, "pvault_copy", "v2", b"a,b\r\n3,4\r\n", "copy.csv", "text/csv")
+
+        assert sorted(p.name for p in store.session_dir(session_id).iterdir()) == ["index.json", "v2"]
+        assert sorted(p.name for p in newer.path.parent.iterdir()) == sorted([newer.path.name, newer.gzip_path.name])
+        store.delete(session_id)
+        assert not store.session_dir(session_id).exists()
+
+    def test_failed_build_leaves_nothing(self, tmp_path):
+        """Test an exception while producing chunks stores no file"""
+        store = ExportArtifactStore(str(tmp_path))
+        session_id = uuid.uuid4()
+
+        def chunks():
+            yield "partial"
+            raise RuntimeError("query failed")
+
+        with pytest.raises(RuntimeError):
+            store.store(session_id, "pvault", "v1", chunks(), "export.csv", "text/csv")
+
+        assert [p for p in store.session_dir(session_id).rglob("*") if p.is_file()] == []
+
+    def test_served_version_outlives_grace_period(self, tmp_path):
+        """Test a superseded version looked up within the grace period is not removed"""
+        store = ExportArtifactStore(str(tmp_path))
+        session_id = uuid.uuid4()
+        old = store.store(session_id, "pvault", "v1", b"a,b\r\n1,2\r\n", "export.csv", "text/csv")
+        _backdate(old.path.parent, settings.export_artifact_grace_seconds + 1)
+
+        served = store.lookup(session_id, "pvault", "v1")
+        store.store(session_id, "pvault", "v2", b"a,b\r\n3,4\r\n", "export.csv", "text/csv")
+
+        assert served.path.read_bytes() == b"a,b\r\n1,2\r\n"
+
+
+def _backdate(path, seconds):
+    """Set a path's modification time the given number of seconds in the past"""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def artifact_app(file_db, tmp_path, monkeypatch):
+    """Export endpoints on a file database with one completed session"""
+    session_id = uuid.uuid4()
+    with file_db.Session() as db:
+        db.add(ProcessingSession(
+            session_id=session_id, session_name="Artifacts", status=SessionStatus.COMPLETED,
+            created_by="DOMAIN\\rcox", total_employees=300
+        ))
+        db.commit()
+        db.add_all(
+            EmployeeRevision(
+                session_id=session_id, employee_id=f"EMP{i:03d}", employee_name=f"EMPLOYEE {i}",
+                car_amount=Decimal("100.00"), receipt_amount=Decimal("100.00"),
+                validation_status=ValidationStatus.VALID if i else ValidationStatus.NEEDS_ATTENTION,
+                validation_flags={}
+            )
+            for i in range(300)
+        )
+        db.commit()
+
+    store = ExportArtifactStore(str(tmp_path / "artifacts"))
+    monkeypatch.setattr(export_artifacts, "export_artifact_store", store)
+    return str(session_id), file_db, store
+
+
+def _export_count(file_db):
+    with file_db.Session() as db:
+        return db.query(ProcessingActivity).filter(ProcessingActivity.activity_type == ActivityType.EXPORT).count()
+
+
+class TestExportArtifactEndpoints:
+    """Test suite for export endpoints served from stored artifacts"""
+
+    def test_repeat_downloads_reuse_file(self, artifact_app, monkeypatch):
+        """Test later downloads are served from the stored files, built off the event loop, and revalidation is not logged"""
+        session_id, file_db, store = artifact_app
+        url = f"/api/export/{session_id}/pvault"
+        identity = {"Accept-Encoding": "identity"}
+        builds = []
+        build_threads = []
+        original_store = store.store
+        monkeypatch.setattr(
+            store, "store",
+            lambda *args: builds.append(args[1]) or build_threads.append(threading.get_ident()) or original_store(*args)
+        )
+
+        first, second = file_db.get_all([(url, identity), (url, {"Accept-Encoding": "gzip"})])
+        (not_modified,) = file_db.get_all([(url, dict(identity, **{"If-None-Match": first.headers["etag"]}))])
+
+        assert builds == ["pvault:resolved=True"]
+        assert build_threads != [threading.get_ident()]
+        assert second.content == first.content and len(first.text.splitlines()) == 300
+        assert "content-encoding" not in first.headers
+        assert first.headers["content-length"] == str(len(first.content))
+        assert second.headers["content-encoding"] == "gzip"
+        assert second.headers["etag"] == first.headers["etag"][:-1] + '-gzip"'
+        assert second.headers["content-disposition"] == first.headers["content-disposition"]
+        assert not_modified.status_code == 304
+        assert _export_count(file_db) == 2
+
+    def test_range_requests(self, artifact_app):
+        """Test a byte range of the stored file is answered with 206"""
+        session_id, file_db, _ = artifact_app
+        url = f"/api/export/{session_id}/pvault"
+
+        identity = {"Accept-Encoding": "identity"}
+
+        full, partial = file_db.get_all([(url, identity), (url, dict(identity, Range="bytes=100-199"))])
+
+        assert partial.status_code == 206
+        assert partial.content == full.content[100:200]
+        assert partial.headers["content-range"] == f"bytes 100-199/{len(full.content)}"
+
+    def test_rebuilt_after_data_change(self, artifact_app):
+        """Test a revision write produces a new file and ETag, and export logging alone does not"""
+        session_id, file_db, store = artifact_app
+        url = f"/api/export/{session_id}/pvault"
+        enhanced = f"/api/export/{session_id}/pvault/enhanced"
+
+        first, first_enhanced, again = file_db.get_all([(url, {}), (enhanced, {}), (url, {})])
+        with file_db.Session() as db:
+            db.query(EmployeeRevision).filter(EmployeeRevision.employee_id == "EMP000").update(
+                {"validation_status": ValidationStatus.RESOLVED, "resolved_by": "rcox"}
+            )
+            db.commit()
+        (changed,) = file_db.get_all([(url, {})])
+
+        assert again.headers["etag"] == first.headers["etag"]
+        assert first_enhanced.status_code == 200
+        assert first_enhanced.headers["etag"] != first.headers["etag"]
+        assert changed.headers["etag"] != first.headers["etag"]
+        assert len(changed.text.splitlines()) == 301
+        # pVault and enhanced CSVs of the superseded version are kept for the grace period
+        assert len(list(store.session_dir(session_id).glob("*/*.csv"))) == 3
+
+    def test_disabled_builds_every_download(self, artifact_app, monkeypatch):
+        """Test disabling export artifacts rebuilds the file for every download"""
+        session_id, file_db, _ = artifact_app
+        monkeypatch.setattr(settings, "export_artifacts_enabled", False)
+        builds = []
+
+        def build():
+            builds.append(1)
+            return b"content", "file.csv"
+
+        with file_db.Session() as db:
+            first, built_first = get_export_artifact(db, uuid.UUID(session_id), "test", "text/csv", build)
+            second, built_second = get_export_artifact(db, uuid.UUID(session_id), "test", "text/csv", build)
+
+        assert built_first and built_second and len(builds) == 2
+        assert first.path == second.path and first.path.read_bytes() == b"content"
@@ -0,0 +1,113 @@
+"""
+Tests for the degraded-mode fallback cache
+Covers reads served from memory without file access, entries surviving a
+restart through the disk tier (including files written by the previous
+one-file-per-key scheme), the disk size cap, expiry sweeps and the
+statistics reported by DegradationManager.get_status
+"""
+
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from app.config import settings
+from app.degradation import DegradationManager, FallbackCache
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """DegradationManager whose fallback cache lives under tmp_path (its sweeper is stopped afterwards)"""
+    monkeypatch.setattr(settings, "upload_path", str(tmp_path / "uploads"))
+    manager = DegradationManager()
+    yield manager
+    manager.cache.stop()
+
+
+class TestFallbackCache:
+    """Test suite for FallbackCache"""
+
+    def test_memory_tier_serves_fresh_copies_without_file_access(self, tmp_path, monkeypatch):
+        """Test reads after a write never open the entry file and callers cannot alter the cache"""
+        cache = FallbackCache(tmp_path)
+        cache.set("status_1", {"status": "completed", "at": datetime(2024, 1, 1, tzinfo=timezone.utc)})
+
+        def no_reads(path):
+            raise AssertionError(f"read {path}")
+
+        monkeypatch.setattr(Path, "read_bytes", no_reads)
+        first = cache.get("status_1")
+        first["fallback"] = True
+
+        assert cache.get("status_1") == {"status": "completed", "at": "2024-01-01 00:00:00+00:00"}
+        assert cache.get("missing") is None
+        stats = cache.get_stats()
+        assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (2, 0, 1)
+        assert stats["hit_rate"] == round(2 / 3, 4)
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """Test a new cache indexes existing files on first use, reads each once and then serves it from memory"""
+        FallbackCache(tmp_path).set("results_1", [1, 2, 3])
+        legacy = {"data": {"old": True}, "cached_at": datetime.now(timezone.utc).isoformat(), "ttl": 3600}
+        (tmp_path / "status_legacy.json").write_text(json.dumps(legacy))
+        expired = dict(legacy, cached_at=(datetime.now(timezone.utc) - timedelta(hours=2)).isoformat())
+        (tmp_path / "status_expired.json").write_text(json.dumps(expired))
+
+        cache = FallbackCache(tmp_path)
+        untouched_until_used = (tmp_path / "status_expired.json").exists()
+
+        assert untouched_until_used
+        assert cache.get("results_1") == [1, 2, 3]
+        assert cache.get("results_1") == [1, 2, 3]
+        assert cache.get("status_legacy") == {"old": True}
+        assert cache.get("status_expired") is None
+        assert not (tmp_path / "status_expired.json").exists()
+        stats = cache.get_stats()
+        assert (stats["disk_hits"], stats["memory_hits"], stats["disk_entries"]) == (2, 1, 2)
+
+    def test_disk_tier_size_cap_removes_oldest(self, tmp_path):
+        """Test the oldest entry files are removed once the disk tier exceeds its cap"""
+        cache = FallbackCache(tmp_path, max_disk_bytes=400)
+        for i in range(4):
+            cache.set(f"export_{i}", "x" * 100)
+
+        stats = cache.get_stats()
+        assert stats["disk_bytes"] <= 400
+        assert stats["disk_evictions"] == 2
+        assert len(list(tmp_path.glob("*.json"))) == 2
+        assert FallbackCache(tmp_path).get("export_0") is None
+        assert FallbackCache(tmp_path).get("export_3") == "x" * 100
+
+    def test_background_sweep_removes_expired_entries(self, tmp_path):
+        """Test the sweeper thread removes expired entries from both tiers without a read"""
+        cache = FallbackCache(tmp_path, sweep_interval=0.02)
+        cache.set("short", 1, ttl=0.05)
+        cache.set("long", 2, ttl=60)
+        cache.start()
+        try:
+            deadline = time.monotonic() + 2
+            while cache.get_stats()["disk_entries"] > 1 and time.monotonic() < deadline:
+                time.sleep(0.02)
+        finally:
+            cache.stop()
+
+        stats = cache.get_stats()
+        assert (stats["disk_entries"], stats["memory_entries"]) == (1, 1)
+        assert stats["expirations"] >= 2
+        assert len(list(tmp_path.glob("*.json"))) == 1
+        assert not cache.is_running
+
+    def test_manager_status_reports_cache_stats(self, manager, tmp_path):
+        """Test the degradation status exposes the fallback cache hit rate"""
+        manager.cache_data("status_stats_test", {"status": "processing"})
+        manager.get_cached_data("status_stats_test")
+        manager.cache.delete("status_stats_test")
+
+        stats = manager.get_status()["cache"]
+
+        assert stats["memory_hits"] >= 1
+        assert stats["sweeper_running"]
+        assert manager.get_cached_data("status_stats_test") is None
+        assert manager.cache.cache_dir == tmp_path / "cache"
@@ -0,0 +1,223 @@
+"""
+Tests for incremental session revalidation
+Covers context delta updates, dependency-tracked rule re-runs, cached statistics
+and database-backed revalidation of reprocessed receipts
+"""
+
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from app.models import EmployeeRevision, ProcessingSession, SessionStatus, ValidationStatus
+from app.services.incremental_validation import (
+    SessionValidationState,
+    get_validation_state,
+    invalidate_validation_state
+)
+from app.services.issue_resolution import IssueResolutionManager
+from app.services.receipt_reprocessing_service import ReceiptReprocessingService
+from app.services.session_statistics import get_session_statistics
+from app.services.validation_engine import ValidationContext, ValidationEngine
+
+
+def _employee(employee_id, name, car=100, receipt=100):
+    employee = {"employee_id": employee_id, "employee_name": name}
+    if car is not None:
+        employee["car_amount"] = Decimal(str(car))
+    if receipt is not None:
+        employee["receipt_amount"] = Decimal(str(receipt))
+    return employee
+
+
+def _state(employees, statuses=None):
+    state = SessionValidationState("session-1")
+    state.load(employees, statuses or {
+        key: ValidationStatus.VALID for key in employees
+    })
+    return state
+
+
+class CountingEngine(ValidationEngine):
+    """Validation engine recording which rules run"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+        for rule in self.rules:
+            rule.validate = self._counted(rule, rule.validate)
+
+    def _counted(self, rule, validate):
+        def wrapper(employee_data, context=None):
+            self.calls.append(rule.name)
+            return validate(employee_data, context)
+        return wrapper
+
+
+class TestContextDelta:
+    """Test suite for ValidationContext delta updates"""
+
+    def test_add_and_remove_match_rebuild(self):
+        """Test delta-updated counts and amount stats equal a fresh build"""
+        employees = [_employee("1", "John Smith", 50), _employee("2", "Mary Jones", 300)]
+        context = ValidationContext(employees[:1])
+        context.add_employee(employees[1])
+        context.add_employee(_employee("1", "JOHN SMITH", 80))
+        context.remove_employee(_employee("1", "JOHN SMITH", 80))
+
+        fresh = ValidationContext(employees)
+        assert context.name_counts == fresh.name_counts
+        assert context.id_counts == fresh.id_counts
+        assert context.amount_stats == fresh.amount_stats
+        assert context.name_keys == []
+
+
+class TestSessionValidationState:
+    """Test suite for SessionValidationState"""
+
+    def test_amount_change_reruns_dependent_rules_only(self):
+        """Test a receipt amount change skips rules not reading amounts"""
+        engine = CountingEngine()
+        state = SessionValidationState("session-1", engine)
+        state.load({"a": _employee("1", "John Smith"), "b": _employee("2", "Mary Jones")},
+                   {"a": ValidationStatus.VALID, "b": ValidationStatus.VALID})
+        engine.calls.clear()
+
+        results = state.apply_changes({"a": _employee("1", "John Smith", receipt=40)})
+
+        assert results == {"a": ValidationStatus.NEEDS_ATTENTION}
+        assert set(engine.calls) == {"amount_mismatch", "missing_receipt", "policy_violation"}
+        assert "amount_mismatch" in state.issues["a"]
+
+    def test_rename_updates_duplicate_peers(self):
+        """Test a change creating or removing a duplicate revalidates the peer"""
+        state = _state({"a": _employee("1", "John Smith"), "b": _employee("2", "Mary Jones")})
+
+        results = state.apply_changes({"b": _employee("2", "John Smith")})
+        assert results == {"a": ValidationStatus.NEEDS_ATTENTION, "b": ValidationStatus.NEEDS_ATTENTION}
+        assert state.context.name_count("john smith") == 2
+
+        results = state.apply_changes({"b": _employee("2", "Mary Jones")})
+        assert results == {"a": ValidationStatus.VALID, "b": ValidationStatus.VALID}
+        assert state.statistics()["issue_counts"] == {}
+
+    def test_statistics_follow_resolutions_and_removals(self):
+        """Test status counts are maintained by delta"""
+        state = _state(
+            {"a": _employee("1", "John Smith"), "b": _employee("2", "Mary Jones", receipt=None)},
+            {"a": ValidationStatus.VALID, "b": ValidationStatus.NEEDS_ATTENTION}
+        )
+        assert state.statistics()["needs_attention"] == 1
+        assert state.statistics()["issue_counts"] == {"missing_receipt": 1}
+
+        state.set_status("b", ValidationStatus.RESOLVED)
+        stats = state.statistics()
+        assert (stats["needs_attention"], stats["resolved_employees"]) == (0, 1)
+
+        state.apply_changes({"a": None, "c": _employee("3", "Ann Lee")})
+        stats = state.statistics()
+        assert stats["total_employees"] == 2
+        assert stats["valid_employees"] == 1
+
+    def test_resolution_kept_unless_new_issue_type(self):
+        """Test a resolved employee stays resolved when a change adds no new issue type"""
+        state = _state({"a": _employee("1", "John Smith", receipt=None)},
+                       {"a": ValidationStatus.RESOLVED})
+
+        assert state.apply_changes({"a": _employee("1", "John Smith", car=120, receipt=None)}) == {
+            "a": ValidationStatus.RESOLVED
+        }
+        assert state.apply_changes({"a": _employee("1", "John Smith", car=5000, receipt=None)}) == {
+            "a": ValidationStatus.NEEDS_ATTENTION
+        }
+
+
+def _session_with_revisions(db_session):
+    """Committed session with two valid employees and a pipeline line-count flag"""
+    session = ProcessingSession(
+        session_id=uuid.uuid4(), session_name="Incremental", status=SessionStatus.COMPLETED,
+        created_by="DOMAIN\\testuser"
+    )
+    db_session.add(session)
+    db_session.flush()
+    revisions = [
+        EmployeeRevision(
+            session_id=session.session_id, employee_id=employee_id, employee_name=name,
+            car_amount=Decimal("100.00"), receipt_amount=Decimal("100.00"),
+            validation_status=ValidationStatus.VALID, validation_flags={"receipt_entry_count": 1}
+        )
+        for employee_id, name in (("EMP001", "JOHN SMITH"), ("EMP002", "MARY JONES"))
+    ]
+    db_session.add_all(revisions)
+    db_session.commit()
+    return session, revisions
+
+
+def _zero_receipt(revision):
+    return {
+        "new_employees": [],
+        "changed_employees": [{
+            "old_employee": revision,
+            "new_employee": {"employee_id": revision.employee_id, "employee_name": revision.employee_name,
+                             "amount": Decimal("0")},
+            "changes": {"amount_changed": True}
+        }],
+        "removed_employees": []
+    }
+
+
+class TestReprocessingRevalidation:
+    """Test suite for revalidation of reprocessed receipts against the database"""
+
+    def _reprocess_zero_receipt(self, db_session, warm):
+        session, revisions = _session_with_revisions(db_session)
+        invalidate_validation_state(session.session_id)
+        if warm:
+            get_validation_state(db_session, session.session_id)
+
+        ReceiptReprocessingService(db_session)._apply_changes(
+            str(session.session_id), _zero_receipt(revisions[0]), 2, "DOMAIN\\testuser"
+        )
+        db_session.commit()
+        db_session.refresh(revisions[0])
+        return session, revisions[0]
+
+    @pytest.mark.parametrize("warm", [False, True])
+    def test_zero_receipt_needs_attention(self, db_session, warm):
+        """Test a receipt set to zero is flagged with a cold and a warm cache"""
+        session, revision = self._reprocess_zero_receipt(db_session, warm)
+
+        assert revision.validation_status == ValidationStatus.NEEDS_ATTENTION
+        assert revision.validation_flags == {"receipt_entry_count": 1, "missing_receipt": True}
+        assert revision.flag_missing_receipt
+
+        stats = get_session_statistics(db_session, session.session_id)
+        assert (stats["valid_employees"], stats["needs_attention_employees"]) == (1, 1)
+        assert stats["missing_receipt_flagged"] == 1
+
+    def test_state_reloaded_after_external_change(self, db_session):
+        """Test a cached state is not reused once the session changed elsewhere"""
+        session, revisions = _session_with_revisions(db_session)
+        invalidate_validation_state(session.session_id)
+        cached = get_validation_state(db_session, session.session_id)
+
+        revisions[1].receipt_amount = Decimal("0")
+        db_session.commit()
+
+        state = get_validation_state(db_session, session.session_id)
+        assert state is not cached
+        assert state.employees[str(revisions[1].revision_id)]["receipt_amount"] == Decimal("0")
+
+    def test_resolution_statistics_read_database(self, db_session):
+        """Test resolution statistics follow status changes made outside the cached state"""
+        session, revisions = _session_with_revisions(db_session)
+        get_validation_state(db_session, session.session_id)
+
+        revisions[0].validation_status = ValidationStatus.NEEDS_ATTENTION
+        revisions[0].validation_flags = {"missing_receipt": True}
+        revisions[1].validation_status = ValidationStatus.RESOLVED
+        db_session.commit()
+
+        stats = IssueResolutionManager(db_session).get_resolution_statistics(str(session.session_id))
+        assert (stats["valid_employees"], stats["needs_attention"], stats["resolved_employees"]) == (0, 1, 1)
+        assert stats["issue_counts"] == {"missing_receipt": 1}
@@ -0,0 +1,116 @@
+"""
+Tests for the employee merge engine
+Covers ID hash join, fuzzy matching of leftovers and persistence record shape
+"""
+
+from app.models import ValidationStatus
+from app.services.merge_engine import MergeEngine, merge_employees, normalize_employee_id
+
+
+def _car(employee_id, name, amount=100.0):
+    return {"employee_id": employee_id, "employee_name": name, "car_amount": amount, "confidence": 0.9}
+
+
+def _receipt(employee_id, name, amount=100.0):
+    return {"employee_id": employee_id, "employee_name": name, "receipt_amount": amount, "confidence": 0.7}
+
+
+class TestMergeEngine:
+    """Test suite for MergeEngine"""
+
+    def test_normalize_employee_id(self):
+        """Test IDs are reduced to digits"""
+        assert normalize_employee_id("EMP-00123") == "00123"
+        assert normalize_employee_id("ABC") is None
+        assert normalize_employee_id(None) is None
+
+    def test_id_join_references_source_records(self):
+        """Test ID matches join regardless of formatting and keep source dicts uncopied"""
+        car = _car("EMP-001", "JOHN SMITH")
+        receipt = _receipt("001", "J. SMITH", 80.0)
+
+        merged = merge_employees([car], [receipt])
+
+        assert len(merged) == 1
+        record = merged[0]
+        assert record["employee_id"] == "001"
+        assert record["employee_name"] == "JOHN SMITH"
+        assert record["car_amount"] == 100.0
+        assert record["receipt_amount"] == 80.0
+        assert record["car_data"] is car
+        assert record["receipt_data"] is receipt
+        assert record["match_status"] == "matched"
+        assert record["sources"] == ["car", "receipt"]
+        assert record["confidence"] == 0.8
+        assert record["validation_status"] == ValidationStatus.VALID
+
+    def test_fuzzy_matches_only_leftovers(self):
+        """Test records without an ID partner are matched by name"""
+        merged = merge_employees(
+            [_car("1", "JOHN SMITH"), _car(None, "MARY JONES")],
+            [_receipt("1", "JOHN SMITH"), _receipt(None, "MARY JONSE")]
+        )
+
+        by_name = {r["employee_name"]: r for r in merged}
+        assert by_name["JOHN SMITH"]["match_reason"] == "Exact Employee ID match"
+        assert by_name["MARY JONES"]["match_status"] == "matched"
+        assert by_name["MARY JONES"]["match_reason"].startswith("Name similarity")
+
+    def test_unmatched_records(self):
+        """Test CAR-only and receipt-only records are emitted with attention flags"""
+        merged = merge_employees(
+            [_car("1", "JOHN SMITH"), _car("2", "ALICE BROWN", 0)],
+            [_receipt("3", "ZED QUINN")]
+        )
+
+        statuses = [(r["employee_name"], r["match_status"], r["validation_status"]) for r in merged]
+        assert statuses == [
+            ("JOHN SMITH", "car_only", ValidationStatus.VALID),
+            ("ALICE BROWN", "car_only", ValidationStatus.NEEDS_ATTENTION),
+            ("ZED QUINN", "receipt_only", ValidationStatus.NEEDS_ATTENTION),
+        ]
+
+    def test_receipt_joined_once(self):
+        """Test a receipt is not claimed by two CAR employees sharing an ID"""
+        merged = merge_employees(
+            [_car("7", "JOHN SMITH"), _car("7", "JON SMITH")],
+            [_receipt("7", "JOHN SMITH")]
+        )
+
+        assert sum(1 for r in merged if r["match_status"] == "matched") == 1
+
+    def test_streams_generators(self):
+        """Test the engine accepts one-shot iterables"""
+        engine = MergeEngine(fuzzy_matching=False)
+        car = (_car(str(i), f"EMPLOYEE {i}") for i in range(3))
+        receipts = (_receipt(str(i), f"EMPLOYEE {i}") for i in range(3))
+
+        assert [r["employee_id"] for r in engine.merge(car, receipts)] == ["0", "1", "2"]
+
+    def test_merge_documents_keeps_merger_shape(self):
+        """Test keyed parser output is paired by the engine and returned with page ranges and summary"""
+        car = {
+            "JOHN SMITH": {"employee_id": "EMP-001", "employee_name": "JOHN SMITH", "car_total": 120.0,
+                           "car_page_range": [1, 2]},
+            "MARY JONES": {"employee_id": None, "employee_name": "MARY JONES", "car_total": 40.0,
+                           "car_page_range": [3]},
+        }
+        receipts = {
+            "J SMITH": {"employee_id": "001", "employee_name": "J SMITH", "receipt_total": 80.0,
+                        "receipt_page_range": [1]},
+            "MARY JONSE": {"employee_id": None, "employee_name": "MARY JONSE", "receipt_total": 40.0,
+                           "receipt_page_range": [2]},
+            "ZED QUINN": {"employee_id": "009", "employee_name": "ZED QUINN", "receipt_total": 5.0},
+        }
+
+        result = MergeEngine().merge_documents(car, receipts)
+
+        pairs = {m["car_key"]: (m["receipt_key"], m["match_reason"]) for m in result["matches"]}
+        assert pairs["JOHN SMITH"] == ("J SMITH", "Exact Employee ID match")
+        assert pairs["MARY JONES"][0] == "MARY JONSE"
+        employees = result["employees"]
+        assert employees["JOHN SMITH"]["receipt_page_range"] == [1]
+        assert employees["JOHN SMITH"]["total_expenses"] == 200.0
+        assert employees["receipt_ZED QUINN"]["match_status"] == "receipt_only"
+        assert result["summary"]["matched_count"] == 2
+        assert result["summary"]["receipt_only_count"] == 1
@@ -0,0 +1,211 @@
+"""
+Tests for the page-level similarity index
+Covers page hashing, MinHash similarity, page deltas, the page text cache and
+page-level delta detection
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from app.config import settings
+from app.models import FileType, FileUpload, ProcessingSession, SessionStatus, UploadStatus
+from app.services import pdf_processor
+from app.services.delta_processor import DeltaProcessor
+from app.services.page_similarity import (
+    PageDelta, compute_minhash_signature, compute_page_hashes, estimate_similarity
+)
+
+
+def _write_pdf(path, pages):
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page()
+        page.insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def _write_form_xobject_pdf(path, text):
+    """PDF whose only page draws its text through a form XObject"""
+    source = fitz.open()
+    source.new_page().insert_text((72, 72), text)
+    doc = fitz.open()
+    doc.new_page().show_pdf_page(fitz.Rect(0, 0, 595, 842), source, 0)
+    doc.save(str(path))
+    doc.close()
+    source.close()
+    return str(path)
+
+
+def _write_subset_font_pdf(path, subset_tag="AAAAAA", to_unicode=None):
+    """PDF whose only page uses an embedded subset font, with its tag and optionally its ToUnicode CMap replaced"""
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_font(fontname="F0", fontbuffer=fitz.Font("helv").buffer)
+    page.insert_text((72, 72), "Receipt 10.00", fontname="F0")
+    doc.subset_fonts()
+    font_xref = next(font[0] for font in page.get_fonts() if font[4] == "F0")
+    basefont = doc.xref_get_key(font_xref, "BaseFont")[1]
+    doc.xref_set_key(font_xref, "BaseFont", f"/{subset_tag}{basefont[7:]}".replace(" ", "#20"))
+    if to_unicode is not None:
+        doc.update_stream(int(doc.xref_get_key(font_xref, "ToUnicode")[1].split()[0]), to_unicode)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+BASE_PAGES = [f"Receipt page {i} for JOHN SMITH amount {i * 10}.00" for i in range(1, 5)]
+
+
+@pytest.fixture
+def pdfs(tmp_path):
+    base = _write_pdf(tmp_path / "base.pdf", BASE_PAGES)
+    appended = _write_pdf(tmp_path / "appended.pdf", BASE_PAGES + ["New page A", "New page B"])
+    edited = _write_pdf(tmp_path / "edited.pdf", BASE_PAGES[:2] + ["Corrected page"] + BASE_PAGES[3:])
+    return base, appended, edited
+
+
+class TestPageHashes:
+    """Test suite for page hashes and MinHash signatures"""
+
+    def test_shared_pages_hash_equal_across_files(self, pdfs):
+        """Test identical pages of different files get the same hash"""
+        base, appended, _ = pdfs
+        base_hashes, appended_hashes = compute_page_hashes(base), compute_page_hashes(appended)
+
+        assert appended_hashes[:4] == base_hashes
+        assert len(set(appended_hashes)) == 6
+
+    def test_form_xobject_pages_with_different_text_differ(self, tmp_path):
+        """Test pages with identical content streams but different form XObjects hash differently"""
+        first = _write_form_xobject_pdf(tmp_path / "first.pdf", "Receipt for JOHN SMITH amount 10.00")
+        second = _write_form_xobject_pdf(tmp_path / "second.pdf", "Receipt for MARY JONES amount 99.00")
+        same = _write_form_xobject_pdf(tmp_path / "same.pdf", "Receipt for JOHN SMITH amount 10.00")
+
+        assert compute_page_hashes(first) != compute_page_hashes(second)
+        assert compute_page_hashes(first) == compute_page_hashes(same)
+        assert PageDelta(compute_page_hashes(first), compute_page_hashes(second)).reused_pages == {}
+
+    def test_font_subsets_are_hashed_by_stream(self, tmp_path):
+        """Test subset tags do not affect page hashes but a different ToUnicode mapping does"""
+        cmap = b"""/CIDInit /ProcSet findresource begin 12 dict begin begincmap
+/CMapName /Remapped def 1 begincodespacerange <0000> <FFFF> endcodespacerange
+1 beginbfrange <0000> <FFFF> <0041> endbfrange endcmap CMapName currentdict /CMap defineresource pop end end"""
+        (original,) = compute_page_hashes(_write_subset_font_pdf(tmp_path / "original.pdf", "AAAAAA"))
+        (retagged,) = compute_page_hashes(_write_subset_font_pdf(tmp_path / "retagged.pdf", "BCDEFG"))
+        (remapped,) = compute_page_hashes(_write_subset_font_pdf(tmp_path / "remapped.pdf", "AAAAAA", cmap))
+
+        assert original == retagged
+        assert remapped != original
+
+    def test_minhash_estimates_similarity(self, pdfs):
+        """Test the signature estimate tracks the page-set Jaccard similarity"""
+        base, appended, _ = pdfs
+        base_signature = compute_minhash_signature(compute_page_hashes(base))
+        appended_signature = compute_minhash_signature(compute_page_hashes(appended))
+
+        assert estimate_similarity(base_signature, base_signature) == 1.0
+        assert 0.45 <= estimate_similarity(base_signature, appended_signature) <= 0.9
+        assert estimate_similarity(base_signature, []) == 0.0
+
+    def test_page_delta_new_and_changed_pages(self, pdfs):
+        """Test appended pages are new and an edited page is changed"""
+        base, appended, edited = pdfs
+        base_hashes = compute_page_hashes(base)
+
+        delta = PageDelta(base_hashes, compute_page_hashes(appended))
+        assert (delta.new_pages, delta.changed_pages, delta.removed_pages) == ([5, 6], [], [])
+        assert delta.reused_pages == {1: 1, 2: 2, 3: 3, 4: 4}
+
+        delta = PageDelta(base_hashes, compute_page_hashes(edited))
+        assert (delta.new_pages, delta.changed_pages, delta.removed_pages) == ([], [3], [3])
+        assert delta.pages_to_extract == [3]
+
+
+class TestPageTextCache:
+    """Test suite for cached page text extraction"""
+
+    def test_only_new_pages_are_extracted(self, pdfs, tmp_path, monkeypatch):
+        """Test text of pages seen before comes from the cache"""
+        base, appended, _ = pdfs
+        monkeypatch.setattr(settings, "upload_path", str(tmp_path / "data" / "uploads"))
+        monkeypatch.setattr(settings, "page_cache_enabled", True)
+        extracted = []
+        original = pdf_processor._extract_page_text
+        monkeypatch.setattr(
+            pdf_processor, "_extract_page_text", lambda page: extracted.append(page.number) or original(page)
+        )
+
+        with fitz.open(base) as doc:
+            base_texts = pdf_processor._extract_page_texts(doc)
+        extracted.clear()
+        with fitz.open(appended) as doc:
+            appended_texts = pdf_processor._extract_page_texts(doc)
+
+        assert extracted == [4, 5]
+        assert [appended_texts[page] for page in range(1, 5)] == [base_texts[page] for page in range(1, 5)]
+        assert "New page B" in appended_texts[6]
+
+    def test_form_xobject_pages_do_not_share_cached_text(self, tmp_path, monkeypatch):
+        """Test a page drawn through a form XObject never gets another page's cached text"""
+        monkeypatch.setattr(settings, "upload_path", str(tmp_path / "data" / "uploads"))
+        monkeypatch.setattr(settings, "page_cache_enabled", True)
+        first = _write_form_xobject_pdf(tmp_path / "first.pdf", "Receipt for JOHN SMITH amount 10.00")
+        second = _write_form_xobject_pdf(tmp_path / "second.pdf", "Receipt for MARY JONES amount 99.00")
+
+        with fitz.open(first) as doc:
+            pdf_processor._extract_page_texts(doc)
+        with fitz.open(second) as doc:
+            texts = pdf_processor._extract_page_texts(doc)
+
+        assert "MARY JONES" in texts[1]
+        assert "JOHN SMITH" not in texts[1]
+
+
+class TestPageDeltaDetection:
+    """Test suite for DeltaProcessor.detect_page_delta"""
+
+    def _upload(self, db_session, pdf_path, status):
+        session = ProcessingSession(
+            session_id=uuid.uuid4(), session_name="Receipts", status=status,
+            created_by="DOMAIN\\testuser", created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc)
+        )
+        page_hashes = compute_page_hashes(pdf_path)
+        db_session.add(session)
+        db_session.add(FileUpload(
+            session_id=session.session_id, file_type=FileType.RECEIPT, original_filename="receipts.pdf",
+            file_path=pdf_path, file_size=1, checksum=uuid.uuid4().hex * 2,
+            page_hashes=page_hashes, minhash_signature=compute_minhash_signature(page_hashes),
+            upload_status=UploadStatus.COMPLETED, uploaded_by="DOMAIN\\testuser"
+        ))
+        db_session.commit()
+        return session
+
+    def test_reports_pages_against_most_similar_file(self, db_session, pdfs):
+        """Test the completed session with shared pages is the base and new pages are listed"""
+        base, appended, _ = pdfs
+        base_session = self._upload(db_session, base, SessionStatus.COMPLETED)
+        current = self._upload(db_session, appended, SessionStatus.PENDING)
+
+        result = DeltaProcessor(db_session).detect_page_delta(str(current.session_id), "DOMAIN\\testuser")
+
+        receipt = result["receipt"]
+        assert receipt["base_session_id"] == str(base_session.session_id)
+        assert receipt["new_pages"] == [5, 6]
+        assert receipt["reused_page_count"] == 4
+        assert receipt["exact_match"] is False
+
+    def test_no_base_below_similarity_threshold(self, db_session, tmp_path):
+        """Test an unrelated earlier file is not reported"""
+        self._upload(db_session, _write_pdf(tmp_path / "other.pdf", ["Unrelated"]), SessionStatus.COMPLETED)
+        current = self._upload(db_session, _write_pdf(tmp_path / "cur.pdf", BASE_PAGES), SessionStatus.PENDING)
+
+        result = DeltaProcessor(db_session).detect_page_delta(str(current.session_id), "DOMAIN\\testuser")
+
+        assert result == {"receipt": None}
@@ -0,0 +1,179 @@
+"""
+Tests for the streaming pVault CSV exports
+Covers byte-for-byte compatibility of the streamed /pvault file with the
+previous in-memory writer, chunking across many rows, the projected and
+batched revision query, and the enhanced export produced by ExportGenerator
+"""
+
+import csv
+import io
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app.models import EmployeeRevision, ProcessingSession, SessionStatus, ValidationStatus
+from app.services import export_artifacts
+from app.services.export_artifacts import ExportArtifactStore
+from app.services.export_generator import (
+    ExportGenerator, PVAULT_COLUMNS, iter_csv_chunks, iter_session_rows
+)
+
+STATUSES = [ValidationStatus.VALID, ValidationStatus.NEEDS_ATTENTION, ValidationStatus.RESOLVED]
+
+
+@pytest.fixture
+def export_db(file_db, tmp_path, monkeypatch):
+    """File database with one completed session of 1,500 revisions in mixed statuses"""
+    session_id = uuid.uuid4()
+    with file_db.Session() as db:
+        db.add(ProcessingSession(
+            session_id=session_id, session_name="Streamed export", status=SessionStatus.COMPLETED,
+            created_by="DOMAIN\\rcox", total_employees=1500
+        ))
+        db.commit()
+        db.add_all(
+            EmployeeRevision(
+                session_id=session_id, employee_id=f"EMP{i:04d}" if i % 7 else None,
+                employee_name=f"EMPLOYEE, \"{i}\"", car_amount=Decimal(i) / 4,
+                receipt_amount=Decimal(i % 50) if i % 3 else None,
+                validation_status=STATUSES[i % 3], validation_flags={"total_issues": i % 2},
+                resolved_by="rcox" if i % 3 == 2 else None,
+                resolution_notes="notes\nwith newline" if i % 5 == 0 else None,
+                created_at=datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=i // 2)
+            )
+            for i in range(1500)
+        )
+        db.commit()
+
+    monkeypatch.setattr(export_artifacts, "export_artifact_store", ExportArtifactStore(str(tmp_path / "artifacts")))
+    return str(session_id), file_db
+
+
+def _in_memory_pvault(db, session_id, statuses):
+    """The /pvault body as it was built before streaming (all rows, one StringIO)"""
+    employees = [
+        employee for employee in
+        db.query(EmployeeRevision).filter(EmployeeRevision.session_id == uuid.UUID(session_id)).order_by(
+            EmployeeRevision.created_at, EmployeeRevision.revision_id
+        ).all()
+        if employee.validation_status in statuses
+    ]
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow([
+        "Employee_ID", "Employee_Name", "Card_Amount", "Receipt_Amount", "Total_Amount",
+        "Validation_Status", "Processing_Date", "Resolved_By", "Resolution_Notes"
+    ])
+    for employee in employees:
+        car_amount = float(employee.car_amount) if employee.car_amount else 0.0
+        receipt_amount = float(employee.receipt_amount) if employee.receipt_amount else 0.0
+        writer.writerow([
+            employee.employee_id or "", employee.employee_name, f"{car_amount:.2f}",
+            f"{receipt_amount:.2f}", f"{car_amount + receipt_amount:.2f}",
+            employee.validation_status.value, employee.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+            employee.resolved_by or "", employee.resolution_notes or ""
+        ])
+    return output.getvalue().encode("utf-8")
+
+
+class TestStreamingPvaultExport:
+    """Test suite for streaming pVault CSV exports"""
+
+    def test_streamed_pvault_matches_in_memory_file(self, export_db):
+        """Test /pvault streams the same bytes the in-memory writer produced, with and without resolved rows"""
+        session_id, file_db = export_db
+
+        with_resolved, valid_only = file_db.get_all([
+            (f"/api/export/{session_id}/pvault", {}),
+            (f"/api/export/{session_id}/pvault?include_resolved=false", {})
+        ])
+
+        with file_db.Session() as db:
+            assert with_resolved.content == _in_memory_pvault(
+                db, session_id, {ValidationStatus.VALID, ValidationStatus.RESOLVED}
+            )
+            assert valid_only.content == _in_memory_pvault(db, session_id, {ValidationStatus.VALID})
+        assert with_resolved.headers["content-type"].startswith("text/csv")
+        assert "attachment; filename=Session_" in with_resolved.headers["content-disposition"]
+
+    def test_no_rows_is_not_found(self, export_db):
+        """Test a session without exportable revisions still answers 404 before streaming"""
+        session_id, file_db = export_db
+        with file_db.Session() as db:
+            db.query(EmployeeRevision).update({"validation_status": ValidationStatus.NEEDS_ATTENTION})
+            db.commit()
+
+        (response,) = file_db.get_all([(f"/api/export/{session_id}/pvault", {})])
+
+        assert response.status_code == 404
+
+    def test_rows_are_projected_and_fetched_in_batches(self, export_db):
+        """Test the export reads only its columns and yields rows before the query is exhausted"""
+        session_id, file_db = export_db
+        statements = []
+        event.listen(file_db.engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        with file_db.Session() as db:
+            rows = iter_session_rows(db, uuid.UUID(session_id), PVAULT_COLUMNS, batch_size=100)
+            next(rows)
+            rows.close()
+
+        selected = statements[0].split("FROM")[0]
+        assert len(statements) == 1
+        assert "validation_flags" not in selected and "revision_id" not in selected
+
+    def test_rows_come_in_created_then_revision_order(self, export_db):
+        """Test rows follow created_at, then revision_id for rows created at the same time"""
+        session_id, file_db = export_db
+
+        with file_db.Session() as db:
+            revisions = db.query(EmployeeRevision.revision_id, EmployeeRevision.employee_name).all()
+            names_by_revision = {str(revision_id): name for revision_id, name in revisions}
+            expected = [
+                names_by_revision[revision_id]
+                for revision_id in sorted(names_by_revision, key=lambda revision_id: (
+                    int(names_by_revision[revision_id].split('"')[1]) // 2, revision_id
+                ))
+            ]
+            streamed = [
+                row.employee_name
+                for row in iter_session_rows(db, uuid.UUID(session_id), PVAULT_COLUMNS, batch_size=100)
+            ]
+
+        assert streamed == expected
+        assert streamed[:2] in (['EMPLOYEE, "0"', 'EMPLOYEE, "1"'], ['EMPLOYEE, "1"', 'EMPLOYEE, "0"'])
+
+    def test_csv_chunks_join_to_single_writer_output(self):
+        """Test chunked CSV output is identical to one writer and is split past the chunk size"""
+        rows = [[i, f"name, {i}", "line\nbreak" if i % 10 == 0 else ""] for i in range(2000)]
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(["A", "B", "C"])
+        writer.writerows(rows)
+
+        chunks = list(iter_csv_chunks(["A", "B", "C"], rows, chunk_size=4096))
+
+        assert "".join(chunks) == output.getvalue()
+        assert len(chunks) > 5
+        assert all(len(chunk) < 4096 + 100 for chunk in chunks)
+
+    def test_enhanced_pvault_streams_generator_output(self, export_db):
+        """Test /pvault/enhanced streams what ExportGenerator.generate_pvault_csv builds"""
+        session_id, file_db = export_db
+
+        (response,) = file_db.get_all([
+            (f"/api/export/{session_id}/pvault/enhanced?include_validation_details=true", {})
+        ])
+
+        with file_db.Session() as db:
+            session = db.query(ProcessingSession).one()
+            expected, _ = ExportGenerator(db).generate_pvault_csv(session, include_validation_details=True)
+        lines = list(csv.reader(io.StringIO(response.text)))
+        assert response.status_code == 200
+        assert response.text == expected.getvalue()
+        assert len(lines) == 1001
+        assert len(lines[0]) == 19 and lines[1][11:13] == ["system", "1.0"]
@@ -0,0 +1,103 @@
+"""
+Tests for SQL query instrumentation
+Covers statement fingerprints, per-request query counts tagged with the
+correlation ID, N+1 flagging and the async (aiosqlite) path
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.metrics import fingerprint_statement, query_metrics
+from app.middleware import RequestLoggingMiddleware
+
+
+@pytest.fixture
+def instrumented_app(monkeypatch):
+    """App with the request middleware whose endpoints run a given number of lookups"""
+    monkeypatch.setattr(settings, "n_plus_one_threshold", 5)
+    query_metrics.reset()
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware)
+
+    @app.get("/lookups/{count}")
+    def lookups(count: int):
+        with engine.connect() as connection:
+            for i in range(count):
+                connection.execute(text("SELECT :value AS value"), {"value": i})
+        return {"count": count}
+
+    @app.get("/async-lookups/{count}")
+    async def async_lookups(count: int):
+        async_engine = create_async_engine("sqlite+aiosqlite://")
+        try:
+            async with async_engine.connect() as connection:
+                for i in range(count):
+                    await connection.execute(text(f"SELECT {i}"))
+        finally:
+            await async_engine.dispose()
+        return {"count": count}
+
+    yield app
+    engine.dispose()
+    query_metrics.reset()
+
+
+def _get(app, path, correlation_id):
+    async def run():
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+            return await client.get(path, headers={"x-correlation-id": correlation_id})
+    return asyncio.run(run())
+
+
+class TestFingerprints:
+    """Test suite for statement fingerprints"""
+
+    def test_literals_and_placeholder_lists_are_collapsed(self):
+        """Test statements differing only in literals share a fingerprint"""
+        first = fingerprint_statement("SELECT * FROM t WHERE id = 5 AND name = 'a''b' AND k IN (?, ?, ?)")
+        second = fingerprint_statement("SELECT *  FROM t WHERE id = 17 AND name = 'c' AND k IN (?, ?)")
+
+        assert first == second == "SELECT * FROM t WHERE id = ? AND name = ? AND k IN (?...)"
+        assert fingerprint_statement("SELECT col1 FROM t2") == "SELECT col1 FROM t2"
+
+
+class TestRequestQueryStats:
+    """Test suite for per-request query statistics and N+1 flagging"""
+
+    def test_repeated_statement_flags_request(self, instrumented_app):
+        """Test a request running one fingerprint past the threshold is flagged with its correlation ID"""
+        response = _get(instrumented_app, "/lookups/8", "corr-n-plus-one")
+
+        metrics = query_metrics.get_metrics()
+        assert response.status_code == 200
+        assert metrics["requests_instrumented"] == 1
+        assert metrics["max_queries_per_request"] == 8
+        assert metrics["top_fingerprints"][0]["fingerprint"] == "SELECT ? AS value"
+        flagged = metrics["n_plus_one"]["recent"]
+        assert [(entry["correlation_id"], entry["path"]) for entry in flagged] == [
+            ("corr-n-plus-one", "/lookups/8")
+        ]
+        assert flagged[0]["repeated"] == {"SELECT ? AS value": 8}
+
+    def test_request_below_threshold_is_not_flagged(self, instrumented_app):
+        """Test a few repeats are counted but not flagged"""
+        _get(instrumented_app, "/lookups/3", "corr-ok")
+
+        metrics = query_metrics.get_metrics()
+        assert metrics["avg_queries_per_request"] == 3
+        assert metrics["n_plus_one"]["flagged_requests"] == 0
+
+    def test_async_queries_are_attributed_to_the_request(self, instrumented_app):
+        """Test statements run through aiosqlite count towards the request"""
+        _get(instrumented_app, "/async-lookups/7", "corr-async")
+
+        flagged = query_metrics.get_metrics()["n_plus_one"]["recent"]
+        assert flagged[0]["correlation_id"] == "corr-async"
+        assert flagged[0]["repeated"] == {"SELECT ?": 7}
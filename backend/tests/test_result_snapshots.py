@@ -0,0 +1,263 @@
+"""
+Tests for result snapshots of completed sessions
+Covers the session_data_versions triggers, writing and lazily reloading
+snapshots by data version, paged, summary, exception and export readers
+querying the database rather than the snapshot, debounced background rewrites
+after resolution, and the snapshot endpoint's gzip body and strong ETag
+"""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.config import settings
+from app.models import (
+    ActivityType, EmployeeRevision, ProcessingActivity, ProcessingSession, SessionDataVersion,
+    SessionStatus, ValidationStatus
+)
+from app.services import export_artifacts, result_snapshots
+from app.services.export_artifacts import ExportArtifactStore
+from app.services.result_snapshots import ResultSnapshotStore, SessionSnapshot, _encode_row
+
+
+def _session(session_id=None, status=SessionStatus.COMPLETED):
+    now = datetime.now(timezone.utc)
+    return ProcessingSession(
+        session_id=session_id or uuid.uuid4(), session_name="Snapshot", status=status,
+        created_by="DOMAIN\\rcox", total_employees=6, created_at=now - timedelta(minutes=5), updated_at=now
+    )
+
+
+def _revisions(session_id):
+    """Six revisions covering each status, missing receipts and flagged issues"""
+    rows = [
+        ("EMP003", "CAROL", "100.00", "100.00", ValidationStatus.VALID, {}),
+        ("EMP001", "ALICE", "250.50", None, ValidationStatus.NEEDS_ATTENTION, {"missing_receipt": True}),
+        ("EMP005", "EVE", "80.00", "95.25", ValidationStatus.NEEDS_ATTENTION, {"amount_mismatch": True}),
+        (None, "bob", "10.00", "10.00", ValidationStatus.RESOLVED, {"coding_incomplete": True}),
+        ("EMP004", "DAVE", "60.00", "0.00", ValidationStatus.VALID, {}),
+        ("EMP002", "FRANK", "75.00", "75.00", ValidationStatus.NEEDS_ATTENTION, {"coding_incomplete": True}),
+    ]
+    return [
+        EmployeeRevision(
+            session_id=session_id, employee_id=employee_id, employee_name=name,
+            car_amount=Decimal(car), receipt_amount=Decimal(receipt) if receipt else None,
+            validation_status=status, validation_flags=flags,
+            resolved_by="rcox" if status == ValidationStatus.RESOLVED else None
+        )
+        for employee_id, name, car, receipt, status, flags in rows
+    ]
+
+
+def _data_version(db_session, session_id):
+    row = db_session.get(SessionDataVersion, session_id)
+    db_session.expire_all()
+    return row.version if row else 0
+
+
+class TestDataVersionAndStore:
+    """Test suite for session_data_versions and ResultSnapshotStore"""
+
+    def test_data_version_ignores_activity_log(self, db_session):
+        """Test session and revision writes bump the data version and activities do not"""
+        session = _session()
+        db_session.add(session)
+        db_session.commit()
+        revision = _revisions(session.session_id)[0]
+        db_session.add(revision)
+        db_session.commit()
+        before = _data_version(db_session, session.session_id)
+
+        db_session.add(ProcessingActivity(
+            session_id=session.session_id, activity_type=ActivityType.EXPORT,
+            activity_message="Generated export", created_by="rcox"
+        ))
+        db_session.commit()
+        unchanged = _data_version(db_session, session.session_id)
+
+        revision.validation_status = ValidationStatus.RESOLVED
+        db_session.commit()
+
+        assert before == unchanged == 2
+        assert _data_version(db_session, session.session_id) == 3
+
+    def test_snapshot_round_trip_and_rebuild(self, db_session, tmp_path):
+        """Test revisions reload with identical values and a data change writes a new version"""
+        store = ResultSnapshotStore(str(tmp_path))
+        session = _session()
+        db_session.add(session)
+        db_session.add_all(_revisions(session.session_id))
+        db_session.commit()
+
+        first = store.load(db_session, session.session_id)
+        again = store.load(db_session, session.session_id, build=False)
+        decoded_on_load = again._document is not None
+        loaded = db_session.query(EmployeeRevision).filter(EmployeeRevision.session_id == session.session_id).order_by(
+            EmployeeRevision.created_at, EmployeeRevision.revision_id
+        ).all()
+
+        assert not decoded_on_load
+        assert [_encode_row(e) for e in again.employees] == [_encode_row(e) for e in loaded]
+        assert isinstance(again.employees[0].car_amount, Decimal)
+        assert again.etag == first.etag
+        assert again.session_summary["needs_attention"] == 3
+
+        next(e for e in loaded if e.employee_id == "EMP003").validation_status = ValidationStatus.NEEDS_ATTENTION
+        db_session.commit()
+
+        assert store.load(db_session, session.session_id, build=False) is None
+        rebuilt = store.load(db_session, session.session_id)
+        files = list((tmp_path / str(session.session_id)).glob("*.json.gz"))
+        assert rebuilt.etag != first.etag
+        assert files == [store.path_for(session.session_id, rebuilt.version)]
+
+    def test_no_snapshot_before_completion(self, db_session, tmp_path):
+        """Test sessions still processing are not snapshotted"""
+        session = _session(status=SessionStatus.PROCESSING)
+        db_session.add(session)
+        db_session.commit()
+
+        assert ResultSnapshotStore(str(tmp_path)).load(db_session, session.session_id) is None
+        assert not any(tmp_path.iterdir())
+
+
+@pytest.fixture
+def snapshot_app(file_db, tmp_path, monkeypatch):
+    """Results, summary, exception and export endpoints on a file database with one completed session"""
+    session_id = uuid.uuid4()
+    with file_db.Session() as db:
+        db.add(_session(session_id))
+        db.commit()
+        db.add_all(_revisions(session_id))
+        db.commit()
+
+    monkeypatch.setattr(export_artifacts, "export_artifact_store", ExportArtifactStore(str(tmp_path / "artifacts")))
+    monkeypatch.setattr(result_snapshots, "result_snapshot_store", ResultSnapshotStore(str(tmp_path / "snapshots")))
+    monkeypatch.setattr(settings, "cache_enabled", False)
+    return str(session_id), tmp_path / "snapshots" / str(session_id), file_db
+
+
+def _reader_urls(session_id):
+    base = f"/api/sessions/{session_id}"
+    return [
+        f"{base}/results",
+        f"{base}/results?sort_by=receipt_amount&sort_order=desc",
+        f"{base}/results?search=e&status_filter=needs_attention&limit=1&offset=1",
+        f"{base}/results/enhanced?include_metadata=false&sort_by=employee_id",
+        f"{base}/results/enhanced?include_metadata=false&search=EMP00&sort_order=desc",
+        f"{base}/summary",
+        f"{base}/exceptions",
+        f"{base}/exceptions?issue_type=coding_issues",
+        f"{base}/exceptions?issue_type=missing_receipts&sort_by=car_amount&sort_order=desc",
+    ]
+
+
+class TestSnapshotReaders:
+    """Test suite for endpoints reading and refreshing result snapshots"""
+
+    def test_readers_do_not_use_snapshots(self, snapshot_app, monkeypatch):
+        """Test paged and summary readers query the database and neither build nor decode snapshots"""
+        session_id, snapshot_dir, file_db = snapshot_app
+        requests = [(url, {}) for url in _reader_urls(session_id)]
+
+        monkeypatch.setattr(settings, "result_snapshots_enabled", False)
+        from_database = file_db.get_all(requests)
+        monkeypatch.setattr(settings, "result_snapshots_enabled", True)
+        without_snapshot = file_db.get_all(requests)
+        written = list(snapshot_dir.glob("*.json.gz"))
+        file_db.get_all([(f"/api/sessions/{session_id}/results/snapshot", {})])
+
+        def fail_decode(snapshot):
+            raise AssertionError("snapshot decoded by a paged reader")
+
+        monkeypatch.setattr(SessionSnapshot, "document", property(fail_decode))
+        with_snapshot = file_db.get_all(requests)
+
+        assert [r.status_code for r in with_snapshot] == [200] * len(requests)
+        assert [r.json() for r in without_snapshot] == [r.json() for r in from_database]
+        assert [r.json() for r in with_snapshot] == [r.json() for r in from_database]
+        assert written == []
+
+    def test_export_logging_keeps_snapshot(self, snapshot_app, monkeypatch):
+        """Test logging exports does not invalidate the snapshot and export files are unchanged"""
+        session_id, snapshot_dir, file_db = snapshot_app
+        url = f"/api/export/{session_id}/issues"
+        snapshot_url = f"/api/sessions/{session_id}/results/snapshot"
+
+        monkeypatch.setattr(settings, "result_snapshots_enabled", False)
+        (from_database,) = file_db.get_all([(url, {})])
+        monkeypatch.setattr(settings, "result_snapshots_enabled", True)
+        (snapshot,) = file_db.get_all([(snapshot_url, {})])
+        written = list(snapshot_dir.glob("*.json.gz"))
+        first, second, pvault = file_db.get_all([(url, {}), (url, {}), (f"/api/export/{session_id}/pvault", {})])
+
+        assert snapshot.status_code == pvault.status_code == 200
+        assert first.content == from_database.content == second.content
+        assert len(written) == 1
+        assert list(snapshot_dir.glob("*.json.gz")) == written
+
+    def test_resolve_schedules_background_refresh(self, snapshot_app, monkeypatch):
+        """Test resolving an issue schedules the snapshot rewrite instead of writing it in the request"""
+        session_id, snapshot_dir, file_db = snapshot_app
+        scheduled = []
+        monkeypatch.setattr(result_snapshots, "refresh_result_snapshot", lambda *args: pytest.fail("refreshed in request"))
+        monkeypatch.setattr(
+            "app.api.results.schedule_result_snapshot_refresh", lambda session_id: scheduled.append(str(session_id))
+        )
+        file_db.get_all([(f"/api/sessions/{session_id}/results/snapshot", {})])
+        written = list(snapshot_dir.glob("*.json.gz"))
+        (listed,) = file_db.get_all([(f"/api/sessions/{session_id}/results?status_filter=needs_attention", {})])
+        revision_id = listed.json()["employees"][0]["revision_id"]
+
+        (resolved,) = file_db.get_all([("POST", f"/api/sessions/{session_id}/employees/{revision_id}/resolve", {})])
+
+        assert resolved.status_code == 200
+        assert scheduled == [session_id]
+        assert list(snapshot_dir.glob("*.json.gz")) == written
+
+    def test_background_refresh_is_debounced(self, monkeypatch):
+        """Test writes within the refresh delay share one rewrite and a write during a rewrite schedules another"""
+        refreshed = []
+
+        async def record_refresh(session_id):
+            refreshed.append(session_id)
+            if len(refreshed) == 1:
+                result_snapshots.schedule_result_snapshot_refresh(session_id)
+
+        monkeypatch.setattr(result_snapshots, "refresh_result_snapshot_async", record_refresh)
+        monkeypatch.setattr(settings, "result_snapshot_refresh_delay_seconds", 0.01)
+        monkeypatch.setattr(settings, "result_snapshots_enabled", True)
+        session_id = str(uuid.uuid4())
+
+        async def run():
+            for _ in range(3):
+                result_snapshots.schedule_result_snapshot_refresh(session_id)
+            while session_id in result_snapshots._refresh_tasks:
+                await asyncio.sleep(0.01)
+
+        asyncio.run(run())
+
+        assert refreshed == [session_id, session_id]
+
+    def test_snapshot_endpoint_etag(self, snapshot_app):
+        """Test the stored gzip body, strong ETag revalidation and the access check"""
+        session_id, _, file_db = snapshot_app
+        url = f"/api/sessions/{session_id}/results/snapshot"
+
+        first, revalidated = file_db.get_all([(url, {"Accept-Encoding": "gzip"}), (url, {"Accept-Encoding": "identity"})])
+        (not_modified,) = file_db.get_all([(url, {"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]})])
+        file_db.authenticate_as("someoneelse")
+        (denied,) = file_db.get_all([(url, {"If-None-Match": first.headers["etag"]})])
+
+        assert first.headers["content-encoding"] == "gzip"
+        assert first.headers["etag"].startswith('"') and first.headers["etag"].endswith('-gzip"')
+        assert len(first.json()["employees"]) == 6
+        assert revalidated.headers["etag"] != first.headers["etag"]
+        assert "content-encoding" not in revalidated.headers
+        assert json.loads(revalidated.content) == first.json()
+        assert not_modified.status_code == 304
+        assert denied.status_code == 403
@@ -0,0 +1,133 @@
+"""
+Tests for session result cloning
+Covers exact-match cloning of revisions, parsed line artifacts and export files
+"""
+
+import json
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.config import settings
+from app.models import (
+    EmployeeRevision, ExportHistory, ProcessingSession, SessionStatus, ValidationStatus
+)
+from app.services.delta_processor import DeltaProcessor
+
+CAR_CHECKSUM = "a" * 64
+RECEIPT_CHECKSUM = "b" * 64
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "upload_path", str(tmp_path / "uploads"))
+    monkeypatch.setattr(settings, "export_path", str(tmp_path / "exports"))
+    return tmp_path
+
+
+def _create_session(db_session, name, status=SessionStatus.COMPLETED, receipt_checksum=RECEIPT_CHECKSUM):
+    session = ProcessingSession(
+        session_id=uuid.uuid4(),
+        session_name=name,
+        status=status,
+        created_by="DOMAIN\\testuser",
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+        car_checksum=CAR_CHECKSUM,
+        receipt_checksum=receipt_checksum
+    )
+    db_session.add(session)
+    return session
+
+
+def _create_base(db_session, storage):
+    base = _create_session(db_session, "March Run")
+    revisions = [
+        EmployeeRevision(
+            revision_id=uuid.uuid4(), session_id=base.session_id, employee_id=f"EMP00{i}",
+            employee_name=name, car_amount=Decimal("100.00"), receipt_amount=Decimal("100.00"),
+            validation_status=status, validation_flags={}, content_fingerprint=f"fp-{i}"
+        )
+        for i, (name, status) in enumerate([
+            ("ANN LEE", ValidationStatus.VALID), ("BOB RAY", ValidationStatus.NEEDS_ATTENTION)
+        ])
+    ]
+    db_session.add_all(revisions)
+    base.total_employees = len(revisions)
+    base.processed_employees = len(revisions)
+
+    parsed = storage / "uploads" / str(base.session_id) / "parsed"
+    parsed.mkdir(parents=True)
+    (parsed / "index.json").write_text(json.dumps({
+        "version": "1.0", "session_id": str(base.session_id),
+        "employees": [{"employee_key": "ANNLEE", "revision_id": str(revisions[0].revision_id)}]
+    }))
+    (parsed / "car.lines.json").write_text(json.dumps({
+        "version": "1.0", "session_id": str(base.session_id), "source": "car", "employees": []
+    }))
+
+    exports = storage / "exports"
+    exports.mkdir()
+    export_file = exports / f"pVault_March_Run_{str(base.session_id)[:8]}_20240301_100000.csv"
+    export_file.write_text("Employee_ID,Employee_Name\nEMP000,ANN LEE\n")
+    db_session.add(ExportHistory(
+        session_id=base.session_id, export_type="pvault", export_batch_id="batch-1",
+        employee_count=1, exported_by="DOMAIN\\testuser", file_path=str(export_file)
+    ))
+    db_session.commit()
+    return base, revisions
+
+
+class TestExactMatchClone:
+    """Test suite for DeltaProcessor.clone_exact_match"""
+
+    def test_clones_results_without_processing(self, db_session, storage):
+        """Test revisions, artifacts and exports are cloned and the session completes"""
+        base, revisions = _create_base(db_session, storage)
+        target = _create_session(db_session, "April Run", status=SessionStatus.PENDING)
+        db_session.commit()
+
+        summary = DeltaProcessor(db_session).clone_exact_match(target, "DOMAIN\\testuser")
+
+        assert summary["employees_cloned"] == 2
+        assert (summary["artifacts_copied"], summary["exports_copied"]) == (2, 1)
+        db_session.refresh(target)
+        assert target.status == SessionStatus.COMPLETED
+        assert target.total_employees == 2
+
+        cloned = db_session.query(EmployeeRevision).filter(
+            EmployeeRevision.session_id == target.session_id
+        ).order_by(EmployeeRevision.employee_name).all()
+        assert [(r.employee_name, r.validation_status, r.content_fingerprint) for r in cloned] == [
+            ("ANN LEE", ValidationStatus.VALID, "fp-0"),
+            ("BOB RAY", ValidationStatus.NEEDS_ATTENTION, "fp-1")
+        ]
+        assert not {r.revision_id for r in cloned} & {r.revision_id for r in revisions}
+
+        index = json.loads(
+            (storage / "uploads" / str(target.session_id) / "parsed" / "index.json").read_text()
+        )
+        assert index["session_id"] == str(target.session_id)
+        assert index["employees"][0]["revision_id"] == str(cloned[0].revision_id)
+
+        history = db_session.query(ExportHistory).filter(
+            ExportHistory.session_id == target.session_id
+        ).one()
+        assert history.file_path.endswith(f"pVault_April_Run_{str(target.session_id)[:8]}_20240301_100000.csv")
+        assert open(history.file_path).read().startswith("Employee_ID")
+
+    def test_no_clone_without_exact_match(self, db_session, storage):
+        """Test a session whose Receipt file differs is left for normal processing"""
+        _create_base(db_session, storage)
+        target = _create_session(
+            db_session, "April Run", status=SessionStatus.PENDING, receipt_checksum="c" * 64
+        )
+        db_session.commit()
+
+        assert DeltaProcessor(db_session).clone_exact_match(target, "DOMAIN\\testuser") is None
+        assert target.status == SessionStatus.PENDING
+        assert db_session.query(EmployeeRevision).filter(
+            EmployeeRevision.session_id == target.session_id
+        ).count() == 0
@@ -0,0 +1,142 @@
+"""
+Tests for session list keyset pagination and the session_status_counts counters
+Covers counter maintenance on insert, status change and delete, cursor walks
+over sessions sharing a creation time, and the dashboard counts
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models import ProcessingSession, SessionStatus, SessionStatusCount
+from app.services.session_counts import count_sessions
+
+SESSIONS = 13
+
+
+def _session(created_by, status=SessionStatus.PENDING, created_at=None):
+    now = datetime.now(timezone.utc)
+    return ProcessingSession(
+        session_id=uuid.uuid4(), session_name="Listing", status=status, created_by=created_by,
+        created_at=created_at or now, updated_at=now
+    )
+
+
+class TestSessionStatusCounts:
+    """Test suite for the session_status_counts triggers and count_sessions"""
+
+    def test_counts_follow_session_changes(self, db_session):
+        """Test inserts, ORM and bulk status changes, and deletes keep the counters exact"""
+        sessions = [_session("DOMAIN\\alice") for _ in range(3)] + [_session("DOMAIN\\bob")]
+        db_session.add_all(sessions)
+        db_session.commit()
+
+        sessions[0].status = SessionStatus.PROCESSING
+        db_session.commit()
+        db_session.query(ProcessingSession).filter(
+            ProcessingSession.created_by == "DOMAIN\\bob"
+        ).update({ProcessingSession.status: SessionStatus.COMPLETED})
+        db_session.delete(sessions[1])
+        db_session.commit()
+
+        assert count_sessions(db_session) == 3
+        assert count_sessions(db_session, "DOMAIN\\alice") == 2
+        assert count_sessions(db_session, "DOMAIN\\alice", SessionStatus.PENDING) == 1
+        assert count_sessions(db_session, status=SessionStatus.COMPLETED) == 1
+        assert count_sessions(db_session, "DOMAIN\\nobody") == 0
+        assert db_session.query(SessionStatusCount).filter(
+            SessionStatusCount.created_by == "DOMAIN\\alice",
+            SessionStatusCount.status == SessionStatus.PROCESSING
+        ).one().session_count == 1
+
+
+@pytest.fixture
+def listing(file_db):
+    """File database with SESSIONS sessions for rcox (several sharing created_at) and two for another user"""
+    base = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    sessions = [
+        _session(
+            "DOMAIN\\rcox",
+            SessionStatus.COMPLETED if i % 3 == 0 else SessionStatus.PENDING,
+            base + timedelta(minutes=i // 4)
+        )
+        for i in range(SESSIONS)
+    ] + [_session("DOMAIN\\other"), _session("DOMAIN\\other", SessionStatus.PROCESSING)]
+    with file_db.Session() as db:
+        db.add_all(sessions)
+        db.commit()
+        expected = [
+            str(s.session_id) for s in sorted(
+                sessions[:SESSIONS], key=lambda s: (s.created_at, str(s.session_id)), reverse=True
+            )
+        ]
+    return file_db, expected
+
+
+def _get_all(file_db, requests):
+    """Issue (url, params) requests in order; params may be a callable of the previous responses"""
+    async def scenario(client, sessions, statements):
+        responses = []
+        for url, params in requests:
+            responses.append(await client.get(url, params=params(responses) if callable(params) else params))
+        return responses
+
+    return file_db.run_client(scenario)
+
+
+class TestKeysetPagination:
+    """Test suite for cursor pagination of GET /api/sessions"""
+
+    def test_cursor_walk_returns_every_session_once(self, listing):
+        """Test following next_cursor visits all sessions in order, across created_at ties"""
+        file_db, expected = listing
+
+        def next_page(responses):
+            return {"page_size": 5, "cursor": responses[-1].json()["next_cursor"]}
+
+        responses = _get_all(file_db, [
+            ("/api/sessions", {"page_size": 5}),
+            ("/api/sessions", next_page),
+            ("/api/sessions", next_page)
+        ])
+
+        pages = [response.json() for response in responses]
+        assert [page["total_count"] for page in pages] == [SESSIONS] * 3
+        assert [len(page["sessions"]) for page in pages] == [5, 5, 3]
+        assert pages[2]["next_cursor"] is None
+        assert [s["session_id"] for page in pages for s in page["sessions"]] == expected
+
+    def test_offset_pages_match_cursor_order(self, listing):
+        """Test page-number paging keeps working and agrees with the cursor order"""
+        file_db, expected = listing
+
+        first, second = _get_all(file_db, [
+            ("/api/sessions", {"page_size": 5, "page": 1}),
+            ("/api/sessions", {"page_size": 5, "page": 2})
+        ])
+
+        assert [s["session_id"] for s in first.json()["sessions"] + second.json()["sessions"]] == expected[:10]
+        assert second.json()["next_cursor"] is not None
+
+    def test_status_filter_total_and_bad_cursor(self, listing):
+        """Test filtered totals come from the counters and malformed cursors are rejected"""
+        file_db, _ = listing
+
+        filtered, bad = _get_all(file_db, [
+            ("/api/sessions", {"status_filter": "COMPLETED"}),
+            ("/api/sessions", {"cursor": "not-a-cursor"})
+        ])
+
+        assert filtered.json()["total_count"] == len(range(0, SESSIONS, 3))
+        assert len(filtered.json()["sessions"]) == len(range(0, SESSIONS, 3))
+        assert bad.status_code == 400
+
+    def test_dashboard_stats(self, listing):
+        """Test active and completed-today counts"""
+        file_db, _ = listing
+
+        (response,) = _get_all(file_db, [("/api/sessions/dashboard/stats", None)])
+
+        assert response.json()["active_sessions"] == 1
+        assert response.json()["completed_today"] == len(range(0, SESSIONS, 3))
@@ -0,0 +1,184 @@
+"""
+Tests for the maintained session_statistics table
+Covers trigger maintenance on insert, resolve, export, delete and Core
+INSERT ... SELECT clones, backfill on table creation, and the summary readers
+"""
+
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import create_engine, insert, literal, select, text
+
+from app.api.results import _calculate_comprehensive_statistics, _calculate_issue_statistics
+from app.database import Base
+from app.models import (
+    EmployeeRevision, ProcessingSession, SessionStatistics, SessionStatus, ValidationStatus
+)
+from app.services.session_statistics import get_session_statistics
+
+
+def _session(db_session):
+    session = ProcessingSession(
+        session_id=uuid.uuid4(), session_name="Statistics", status=SessionStatus.COMPLETED,
+        created_by="DOMAIN\\testuser", created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc)
+    )
+    db_session.add(session)
+    db_session.commit()
+    return session
+
+
+def _revisions(session_id):
+    """Eight employees: VALID with receipts, missing receipts, coding and mismatch issues"""
+    revisions = []
+    for i in range(8):
+        flags = {}
+        if i % 4 == 1:
+            flags = {"missing_receipt": True}
+        elif i % 4 == 2:
+            flags = {"coding_incomplete": True}
+        elif i % 4 == 3:
+            flags = {"amount_mismatch": True}
+        revisions.append(EmployeeRevision(
+            session_id=session_id, employee_id=f"EMP{i:03d}", employee_name=f"EMPLOYEE {i}",
+            car_amount=Decimal("100.00"), receipt_amount=Decimal("0") if i % 4 == 1 else Decimal("100.00"),
+            validation_status=ValidationStatus.VALID if not flags else ValidationStatus.NEEDS_ATTENTION,
+            validation_flags=flags
+        ))
+    return revisions
+
+
+def _recompute(db_session, session_id):
+    """Statistics computed from the revisions themselves"""
+    revisions = db_session.query(EmployeeRevision).filter(EmployeeRevision.session_id == session_id).all()
+    attention = [r for r in revisions if r.validation_status == ValidationStatus.NEEDS_ATTENTION]
+    missing = [r for r in revisions if not r.receipt_amount or r.receipt_amount <= 0]
+    return {
+        "total_employees": len(revisions),
+        "valid_employees": sum(r.validation_status == ValidationStatus.VALID for r in revisions),
+        "needs_attention_employees": len(attention),
+        "resolved_employees": sum(r.validation_status == ValidationStatus.RESOLVED for r in revisions),
+        "ready_for_export": sum(
+            r.validation_status == ValidationStatus.VALID and bool(r.receipt_amount) and r.receipt_amount > 0
+            for r in revisions
+        ),
+        "attention_required": len({r.revision_id for r in attention + missing}),
+        "missing_receipt_amount": len(missing),
+        "exported_employees": sum(bool(r.exported_to_pvault) for r in revisions),
+        "missing_receipt_flagged": sum(bool(r.validation_flags.get("missing_receipt")) for r in revisions),
+        "coding_incomplete": sum(bool(r.validation_flags.get("coding_incomplete")) for r in attention),
+        "amount_mismatch": sum(bool(r.validation_flags.get("amount_mismatch")) for r in attention),
+        "car_amount_total": float(sum(r.car_amount or 0 for r in revisions)),
+        "receipt_amount_total": float(sum(r.receipt_amount or 0 for r in revisions))
+    }
+
+
+class TestSessionStatisticsTriggers:
+    """Test suite for the triggers keeping session_statistics current"""
+
+    def test_insert(self, db_session):
+        """Test inserted revisions are counted per status and issue type"""
+        session = _session(db_session)
+        db_session.add_all(_revisions(session.session_id))
+        db_session.commit()
+
+        stats = get_session_statistics(db_session, session.session_id)
+        assert stats == _recompute(db_session, session.session_id)
+        assert (stats["total_employees"], stats["ready_for_export"], stats["attention_required"]) == (8, 2, 6)
+        assert (stats["coding_incomplete"], stats["amount_mismatch"], stats["car_amount_total"]) == (2, 2, 800.0)
+
+    def test_resolve_export_and_delete(self, db_session):
+        """Test status changes, export flags and deletes move the counters"""
+        session = _session(db_session)
+        revisions = _revisions(session.session_id)
+        db_session.add_all(revisions)
+        db_session.commit()
+
+        revisions[2].validation_status = ValidationStatus.RESOLVED
+        revisions[3].receipt_amount = Decimal("40.00")
+        db_session.commit()
+        db_session.query(EmployeeRevision).filter(
+            EmployeeRevision.session_id == session.session_id,
+            EmployeeRevision.validation_status == ValidationStatus.VALID
+        ).update({"exported_to_pvault": True})
+        db_session.delete(revisions[1])
+        db_session.commit()
+
+        stats = get_session_statistics(db_session, session.session_id)
+        assert stats == _recompute(db_session, session.session_id)
+        assert (stats["resolved_employees"], stats["exported_employees"], stats["total_employees"]) == (1, 2, 7)
+
+    def test_core_insert_select_clone(self, db_session):
+        """Test rows copied with INSERT ... SELECT (session cloning) are counted"""
+        source, target = _session(db_session), _session(db_session)
+        db_session.add_all(_revisions(source.session_id))
+        db_session.commit()
+
+        revisions = EmployeeRevision.__table__
+        columns = ["revision_id", "session_id", "employee_id", "employee_name", "car_amount", "receipt_amount",
+                   "validation_status", "validation_flags", "created_at", "updated_at", "exported_to_pvault",
+                   "receipt_version_processed", "amount_changed"]
+        db_session.execute(insert(revisions).from_select(columns, select(
+            *[
+                literal(str(uuid.uuid4())).label(name) if name == "revision_id"
+                else literal(str(target.session_id)).label(name) if name == "session_id"
+                else revisions.c[name]
+                for name in columns
+            ]
+        ).where(revisions.c.session_id == source.session_id).limit(1)))
+        db_session.commit()
+
+        assert get_session_statistics(db_session, target.session_id) == _recompute(db_session, target.session_id)
+        assert get_session_statistics(db_session, target.session_id)["total_employees"] == 1
+
+    def test_missing_row_reads_as_zero(self, db_session):
+        """Test a session without revisions has zero statistics"""
+        session = _session(db_session)
+
+        stats = get_session_statistics(db_session, session.session_id)
+        assert stats["total_employees"] == 0
+        assert db_session.query(SessionStatistics).count() == 0
+
+    def test_backfill_when_table_is_created(self, tmp_path):
+        """Test create_all on an existing database fills statistics from its revisions"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'existing.db'}")
+        Base.metadata.create_all(engine)
+        session_id = uuid.uuid4()
+        with engine.begin() as connection:
+            connection.execute(ProcessingSession.__table__.insert().values(
+                session_id=session_id, session_name="Existing", status=SessionStatus.COMPLETED,
+                created_by="DOMAIN\\testuser"
+            ))
+            connection.execute(EmployeeRevision.__table__.insert(), [
+                {"session_id": session_id, "employee_name": f"EMPLOYEE {i}", "receipt_amount": Decimal(i)}
+                for i in range(3)
+            ])
+            connection.execute(text("DROP TABLE session_statistics"))
+
+        Base.metadata.create_all(engine)
+
+        with engine.connect() as connection:
+            row = connection.execute(select(SessionStatistics.__table__)).one()
+        engine.dispose()
+        assert (row.total_employees, row.valid_employees, row.ready_for_export, row.missing_receipt_amount) == (
+            3, 3, 2, 1
+        )
+
+
+class TestSummaryReaders:
+    """Test suite for summary statistics read from session_statistics"""
+
+    def test_summary_and_issue_statistics(self, db_session):
+        """Test the summary endpoints' statistics match the revisions"""
+        session = _session(db_session)
+        db_session.add_all(_revisions(session.session_id))
+        db_session.commit()
+
+        summary = _calculate_comprehensive_statistics(db_session, session.session_id)
+        issues = _calculate_issue_statistics(db_session, session.session_id)
+
+        assert (summary["ready_for_pvault"], summary["need_attention"]) == (2, 6)
+        assert summary["issues_breakdown"] == {"missing_receipts": 2, "coding_incomplete": 2, "data_mismatches": 2}
+        assert summary["export_readiness"]["percentage"] == 25.0
+        assert (issues.total_employees, issues.ready_for_export, issues.needs_attention) == (8, 2, 6)
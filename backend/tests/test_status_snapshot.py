@@ -0,0 +1,362 @@
+"""
+Tests for session status snapshots
+Covers the status version triggers, ETag matching, conditional status polls
+answered with 304 or from the snapshot cache with one primary key read, and
+the long-poll and Server-Sent Events variants woken by pipeline notifications
+"""
+
+import asyncio
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.api.sessions import status_events
+from app.config import settings
+from app.models import (
+    ActivityType, EmployeeRevision, ProcessingActivity, ProcessingSession, SessionStatus,
+    SessionStatusVersion, ValidationStatus
+)
+from app.services import status_snapshot
+from app.services.status_snapshot import (
+    StatusChangeNotifier, StatusSnapshotCache, etag_matches, notify_status_change, status_etag
+)
+
+
+def _session(session_id=None):
+    return ProcessingSession(
+        session_id=session_id or uuid.uuid4(), session_name="Status", status=SessionStatus.PROCESSING,
+        created_by="DOMAIN\\rcox", total_employees=10, created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc)
+    )
+
+
+def _revision(session_id, employee_id="EMP001"):
+    return EmployeeRevision(
+        session_id=session_id, employee_id=employee_id, employee_name="JOHN SMITH",
+        car_amount=Decimal("100.00"), receipt_amount=Decimal("100.00"),
+        validation_status=ValidationStatus.VALID, validation_flags={}
+    )
+
+
+def _activity(session_id, message):
+    return ProcessingActivity(
+        session_id=session_id, activity_type=ActivityType.PROCESSING,
+        activity_message=message, created_by="SYSTEM"
+    )
+
+
+def _version(db_session, session_id):
+    row = db_session.get(SessionStatusVersion, session_id)
+    db_session.expire_all()
+    return row.version if row else 0
+
+
+class TestStatusVersionTriggers:
+    """Test suite for the session_status_versions triggers"""
+
+    def test_status_inputs_bump_version(self, db_session):
+        """Test session, revision and activity writes each bump the version"""
+        session = _session()
+        db_session.add(session)
+        db_session.commit()
+        versions = [_version(db_session, session.session_id)]
+
+        session.status = SessionStatus.COMPLETED
+        db_session.commit()
+        versions.append(_version(db_session, session.session_id))
+
+        revision = _revision(session.session_id)
+        db_session.add(revision)
+        db_session.commit()
+        versions.append(_version(db_session, session.session_id))
+
+        revision.validation_status = ValidationStatus.NEEDS_ATTENTION
+        db_session.commit()
+        versions.append(_version(db_session, session.session_id))
+
+        db_session.add(_activity(session.session_id, "Processed batch"))
+        db_session.commit()
+        versions.append(_version(db_session, session.session_id))
+
+        assert versions == [1, 2, 3, 4, 5]
+
+
+class TestEtags:
+    """Test suite for status ETags"""
+
+    def test_etag_matching(self):
+        """Test weak comparison, lists and the wildcard"""
+        etag = status_etag(3, datetime(2026, 10, 18, 12, 0, 0))
+
+        assert etag == 'W/"3-20261018120000"'
+        assert status_etag(None, None) == 'W/"0"'
+        assert etag_matches('"3-20261018120000"', etag)
+        assert etag_matches('W/"1-x", W/"3-20261018120000"', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('W/"2-20261018120000"', etag)
+        assert not etag_matches(None, etag)
+
+    def test_cache_keeps_latest_version_per_session(self):
+        """Test a newer version replaces the cached response and old sessions are evicted"""
+        cache = StatusSnapshotCache(max_entries=2)
+        cache.put("a", "v1", "a1")
+        cache.put("a", "v2", "a2")
+        cache.put("b", "v1", "b1")
+        cache.put("c", "v1", "c1")
+
+        assert cache.get("a", "v2") is None
+        assert (cache.get("b", "v1"), cache.get("c", "v1")) == ("b1", "c1")
+        assert cache.get_metrics()["evictions"] == 1
+
+
+@pytest.fixture
+def status_app(file_db, monkeypatch):
+    """Status endpoint on a file database seeded with one processing session, counting async queries"""
+    session_id = uuid.uuid4()
+    with file_db.Session() as db:
+        db.add(_session(session_id))
+        db.add_all(_revision(session_id, f"EMP{i:03d}") for i in range(5))
+        db.add_all(_activity(session_id, f"Processed batch {i}") for i in range(3))
+        db.commit()
+
+    monkeypatch.setattr(status_snapshot, "_status_snapshot_cache", StatusSnapshotCache())
+    return str(session_id), file_db
+
+
+def _poll(file_db, session_id, steps):
+    """Run (headers, before) steps against the status endpoint; returns [(response, queries)]"""
+    async def scenario(client, sessions, statements):
+        results = []
+        for headers, before in steps:
+            if before:
+                before()
+            del statements[:]
+            response = await client.get(f"/api/sessions/{session_id}/status", headers=headers(results))
+            results.append((response, len(statements)))
+        return results
+
+    return file_db.run_client(scenario)
+
+
+def _log_activity(file_db, session_id, message):
+    """Write an activity as the pipeline would and notify status waiters"""
+    with file_db.Session() as db:
+        db.add(_activity(uuid.UUID(session_id), message))
+        db.commit()
+    notify_status_change(session_id)
+
+
+def _if_none_match(results):
+    return {"If-None-Match": results[-1][0].headers["etag"]}
+
+
+class TestConditionalStatusPolls:
+    """Test suite for ETag / If-None-Match on GET /api/sessions/{id}/status"""
+
+    def test_unchanged_poll_returns_304_with_one_query(self, status_app):
+        """Test a matching If-None-Match is answered with 304 from the version row alone"""
+        session_id, file_db = status_app
+
+        (first, _), (second, queries) = _poll(file_db, session_id, [
+            (lambda results: {}, None),
+            (_if_none_match, None)
+        ])
+
+        assert first.status_code == 200
+        assert first.headers["etag"].startswith('W/"')
+        assert first.json()["valid_employees"] == 5
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == first.headers["etag"]
+        assert queries == 1
+
+    def test_repeat_poll_served_from_snapshot_cache(self, status_app):
+        """Test pollers without the ETag get the cached response for the same version"""
+        session_id, file_db = status_app
+
+        (first, built), (second, queries) = _poll(file_db, session_id, [
+            (lambda results: {}, None),
+            (lambda results: {}, None)
+        ])
+
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert built > queries == 1
+
+    def test_change_returns_new_status(self, status_app):
+        """Test an activity written after the first poll produces a new ETag and body"""
+        session_id, file_db = status_app
+
+        (first, _), (second, _) = _poll(file_db, session_id, [
+            (lambda results: {}, None),
+            (_if_none_match, lambda: _log_activity(file_db, session_id, "Processed batch 3"))
+        ])
+
+        assert second.status_code == 200
+        assert second.headers["etag"] != first.headers["etag"]
+        messages = [activity["activity_message"] for activity in second.json()["recent_activities"]]
+        assert "Processed batch 3" in messages
+
+    def test_access_checked_before_304(self, status_app):
+        """Test another user's matching ETag is still refused"""
+        session_id, file_db = status_app
+
+        def other_user(results):
+            file_db.authenticate_as("someoneelse")
+            return _if_none_match(results)
+
+        (_, _), (second, _) = _poll(file_db, session_id, [
+            (lambda results: {}, None),
+            (other_user, None)
+        ])
+
+        assert second.status_code == 403
+
+
+class TestStatusChangeNotifier:
+    """Test suite for StatusChangeNotifier"""
+
+    def test_notify_from_thread_wakes_waiter(self):
+        """Test a notification from a writer thread ends the wait on the event loop"""
+        notifier = StatusChangeNotifier()
+        session_id = uuid.uuid4()
+
+        async def run():
+            with notifier.watch(session_id) as watch:
+                asyncio.get_running_loop().call_later(
+                    0.05, lambda: threading.Thread(target=notifier.notify, args=(str(session_id).upper(),)).start()
+                )
+                woken = await watch.wait(5)
+                timed_out = not await watch.wait(0.05)
+            return woken, timed_out
+
+        assert asyncio.run(run()) == (True, True)
+        assert notifier.get_metrics() == {"notifications": 1, "wakeups": 1, "waiting": 0}
+
+    def test_notification_before_wait_is_kept(self):
+        """Test a change notified between reads ends the next wait immediately"""
+        notifier = StatusChangeNotifier()
+
+        async def run():
+            with notifier.watch("session") as watch:
+                notifier.notify("session")
+                await asyncio.sleep(0)
+                return await watch.wait(5)
+
+        assert asyncio.run(run()) is True
+
+
+class TestLongPollAndStream:
+    """Test suite for ?wait_for_version long-polls and the SSE status stream"""
+
+    def test_long_poll_returns_on_pipeline_change(self, status_app, monkeypatch):
+        """Test a long-poll is answered once, right after the pipeline notifies a change"""
+        session_id, file_db = status_app
+        monkeypatch.setattr(settings, "status_recheck_seconds", 30.0)
+
+        async def scenario(client, sessions, statements):
+            current = await client.get(f"/api/sessions/{session_id}/status")
+            version = int(current.headers["x-status-version"])
+            asyncio.get_running_loop().call_later(
+                0.2, lambda: threading.Thread(
+                    target=_log_activity, args=(file_db, session_id, "Processed batch 3")
+                ).start()
+            )
+            started = time.monotonic()
+            changed = await client.get(
+                f"/api/sessions/{session_id}/status", params={"wait_for_version": version + 1},
+                headers={"If-None-Match": current.headers["etag"]}
+            )
+            return version, changed, time.monotonic() - started
+
+        version, changed, elapsed = file_db.run_client(scenario)
+
+        assert changed.status_code == 200
+        assert int(changed.headers["x-status-version"]) == version + 1
+        assert changed.json()["recent_activities"][0]["activity_message"] == "Processed batch 3"
+        assert 0.2 <= elapsed < 5
+
+    def test_long_poll_timeout_returns_current_status(self, status_app):
+        """Test an unchanged session answers the long-poll at the timeout (304 with a matching ETag)"""
+        session_id, file_db = status_app
+
+        async def scenario(client, sessions, statements):
+            current = await client.get(f"/api/sessions/{session_id}/status")
+            version = int(current.headers["x-status-version"])
+            return current, await client.get(
+                f"/api/sessions/{session_id}/status",
+                params={"wait_for_version": version + 1, "wait_timeout": 0.2},
+                headers={"If-None-Match": current.headers["etag"]}
+            )
+
+        current, waited = file_db.run_client(scenario)
+
+        assert waited.status_code == 304
+        assert waited.headers["x-status-version"] == current.headers["x-status-version"]
+
+    def test_stream_sends_one_event_per_change(self, status_app, monkeypatch):
+        """Test the stream sends the current status, then one event after a change, with keep-alives between"""
+        session_id, file_db = status_app
+        monkeypatch.setattr(settings, "status_stream_keepalive_seconds", 0.1)
+        events = []
+
+        async def is_disconnected():
+            return sum(event.startswith("id:") for event in events) >= 2
+
+        async def scenario(client, sessions, statements):
+            async with sessions() as db:
+                async for event_text in status_events(db, uuid.UUID(session_id), None, is_disconnected):
+                    events.append(event_text)
+                    if event_text.startswith(": keepalive") and len(events) < 4:
+                        await asyncio.to_thread(_log_activity, file_db, session_id, "Processed batch 3")
+
+        file_db.run_client(scenario)
+
+        status_events_sent = [event for event in events if event.startswith("id:")]
+        assert events[0].startswith("retry:")
+        assert len(status_events_sent) == 2
+        first_id, second_id = (int(event.split("\n")[0][4:]) for event in status_events_sent)
+        assert second_id == first_id + 1
+        data = json.loads(status_events_sent[1].split("data: ", 1)[1])
+        assert data["recent_activities"][0]["activity_message"] == "Processed batch 3"
+
+    def test_stream_resumes_from_last_event_id(self, status_app):
+        """Test a reconnect with the current version gets no repeated status event"""
+        session_id, file_db = status_app
+        events = []
+
+        async def scenario(client, sessions, statements):
+            current = await client.get(f"/api/sessions/{session_id}/status")
+            checks = iter([False, True])
+
+            async def is_disconnected():
+                return next(checks)
+
+            async with sessions() as db:
+                async for event_text in status_events(
+                    db, uuid.UUID(session_id), int(current.headers["x-status-version"]), is_disconnected
+                ):
+                    events.append(event_text)
+
+        file_db.run_client(scenario)
+
+        assert not any(event.startswith("id:") for event in events)
+
+    def test_stream_checks_session_before_streaming(self, status_app):
+        """Test unknown sessions and malformed IDs are refused before the stream starts"""
+        _, file_db = status_app
+
+        async def scenario(client, sessions, statements):
+            return (
+                await client.get(f"/api/sessions/{uuid.uuid4()}/status/stream"),
+                await client.get("/api/sessions/not-a-uuid/status/stream")
+            )
+
+        missing, malformed = file_db.run_client(scenario)
+
+        assert (missing.status_code, malformed.status_code) == (404, 400)
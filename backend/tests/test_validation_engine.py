@@ -0,0 +1,160 @@
+"""
+Tests for the enhanced validation engine
+Covers batch context indexes and duplicate detection
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from app.models import ValidationStatus
+from app.services.validation_engine import (
+    ContextIndex, DuplicateEmployeeRule, EmployeeColumns, ValidationContext, ValidationEngine
+)
+
+
+def _employee(name, employee_id, car="100.00", receipt="100.00", confidence=0.95):
+    return {
+        "employee_name": name,
+        "employee_id": employee_id,
+        "car_amount": Decimal(car),
+        "receipt_amount": Decimal(receipt),
+        "confidence": confidence
+    }
+
+
+class TestValidationContext:
+    """Test suite for the precomputed batch validation context"""
+
+    def test_counts_by_normalized_name_and_id(self):
+        """Test name and ID counts ignore case and surrounding whitespace"""
+        context = ValidationContext([
+            _employee("John Smith", "E1"),
+            _employee(" JOHN SMITH ", "E2"),
+            _employee("Mary Jones", " E1 "),
+            _employee("Ann Lee", None),
+        ])
+
+        assert context.name_count("john smith") == 2
+        assert context.name_count("Mary Jones") == 1
+        assert context.id_count("E1") == 2
+        assert context.id_count("E3") == 0
+
+    def test_amount_aggregates_and_percentiles(self):
+        """Test amount statistics over valid amounts"""
+        employees = [_employee(f"E{i}", str(i), car=f"{i}.00") for i in range(1, 101)]
+        employees.append({"employee_name": "Bad", "employee_id": "x", "car_amount": "n/a"})
+
+        context = ValidationContext(employees, [ContextIndex.AMOUNT_STATS])
+
+        assert context.amount_stat("car_amount", "count") == 100
+        assert context.amount_stat("car_amount", "total") == pytest.approx(5050.0)
+        assert context.amount_stat("car_amount", "p50") == pytest.approx(50.5)
+        assert context.amount_stat("car_amount", "max") == 100.0
+        assert context.name_counts == {}
+
+    def test_engine_builds_only_required_indexes(self):
+        """Test the engine requests the indexes declared by its rules"""
+        engine = ValidationEngine()
+        context = engine.build_context([_employee("John Smith", "E1")])
+
+        assert context.indexes == {ContextIndex.NAME_COUNTS, ContextIndex.ID_COUNTS}
+
+
+class TestDuplicateDetection:
+    """Test suite for batch duplicate detection"""
+
+    def test_validate_batch_flags_duplicates(self):
+        """Test duplicates by name or ID are flagged and unique employees are not"""
+        employees = [
+            _employee("John Smith", "E1"),
+            _employee("john smith", "E2"),
+            _employee("Mary Jones", "E3"),
+            _employee("Ann Lee", "E3"),
+            _employee("Bob Brown", "E4"),
+        ]
+
+        results = ValidationEngine().validate_batch(employees)
+
+        flagged = ["duplicate_employee" in r["validation_flags"] for r in results]
+        assert flagged == [True, True, True, True, False]
+        assert results[4]["validation_status"] == ValidationStatus.VALID
+        assert results[0]["validation_flags"]["duplicate_employee"]["details"] == {"name_matches": 2, "id_matches": 1}
+
+    def test_rule_without_index_falls_back_to_list(self):
+        """Test the rule still works when only the employee list is supplied"""
+        employees = [_employee("John Smith", "E1"), _employee("John Smith", None)]
+
+        issue = DuplicateEmployeeRule().validate(employees[1], {"all_employees": employees})
+
+        assert issue["details"] == {"name_matches": 2, "id_matches": 0}
+
+
+class TestColumnarValidation:
+    """Test suite for vectorized batch validation"""
+
+    def test_columnar_matches_row_by_row(self):
+        """Test columnar masks produce the same results as per-row evaluation"""
+        pytest.importorskip("numpy")
+        employees = [
+            _employee("John Smith", "E1"),
+            _employee("Mary Jones", "E2", car="100.00", receipt="105.00"),    # exactly $5 difference
+            _employee("Ann Lee", "E3", car="100.00", receipt="120.00"),       # mismatch
+            _employee("Bob Brown", "E4", car="2500.00", receipt="2500.00"),   # policy violation
+            _employee("Cy Young", "E5", receipt="0.00"),                       # missing receipt
+            _employee("Di Prince", "", confidence=0.5),                        # missing ID, low confidence
+            {"employee_name": "Ed Norton", "employee_id": "E6", "car_amount": "abc", "receipt_amount": None},
+            _employee("john smith", "E7"),                                     # duplicate name
+        ]
+        engine = ValidationEngine()
+
+        row_results = engine.validate_batch(employees, columnar=False)
+        columnar_results = engine.validate_batch(employees, columnar=True)
+
+        def strip_timestamps(results):
+            for result in results:
+                for flag in result["validation_flags"].values():
+                    if isinstance(flag, dict):
+                        flag.pop("detected_at", None)
+                        for issue in flag.get("issues", []):
+                            issue.pop("detected_at", None)
+            return results
+
+        assert strip_timestamps(columnar_results) == strip_timestamps(row_results)
+        assert columnar_results[0]["validation_status"] == ValidationStatus.NEEDS_ATTENTION
+        assert columnar_results[1]["validation_status"] == ValidationStatus.VALID
+
+    def test_columns_convert_like_row_rules(self):
+        """Test vectorized column loading converts numeric and mixed batches like the row rules"""
+        np = pytest.importorskip("numpy")
+        numeric = EmployeeColumns([
+            {"car_amount": 1, "employee_id": "E1", "confidence": 0.5},
+            {"car_amount": Decimal("2.50"), "employee_id": " \t"},
+            {"car_amount": None, "employee_id": None, "confidence": 1},
+        ])
+        mixed = EmployeeColumns([
+            {"car_amount": " 3.5 ", "employee_id": 0, "confidence": "high"},
+            {"car_amount": "abc", "employee_id": "", "confidence": True},
+            {"car_amount": 4.0, "employee_id": "E2", "confidence": 0.7},
+        ])
+
+        np.testing.assert_array_equal(numeric.amount("car_amount"), [1.0, 2.5, np.nan])
+        np.testing.assert_array_equal(numeric.blank("employee_id"), [False, True, True])
+        np.testing.assert_array_equal(numeric.confidence(), [0.5, 1.0, 1.0])
+        np.testing.assert_array_equal(mixed.amount("car_amount"), [3.5, np.nan, 4.0])
+        np.testing.assert_array_equal(mixed.blank("employee_id"), [False, True, False])
+        np.testing.assert_array_equal(mixed.confidence(), [np.nan, np.nan, 0.7])
+
+    def test_issue_timestamps_shared_per_batch(self):
+        """Test issues in one batch share a single detection timestamp"""
+        employees = [_employee("Ann Lee", "", receipt="0.00"), _employee("Bob Brown", "", receipt="0.00")]
+
+        results = ValidationEngine().validate_batch(employees)
+
+        timestamps = {
+            issue["detected_at"]
+            for result in results
+            for flag in result["validation_flags"].values() if isinstance(flag, dict)
+            for issue in flag.get("issues", [flag])
+        }
+        assert len(timestamps) == 1
@@ -0,0 +1,71 @@
+"""
+Tests for the generated validation flag columns on employee_revisions
+Covers column values from validation_flags, updates, index use for issue
+filters and issue categorization
+"""
+
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from app.api.results import _categorize_employee_issues
+from app.models import EmployeeRevision, ProcessingSession, SessionStatus, ValidationStatus
+
+
+def _revision(db_session, flags, status=ValidationStatus.NEEDS_ATTENTION):
+    session = ProcessingSession(
+        session_id=uuid.uuid4(), session_name="Flags", status=SessionStatus.COMPLETED,
+        created_by="DOMAIN\\testuser", created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc)
+    )
+    revision = EmployeeRevision(
+        session_id=session.session_id, employee_id="EMP001", employee_name="JOHN SMITH",
+        car_amount=Decimal("100.00"), receipt_amount=Decimal("90.00"),
+        validation_status=status, validation_flags=flags
+    )
+    db_session.add_all([session, revision])
+    db_session.commit()
+    return revision
+
+
+class TestValidationFlagColumns:
+    """Test suite for flag_missing_receipt, flag_amount_mismatch and flag_coding_incomplete"""
+
+    def test_columns_follow_validation_flags(self, db_session):
+        """Test flags set to true are reflected, other values are not"""
+        revision = _revision(db_session, {"amount_mismatch": True, "coding_incomplete": False, "note": "x"})
+
+        assert (revision.flag_amount_mismatch, revision.flag_coding_incomplete, revision.flag_missing_receipt) == (
+            True, False, False
+        )
+
+        revision.validation_flags = {"missing_receipt": True}
+        db_session.commit()
+
+        assert (revision.flag_amount_mismatch, revision.flag_missing_receipt) == (False, True)
+
+    def test_issue_filter_uses_session_flag_index(self, db_session):
+        """Test the exceptions issue filter is answered from the (session_id, flag) index"""
+        revision = _revision(db_session, {"coding_incomplete": True})
+
+        matches = db_session.query(EmployeeRevision).filter(
+            EmployeeRevision.session_id == revision.session_id,
+            EmployeeRevision.flag_coding_incomplete.is_(True)
+        ).all()
+        plan = db_session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT revision_id FROM employee_revisions "
+            "WHERE session_id = :session_id AND flag_coding_incomplete IS 1"
+        ), {"session_id": str(revision.session_id)}).all()
+
+        assert matches == [revision]
+        assert "idx_employee_session_coding_incomplete" in " ".join(row[-1] for row in plan)
+
+    def test_categorize_from_columns(self, db_session):
+        """Test issue categories come from the flag columns"""
+        assert _categorize_employee_issues(_revision(db_session, {"amount_mismatch": True})) == "data_mismatches"
+        assert _categorize_employee_issues(_revision(db_session, {"coding_incomplete": True})) == "coding_issues"
+        assert _categorize_employee_issues(
+            _revision(db_session, {"coding_incomplete": True}, ValidationStatus.RESOLVED)
+        ) == "validation_errors"
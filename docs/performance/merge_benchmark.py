@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Employee Merge Benchmark for Credit Card Processor
+Compares the merge engine with the previous merge paths on synthetic employees
+
+Usage (from the repository root):
+    python docs/performance/merge_benchmark.py --employees 500 2000
+"""
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+from app.models import ValidationStatus  # noqa: E402
+from app.services.employee_merger import EmployeeDataMerger  # noqa: E402
+from app.services.merge_engine import MergeEngine  # noqa: E402
+
+FIRST_NAMES = ["JOHN", "MARY", "WILLIAM", "ANNA", "KEVIN", "AARON", "MARIA", "DAVID",
+               "LINDA", "JAMES", "SUSAN", "ROBERT", "KAREN", "MICHAEL", "NANCY", "BRIAN"]
+LAST_NAMES = ["SMITH", "JOHNSON", "BROWN", "GARCIA", "NGUYEN", "LEE", "DAVIS", "MARTINEZ",
+              "WILSON", "ANDERSON", "TAYLOR", "THOMAS", "MOORE", "JACKSON", "WHITE", "HARRIS"]
+
+
+def generate_employees(count: int, seed: int = 42):
+    """Generate CAR and receipt employees; ~85% share IDs, some names carry typos"""
+    rng = random.Random(seed)
+    car, receipts = [], []
+    for i in range(count):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}{i}"
+        amount = round(rng.uniform(50, 2500), 2)
+        car.append({"employee_id": f"{100000 + i}", "employee_name": name,
+                    "car_amount": amount, "confidence": 0.95})
+        if rng.random() < 0.9:
+            receipt_name = name if rng.random() < 0.9 else name[:-1] + "X"
+            receipt_id = f"{100000 + i}" if rng.random() < 0.85 else None
+            receipts.append({"employee_id": receipt_id, "employee_name": receipt_name,
+                             "receipt_amount": amount, "confidence": 0.9})
+    rng.shuffle(receipts)
+    return car, receipts
+
+
+def legacy_processing_merge(car_employees: List[Dict], receipt_employees: List[Dict]) -> List[Dict]:
+    """Previous api/processing.py merge_employee_data (ID join only)"""
+    def _norm_emp_id(value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        norm = re.sub(r"\D+", "", str(value))
+        return norm if norm else None
+
+    receipt_lookup = {_norm_emp_id(e.get('employee_id')): e for e in receipt_employees if _norm_emp_id(e.get('employee_id'))}
+    merged, processed_ids = [], set()
+    for car_emp in car_employees:
+        employee_id = _norm_emp_id(car_emp.get('employee_id'))
+        receipt_emp = (receipt_lookup.get(employee_id) if employee_id else None) or {}
+        merged.append({
+            'employee_id': employee_id,
+            'employee_name': car_emp.get('employee_name', receipt_emp.get('employee_name')),
+            'car_amount': car_emp.get('car_amount'),
+            'receipt_amount': receipt_emp.get('receipt_amount'),
+            'car_data': car_emp,
+            'receipt_data': receipt_emp,
+            'validation_status': ValidationStatus.VALID
+        })
+        if employee_id:
+            processed_ids.add(employee_id)
+    for receipt_emp in receipt_employees:
+        employee_id = _norm_emp_id(receipt_emp.get('employee_id'))
+        if employee_id and employee_id in processed_ids:
+            continue
+        merged.append({'employee_id': employee_id, 'employee_name': receipt_emp.get('employee_name'),
+                       'car_amount': None, 'receipt_amount': receipt_emp.get('receipt_amount'),
+                       'car_data': {}, 'receipt_data': receipt_emp,
+                       'validation_status': ValidationStatus.NEEDS_ATTENTION})
+    return merged
+
+
+def legacy_document_processor_merge(car_employees: List[Dict], receipt_employees: List[Dict]) -> List[Dict]:
+    """Previous DocumentProcessor._merge_employee_data (EmployeeDataMerger + Decimal + sort)"""
+    car_dict = {f"car_{i}": {**e, "car_total": e["car_amount"]} for i, e in enumerate(car_employees)}
+    receipt_dict = {f"receipt_{i}": {**e, "receipt_total": e["receipt_amount"]} for i, e in enumerate(receipt_employees)}
+    result = EmployeeDataMerger(similarity_threshold=0.8).merge_employee_data(car_dict, receipt_dict)
+    merged = [{
+        "employee_name": emp["employee_name"],
+        "employee_id": emp["employee_id"],
+        "car_amount": Decimal(str(emp["car_total"])),
+        "receipt_amount": Decimal(str(emp["receipt_total"])),
+        "match_status": emp["match_status"],
+        "total_expenses": emp["total_expenses"],
+    } for emp in result["employees"].values()]
+    merged.sort(key=lambda emp: emp["total_expenses"], reverse=True)
+    return merged
+
+
+def merge_engine(car_employees: List[Dict], receipt_employees: List[Dict]) -> List[Dict]:
+    """Current merge engine (ID hash join + blocked fuzzy match of leftovers)"""
+    return list(MergeEngine(similarity_threshold=0.8).merge(car_employees, receipt_employees))
+
+
+def time_merge(fn: Callable, car: List[Dict], receipts: List[Dict], repeats: int) -> Dict[str, Any]:
+    """Time a merge implementation over several runs"""
+    timings = []
+    result = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(car, receipts)
+        timings.append(time.perf_counter() - start)
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        "records": len(result),
+        "matched": sum(1 for r in result if r.get("match_status") == "matched" or (r.get("car_data") and r.get("receipt_data")))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark employee merge implementations")
+    parser.add_argument("--employees", type=int, nargs="+", default=[200, 1000, 2000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    implementations = [
+        ("legacy processing merge (ID only)", legacy_processing_merge),
+        ("legacy DocumentProcessor merge", legacy_document_processor_merge),
+        ("merge engine", merge_engine),
+    ]
+
+    print(f"{'employees':>10}  {'implementation':<36} {'median ms':>10} {'records':>8} {'matched':>8}")
+    for count in args.employees:
+        car, receipts = generate_employees(count)
+        for label, fn in implementations:
+            stats = time_merge(fn, car, receipts, args.repeats)
+            print(f"{count:>10}  {label:<36} {stats['median_ms']:>10} {stats['records']:>8} {stats['matched']:>8}")
+
+
+if __name__ == "__main__":
+    main()
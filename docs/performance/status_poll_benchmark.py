@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Status Polling Benchmark for Credit Card Processor
+Compares status polling latency on a blocking synchronous Session run in the
+event loop (the previous read path) with the AsyncSession read path
+
+Usage (from the repository root):
+    python docs/performance/status_poll_benchmark.py --pollers 50 --polls 4
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import main as app_main  # noqa: E402
+from app.auth import UserInfo, get_current_user  # noqa: E402
+from app.database import Base, get_async_db, set_async_sqlite_pragma, set_sqlite_pragma  # noqa: E402
+from app.models import (  # noqa: E402
+    ActivityType, EmployeeRevision, ProcessingActivity, ProcessingSession, SessionStatus, ValidationStatus
+)
+
+
+class BlockingSession:
+    """Runs read builders on a synchronous Session in the event loop (the previous behaviour)"""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.session, *args, **kwargs)
+
+    async def scalars(self, statement):
+        return self.session.scalars(statement)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.session.close()
+
+
+def seed_database(path: Path, employees: int) -> str:
+    """Create a database with one completed session; returns its ID"""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", set_sqlite_pragma)
+    Base.metadata.create_all(bind=engine)
+
+    session_id = uuid.uuid4()
+    with sessionmaker(bind=engine)() as db:
+        db.add(ProcessingSession(
+            session_id=session_id, session_name="Polling", status=SessionStatus.COMPLETED,
+            created_by="DOMAIN\\benchmark", total_employees=employees, processed_employees=employees,
+            created_at=datetime.now(timezone.utc), updated_at=datetime.now(timezone.utc)
+        ))
+        db.add_all(
+            EmployeeRevision(
+                session_id=session_id, employee_id=f"EMP{i:04d}", employee_name=f"EMPLOYEE {i:04d}",
+                car_amount=Decimal("100.00"), receipt_amount=Decimal("100.00") if i % 5 else Decimal("0"),
+                validation_status=ValidationStatus.VALID if i % 5 else ValidationStatus.NEEDS_ATTENTION,
+                validation_flags={} if i % 5 else {"missing_receipt": True}
+            )
+            for i in range(employees)
+        )
+        db.add_all(
+            ProcessingActivity(
+                session_id=session_id, activity_type=ActivityType.PROCESSING,
+                activity_message=f"Processed batch {i}", created_by="DOMAIN\\benchmark"
+            )
+            for i in range(20)
+        )
+        db.commit()
+    engine.dispose()
+    return str(session_id)
+
+
+def client_for(session_source) -> AsyncClient:
+    """HTTP client whose async database dependency yields sessions from session_source"""
+    async def override_get_async_db():
+        async with session_source() as session:
+            yield session
+
+    app_main.app.dependency_overrides[get_async_db] = override_get_async_db
+    return AsyncClient(transport=ASGITransport(app=app_main.app), base_url="http://testserver")
+
+
+async def poll_status(client: AsyncClient, session_id: str, pollers: int, polls: int) -> Tuple[List[float], float]:
+    """Concurrent pollers after a warm-up round; returns (latencies, max event loop stall) in seconds"""
+    await asyncio.gather(*(client.get(f"/api/sessions/{session_id}/status") for _ in range(pollers)))
+    latencies = []
+    max_stall = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal max_stall
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            max_stall = max(max_stall, time.perf_counter() - started - 0.001)
+
+    async def poller():
+        for _ in range(polls):
+            started = time.perf_counter()
+            response = await client.get(f"/api/sessions/{session_id}/status")
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    ticker = asyncio.create_task(heartbeat())
+    try:
+        await asyncio.gather(*(poller() for _ in range(pollers)))
+    finally:
+        done.set()
+        await ticker
+    return latencies, max_stall
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark status polling on the blocking and async read paths")
+    parser.add_argument("--pollers", type=int, default=50)
+    parser.add_argument("--polls", type=int, default=4, help="Polls per poller")
+    parser.add_argument("--employees", type=int, default=150)
+    args = parser.parse_args()
+
+    app_main.rate_limiter.is_allowed = lambda client_ip: True
+    app_main.app.dependency_overrides[get_current_user] = lambda: UserInfo(
+        username="benchmark", is_admin=True, is_authenticated=True, auth_method="benchmark",
+        timestamp=datetime.now(timezone.utc)
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "status_poll.db"
+        session_id = seed_database(path, args.employees)
+
+        # Sized to the pollers: with a smaller pool a blocked event loop cannot run the
+        # teardown that returns connections, and the blocking path stalls on checkout
+        blocking_engine = create_engine(
+            f"sqlite:///{path}", connect_args={"check_same_thread": False},
+            pool_size=args.pollers, max_overflow=0
+        )
+        event.listen(blocking_engine, "connect", set_sqlite_pragma)
+        blocking_sessions = sessionmaker(bind=blocking_engine)
+
+        async def run_blocking():
+            async with client_for(lambda: BlockingSession(blocking_sessions())) as client:
+                return await poll_status(client, session_id, args.pollers, args.polls)
+
+        async def run_async():
+            async_engine = create_async_engine(
+                f"sqlite+aiosqlite:///{path}", pool_size=args.pollers, max_overflow=0
+            )
+            event.listen(async_engine.sync_engine, "connect", set_async_sqlite_pragma)
+            try:
+                async with client_for(async_sessionmaker(async_engine, class_=AsyncSession)) as client:
+                    return await poll_status(client, session_id, args.pollers, args.polls)
+            finally:
+                await async_engine.dispose()
+
+        results = [("blocking", *asyncio.run(run_blocking()))]
+        blocking_engine.dispose()
+        results.append(("async", *asyncio.run(run_async())))
+
+    print(f"{'read path':<10} {'polls':>6} {'p50 ms':>8} {'p99 ms':>8} {'max loop stall ms':>18}")
+    for label, latencies, stall in results:
+        print(f"{label:<10} {len(latencies):>6} {percentile(latencies, 50) * 1000:>8.1f} "
+              f"{percentile(latencies, 99) * 1000:>8.1f} {stall * 1000:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()